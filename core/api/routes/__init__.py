@@ -13,6 +13,7 @@ from .vod import create_vod_blueprint
 from .digitalfiles import create_digitalfiles_blueprint
 from .metrics import bp as metrics_bp
 from .helo import create_helo_blueprint
+from .search import create_search_blueprint
 
 def register_routes(app, limiter):
     """Register all API routes with the Flask application."""
@@ -37,6 +38,7 @@ def register_routes(app, limiter):
     vod_bp, vod_ns = create_vod_blueprint(limiter)
     digitalfiles_bp, digitalfiles_ns = create_digitalfiles_blueprint(limiter)
     helo_bp, helo_ns = create_helo_blueprint(limiter)
+    search_bp, search_ns = create_search_blueprint(limiter)
 
     # Add all namespaces to the main API
     api.add_namespace(browse_ns)
@@ -45,6 +47,7 @@ def register_routes(app, limiter):
     api.add_namespace(vod_ns)
     api.add_namespace(digitalfiles_ns)
     api.add_namespace(helo_ns)
+    api.add_namespace(search_ns)
 
     # Register blueprints
     app.register_blueprint(browse_bp, url_prefix='/api')
@@ -53,6 +56,7 @@ def register_routes(app, limiter):
     app.register_blueprint(vod_bp, url_prefix='/api')
     app.register_blueprint(digitalfiles_bp, url_prefix='/api')
     app.register_blueprint(helo_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
     app.register_blueprint(metrics_bp, url_prefix='/api')
 
     # Register main API blueprint
@@ -238,6 +238,21 @@ def api_performance():
         return jsonify({'error': str(e)}), 500 
 
 
+@bp.route('/metrics/transcription-cache', methods=['GET'])
+def transcription_cache_metrics():
+    """Expose hit rates of the content-addressed transcription result cache."""
+    try:
+        from core.transcription_cache import get_transcription_cache
+
+        return jsonify({
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            **get_transcription_cache().get_stats(),
+        })
+    except Exception as e:
+        logger.error(f"transcription cache metrics error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @bp.route('/metrics/caption-autopriority', methods=['GET'])
 def caption_autopriority_metrics():
     """Expose Redis-backed counters for caption autopriority.
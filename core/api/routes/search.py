@@ -0,0 +1,122 @@
+"""Transcript search API endpoints for Archivist application."""
+
+from flask import Blueprint, jsonify, request
+from flask_restx import Namespace, fields
+from loguru import logger
+import os
+
+from core.caption_index import get_caption_index
+from core.cea608 import seconds_to_timecode
+from core.transcript_search import MAX_PER_PAGE, get_transcript_index
+
+# Rate limiting configuration
+SEARCH_RATE_LIMIT = os.getenv('SEARCH_RATE_LIMIT', '120 per minute')
+
+
+def create_search_blueprint(limiter):
+    """Create search blueprint with routes."""
+    bp = Blueprint('search', __name__)
+
+    # Create namespace for API documentation
+    ns = Namespace('search', description='Transcript search operations')
+
+    # Swagger model definitions
+    ns.model('TranscriptHit', {
+        'transcript_id': fields.Integer(description='Index id of the transcript'),
+        'title': fields.String(description='Transcript file name without extension'),
+        'mount': fields.String(description='Flex mount the transcript lives on'),
+        'scc_path': fields.String(description='Path to the SCC file'),
+        'video_path': fields.String(description='Path to the matching video, if found'),
+        'start': fields.Float(description='Caption start in seconds'),
+        'end': fields.Float(description='Caption end in seconds'),
+        'timecode': fields.String(description='Caption start as a drop-frame timecode'),
+        'text': fields.String(description='Caption text'),
+        'snippet': fields.String(description='Caption text with matches in [brackets]')
+    })
+
+    @bp.route('/search/transcripts')
+    @limiter.limit(SEARCH_RATE_LIMIT)
+    def search_transcripts():
+        """Search caption text across all indexed transcripts.
+
+        Query parameters: ``q`` (phrases in quotes, ``word*`` for prefixes),
+        ``page`` (1-based), ``per_page`` (max 100) and optional ``mount``.
+        """
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Missing search query'}), 400
+        try:
+            page = int(request.args.get('page', 1))
+            per_page = int(request.args.get('per_page', 20))
+        except ValueError:
+            return jsonify({'error': 'page and per_page must be integers'}), 400
+        if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+            message = f'page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}'
+            return jsonify({'error': message}), 400
+
+        try:
+            return jsonify(
+                get_transcript_index().search(
+                    query,
+                    page=page,
+                    per_page=per_page,
+                    mount=request.args.get('mount') or None,
+                )
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Error searching transcripts: {e}")
+            return jsonify({'error': 'Internal server error'}), 500
+
+    @bp.route('/search/transcripts/<int:transcript_id>/captions')
+    @limiter.limit(SEARCH_RATE_LIMIT)
+    def transcript_captions(transcript_id):
+        """Get the captions of one transcript at a time or within a time range.
+
+        Query parameters: ``at`` (seconds) for the caption on screen at that
+        moment, or ``start``/``end`` (seconds) for every caption overlapping
+        the range.
+        """
+        try:
+            at = request.args.get('at', type=float)
+            start = request.args.get('start', 0.0, type=float)
+            end = request.args.get('end', float('inf'), type=float)
+            transcript = get_transcript_index().get_transcript(transcript_id)
+            if transcript is None:
+                return jsonify({'error': 'Transcript not found'}), 404
+
+            index = get_caption_index(transcript['scc_path'])
+            captions = index.at(at) if at is not None else index.between(start, end)
+            return jsonify(
+                {
+                    'transcript_id': transcript_id,
+                    'title': transcript['title'],
+                    'captions': [
+                        {
+                            'start': s,
+                            'end': e,
+                            'timecode': seconds_to_timecode(s),
+                            'text': text,
+                        }
+                        for s, e, text in captions
+                    ],
+                }
+            )
+        except FileNotFoundError:
+            return jsonify({'error': 'Transcript file no longer exists'}), 404
+        except Exception as e:
+            logger.error(f"Error reading captions for transcript {transcript_id}: {e}")
+            return jsonify({'error': 'Internal server error'}), 500
+
+    @bp.route('/search/transcripts/stats')
+    @limiter.limit(SEARCH_RATE_LIMIT)
+    def search_stats():
+        """Get transcript search index size per mount."""
+        try:
+            return jsonify(get_transcript_index().get_stats())
+        except Exception as e:
+            logger.error(f"Error getting transcript search stats: {e}")
+            return jsonify({'error': 'Internal server error'}), 500
+
+    return bp, ns
@@ -11,7 +11,7 @@ from kombu.exceptions import OperationalError
 from core.services import TranscriptionService, FileService, QueueService
 from core.models import TranscribeRequest, BatchTranscribeRequest
 from core.security import validate_json_input, sanitize_output, require_csrf_token
-from core.tasks.transcription import batch_transcription
+from core.tasks.transcription import queue_batch_transcription
 
 # Rate limiting configuration
 TRANSCRIBE_RATE_LIMIT = os.getenv('TRANSCRIBE_RATE_LIMIT', '10 per minute')
@@ -90,7 +90,8 @@ def create_transcribe_blueprint(limiter):
             # Use Celery batch transcription task for better integration with captioning workflow
             logger.info(f"Starting Celery batch transcription for {len(valid_paths)} files")
             try:
-                batch_task = batch_transcription.delay(valid_paths)
+                # The chord callback's id: polling it yields the aggregated results
+                batch = queue_batch_transcription(valid_paths)
             except (OperationalError, redis.exceptions.ConnectionError) as e:
                 logger.error(f"Celery broker unavailable: {e}")
                 return jsonify({'error': 'Task queue unavailable'}), 503
@@ -98,7 +99,7 @@ def create_transcribe_blueprint(limiter):
             # Return response with task ID for tracking
             response_data = {
                 'message': f'Batch transcription queued successfully',
-                'batch_task_id': batch_task.id,
+                'batch_task_id': batch.id,
                 'total_files': len(valid_paths),
                 'valid_paths': valid_paths,
                 'queued': valid_paths
@@ -108,7 +109,10 @@ def create_transcribe_blueprint(limiter):
                 response_data['errors'] = [f'Invalid file path: {path}' for path in invalid_paths]
                 response_data['invalid_paths'] = invalid_paths
             
-            logger.info(f"Batch transcription task {batch_task.id} queued for {len(valid_paths)} files")
+            logger.info(
+                f"Batch transcription task {batch.id} queued "
+                f"for {len(valid_paths)} files"
+            )
             return jsonify(response_data)
             
         except Exception as e:
@@ -18,8 +18,10 @@ api = Api(unified_queue_bp, doc='/docs', title='Unified Queue Management API')
 # Create namespaces
 tasks_ns = Namespace('tasks', description='Task management operations')
 workers_ns = Namespace('workers', description='Worker management operations')
+pipelines_ns = Namespace('pipelines', description='End-to-end VOD pipeline operations')
 api.add_namespace(tasks_ns)
 api.add_namespace(workers_ns)
+api.add_namespace(pipelines_ns)
 
 # Define models
 task_model = api.model('Task', {
@@ -249,8 +251,79 @@ class CachedData(Resource):
             logger.error(f"Error getting cached data: {e}")
             api.abort(500, f"Failed to get cached data: {str(e)}")
 
+
+@pipelines_ns.route('/')
+class PipelineList(Resource):
+    """List or start VOD pipelines."""
+
+    @pipelines_ns.doc(
+        'list_pipelines', params={'limit': 'Maximum number of pipelines (default 50)'}
+    )
+    def get(self):
+        """List the most recent VOD pipelines with their stage states."""
+        try:
+            limit = request.args.get('limit', 50, type=int)
+            queue_manager = get_unified_queue_manager()
+            return queue_manager.list_pipelines(limit)
+        except Exception as e:
+            logger.error(f"Error listing pipelines: {e}")
+            api.abort(500, f"Failed to list pipelines: {str(e)}")
+
+    @pipelines_ns.doc('start_pipeline')
+    def post(self):
+        """Start the pipeline for one VOD (vod_id, city_id, optional video_path)."""
+        try:
+            data = request.get_json() or {}
+            vod_id = data.get('vod_id')
+            city_id = data.get('city_id')
+
+            if not vod_id or not city_id:
+                api.abort(400, "vod_id and city_id are required")
+
+            queue_manager = get_unified_queue_manager()
+            return queue_manager.start_vod_pipeline(
+                vod_id, city_id, data.get('video_path')
+            )
+        except Exception as e:
+            logger.error(f"Error starting pipeline: {e}")
+            api.abort(500, f"Failed to start pipeline: {str(e)}")
+
+
+@pipelines_ns.route('/stages')
+class PipelineStages(Resource):
+    """Stage queues, their concurrency limits and current load."""
+
+    @pipelines_ns.doc('get_pipeline_stages')
+    def get(self):
+        """Get stage -> queue routing and per-queue active/reserved counts."""
+        try:
+            queue_manager = get_unified_queue_manager()
+            return queue_manager.get_pipeline_stages()
+        except Exception as e:
+            logger.error(f"Error getting pipeline stages: {e}")
+            api.abort(500, f"Failed to get pipeline stages: {str(e)}")
+
+
+@pipelines_ns.route('/<string:pipeline_id>')
+class PipelineDetail(Resource):
+    """DAG state of one VOD pipeline."""
+
+    @pipelines_ns.doc('get_pipeline')
+    def get(self, pipeline_id):
+        """Get the stage states of a pipeline."""
+        try:
+            queue_manager = get_unified_queue_manager()
+            pipeline = queue_manager.get_pipeline(pipeline_id)
+            if pipeline:
+                return pipeline
+            else:
+                api.abort(404, f"Pipeline {pipeline_id} not found")
+        except Exception as e:
+            logger.error(f"Error getting pipeline: {e}")
+            api.abort(500, f"Failed to get pipeline: {str(e)}")
+
 def register_unified_queue_routes(app):
     """Register the unified queue routes with the Flask app."""
     app.register_blueprint(unified_queue_bp)
     logger.info("Registered unified queue management routes")
-    return api 
\ No newline at end of file
+    return api
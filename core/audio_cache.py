@@ -0,0 +1,343 @@
+"""Local PCM staging cache for media consumers.
+
+faster-whisper used to decode the full container straight off the NFS flex
+mount, and every later consumer decoded it again.  This module runs ffmpeg
+once per source to produce mono 16 kHz PCM on local scratch and hands out a
+``numpy.memmap`` over it, so transcription, chunked transcription and speech
+pre-screening read the same bytes with no further decoding or copying.
+
+Key Features:
+- Entries keyed by (path, size, mtime_ns) so edited sources re-extract
+- float32 or int16 storage, atomically published after extraction
+- Size-bounded LRU eviction across worker processes
+- Hit/miss counters and bytes-saved-from-mount metrics
+
+Example:
+    >>> from core.audio_cache import get_audio_cache
+    >>> staged = get_audio_cache().get("/mnt/flex-1/council.mp4")
+    >>> staged.samples[:16000]  # first second, memory-mapped
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from core.config import AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES, AUDIO_CACHE_DTYPE
+from core.monitoring.metrics import record_metric
+
+SAMPLE_RATE = 16000
+
+_FFMPEG_FORMATS = {"float32": "f32le", "int16": "s16le"}
+
+
+@dataclass
+class StagedAudio:
+    """Handle on a cached PCM file; ``samples`` is a read-only memmap."""
+
+    source_path: str
+    pcm_path: str
+    dtype: str
+    num_samples: int
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / self.sample_rate
+
+    @property
+    def samples(self) -> np.memmap:
+        return open_pcm(self.pcm_path, self.dtype, self.num_samples)
+
+    def sidecar(self, suffix: str) -> str:
+        """Path for derived data stored (and evicted) alongside the PCM."""
+        return os.path.splitext(self.pcm_path)[0] + suffix
+
+    def read(self, start: float = 0.0, end: Optional[float] = None) -> np.ndarray:
+        """Return ``[start, end)`` seconds as contiguous float32 for Whisper."""
+        first = max(0, int(start * self.sample_rate))
+        last = (
+            self.num_samples
+            if end is None
+            else min(self.num_samples, int(end * self.sample_rate))
+        )
+        return to_float32(self.samples[first:last])
+
+
+def open_pcm(pcm_path: str, dtype: str, num_samples: int) -> np.memmap:
+    """Memory-map a staged PCM file (usable from pool workers by path)."""
+    return np.memmap(pcm_path, dtype=np.dtype(dtype), mode="r", shape=(num_samples,))
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert a PCM slice to contiguous float32 in [-1, 1]."""
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+def extract_pcm(source_path: str, pcm_path: str, dtype: str = "float32") -> int:
+    """Decode ``source_path`` once to mono 16 kHz PCM; return the sample count."""
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error", "-y",
+        "-i", source_path,
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", _FFMPEG_FORMATS[dtype], pcm_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Audio extraction failed: {result.stderr.strip()}")
+    return os.path.getsize(pcm_path) // np.dtype(dtype).itemsize
+
+
+def decode_pcm(
+    source_path: str, start: float = 0.0, duration: Optional[float] = None
+) -> np.ndarray:
+    """Decode ``source_path`` from ``start`` seconds to in-memory float32 PCM.
+
+    Used when the source is not (or cannot be) staged; ffmpeg seeks before
+    decoding, so the returned samples begin at ``start`` on the source
+    timeline.  ``duration`` bounds how much is decoded.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-ss", f"{max(0.0, start):.3f}", "-i", source_path,
+    ]
+    if duration is not None:
+        cmd += ["-t", f"{duration:.3f}"]
+    cmd += [
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", _FFMPEG_FORMATS["float32"], "pipe:1",
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Audio decode failed: {result.stderr.decode(errors='replace').strip()}"
+        )
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+class AudioCache:
+    """Size-bounded LRU cache of extracted PCM audio on local scratch."""
+
+    def __init__(
+        self,
+        cache_dir: str = AUDIO_CACHE_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        dtype: str = AUDIO_CACHE_DTYPE,
+    ):
+        if dtype not in _FFMPEG_FORMATS:
+            raise ValueError(f"Unsupported audio cache dtype: {dtype}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+            "extract_seconds_total": 0.0,
+        }
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(path: str, dtype: str) -> str:
+        st = os.stat(path)
+        raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{dtype}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Dict[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return {
+            "pcm": base + ".pcm",
+            "meta": base + ".json",
+            "lock": base + ".lock",
+            "speech": base + ".speech.json",
+        }
+
+    def get(self, source_path: str, dtype: Optional[str] = None) -> StagedAudio:
+        """Return staged audio for ``source_path``, extracting it on a miss."""
+        dtype = dtype or self.dtype
+        key = self.make_key(source_path, dtype)
+        paths = self._paths(key)
+
+        staged = self._load(source_path, paths, dtype)
+        if staged is not None:
+            self._hit(source_path)
+            return staged
+
+        # Serialise extraction of the same source across worker processes
+        with open(paths["lock"], "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                staged = self._load(source_path, paths, dtype)
+                if staged is not None:
+                    self._hit(source_path)
+                    return staged
+
+                with self._lock:
+                    self._stats["misses"] += 1
+                record_metric("increment", "audio_cache_misses")
+
+                started = time.perf_counter()
+                tmp_pcm = paths["pcm"] + ".part"
+                try:
+                    num_samples = extract_pcm(source_path, tmp_pcm, dtype)
+                except Exception:
+                    if os.path.exists(tmp_pcm):
+                        os.remove(tmp_pcm)
+                    raise
+                os.replace(tmp_pcm, paths["pcm"])
+                elapsed = time.perf_counter() - started
+
+                meta = {
+                    "source_path": os.path.abspath(source_path),
+                    "dtype": dtype,
+                    "num_samples": num_samples,
+                    "sample_rate": SAMPLE_RATE,
+                    "created": time.time(),
+                }
+                tmp_meta = paths["meta"] + ".part"
+                with open(tmp_meta, "w") as f:
+                    json.dump(meta, f)
+                os.replace(tmp_meta, paths["meta"])
+
+                with self._lock:
+                    self._stats["extract_seconds_total"] += elapsed
+                record_metric("timer", "audio_cache_extract_duration", elapsed)
+                logger.info(
+                    f"Staged audio for {source_path} in {elapsed:.1f}s "
+                    f"({num_samples / SAMPLE_RATE:.0f}s audio)"
+                )
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        self.evict(keep=key)
+        return StagedAudio(source_path, paths["pcm"], dtype, num_samples)
+
+    def lookup(
+        self, source_path: str, dtype: Optional[str] = None
+    ) -> Optional[StagedAudio]:
+        """Return staged audio if already cached, without extracting or counting."""
+        dtype = dtype or self.dtype
+        try:
+            key = self.make_key(source_path, dtype)
+        except OSError:
+            return None
+        return self._load(source_path, self._paths(key), dtype)
+
+    def _load(
+        self, source_path: str, paths: Dict[str, str], dtype: str
+    ) -> Optional[StagedAudio]:
+        try:
+            with open(paths["meta"]) as f:
+                meta = json.load(f)
+            if not os.path.exists(paths["pcm"]):
+                return None
+            # Touch for LRU ordering; atime is unreliable on noatime scratch mounts
+            os.utime(paths["pcm"], None)
+            return StagedAudio(
+                source_path,
+                paths["pcm"],
+                dtype,
+                int(meta["num_samples"]),
+                int(meta.get("sample_rate", SAMPLE_RATE)),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _hit(self, source_path: str) -> None:
+        try:
+            saved = os.path.getsize(source_path)
+        except OSError:
+            saved = 0
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += saved
+        record_metric("increment", "audio_cache_hits")
+        record_metric("increment", "audio_cache_bytes_saved", saved)
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pcm"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append(
+                {"key": name[:-4], "size": st.st_size, "last_used": st.st_mtime}
+            )
+        return entries
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used entries until under ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda e: e["last_used"])
+        total = sum(e["size"] for e in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry["key"] == keep:
+                continue
+            paths = self._paths(entry["key"])
+            for p in paths.values():
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= entry["size"]
+            removed += 1
+        if removed:
+            with self._lock:
+                self._stats["evictions"] += removed
+            record_metric("increment", "audio_cache_evictions", removed)
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics for health/metrics endpoints."""
+        entries = self._entries()
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": (self._stats["hits"] / lookups) if lookups else 0.0,
+                "entries": len(entries),
+                "size_bytes": sum(e["size"] for e in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Global per-process cache handle (the cache itself is shared on disk)
+_audio_cache: Optional[AudioCache] = None
+
+
+def get_audio_cache() -> AudioCache:
+    """Get the process-wide audio staging cache."""
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = AudioCache()
+    return _audio_cache
+
+
+__all__ = [
+    "AudioCache",
+    "StagedAudio",
+    "extract_pcm",
+    "get_audio_cache",
+    "open_pcm",
+    "to_float32",
+]
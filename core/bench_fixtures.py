@@ -0,0 +1,73 @@
+"""Synthetic caption fixtures for benchmarks and tests.
+
+The encoder, parser and summarizer benchmarks all need long meetings to
+work on, and the archive itself is not available on a developer machine.
+These helpers generate deterministic transcripts and SCC archives of any
+length instead.
+
+Example:
+    >>> from core.bench_fixtures import synthetic_scc_archive
+    >>> paths = synthetic_scc_archive("/tmp/bench", files=10, hours=2.0)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Tuple
+
+PHRASES = [
+    "The motion to approve the consent agenda carries unanimously.",
+    "Council member Peña asked about the café permit on Main Street.",
+    "Public comment is now open; please state your name for the record.",
+    "We'll take a brief recess and reconvene at 7:45 p.m.",
+    "The budget includes $2.4 million for road repairs — about 12% more.",
+    "“Thank you,” said the mayor. ♪ Music plays ♪",
+]
+
+
+def synthetic_transcript(
+    hours: float, segment_seconds: float = 4.0
+) -> List[Tuple[float, float, str]]:
+    """Return ``(start, end, text)`` segments covering ``hours`` of meeting.
+
+    The phrases exercise accents, curly quotes and the music note, so the
+    CEA-608 special and extended character paths are part of every run.
+    """
+    count = int(hours * 3600 / segment_seconds)
+    return [
+        (
+            i * segment_seconds,
+            i * segment_seconds + segment_seconds * 0.9,
+            PHRASES[i % len(PHRASES)],
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_scc(hours: float) -> str:
+    """Encode a synthetic ``hours``-long transcript as a pop-on SCC document."""
+    from core.cea608 import Cea608Encoder
+
+    encoder = Cea608Encoder()
+    body = "".join(encoder.encode(*segment) for segment in synthetic_transcript(hours))
+    return "Scenarist_SCC V1.0\n\n" + body + encoder.finish()
+
+
+def synthetic_scc_archive(directory: str, files: int, hours: float) -> List[str]:
+    """Write ``files`` synthetic SCC copies into ``directory``; return their paths."""
+    scc = synthetic_scc(hours)
+    paths = []
+    for i in range(files):
+        path = os.path.join(directory, f"meeting_{i:04d}.scc")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(scc)
+        paths.append(path)
+    return paths
+
+
+__all__ = [
+    "PHRASES",
+    "synthetic_scc",
+    "synthetic_scc_archive",
+    "synthetic_transcript",
+]
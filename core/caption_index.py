@@ -0,0 +1,250 @@
+"""Time-indexed random access into long caption files.
+
+Chapters, search-hit context and the dashboard all ask for "the caption at
+time t" or "the captions between t1 and t2".  Answering that used to mean
+re-parsing the whole SCC.  This module builds a compact per-transcript index
+once and answers point and range queries by binary search.
+
+Index file layout (little-endian, one file per SCC in the cache directory)::
+
+    header   magic, caption count, source size, source mtime_ns
+    starts   float64[n]  sorted caption start seconds
+    ends     float64[n]  caption end seconds
+    reach    float64[n]  running maximum of ``ends`` (for overlap queries)
+    offsets  int64[n+1]  byte offsets of each caption in the text block
+    text     UTF-8 caption text, concatenated
+
+The file is memory-mapped and the arrays are zero-copy views, so opening an
+index costs a page fault or two rather than a parse, and a query only
+touches the pages it needs.
+
+Key Features:
+- Built lazily on first access from ``core.scc_parser.iter_captions``
+- Invalidated automatically when the SCC's size or mtime changes
+- ``at(t)`` and ``between(t1, t2)`` by ``numpy.searchsorted``
+- Thread-safe LRU of open indexes for the API process
+
+Example:
+    >>> from core.caption_index import get_caption_index
+    >>> index = get_caption_index("/mnt/flex-1/council.scc")
+    >>> index.at(754.2)
+    [(752.9, 756.1, 'Motion to approve the consent agenda')]
+    >>> len(index.between(600, 900))
+    71
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from core.config import CAPTION_INDEX_DIR, CAPTION_INDEX_LRU_SIZE
+from core.scc_parser import Caption, iter_captions
+
+_MAGIC = b"ARCCIDX1"
+_HEADER = struct.Struct("<8sqqq")
+
+
+class CaptionTimeIndex:
+    """Sorted start/end columns and a text block, read from a memory map."""
+
+    __slots__ = ("path", "source_size", "source_mtime_ns", "starts", "ends", "reach",
+                 "offsets", "_mmap", "_text_base")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, self.source_size, self.source_mtime_ns = _HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a caption index")
+        position = _HEADER.size
+        columns = []
+        for dtype, length in (
+            ("<f8", count),
+            ("<f8", count),
+            ("<f8", count),
+            ("<i8", count + 1),
+        ):
+            columns.append(
+                np.frombuffer(self._mmap, dtype=dtype, count=length, offset=position)
+            )
+            position += length * 8
+        self.starts, self.ends, self.reach, self.offsets = columns
+        self._text_base = position
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text_at(self, index: int) -> str:
+        first = self._text_base + int(self.offsets[index])
+        last = self._text_base + int(self.offsets[index + 1])
+        return self._mmap[first:last].decode("utf-8")
+
+    def __getitem__(self, index: int) -> Caption:
+        if index < 0:
+            index += len(self)
+        return float(self.starts[index]), float(self.ends[index]), self.text_at(index)
+
+    def indices_between(self, start: float, end: float) -> np.ndarray:
+        """Indices of captions overlapping ``[start, end)``, in start order."""
+        # Everything before ``first`` ended by ``start``; nothing from ``last`` on
+        # has begun
+        first = int(np.searchsorted(self.reach, start, side="right"))
+        last = int(np.searchsorted(self.starts, end, side="left"))
+        if first >= last:
+            return np.empty(0, dtype=np.intp)
+        return first + np.flatnonzero(self.ends[first:last] > start)
+
+    def between(self, start: float, end: float) -> List[Caption]:
+        """Captions on screen at any point in ``[start, end)``."""
+        return [self[int(i)] for i in self.indices_between(start, end)]
+
+    def at(self, seconds: float) -> List[Caption]:
+        """Captions on screen at ``seconds`` (usually zero or one)."""
+        first = int(np.searchsorted(self.reach, seconds, side="right"))
+        last = int(np.searchsorted(self.starts, seconds, side="right"))
+        return [
+            self[first + int(i)]
+            for i in np.flatnonzero(self.ends[first:last] > seconds)
+        ]
+
+    def index_before(self, seconds: float) -> int:
+        """Index of the last caption starting at or before ``seconds`` (-1 if none)."""
+        return int(np.searchsorted(self.starts, seconds, side="right")) - 1
+
+
+def write_index(
+    path: str, captions: List[Caption], source_size: int, source_mtime_ns: int
+) -> None:
+    """Write captions (any order) to an index file at ``path`` atomically."""
+    starts = np.fromiter((c[0] for c in captions), dtype="<f8", count=len(captions))
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    ends = np.fromiter(
+        (captions[i][1] for i in order), dtype="<f8", count=len(captions)
+    )
+    reach = np.maximum.accumulate(ends) if len(ends) else ends
+    encoded = [captions[i][2].encode("utf-8") for i in order]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(captions), source_size, source_mtime_ns))
+            for column in (starts, ends, reach, offsets):
+                f.write(column.tobytes())
+            f.write(b"".join(encoded))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class CaptionIndexStore:
+    """Builds, persists and caches time indexes for SCC files."""
+
+    def __init__(
+        self, cache_dir: str = CAPTION_INDEX_DIR, max_open: int = CAPTION_INDEX_LRU_SIZE
+    ):
+        self.cache_dir = cache_dir
+        self.max_open = max(1, max_open)
+        self._open: "OrderedDict[str, CaptionTimeIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "loads": 0, "builds": 0, "evictions": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def index_path(self, scc_path: str) -> str:
+        digest = hashlib.sha1(os.path.abspath(scc_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.idx")
+
+    def get(self, scc_path: str) -> CaptionTimeIndex:
+        """Return the index for ``scc_path``, building it if missing or stale."""
+        scc_path = os.path.abspath(scc_path)
+        st = os.stat(scc_path)
+        with self._lock:
+            index = self._open.get(scc_path)
+            if index is not None and (index.source_size, index.source_mtime_ns) == (
+                st.st_size,
+                st.st_mtime_ns,
+            ):
+                self._open.move_to_end(scc_path)
+                self._stats["hits"] += 1
+                return index
+
+        index = self._load(scc_path, st)
+        with self._lock:
+            # Evicted maps are released once callers drop their references
+            self._open.pop(scc_path, None)
+            self._open[scc_path] = index
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+                self._stats["evictions"] += 1
+        return index
+
+    def _load(self, scc_path: str, st: os.stat_result) -> CaptionTimeIndex:
+        path = self.index_path(scc_path)
+        try:
+            index = CaptionTimeIndex(path)
+            if (index.source_size, index.source_mtime_ns) == (
+                st.st_size,
+                st.st_mtime_ns,
+            ):
+                self._stats["loads"] += 1
+                return index
+        except (OSError, ValueError, struct.error):
+            pass
+
+        captions = list(iter_captions(scc_path))
+        write_index(path, captions, st.st_size, st.st_mtime_ns)
+        self._stats["builds"] += 1
+        logger.debug(
+            f"Built caption time index for {scc_path} ({len(captions)} captions)"
+        )
+        return CaptionTimeIndex(path)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "open": len(self._open), "max_open": self.max_open}
+
+
+# Global per-process store (index files themselves are shared on disk)
+_store: Optional[CaptionIndexStore] = None
+_store_lock = threading.Lock()
+
+
+def get_caption_index_store() -> CaptionIndexStore:
+    """Get the process-wide caption index store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CaptionIndexStore()
+        return _store
+
+
+def get_caption_index(scc_path: str) -> CaptionTimeIndex:
+    """Shortcut for ``get_caption_index_store().get(scc_path)``."""
+    return get_caption_index_store().get(scc_path)
+
+
+__all__ = [
+    "CaptionIndexStore",
+    "CaptionTimeIndex",
+    "get_caption_index",
+    "get_caption_index_store",
+    "write_index",
+]
@@ -0,0 +1,270 @@
+"""Caption embedding for VOD files without a full video re-encode.
+
+``create_captioned_video`` used to burn the SCC into the picture with
+``-vf subtitles=...`` and re-encode every frame with libx264, which made
+captioning a multi-hour meeting the most CPU-expensive step in the pipeline
+and cost a generation of video quality.  This module adds the captions as a
+separate track next to stream-copied (``-c copy``) video and audio instead,
+and only burns them in when the delivery target cannot decode a caption
+track.
+
+Modes (cheapest first):
+- ``mov_text``: MP4 timed-text track built from the captions as SRT
+- ``cea608``: QuickTime ``c608`` closed-caption track muxed from a CEA-608
+  SCC (output is ``.mov``; plain-text SCCs are re-encoded with
+  ``core.cea608`` first)
+- ``burn_in``: open captions rendered into the picture, re-encoded
+  segment-parallel by ``core.segment_transcoder``
+
+Which modes a VOD may use comes from ``CAPTION_EMBED_POLICY`` per city and
+delivery target; ``embed_captions`` tries them cheapest-first and falls back
+to the next mode when ffmpeg rejects one (e.g. a codec the container cannot
+carry), reporting the estimated time saved against burn-in.  ffmpeg runs
+through ``core.ffmpeg_runner``, so a long mux or burn-in reports progress to
+the Celery task and stops when the task is cancelled.
+
+Example:
+    >>> from core.caption_muxer import embed_captions
+    >>> output = "/mnt/flex-1/vod_processed/council_captioned.mp4"
+    >>> result = embed_captions(video, scc, output, city_id="flex1")
+    >>> result["mode"], round(result["time_saved_seconds"])
+    ('mov_text', 4731)
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from core.caption_sink import Cea608SccWriter, SrtWriter
+from core.config import (
+    CAPTION_BURN_IN_SPEED,
+    CAPTION_BURN_IN_TIMEOUT,
+    CAPTION_EMBED_POLICY,
+    CAPTION_MUX_TIMEOUT,
+)
+from core.exceptions import VODError
+from core.ffmpeg_runner import FfmpegCancelled, FfmpegJob, run_ffmpeg
+from core.media_probe import media_duration
+from core.monitoring.metrics import record_metric
+from core.scc_parser import iter_captions
+from core.segment_transcoder import transcode
+
+MODES = ("mov_text", "cea608", "burn_in")
+# Relative cost: stream copies are bound by I/O, burn-in decodes and encodes every frame
+MODE_COST = {"mov_text": 1, "cea608": 1, "burn_in": 100}
+DEFAULT_TARGET = "cablecast"
+
+
+def parse_policy(spec: str) -> Dict[str, List[str]]:
+    """Parse ``"key=mode|mode;key=mode"`` to ``{key: [modes]}``, minus unknown modes."""
+    policy: Dict[str, List[str]] = {}
+    for entry in spec.split(";"):
+        key, sep, modes = entry.partition("=")
+        if not sep or not key.strip():
+            continue
+        accepted = [
+            m.strip().lower() for m in modes.split("|") if m.strip().lower() in MODES
+        ]
+        if accepted:
+            policy[key.strip().lower()] = accepted
+        else:
+            logger.warning(
+                f"Ignoring caption policy entry without known modes: {entry!r}"
+            )
+    return policy
+
+
+def allowed_modes(city_id: Optional[str] = None, target: str = DEFAULT_TARGET,
+                  policy: Optional[str] = None) -> List[str]:
+    """Modes a city/target accepts, most specific policy entry first."""
+    rules = parse_policy(CAPTION_EMBED_POLICY if policy is None else policy)
+    city, target = (city_id or "").lower(), (target or DEFAULT_TARGET).lower()
+    for key in (f"{city}.{target}", city, target, "default"):
+        if key and key in rules:
+            return rules[key]
+    return list(MODES)
+
+
+def plan_modes(modes: Sequence[str]) -> List[str]:
+    """Order accepted modes by cost, keeping the policy's order between equal costs."""
+    return sorted(dict.fromkeys(modes), key=lambda mode: MODE_COST[mode])
+
+
+def mode_output_path(mode: str, output_path: str) -> str:
+    """Output file for ``mode``: ``c608`` tracks need a QuickTime container."""
+    if mode == "cea608":
+        return os.path.splitext(output_path)[0] + ".mov"
+    return output_path
+
+
+def is_cea608_scc(scc_path: str) -> bool:
+    """True for broadcast (hex byte pair) SCC, False for the plain-text dialect."""
+    with open(scc_path, "rb") as f:
+        for line in f:
+            if line.find(b"\t") == 11:
+                return line[12:].strip()[2:3] != b":"
+    return False
+
+
+def write_caption_track(scc_path: str, mode: str, workdir: str) -> str:
+    """Caption file ffmpeg muxes for a stream-copy ``mode``, converted when needed."""
+    if mode == "cea608":
+        if is_cea608_scc(scc_path):
+            return scc_path
+        writer, path = Cea608SccWriter(), os.path.join(workdir, "captions.scc")
+    else:
+        # mov_text is built from SRT, whatever the SCC dialect
+        writer, path = SrtWriter(), os.path.join(workdir, "captions.srt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(writer.header())
+        for index, (start, end, text) in enumerate(iter_captions(scc_path), 1):
+            f.write(writer.format({"start": start, "end": end, "text": text}, index))
+        f.write(writer.footer())
+    return path
+
+
+def build_command(
+    mode: str, video_path: str, track_path: str, output_path: str
+) -> List[str]:
+    """ffmpeg argv stream-copying ``video_path`` with ``track_path`` as captions."""
+    codec = "mov_text" if mode == "mov_text" else "copy"
+    return [
+        "ffmpeg", "-hide_banner", "-nostdin", "-i", video_path, "-i", track_path,
+        "-map", "0:v", "-map", "0:a?", "-map", "1:0",
+        "-c:v", "copy", "-c:a", "copy", "-c:s", codec,
+        "-metadata:s:s:0", "language=eng",
+        "-y", output_path,
+    ]
+
+
+def _run(cmd: List[str], timeout: int, job: FfmpegJob) -> Optional[str]:
+    """Run ffmpeg; return ``None`` on success or a short error description.
+
+    Cancellation is not a failure of the mode and propagates.
+    """
+    try:
+        run_ffmpeg(cmd, timeout, job)
+    except FfmpegCancelled:
+        raise
+    except VODError as e:
+        return e.message
+    return None
+
+
+def embed_captions(video_path: str, scc_path: str, output_path: str,
+                   modes: Optional[Sequence[str]] = None, city_id: Optional[str] = None,
+                   target: str = DEFAULT_TARGET) -> Dict[str, Any]:
+    """Embed ``scc_path`` into ``video_path`` with the cheapest mode that works.
+
+    ``modes`` overrides the city/target policy.  The returned ``output_path``
+    may differ from the requested one in its extension (``cea608`` writes
+    ``.mov``).  ``time_saved_seconds`` compares the run against a burn-in
+    estimated from the video duration and ``CAPTION_BURN_IN_SPEED``.
+    Raises ``FfmpegCancelled`` (after removing partial output) when the
+    calling task is cancelled.
+    """
+    planned = plan_modes(modes or allowed_modes(city_id, target))
+    duration = media_duration(video_path)
+    attempts: List[Dict[str, Any]] = []
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    workdir = tempfile.mkdtemp(prefix="caption_mux_")
+    try:
+        for mode in planned:
+            path = mode_output_path(mode, output_path)
+            started = time.monotonic()
+            job = FfmpegJob(duration, label=f"captions {mode}")
+            logger.info(f"Embedding captions into {video_path} ({mode})")
+            try:
+                if mode == "burn_in":
+                    # Re-encode is unavoidable: segment-parallel across the CPU budget
+                    transcode(video_path, path, captions=list(iter_captions(scc_path)),
+                              timeout=CAPTION_BURN_IN_TIMEOUT, job=job)
+                    error = None
+                else:
+                    track = write_caption_track(scc_path, mode, workdir)
+                    error = _run(build_command(mode, video_path, track, path),
+                                 CAPTION_MUX_TIMEOUT, job)
+            except FfmpegCancelled:
+                if os.path.exists(path):
+                    os.remove(path)
+                raise
+            except OSError as e:
+                return {
+                    "success": False,
+                    "mode": None,
+                    "output_path": None,
+                    "error": f"Cannot read captions {scc_path}: {e}",
+                    "attempts": attempts,
+                }
+            except VODError as e:
+                error = e.message
+            seconds = time.monotonic() - started
+            if error is None and (
+                not os.path.exists(path) or os.path.getsize(path) == 0
+            ):
+                error = f"output not created: {path}"
+            attempts.append(
+                {"mode": mode, "seconds": round(seconds, 2), "error": error}
+            )
+            if error is None:
+                break
+            logger.warning(
+                f"Caption mode {mode} failed for {video_path}: {error[-300:]}"
+            )
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            record_metric("increment", "caption_mux_failed")
+            return {
+                "success": False,
+                "mode": None,
+                "output_path": None,
+                "error": (
+                    attempts[-1]["error"] if attempts else "no caption modes allowed"
+                ),
+                "attempts": attempts,
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    estimate = (
+        duration / CAPTION_BURN_IN_SPEED if duration and mode != "burn_in" else None
+    )
+    elapsed = sum(a["seconds"] for a in attempts)
+    saved = max(0.0, estimate - elapsed) if estimate is not None else 0.0
+    record_metric("increment", f"caption_mux_{mode}")
+    record_metric("timer", "caption_mux_duration", seconds)
+    record_metric("increment", "caption_mux_seconds_saved", saved)
+    logger.info(f"Captions embedded with {mode} in {seconds:.1f}s: {path}"
+                + (f" (~{saved:.0f}s saved vs burn-in)" if saved else ""))
+    return {
+        "success": True,
+        "mode": mode,
+        "output_path": path,
+        "seconds": round(seconds, 2),
+        "duration": duration,
+        "estimated_burn_in_seconds": (
+            round(estimate, 1) if estimate is not None else None
+        ),
+        "time_saved_seconds": round(saved, 1),
+        "attempts": attempts,
+    }
+
+
+__all__ = [
+    "MODES",
+    "allowed_modes",
+    "build_command",
+    "embed_captions",
+    "mode_output_path",
+    "parse_policy",
+    "plan_modes",
+    "write_caption_track",
+]
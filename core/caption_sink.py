@@ -0,0 +1,371 @@
+"""Streaming caption sink for incremental transcription output.
+
+faster-whisper yields segments lazily, but the transcription path used to call
+``list(segments)`` before writing anything: memory grew with meeting length,
+a worker dying at hour 3 left nothing behind and progress was invisible.
+``StreamingCaptionSink`` consumes segments as they arrive instead, and fans
+each one out to every configured caption format in the same pass, so other
+formats never need a second ASR run or an SCC re-parse.
+
+Key Features:
+- Pluggable writers: plain SCC, CEA-608 SCC (see ``core.cea608``), SRT, WebVTT and
+  JSON word timings
+- Flushes on a bounded buffer so memory stays constant
+- Writes to ``.part`` files that are atomically renamed on completion
+- Reports progress as ``segment.end / duration`` through a callback
+- Per-writer timing exported as ``caption_writer_seconds``
+
+Example:
+    >>> from core.caption_sink import StreamingCaptionSink
+    >>> with StreamingCaptionSink("meeting.scc", duration=info.duration) as sink:
+    ...     for segment in segments:
+    ...         sink.write(segment)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+from loguru import logger
+
+from core.cea608 import Cea608Encoder
+from core.config import CAPTION_SINK_BUFFER_SEGMENTS, CEA608_CAPTION_MODE, CEA608_ROWS
+from core.monitoring.metrics import record_metric
+
+ProgressCallback = Callable[[float, int], None]
+
+
+def seconds_to_scc_timestamp(seconds: float) -> str:
+    """Convert seconds to SCC timestamp format (HH:MM:SS:FF) at 30 fps."""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    frames = int((seconds % 1) * 30)  # 30 fps for SCC
+
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}:{frames:02d}"
+
+
+def seconds_to_srt_timestamp(seconds: float) -> str:
+    """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)."""
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def seconds_to_vtt_timestamp(seconds: float) -> str:
+    """Convert seconds to WebVTT timestamp format (HH:MM:SS.mmm)."""
+    return seconds_to_srt_timestamp(seconds).replace(",", ".")
+
+
+def segment_field(segment: Any, name: str, default: Any = None) -> Any:
+    """Read ``name`` from a faster-whisper ``Segment`` or a plain dict."""
+    if isinstance(segment, dict):
+        return segment.get(name, default)
+    return getattr(segment, name, default)
+
+
+def clean_caption_text(text: str) -> str:
+    """Collapse whitespace the way every caption writer expects."""
+    return " ".join(str(text or "").strip().split())
+
+
+class CaptionFormatWriter:
+    """Formats segments for one caption file format.
+
+    ``extension`` is the file extension (without the leading dot); the sink
+    derives each format's path from the SCC output path.
+    """
+
+    extension = ""
+
+    def header(self) -> str:
+        return ""
+
+    def format(self, segment: Any, index: int) -> str:
+        raise NotImplementedError
+
+    def footer(self) -> str:
+        return ""
+
+
+class SccTextWriter(CaptionFormatWriter):
+    """Plain-text SCC layout produced by the transcription pipeline."""
+
+    extension = "scc"
+
+    def header(self) -> str:
+        return "Scenarist_SCC V1.0\n\n"
+
+    def format(self, segment: Any, index: int) -> str:
+        start = seconds_to_scc_timestamp(float(segment_field(segment, "start", 0.0)))
+        end = seconds_to_scc_timestamp(float(segment_field(segment, "end", 0.0)))
+        text = clean_caption_text(segment_field(segment, "text", ""))
+        return f"{start}\t{end}\n{text}\n\n"
+
+
+class Cea608SccWriter(CaptionFormatWriter):
+    """Broadcast SCC: CEA-608 pop-on (or roll-up) captions, drop-frame timecodes."""
+
+    extension = "scc"
+
+    def __init__(self, mode: str = CEA608_CAPTION_MODE, rows: int = CEA608_ROWS):
+        self.encoder = Cea608Encoder(mode=mode, rows=rows)
+
+    def header(self) -> str:
+        return "Scenarist_SCC V1.0\n\n"
+
+    def format(self, segment: Any, index: int) -> str:
+        return self.encoder.encode(
+            float(segment_field(segment, "start", 0.0)),
+            float(segment_field(segment, "end", 0.0)),
+            clean_caption_text(segment_field(segment, "text", "")),
+        )
+
+    def footer(self) -> str:
+        return self.encoder.finish()
+
+
+class SrtWriter(CaptionFormatWriter):
+    extension = "srt"
+
+    def format(self, segment: Any, index: int) -> str:
+        start = seconds_to_srt_timestamp(float(segment_field(segment, "start", 0.0)))
+        end = seconds_to_srt_timestamp(float(segment_field(segment, "end", 0.0)))
+        text = clean_caption_text(segment_field(segment, "text", ""))
+        return f"{index}\n{start} --> {end}\n{text}\n\n"
+
+
+class WebVttWriter(CaptionFormatWriter):
+    extension = "vtt"
+
+    def header(self) -> str:
+        return "WEBVTT\n\n"
+
+    def format(self, segment: Any, index: int) -> str:
+        start = seconds_to_vtt_timestamp(float(segment_field(segment, "start", 0.0)))
+        end = seconds_to_vtt_timestamp(float(segment_field(segment, "end", 0.0)))
+        text = clean_caption_text(segment_field(segment, "text", ""))
+        return f"{start} --> {end}\n{text}\n\n"
+
+
+class WordTimingsWriter(CaptionFormatWriter):
+    """Compact JSON word timings: one ``[start, end, text, words]`` row per segment.
+
+    ``words`` is a list of ``[start, end, word]`` rows (empty when the decoder
+    produced no word timestamps).  Times are seconds rounded to milliseconds.
+    """
+
+    extension = "words.json"
+
+    def header(self) -> str:
+        return '{"version":1,"segments":[\n'
+
+    def format(self, segment: Any, index: int) -> str:
+        words = [
+            [round(float(segment_field(w, "start", 0.0)), 3),
+             round(float(segment_field(w, "end", 0.0)), 3),
+             str(segment_field(w, "word", "")).strip()]
+            for w in (segment_field(segment, "words") or [])
+        ]
+        row = [
+            round(float(segment_field(segment, "start", 0.0)), 3),
+            round(float(segment_field(segment, "end", 0.0)), 3),
+            clean_caption_text(segment_field(segment, "text", "")),
+            words,
+        ]
+        prefix = "" if index == 1 else ",\n"
+        return prefix + json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+
+    def footer(self) -> str:
+        return "\n]}\n"
+
+
+CAPTION_WRITERS: Dict[str, type] = {
+    "scc": SccTextWriter,
+    "scc608": Cea608SccWriter,
+    "srt": SrtWriter,
+    "vtt": WebVttWriter,
+    "words": WordTimingsWriter,
+}
+
+
+def caption_paths(output_path: str, formats: Iterable[str]) -> Dict[str, str]:
+    """Map each format to its output file.
+
+    The first format whose extension matches ``output_path`` writes to it;
+    other formats go next to it as ``<base>.<extension>``, or as
+    ``<base>.<format>.<extension>`` when that extension is already taken.
+    """
+    base, ext = os.path.splitext(output_path)
+    taken = set()
+    paths: Dict[str, str] = {}
+    for fmt in formats:
+        if fmt not in CAPTION_WRITERS:
+            raise ValueError(f"Unsupported caption format: {fmt}")
+        extension = CAPTION_WRITERS[fmt].extension
+        if extension in taken:
+            paths[fmt] = f"{base}.{fmt}.{extension}"
+        elif ext.lower() == f".{extension}":
+            paths[fmt] = output_path
+        else:
+            paths[fmt] = f"{base}.{extension}"
+        taken.add(extension)
+    return paths
+
+
+class StreamingCaptionSink:
+    """Write caption segments incrementally to one or more formats.
+
+    Output goes to ``<path>.part`` and is renamed into place by ``close()``.
+    If the caller fails mid-stream the ``.part`` files keep everything flushed
+    so far.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        formats: Iterable[str] = ("scc",),
+        duration: Optional[float] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        buffer_segments: int = CAPTION_SINK_BUFFER_SEGMENTS,
+        progress_step: float = 0.01,
+    ):
+        self.output_path = output_path
+        self.paths: Dict[str, str] = caption_paths(output_path, formats)
+        self.writers: Dict[str, CaptionFormatWriter] = {
+            fmt: CAPTION_WRITERS[fmt]() for fmt in self.paths
+        }
+        # Seconds spent formatting and writing, per format
+        self.timings: Dict[str, float] = {fmt: 0.0 for fmt in self.paths}
+
+        self.duration = duration or 0.0
+        self.progress_callback = progress_callback
+        self.buffer_segments = max(1, buffer_segments)
+        self.progress_step = progress_step
+        self.count = 0
+        self.last_end = 0.0
+        self._buffer: List[Any] = []
+        self._files: Dict[str, TextIO] = {}
+        self._last_progress = -1.0
+        self._closed = False
+
+    def part_path(self, fmt: str) -> str:
+        return self.paths[fmt] + ".part"
+
+    def open(self) -> "StreamingCaptionSink":
+        for fmt, writer in self.writers.items():
+            directory = os.path.dirname(self.paths[fmt])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            f = open(self.part_path(fmt), "w", encoding="utf-8")
+            f.write(writer.header())
+            self._files[fmt] = f
+        return self
+
+    def write(self, segment: Any) -> None:
+        """Buffer one segment; flush once the buffer is full."""
+        self._buffer.append(segment)
+        self.count += 1
+        self.last_end = float(
+            segment_field(segment, "end", self.last_end) or self.last_end
+        )
+        if len(self._buffer) >= self.buffer_segments:
+            self.flush()
+        self._report_progress()
+
+    def flush(self) -> None:
+        """Write buffered segments to every format and flush to disk."""
+        if not self._buffer:
+            return
+        first_index = self.count - len(self._buffer) + 1
+        for fmt, writer in self.writers.items():
+            started = time.perf_counter()
+            f = self._files[fmt]
+            f.write(
+                "".join(
+                    writer.format(seg, first_index + i)
+                    for i, seg in enumerate(self._buffer)
+                )
+            )
+            f.flush()
+            self.timings[fmt] += time.perf_counter() - started
+        self._buffer.clear()
+
+    def _report_progress(self) -> None:
+        if not self.progress_callback or not self.duration:
+            return
+        fraction = min(1.0, self.last_end / self.duration)
+        if fraction - self._last_progress < self.progress_step:
+            return
+        self._last_progress = fraction
+        try:
+            self.progress_callback(fraction, self.count)
+        except Exception as e:
+            logger.warning(f"Caption progress callback failed: {e}")
+
+    def close(self) -> Dict[str, str]:
+        """Flush, fsync and atomically publish every output file."""
+        if self._closed:
+            return dict(self.paths)
+        self.flush()
+        for fmt, f in self._files.items():
+            started = time.perf_counter()
+            f.write(self.writers[fmt].footer())
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+            os.replace(self.part_path(fmt), self.paths[fmt])
+            self.timings[fmt] += time.perf_counter() - started
+        self._closed = True
+        self._record_timings()
+        return dict(self.paths)
+
+    def _record_timings(self) -> None:
+        """Export per-writer time so an expensive format shows up in metrics."""
+        for fmt, seconds in self.timings.items():
+            record_metric(
+                "histogram", "caption_writer_seconds", seconds, {"format": fmt}
+            )
+
+    def abort(self) -> None:
+        """Flush what we have and leave the ``.part`` files for inspection."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            for f in self._files.values():
+                f.close()
+            self._closed = True
+
+    def __enter__(self) -> "StreamingCaptionSink":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+__all__ = [
+    "CAPTION_WRITERS",
+    "CaptionFormatWriter",
+    "Cea608SccWriter",
+    "SccTextWriter",
+    "SrtWriter",
+    "StreamingCaptionSink",
+    "WebVttWriter",
+    "WordTimingsWriter",
+    "caption_paths",
+    "clean_caption_text",
+    "seconds_to_scc_timestamp",
+    "seconds_to_srt_timestamp",
+    "seconds_to_vtt_timestamp",
+    "segment_field",
+]
@@ -0,0 +1,379 @@
+"""Parallel chunked transcription for long meeting recordings.
+
+City council meetings regularly run 3-5 hours and a single faster-whisper
+decode leaves most cores idle.  Chunked mode stages the audio once, splits
+it at detected silences into roughly equal windows, transcribes the windows in
+a bounded process pool (each worker holding its own pooled model, or one
+model with a replica per thread inside Celery's daemonic workers), then
+stitches the segments back together on the global timeline.
+
+Key Features:
+- Silence-aligned window planning from vectorised frame energies
+- Bounded worker pool with a Whisper model replica per worker
+- Global timestamp correction and boundary word de-duplication
+- Real-time factor reporting comparable with the serial path
+
+Example:
+    >>> from core.transcription import run_whisper_transcription
+    >>> run_whisper_transcription("/mnt/flex-1/council.mp4", mode="chunked", workers=4)
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from core.audio_cache import SAMPLE_RATE, get_audio_cache, open_pcm, to_float32
+from core.caption_sink import ProgressCallback
+from core.cpu_budget import get_cpu_budget
+from core.speech_prescreen import FRAME_SECONDS, analyze_energies, frame_energies_db
+from core.config import (
+    WHISPER_MODEL,
+    USE_GPU,
+    LANGUAGE,
+    COMPUTE_TYPE,
+    BATCH_SIZE,
+    TRANSCRIPTION_CHUNK_WORKERS,
+    TRANSCRIPTION_CHUNK_MAX_SECONDS,
+    TRANSCRIPTION_CHUNK_MIN_DURATION,
+    SPEECH_PRESCREEN_SKIP_NO_SPEECH,
+)
+
+# Audio on either side of a window's owned range that is decoded for context
+WINDOW_PAD_SECONDS = 1.0
+
+
+@dataclass
+class TranscribedWord:
+    start: float
+    end: float
+    word: str
+
+
+@dataclass
+class TranscribedSegment:
+    """Picklable stand-in for faster-whisper's ``Segment`` on the global timeline."""
+
+    start: float
+    end: float
+    text: str
+    words: List[TranscribedWord] = field(default_factory=list)
+
+
+@dataclass
+class _WindowJob:
+    index: int
+    pcm_path: str
+    dtype: str
+    num_samples: int
+    start: float       # decoded range, seconds
+    end: float
+    own_start: float   # range whose words this window is responsible for
+    own_end: float
+    model_key: Tuple[str, str, int, str, int]
+    # Decode options travel with the job: spawned workers re-import the defaults
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+def plan_windows(energies_db: np.ndarray, duration: float, n_windows: int,
+                 frame_seconds: float = FRAME_SECONDS, silence_db: float = -40.0,
+                 min_silence: float = 0.5) -> List[Tuple[float, float]]:
+    """Split ``[0, duration)`` into ``n_windows`` ranges cut at silences.
+
+    Each ideal boundary (``i * duration / n``) snaps to the midpoint of the
+    nearest silence run of at least ``min_silence`` seconds within a quarter
+    window; otherwise it falls on the quietest frame in that search range.
+    """
+    if n_windows <= 1 or duration <= 0 or len(energies_db) == 0:
+        return [(0.0, duration)]
+
+    silent = energies_db < silence_db
+    # Run-length encode the silence mask to find candidate cut points
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.view(np.int8), [0]))))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+    long_runs = (run_ends - run_starts) * frame_seconds >= min_silence
+    candidates = ((run_starts[long_runs] + run_ends[long_runs]) / 2.0) * frame_seconds
+
+    window = duration / n_windows
+    search = window / 4.0
+    cuts: List[float] = []
+    for i in range(1, n_windows):
+        ideal = i * window
+        cut: Optional[float] = None
+        if candidates.size:
+            nearest = candidates[np.argmin(np.abs(candidates - ideal))]
+            if abs(nearest - ideal) <= search:
+                cut = float(nearest)
+        if cut is None:
+            lo = max(0, int((ideal - search) / frame_seconds))
+            hi = min(len(energies_db), int((ideal + search) / frame_seconds) + 1)
+            if hi > lo:
+                cut = (lo + int(np.argmin(energies_db[lo:hi])) + 0.5) * frame_seconds
+            else:
+                cut = ideal
+        if cuts and cut <= cuts[-1]:
+            continue
+        cuts.append(min(cut, duration))
+
+    bounds = [0.0] + cuts + [duration]
+    return [
+        (bounds[i], bounds[i + 1])
+        for i in range(len(bounds) - 1)
+        if bounds[i + 1] > bounds[i]
+    ]
+
+
+def _transcribe_window(job: _WindowJob) -> List[TranscribedSegment]:
+    """Pool worker: transcribe one window and shift results onto the global timeline."""
+    from core.whisper_model_pool import get_whisper_model
+
+    audio = open_pcm(job.pcm_path, job.dtype, job.num_samples)
+    first = int(job.start * SAMPLE_RATE)
+    last = min(job.num_samples, int(job.end * SAMPLE_RATE))
+    window = to_float32(audio[first:last])
+
+    model = get_whisper_model(*job.model_key)
+    segments, _info = model.transcribe(window, **job.options)
+
+    offset = job.start
+    results: List[TranscribedSegment] = []
+    for seg in segments:
+        words = [
+            TranscribedWord(w.start + offset, w.end + offset, w.word)
+            for w in (getattr(seg, "words", None) or [])
+        ]
+        results.append(
+            TranscribedSegment(seg.start + offset, seg.end + offset, seg.text, words)
+        )
+    return results
+
+
+def _owned(start: float, end: float, own_start: float, own_end: float) -> bool:
+    midpoint = (start + end) / 2.0
+    return own_start <= midpoint < own_end
+
+
+def _norm(word: str) -> str:
+    return "".join(ch for ch in word.lower() if ch.isalnum())
+
+
+def stitch_windows(
+    jobs: Sequence[_WindowJob], results: Sequence[List[TranscribedSegment]]
+) -> List[TranscribedSegment]:
+    """Merge per-window segments, keeping each word only in the window that owns it."""
+    stitched: List[TranscribedSegment] = []
+    last_word: Optional[TranscribedWord] = None
+
+    for job, segments in sorted(zip(jobs, results), key=lambda pair: pair[0].index):
+        for seg in segments:
+            if seg.words:
+                kept = [
+                    w
+                    for w in seg.words
+                    if _owned(w.start, w.end, job.own_start, job.own_end)
+                ]
+                # Context padding can make neighbouring windows hear the same word
+                if (
+                    kept
+                    and last_word is not None
+                    and _norm(kept[0].word) == _norm(last_word.word)
+                    and abs(kept[0].start - last_word.start) < 0.5
+                ):
+                    kept = kept[1:]
+                if not kept:
+                    continue
+                stitched.append(TranscribedSegment(
+                    start=kept[0].start,
+                    end=kept[-1].end,
+                    text="".join(w.word for w in kept).strip(),
+                    words=kept,
+                ))
+                last_word = kept[-1]
+            elif _owned(seg.start, seg.end, job.own_start, job.own_end):
+                stitched.append(seg)
+
+    stitched.sort(key=lambda s: s.start)
+    return stitched
+
+
+def _use_threads() -> bool:
+    # Celery prefork children are daemonic and may not spawn processes
+    return multiprocessing.current_process().daemon
+
+
+def _make_executor(workers: int, threads: bool) -> Executor:
+    """Return a process pool, or a thread pool when processes cannot fork children.
+
+    CTranslate2 releases the GIL during decoding, so threads overlap as long
+    as each has its own model replica (see ``_model_key``).
+    """
+    if threads:
+        logger.info(
+            "Running inside a daemonic process; chunked transcription uses threads"
+        )
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def _model_key(workers: int, threads: bool) -> Tuple[str, str, int, str, int]:
+    """Pool key for window decodes by ``workers`` parallel workers.
+
+    The ``BATCH_SIZE`` thread budget is split across the workers.  Each pool
+    process loads its own single-replica model; threads share one model with
+    a replica per thread, since a single replica decodes one call at a time.
+    """
+    return (
+        WHISPER_MODEL,
+        COMPUTE_TYPE,
+        max(1, BATCH_SIZE // workers),
+        "cuda" if USE_GPU else "cpu",
+        workers if threads else 1,
+    )
+
+
+def transcribe_chunked(video_path: str, workers: Optional[int] = None,
+                       progress_callback: Optional[ProgressCallback] = None,
+                       options: Optional[Dict[str, Any]] = None) -> Dict:
+    """Transcribe ``video_path`` as parallel silence-aligned windows and write SCC.
+
+    Returns the same result dictionary as the serial path, plus ``mode``,
+    ``workers``, ``chunks`` and ``real_time_factor``.  Unlike the serial path
+    this does not keep a checkpoint journal, so an interrupted run starts over;
+    short files and ``workers == 1`` fall back to the serial path and keep
+    both the journal and ``progress_callback``.  ``options`` overrides the
+    faster-whisper decode options (default ``TRANSCRIBE_OPTIONS``).
+    """
+    from core.transcription import (
+        TRANSCRIBE_OPTIONS,
+        _transcribe_with_faster_whisper,
+        _scc_path_for,
+        _write_empty_scc,
+        _write_scc,
+        _record_real_time_factor,
+        _remember_transcription,
+    )
+
+    workers = max(1, int(workers or TRANSCRIPTION_CHUNK_WORKERS))
+    options = dict(TRANSCRIBE_OPTIONS if options is None else options)
+    started = time.perf_counter()
+
+    # Workers memory-map the staged PCM instead of re-decoding the source
+    staged = get_audio_cache().get(video_path)
+    duration = staged.duration
+
+    if workers == 1 or duration < TRANSCRIPTION_CHUNK_MIN_DURATION:
+        logger.info(f"{video_path} is {duration:.0f}s; using serial transcription")
+        return _transcribe_with_faster_whisper(
+            video_path,
+            mode="serial",
+            progress_callback=progress_callback,
+            use_cache=False,
+            options=options,
+        )
+
+    n_windows = max(workers, math.ceil(duration / TRANSCRIPTION_CHUNK_MAX_SECONDS))
+    energies = frame_energies_db(staged.samples)
+    windows = plan_windows(energies, duration, n_windows)
+    speech = analyze_energies(energies, duration)
+
+    owned = [
+        (i, own_start, own_end if i < len(windows) - 1 else math.inf)
+        for i, (own_start, own_end) in enumerate(windows)
+    ]
+    # Windows that are all slate, tone or silence never reach Whisper, unless
+    # the whole file looks silent (then the pre-screen is not trusted)
+    if speech.has_speech() or SPEECH_PRESCREEN_SKIP_NO_SPEECH:
+        owned = [
+            w for w in owned if speech.speech_between(w[1], min(w[2], duration)) > 0
+        ]
+    logger.info(
+        f"Chunked transcription of {video_path}: {duration:.0f}s in "
+        f"{len(owned)}/{len(windows)} windows with speech across {workers} workers"
+    )
+
+    threads = _use_threads()
+    # Pool size is leased from the host CPU budget shared with transcoding
+    with get_cpu_budget().lease(
+        min(workers, max(1, len(owned))), owner=f"transcribe {video_path}"
+    ) as slots, _make_executor(slots, threads) as pool:
+        model_key = _model_key(slots, threads)
+        jobs = [
+            _WindowJob(
+                index=i,
+                pcm_path=staged.pcm_path,
+                dtype=staged.dtype,
+                num_samples=staged.num_samples,
+                start=max(0.0, own_start - WINDOW_PAD_SECONDS),
+                end=min(duration, own_end + WINDOW_PAD_SECONDS),
+                own_start=own_start,
+                own_end=own_end,
+                model_key=model_key,
+                options=options,
+            )
+            for i, own_start, own_end in owned
+        ]
+        results: List[List[TranscribedSegment]] = [[] for _ in jobs]
+        futures = {
+            pool.submit(_transcribe_window, job): pos for pos, job in enumerate(jobs)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress_callback:
+                progress_callback(done / len(jobs), sum(len(r) for r in results))
+
+    segments = stitch_windows(jobs, results)
+    scc_path = _scc_path_for(video_path)
+    processing_time = time.perf_counter() - started
+    rtf = processing_time / duration if duration else None
+    _record_real_time_factor("chunked", rtf)
+
+    result = {
+        'output_path': scc_path,
+        'scc_path': scc_path,
+        'segments': len(segments),
+        'duration': duration,
+        'language': LANGUAGE,
+        'status': 'completed',
+        'model_used': WHISPER_MODEL,
+        'mode': 'chunked',
+        'workers': workers,
+        'chunks': len(jobs),
+        'processing_time': processing_time,
+        'real_time_factor': rtf,
+    }
+    if not segments:
+        logger.warning(f"No speech segments found in {video_path}")
+        _write_empty_scc(scc_path)
+        result['warning'] = 'No speech detected'
+        return _remember_transcription(video_path, result)
+
+    _write_scc(segments, scc_path)
+    logger.info(
+        f"Chunked transcription completed: {len(segments)} segments, "
+        f"RTF {rtf:.3f} ({workers} workers)"
+    )
+    return _remember_transcription(video_path, result)
+
+
+__all__ = [
+    "TranscribedSegment",
+    "TranscribedWord",
+    "frame_energies_db",
+    "plan_windows",
+    "stitch_windows",
+    "transcribe_chunked",
+]
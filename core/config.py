@@ -168,11 +168,136 @@ if REDIS_PASSWORD:
 # WhisperX configuration
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "large-v2")
 USE_GPU = os.getenv("USE_GPU", "false").lower() == "true"
-COMPUTE_TYPE = "float16" if USE_GPU else "int8"
+COMPUTE_TYPE = os.getenv("COMPUTE_TYPE", "float16" if USE_GPU else "int8")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "16"))  # Increased for better CPU utilization
 NUM_WORKERS = int(os.getenv("NUM_WORKERS", "4"))  # Number of CPU workers
 LANGUAGE = os.getenv("LANGUAGE", "en")
 
+# Whisper model pool: models stay resident per worker process up to this budget
+WHISPER_MODEL_POOL_MAX_MB = int(os.getenv("WHISPER_MODEL_POOL_MAX_MB", "6144"))
+# Load the default model when a worker process starts. Off by default: every
+# prefork child of every worker would pay for it; enable it on ASR workers only
+WHISPER_MODEL_WARMUP = os.getenv("WHISPER_MODEL_WARMUP", "false").lower() == "true"
+
+# Transcription mode: "serial" decodes in one process, "chunked" splits long
+# recordings at silences and decodes the windows in a process pool. Only the
+# serial path writes the checkpoint journal; an interrupted chunked run starts
+# over (short files and single-worker runs fall back to serial and do resume)
+TRANSCRIPTION_MODE = os.getenv("TRANSCRIPTION_MODE", "serial").lower()
+TRANSCRIPTION_CHUNK_WORKERS = int(
+    os.getenv("TRANSCRIPTION_CHUNK_WORKERS", str(NUM_WORKERS))
+)
+TRANSCRIPTION_CHUNK_MAX_SECONDS = int(
+    os.getenv("TRANSCRIPTION_CHUNK_MAX_SECONDS", "1800")
+)
+TRANSCRIPTION_CHUNK_MIN_DURATION = int(
+    os.getenv("TRANSCRIPTION_CHUNK_MIN_DURATION", "900")
+)
+
+# Audio staging cache: mono 16 kHz PCM extracted once per source on local scratch
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "true").lower() == "true"
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", "/tmp/archivist_audio_cache")
+AUDIO_CACHE_MAX_BYTES = int(float(os.getenv("AUDIO_CACHE_MAX_GB", "20")) * 1024**3)
+AUDIO_CACHE_DTYPE = os.getenv("AUDIO_CACHE_DTYPE", "float32").lower()
+
+# Caption output: formats written from the one transcription pass (scc, scc608,
+# srt, vtt, words) and the streaming flush size
+CAPTION_OUTPUT_FORMATS = [
+    fmt.strip().lower()
+    for fmt in os.getenv("CAPTION_OUTPUT_FORMATS", "scc").split(",")
+    if fmt.strip()
+]
+CAPTION_SINK_BUFFER_SEGMENTS = int(os.getenv("CAPTION_SINK_BUFFER_SEGMENTS", "32"))
+# CEA-608 SCC layout: "popon" or "rollup", and rows per caption (1-4)
+CEA608_CAPTION_MODE = os.getenv("CEA608_CAPTION_MODE", "popon").lower()
+CEA608_ROWS = int(os.getenv("CEA608_ROWS", "4"))
+
+# Transcription checkpoints: journal segments so retried jobs resume mid-file
+TRANSCRIPTION_CHECKPOINT_ENABLED = (
+    os.getenv("TRANSCRIPTION_CHECKPOINT_ENABLED", "true").lower() == "true"
+)
+# Empty checkpoint dir = next to the SCC
+TRANSCRIPTION_CHECKPOINT_DIR = os.getenv("TRANSCRIPTION_CHECKPOINT_DIR", "")
+TRANSCRIPTION_CHECKPOINT_INTERVAL = float(
+    os.getenv("TRANSCRIPTION_CHECKPOINT_INTERVAL", "30")
+)
+# Transcription tasks ack late, and the Redis broker redelivers an unacked task
+# after this many seconds; it must exceed the longest transcription or a second
+# worker starts the same file (and journal) while the first is still running
+CELERY_VISIBILITY_TIMEOUT = int(os.getenv("CELERY_VISIBILITY_TIMEOUT", str(12 * 3600)))
+
+# Transcription result cache: reuse captions for identical media found under a
+# different name or on another flex mount (index is SQLite, keep it off NFS)
+TRANSCRIPTION_CACHE_ENABLED = (
+    os.getenv("TRANSCRIPTION_CACHE_ENABLED", "true").lower() == "true"
+)
+TRANSCRIPTION_CACHE_DIR = os.getenv(
+    "TRANSCRIPTION_CACHE_DIR",
+    str(BASE_DIR.parent / "data" / "cache" / "transcription_results"),
+)
+TRANSCRIPTION_CACHE_SAMPLE_COUNT = int(
+    os.getenv("TRANSCRIPTION_CACHE_SAMPLE_COUNT", "16")
+)
+TRANSCRIPTION_CACHE_SAMPLE_BYTES = int(
+    os.getenv("TRANSCRIPTION_CACHE_SAMPLE_BYTES", "65536")
+)
+
+# Transcript search: SQLite FTS5 index of caption text across the flex mounts
+TRANSCRIPT_SEARCH_ENABLED = (
+    os.getenv("TRANSCRIPT_SEARCH_ENABLED", "true").lower() == "true"
+)
+TRANSCRIPT_SEARCH_INDEX_PATH = os.getenv(
+    "TRANSCRIPT_SEARCH_INDEX_PATH",
+    str(BASE_DIR.parent / "data" / "cache" / "transcript_search.sqlite"),
+)
+
+# Catalog of media files on the member-city mounts (replaces per-VOD os.walk);
+# lookups refresh it incrementally when older than the max age
+MEDIA_CATALOG_PATH = os.getenv(
+    "MEDIA_CATALOG_PATH",
+    str(BASE_DIR.parent / "data" / "cache" / "media_catalog.sqlite"),
+)
+MEDIA_CATALOG_MAX_AGE_SECONDS = float(os.getenv("MEDIA_CATALOG_MAX_AGE_SECONDS", "300"))
+MEDIA_CATALOG_PROBE_LIMIT = int(os.getenv("MEDIA_CATALOG_PROBE_LIMIT", "50"))
+
+# Media probe cache: one ffprobe per (path, size, mtime) shared by every caller
+MEDIA_PROBE_CACHE_PATH = os.getenv(
+    "MEDIA_PROBE_CACHE_PATH",
+    str(BASE_DIR.parent / "data" / "cache" / "media_probe.sqlite"),
+)
+MEDIA_PROBE_LRU_SIZE = int(os.getenv("MEDIA_PROBE_LRU_SIZE", "512"))
+MEDIA_PROBE_WORKERS = int(os.getenv("MEDIA_PROBE_WORKERS", "8"))
+
+# Caption time indexes: memory-mapped start/end/text files for random access
+CAPTION_INDEX_DIR = os.getenv(
+    "CAPTION_INDEX_DIR", str(BASE_DIR.parent / "data" / "cache" / "caption_index")
+)
+# Open caption indexes kept per process
+CAPTION_INDEX_LRU_SIZE = int(os.getenv("CAPTION_INDEX_LRU_SIZE", "64"))
+
+# Speech pre-screen: energy-based pass over staged audio before Whisper runs
+SPEECH_PRESCREEN_ENABLED = (
+    os.getenv("SPEECH_PRESCREEN_ENABLED", "true").lower() == "true"
+)
+# Below this speech ratio a file counts as having no speech
+SPEECH_PRESCREEN_MIN_RATIO = float(os.getenv("SPEECH_PRESCREEN_MIN_RATIO", "0.01"))
+# Caption files below the ratio as "no speech" without running Whisper. Off by
+# default: a misclassified quiet meeting would then never be transcribed
+SPEECH_PRESCREEN_SKIP_NO_SPEECH = (
+    os.getenv("SPEECH_PRESCREEN_SKIP_NO_SPEECH", "false").lower() == "true"
+)
+SPEECH_PRESCREEN_MIN_CUT_SECONDS = float(
+    os.getenv("SPEECH_PRESCREEN_MIN_CUT_SECONDS", "10")
+)
+SPEECH_PRESCREEN_PAD_SECONDS = float(os.getenv("SPEECH_PRESCREEN_PAD_SECONDS", "0.5"))
+# Extra candidates ranked per pass
+SPEECH_PRESCREEN_RANK_LIMIT = int(os.getenv("SPEECH_PRESCREEN_RANK_LIMIT", "6"))
+# Candidates without staged audio are ranked from a few short decoded samples
+SPEECH_PRESCREEN_SAMPLE_COUNT = int(os.getenv("SPEECH_PRESCREEN_SAMPLE_COUNT", "3"))
+SPEECH_PRESCREEN_SAMPLE_SECONDS = float(
+    os.getenv("SPEECH_PRESCREEN_SAMPLE_SECONDS", "20")
+)
+
 # API configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
@@ -296,6 +421,59 @@ VOD_ENABLE_RETRY_ON_FAILURE = os.getenv("VOD_ENABLE_RETRY_ON_FAILURE", "true").l
 VOD_MAX_RETRY_ATTEMPTS = int(os.getenv("VOD_MAX_RETRY_ATTEMPTS", "5"))
 VOD_RETRY_BACKOFF_MULTIPLIER = float(os.getenv("VOD_RETRY_BACKOFF_MULTIPLIER", "2"))
 
+# VOD Downloads: concurrent HTTP Range segments into a preallocated .part file,
+# resumable from a sidecar journal after a failure or worker restart
+VOD_DOWNLOAD_CONNECTIONS = int(os.getenv("VOD_DOWNLOAD_CONNECTIONS", "4"))
+VOD_DOWNLOAD_SEGMENT_MB = int(os.getenv("VOD_DOWNLOAD_SEGMENT_MB", "16"))
+VOD_DOWNLOAD_BUFFER_MB = int(os.getenv("VOD_DOWNLOAD_BUFFER_MB", "4"))
+VOD_DOWNLOAD_SEGMENT_RETRIES = int(os.getenv("VOD_DOWNLOAD_SEGMENT_RETRIES", "3"))
+
+# Caption embedding: stream-copy video/audio and add a caption track; burn-in
+# (a full re-encode) only where a target requires it.  The policy maps
+# "<city>.<target>", "<city>", "<target>" or "default" to accepted modes in
+# preference order, e.g. "default=mov_text|cea608|burn_in;flex3=burn_in"
+CAPTION_EMBED_POLICY = os.getenv(
+    "CAPTION_EMBED_POLICY", "default=mov_text|cea608|burn_in"
+)
+CAPTION_MUX_TIMEOUT = int(os.getenv("CAPTION_MUX_TIMEOUT", "900"))
+CAPTION_BURN_IN_TIMEOUT = int(os.getenv("CAPTION_BURN_IN_TIMEOUT", "3600"))
+# Observed libx264 -preset medium speed (x realtime), used to report time saved
+CAPTION_BURN_IN_SPEED = float(os.getenv("CAPTION_BURN_IN_SPEED", "1.5"))
+
+# Host-wide CPU budget: slots leased by chunked transcription and transcoding
+CPU_BUDGET_SLOTS = int(os.getenv("CPU_BUDGET_SLOTS", str(os.cpu_count() or 4)))
+CPU_BUDGET_DIR = os.getenv("CPU_BUDGET_DIR", "/tmp/archivist_cpu_budget")
+
+# Segment-parallel transcoding: keyframe-aligned segments encoded in a bounded
+# ffmpeg pool (TRANSCODE_SEGMENT_THREADS x264 threads each), then concatenated
+TRANSCODE_SEGMENT_THREADS = int(os.getenv("TRANSCODE_SEGMENT_THREADS", "2"))
+TRANSCODE_SEGMENTS_PER_WORKER = int(os.getenv("TRANSCODE_SEGMENTS_PER_WORKER", "2"))
+TRANSCODE_SEGMENT_MIN_SECONDS = int(os.getenv("TRANSCODE_SEGMENT_MIN_SECONDS", "120"))
+
+# ffmpeg runner: progress streamed from -progress into Celery task state and
+# metrics every FFMPEG_PROGRESS_INTERVAL seconds, only the last
+# FFMPEG_STDERR_TAIL_LINES of stderr kept, cancel requests polled from Redis
+FFMPEG_PROGRESS_INTERVAL = float(os.getenv("FFMPEG_PROGRESS_INTERVAL", "5"))
+FFMPEG_STDERR_TAIL_LINES = int(os.getenv("FFMPEG_STDERR_TAIL_LINES", "200"))
+FFMPEG_CANCEL_POLL_SECONDS = float(os.getenv("FFMPEG_CANCEL_POLL_SECONDS", "2"))
+
+# End-to-end VOD pipeline (a Celery chain per VOD).  Stages are routed to
+# per-resource queues so a transcode of one VOD overlaps transcription of the
+# next and upload of a third; run one worker per queue with
+# -c <VOD_STAGE_CONCURRENCY[queue]> ("queue=N,..."; unlisted queues get 1).
+# Routing is opt-in: until a worker consumes each queue, stages stay on the
+# default queue (the startup manager starts the stage workers when enabled)
+VOD_STAGE_QUEUES_ENABLED = (
+    os.getenv("VOD_STAGE_QUEUES_ENABLED", "false").lower() == "true"
+)
+VOD_QUEUE_ASR = os.getenv("VOD_QUEUE_ASR", "cpu_asr")
+VOD_QUEUE_TRANSCODE = os.getenv("VOD_QUEUE_TRANSCODE", "cpu_transcode")
+VOD_QUEUE_IO = os.getenv("VOD_QUEUE_IO", "io_upload")
+VOD_STAGE_CONCURRENCY = os.getenv(
+    "VOD_STAGE_CONCURRENCY", "cpu_asr=1,cpu_transcode=2,io_upload=4"
+)
+VOD_PIPELINE_STATE_TTL = int(os.getenv("VOD_PIPELINE_STATE_TTL", str(7 * 86400)))
+
 # VOD Logging
 VOD_LOG_LEVEL = os.getenv("VOD_LOG_LEVEL", "INFO")
 VOD_ENABLE_DEBUG_LOGGING = os.getenv("VOD_ENABLE_DEBUG_LOGGING", "false").lower() == "true"
@@ -304,7 +482,43 @@ VOD_ENABLE_DEBUG_LOGGING = os.getenv("VOD_ENABLE_DEBUG_LOGGING", "false").lower(
 SUMMARIZATION_MODEL = os.getenv("SUMMARIZATION_MODEL", "facebook/bart-large-cnn")
 SUMMARIZATION_MAX_LENGTH = int(os.getenv("SUMMARIZATION_MAX_LENGTH", "100"))
 SUMMARIZATION_MIN_LENGTH = int(os.getenv("SUMMARIZATION_MIN_LENGTH", "30"))
-SUMMARIZATION_CHUNK_SIZE = int(os.getenv("SUMMARIZATION_CHUNK_SIZE", "5"))
+# Chunks fill the model's input window (0 = tokenizer max) and run in batches;
+# map-reduce also summarizes the chunk summaries into a meeting overview
+SUMMARIZATION_MAX_INPUT_TOKENS = int(os.getenv("SUMMARIZATION_MAX_INPUT_TOKENS", "0"))
+SUMMARIZATION_BATCH_SIZE = int(os.getenv("SUMMARIZATION_BATCH_SIZE", "8"))
+SUMMARIZATION_MAP_REDUCE = (
+    os.getenv("SUMMARIZATION_MAP_REDUCE", "true").lower() == "true"
+)
+# "abstractive" runs the transformer; "extractive" ranks transcript sentences
+# (TF-IDF + TextRank) in well under a second per meeting, for bulk minutes
+SUMMARIZATION_MODE = os.getenv("SUMMARIZATION_MODE", "abstractive").lower()
+SUMMARIZATION_EXTRACTIVE_POINTS = int(os.getenv("SUMMARIZATION_EXTRACTIVE_POINTS", "1"))
+SUMMARIZATION_OVERVIEW_SENTENCES = int(
+    os.getenv("SUMMARIZATION_OVERVIEW_SENTENCES", "5")
+)
+# The summarizer loads on first use; warm it when a worker starts and release
+# it after this many idle seconds (0 = keep loaded)
+SUMMARIZATION_WARMUP = os.getenv("SUMMARIZATION_WARMUP", "false").lower() == "true"
+SUMMARIZATION_IDLE_UNLOAD_SECONDS = float(
+    os.getenv("SUMMARIZATION_IDLE_UNLOAD_SECONDS", "900")
+)
+# Inference backend: "torch" (float32 pipeline), "torch-int8" (dynamic int8
+# quantization of the Linear layers) or "ctranslate2" (converted once into
+# SUMMARIZATION_CT2_DIR); anything that fails to load falls back to "torch"
+SUMMARIZATION_BACKEND = os.getenv("SUMMARIZATION_BACKEND", "torch").lower()
+SUMMARIZATION_CT2_DIR = os.getenv(
+    "SUMMARIZATION_CT2_DIR",
+    str(BASE_DIR.parent / "data" / "cache" / "ctranslate2_summarizer"),
+)
+SUMMARIZATION_CT2_COMPUTE_TYPE = os.getenv("SUMMARIZATION_CT2_COMPUTE_TYPE", "int8")
+SUMMARIZATION_CPU_THREADS = int(os.getenv("SUMMARIZATION_CPU_THREADS", "0"))
+# Summary memo: reuse chunk summaries when model, parameters and text are unchanged
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+SUMMARY_CACHE_PATH = os.getenv(
+    "SUMMARY_CACHE_PATH",
+    str(BASE_DIR.parent / "data" / "cache" / "summary_cache.sqlite"),
+)
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "200000"))
 
 # AJA HELO integration configuration
 # Map member cities to HELO device connection info. Preferred via JSON file path for flexibility.
@@ -375,4 +589,4 @@ if _CITY_ALIASES_INLINE:
         import json
         CITY_ALIASES_TO_HELO = json.loads(_CITY_ALIASES_INLINE)
     except Exception:
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,127 @@
+"""Host-wide CPU budget shared by transcription and transcoding workers.
+
+Chunked transcription and segment-parallel transcoding each fan out into
+a process pool, and Celery runs them in separate worker processes on the
+same host.  Without coordination a transcode starting next to a chunked
+transcription oversubscribes the cores and both slow down.  The budget is a
+fixed number of slots (``CPU_BUDGET_SLOTS``, one per core by default); a
+job leases as many as it can use and sizes its pool to the lease.
+
+Slots are ``flock``-ed files in ``CPU_BUDGET_DIR``, so leases work across
+processes without a broker and are released by the kernel when a worker
+dies.
+
+Example:
+    >>> from core.cpu_budget import get_cpu_budget
+    >>> with get_cpu_budget().lease(8, minimum=2, owner="transcode") as slots:
+    ...     run_pool(workers=slots)
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from core.config import CPU_BUDGET_DIR, CPU_BUDGET_SLOTS
+
+POLL_SECONDS = 0.5
+
+
+class CpuBudget:
+    """Counting semaphore over ``slots`` lock files."""
+
+    def __init__(self, slots: int = CPU_BUDGET_SLOTS, directory: str = CPU_BUDGET_DIR):
+        self.slots = max(1, slots)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _try_take(self, wanted: int) -> List[int]:
+        """Lock up to ``wanted`` free slots without blocking; return their fds."""
+        fds: List[int] = []
+        for slot in range(self.slots):
+            if len(fds) >= wanted:
+                break
+            fd = os.open(
+                os.path.join(self.directory, f"slot-{slot}.lock"),
+                os.O_RDWR | os.O_CREAT,
+                0o666,
+            )
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fds.append(fd)
+            except BlockingIOError:
+                os.close(fd)
+        return fds
+
+    @staticmethod
+    def _release(fds: List[int]) -> None:
+        for fd in fds:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+    @contextmanager
+    def lease(self, wanted: int, minimum: int = 1, timeout: Optional[float] = None,
+              owner: str = "") -> Iterator[int]:
+        """Hold between ``minimum`` and ``wanted`` slots; yield how many were granted.
+
+        Blocks until ``minimum`` slots are free (``minimum`` is capped at the
+        budget size).  Raises ``TimeoutError`` after ``timeout`` seconds.
+        """
+        wanted = max(1, min(wanted, self.slots))
+        minimum = max(1, min(minimum, wanted))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            fds = self._try_take(wanted)
+            if len(fds) >= minimum:
+                break
+            self._release(fds)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"CPU budget: {minimum} of {self.slots} slots not free "
+                    f"for {owner or 'job'}"
+                )
+            if not waited:
+                logger.info(f"Waiting for {minimum} CPU slot(s) for {owner or 'job'}")
+                waited = True
+            time.sleep(POLL_SECONDS)
+        if len(fds) < wanted:
+            logger.info(
+                f"CPU budget granted {len(fds)}/{wanted} slots to {owner or 'job'}"
+            )
+        try:
+            yield len(fds)
+        finally:
+            self._release(fds)
+
+    def in_use(self) -> int:
+        """Slots currently leased by any process on this host."""
+        fds = self._try_take(self.slots)
+        self._release(fds)
+        return self.slots - len(fds)
+
+    def get_stats(self) -> Dict[str, int]:
+        busy = self.in_use()
+        return {"slots": self.slots, "in_use": busy, "free": self.slots - busy}
+
+
+# Global per-process handle (the slots themselves are shared on the host)
+_cpu_budget: Optional[CpuBudget] = None
+
+
+def get_cpu_budget() -> CpuBudget:
+    """Return the process-wide ``CpuBudget``."""
+    global _cpu_budget
+    if _cpu_budget is None:
+        _cpu_budget = CpuBudget()
+    return _cpu_budget
+
+
+__all__ = ["CpuBudget", "get_cpu_budget"]
@@ -0,0 +1,286 @@
+"""Vectorized extractive summarizer for meeting transcripts.
+
+The abstractive model is too slow to run over the whole archive, and the old
+fallback just kept the first sentences of each chunk.  This engine scores
+every sentence of a meeting at once: sentences become rows of a sparse TF-IDF
+matrix, their cosine similarities form a graph, and TextRank (PageRank over
+that graph) ranks them.  Each section of the meeting keeps its best-ranked
+sentences as timestamped key points, and the best sentences overall form
+the overview, with near-duplicates skipped.
+
+Output uses the same ``_minutes.json`` schema as the abstractive path, so
+minutes can be bulk-generated for the archive in well under a second per
+meeting and the transformer kept for on-demand requests.
+
+Key Features:
+- TF-IDF with sublinear term frequency over the whole transcript
+- Sparse similarity graph and power-iteration TextRank (numpy / scipy.sparse)
+- Sections sized like the abstractive chunks, one key point per section
+- Bulk CLI: ``python scripts/utils/generate_extractive_minutes.py /mnt/flex-1``
+
+Example:
+    >>> from core.scc_parser import load_scc
+    >>> from core.extractive_summarizer import summarize_captions
+    >>> result = summarize_captions(load_scc("meeting.scc"))
+    >>> result["summary"][0]
+    {'speaker': 'Unknown', 'start': '00:00:04;00', 'text': 'The motion ... carries.'}
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from scipy import sparse
+
+from core.cea608 import seconds_to_timecode
+from core.config import (
+    SUMMARIZATION_EXTRACTIVE_POINTS,
+    SUMMARIZATION_MAX_INPUT_TOKENS,
+    SUMMARIZATION_OVERVIEW_SENTENCES,
+)
+from core.scc_parser import load_scc
+
+MODEL_NAME = "textrank-tfidf"
+# Sections match the abstractive chunks: one BART input window of text
+SECTION_TOKENS = (SUMMARIZATION_MAX_INPUT_TOKENS or 1024) - 8
+# Sentences shorter than this are rarely minutes material ("Thank you.")
+MIN_SENTENCE_WORDS = 5
+# Unpunctuated stretches are cut into pieces of this many words
+MAX_SENTENCE_WORDS = 60
+# Similarities below this are dropped from the graph to keep it sparse
+MIN_SIMILARITY = 0.05
+# Candidates this similar to an already chosen sentence are skipped
+DUPLICATE_SIMILARITY = 0.8
+DAMPING = 0.85
+
+# Sentence ends at . ! or ? followed by whitespace, so "$2.4" and "p.m." stay whole
+_SENTENCE = re.compile(r"(?:[^.!?]|[.!?]+(?![\s\"'”’)\]]|$))+(?:[.!?]+[\"'”’)\]]*|$)")
+_WORD = re.compile(r"[a-z0-9']+")
+STOP_WORDS = frozenset("""
+a about after all also am an and any are as at be been before being but by can
+could did do does doing for from had has have having he her here hers him his
+how i if in into is it its just me more most my no nor not now of off on once
+only or other our ours out over own same she should so some such than that the
+their theirs them then there these they this those through to too under until
+up very was we were what when where which while who whom why will with would
+you your yours uh um okay ok yeah oh
+""".split())
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """``(char_offset, sentence)`` pairs, long unpunctuated runs cut into pieces."""
+    sentences: List[Tuple[int, str]] = []
+    for match in _SENTENCE.finditer(text):
+        sentence = match.group().strip()
+        if not sentence:
+            continue
+        offset = match.start() + (len(match.group()) - len(match.group().lstrip()))
+        words = sentence.split(" ")
+        if len(words) <= MAX_SENTENCE_WORDS:
+            sentences.append((offset, sentence))
+            continue
+        for i in range(0, len(words), MAX_SENTENCE_WORDS):
+            piece = " ".join(words[i:i + MAX_SENTENCE_WORDS])
+            sentences.append((offset, piece))
+            offset += len(piece) + 1
+    return sentences
+
+
+def tfidf_matrix(sentences: Sequence[str]) -> sparse.csr_matrix:
+    """Row-normalized TF-IDF matrix (sentences x vocabulary), stop words removed."""
+    vocabulary: Dict[str, int] = {}
+    indptr, indices, counts = [0], [], []
+    for sentence in sentences:
+        row: Dict[int, int] = {}
+        for word in _WORD.findall(sentence.lower()):
+            if word not in STOP_WORDS:
+                column = vocabulary.setdefault(word, len(vocabulary))
+                row[column] = row.get(column, 0) + 1
+        indices.extend(row)
+        counts.extend(row.values())
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.asarray(counts, dtype=np.float32),
+            np.asarray(indices, dtype=np.int32),
+            indptr,
+        ),
+        shape=(len(sentences), len(vocabulary)),
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+    matrix = matrix.multiply(idf.astype(np.float32)).tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+def textrank(similarity: sparse.csr_matrix, damping: float = DAMPING,
+             iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    """PageRank scores over a symmetric weighted similarity graph."""
+    n = similarity.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    out_weight[dangling] = 1.0
+    scores = np.full(n, 1.0 / n)
+    transposed = similarity.T.tocsr()
+    for _ in range(iterations):
+        spread = transposed.dot(scores / out_weight)
+        updated = (1 - damping) / n + damping * (spread + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def _select(order: np.ndarray, duplicates: sparse.csr_matrix, limit: int,
+            blocked: np.ndarray) -> List[int]:
+    """Take up to ``limit`` indices from ``order`` that are not near-duplicates.
+
+    ``duplicates`` holds an edge between any two sentences at least
+    ``DUPLICATE_SIMILARITY`` alike; picking a sentence blocks its neighbours
+    in ``blocked`` (updated in place).
+    """
+    picked: List[int] = []
+    for i in order:
+        if len(picked) >= limit:
+            break
+        if blocked[i]:
+            continue
+        picked.append(int(i))
+        blocked[i] = True
+        start, end = duplicates.indptr[i], duplicates.indptr[i + 1]
+        blocked[duplicates.indices[start:end]] = True
+    return picked
+
+
+def summarize_captions(captions, points: int = SUMMARIZATION_EXTRACTIVE_POINTS,
+                       overview_sentences: int = SUMMARIZATION_OVERVIEW_SENTENCES,
+                       section_tokens: int = SECTION_TOKENS,
+                       map_reduce: bool = True) -> Dict[str, Any]:
+    """
+    Summarize parsed captions into timestamped key points by sentence ranking.
+
+    Args:
+        captions: ``SccCaptions`` from ``load_scc``
+        points: Sentences kept per section
+        overview_sentences: Sentences in the meeting ``overview``
+        section_tokens: Approximate tokens per section (one key point each)
+        map_reduce: Also produce the meeting-level ``overview``
+
+    Returns:
+        ``{"summary": [...], "overview": str, "generation": {...}}``, the
+        same schema as ``core.scc_summarizer.summarize_captions``
+    """
+    started = time.perf_counter()
+    text = captions.joined_text()
+    # Character offset of each caption inside the space-joined text
+    caption_offsets = np.asarray(captions.offsets[:-1], dtype=np.int64) + np.arange(
+        len(captions)
+    )
+    sentences = split_sentences(text)
+    bodies = [s for _offset, s in sentences]
+    starts = np.asarray(captions.starts, dtype=np.float64)[
+        np.searchsorted(caption_offsets, [o for o, _s in sentences], side="right") - 1
+    ] if sentences else np.zeros(0)
+
+    vectors = tfidf_matrix(bodies)
+    similarity = vectors.dot(vectors.T).tocsr()
+    similarity.setdiag(0)
+    similarity.data[similarity.data < MIN_SIMILARITY] = 0
+    similarity.eliminate_zeros()
+    scores = textrank(similarity)
+    duplicates = similarity.copy()
+    duplicates.data[duplicates.data < DUPLICATE_SIMILARITY] = 0
+    duplicates.eliminate_zeros()
+    word_counts = np.asarray([len(s.split()) for s in bodies])
+    # Short utterances can still win a section with nothing better in it
+    scores = np.where(word_counts >= MIN_SENTENCE_WORDS, scores, scores * 1e-3)
+
+    # Sections of roughly one model window each, by cumulative token estimate
+    tokens = np.cumsum((word_counts * 4 + 2) // 3)
+    section_of = tokens // max(1, section_tokens) if len(tokens) else tokens
+    summary = []
+    # Key points never repeat an earlier section's point nearly word for word
+    blocked = np.zeros(len(bodies), dtype=bool)
+    boundaries = np.flatnonzero(np.diff(section_of)) + 1
+    for members in np.split(np.arange(len(bodies)), boundaries) if len(bodies) else []:
+        order = members[np.argsort(-scores[members], kind="stable")]
+        picked = sorted(_select(order, duplicates, points, blocked))
+        if picked:
+            summary.append({
+                "speaker": "Unknown",
+                "start": seconds_to_timecode(float(starts[picked[0]])),
+                "text": " ".join(bodies[i] for i in picked),
+            })
+
+    result: Dict[str, Any] = {"summary": summary}
+    if map_reduce and bodies:
+        order = np.argsort(-scores, kind="stable")
+        result["overview"] = " ".join(
+            bodies[i] for i in sorted(_select(order, duplicates, overview_sentences,
+                                              np.zeros(len(bodies), dtype=bool)))
+        )
+    seconds = time.perf_counter() - started
+    result["generation"] = {
+        "mode": "extractive",
+        "model": MODEL_NAME,
+        "backend": MODEL_NAME,
+        "chunks": len(summary),
+        "sentences": len(bodies),
+        "map_reduce": bool(map_reduce),
+        "chunks_per_second": round(len(summary) / seconds, 2) if seconds else 0.0,
+        "seconds": round(seconds, 3),
+    }
+    return result
+
+
+def summarize_scc(scc_path: str, map_reduce: bool = True,
+                  output_path: Optional[str] = None) -> Optional[str]:
+    """Write extractive ``_minutes.json`` for ``scc_path``; return its path."""
+    captions = load_scc(scc_path)
+    if not len(captions):
+        logger.warning(f"No segments found in SCC file: {scc_path}")
+        return None
+    result = summarize_captions(captions, map_reduce=map_reduce)
+    output_path = output_path or scc_path.replace(".scc", "_minutes.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return output_path
+
+
+def _bulk_one(scc_path: str) -> Tuple[str, Optional[str], float]:
+    started = time.perf_counter()
+    try:
+        return scc_path, summarize_scc(scc_path), time.perf_counter() - started
+    except Exception as e:
+        logger.error(f"Extractive summarization failed for {scc_path}: {e}")
+        return scc_path, None, time.perf_counter() - started
+
+
+def bulk_summarize(paths: Sequence[str], workers: int = 1) -> Dict[str, Any]:
+    """Summarize many SCC files, ``workers`` processes at a time."""
+    started = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_bulk_one, paths, chunksize=4))
+    else:
+        results = [_bulk_one(path) for path in paths]
+    timings = [seconds for _path, out, seconds in results if out]
+    return {
+        "meetings": len(paths),
+        "written": len(timings),
+        "failed": [path for path, out, _seconds in results if not out],
+        "seconds": round(time.perf_counter() - started, 3),
+        "max_seconds_per_meeting": round(max(timings), 3) if timings else 0.0,
+    }
@@ -0,0 +1,390 @@
+"""Streaming ffmpeg runner: live progress, bounded stderr, cooperative cancel.
+
+``subprocess.run(..., capture_output=True)`` buffers an hour-long encode's
+whole stderr in memory and tells the Celery task nothing until ffmpeg exits.
+``run_ffmpeg`` starts ffmpeg with ``-progress pipe:1 -nostats``, parses the
+``out_time``/``speed``/``fps`` blocks as they arrive and keeps only the last
+``FFMPEG_STDERR_TAIL_LINES`` stderr lines for the error message.
+
+An ``FfmpegJob`` groups the ffmpeg processes working on one piece of work
+(one command, or every segment of a parallel transcode).  It sums their
+progress against the media duration and publishes it every
+``FFMPEG_PROGRESS_INTERVAL`` seconds as Celery ``PROGRESS`` state and as the
+``ffmpeg_progress_percent`` / ``ffmpeg_speed`` gauges.
+
+Cancellation is cooperative: ``UnifiedQueueManager.stop_task`` calls
+``request_cancel(task_id)``; running jobs poll the flag, stop ffmpeg with
+SIGTERM and raise ``FfmpegCancelled`` so the task cleans up its partial
+output instead of being killed with ffmpeg orphaned.
+
+Example:
+    >>> from core.ffmpeg_runner import FfmpegJob, run_ffmpeg
+    >>> job = FfmpegJob(total_seconds=10843.2, label="captions mov_text")
+    >>> argv = ["ffmpeg", "-i", "in.mp4", "-c", "copy", "-y", "out.mp4"]
+    >>> run_ffmpeg(argv, 900, job)["seconds"]
+    41.7
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+from core.config import (
+    FFMPEG_CANCEL_POLL_SECONDS,
+    FFMPEG_PROGRESS_INTERVAL,
+    FFMPEG_STDERR_TAIL_LINES,
+    REDIS_URL,
+)
+from core.exceptions import VODError
+from core.monitoring.metrics import record_metric
+
+CANCEL_KEY_PREFIX = "archivist:cancel:"
+ACTIVE_KEY_PREFIX = "archivist:ffmpeg_active:"
+CANCEL_TTL_SECONDS = 3600
+STOP_GRACE_SECONDS = 10
+_WAIT_SECONDS = 0.5
+
+_redis_client = None
+
+
+class FfmpegCancelled(VODError):
+    """ffmpeg was stopped because the task was cancelled."""
+
+
+def _redis(client=None):
+    global _redis_client
+    if client is not None:
+        return client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.from_url(REDIS_URL)
+    return _redis_client
+
+
+def request_cancel(task_id: str, client=None) -> bool:
+    """Ask the worker running ``task_id`` to stop its ffmpeg work."""
+    try:
+        _redis(client).setex(f"{CANCEL_KEY_PREFIX}{task_id}", CANCEL_TTL_SECONDS, "1")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not request cancellation of {task_id}: {e}")
+        return False
+
+
+def cancel_requested(task_id: str, client=None) -> bool:
+    try:
+        return bool(_redis(client).exists(f"{CANCEL_KEY_PREFIX}{task_id}"))
+    except Exception as e:
+        logger.debug(f"Cancel flag for {task_id} unavailable: {e}")
+        return False
+
+
+def ffmpeg_active(task_id: str, client=None) -> bool:
+    """Whether a worker is running ffmpeg for ``task_id`` (and will honour a cancel)."""
+    try:
+        return bool(_redis(client).exists(f"{ACTIVE_KEY_PREFIX}{task_id}"))
+    except Exception:
+        return False
+
+
+def _current_task():
+    """The Celery task executing in this thread, if any (Celery is optional here)."""
+    try:
+        from celery import current_task
+    except ImportError:
+        return None
+    # current_task is a thread-local Proxy: falsy outside a task, never None
+    if not current_task or not getattr(current_task.request, "id", None):
+        return None
+    # Unwrap it so progress published from reader threads reaches this task
+    return current_task._get_current_object()
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value.strip().rstrip("x"))
+    except ValueError:
+        return None  # "N/A" until the first frame is out
+
+
+def _clock_seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        hours, minutes, seconds = (value or "").split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+
+def parse_progress(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield one snapshot per ``-progress`` block (each ends with ``progress=...``)."""
+    block: Dict[str, str] = {}
+    for line in lines:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        block[key] = value
+        if key != "progress":
+            continue
+        # out_time_ms is microseconds too (a long-standing ffmpeg misnomer)
+        micros = _number(block.get("out_time_us", block.get("out_time_ms")))
+        out_seconds = (
+            micros / 1e6
+            if micros is not None
+            else _clock_seconds(block.get("out_time"))
+        )
+        frame = _number(block.get("frame"))
+        total_size = _number(block.get("total_size"))
+        yield {
+            "out_seconds": max(0.0, out_seconds) if out_seconds is not None else None,
+            "speed": _number(block.get("speed")),
+            "fps": _number(block.get("fps")),
+            "frame": int(frame) if frame is not None else None,
+            "total_size": int(total_size) if total_size is not None else None,
+            "done": value == "end",
+        }
+        block = {}
+
+
+def with_progress(cmd: List[str]) -> List[str]:
+    """``cmd`` with progress on stdout and the periodic stats line off stderr."""
+    if "-progress" in cmd:
+        return list(cmd)
+    return [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+
+class FfmpegJob:
+    """Progress, Celery state and cancellation shared by one job's ffmpeg processes.
+
+    ``total_seconds`` is the media duration the parts add up to; without it
+    the job still reports speed and position but no percentage.  ``task``
+    defaults to the Celery task running in the creating thread, captured
+    here because Celery's ``current_task`` is thread-local and segment
+    encodes report from pool threads.
+    """
+
+    def __init__(self, total_seconds: Optional[float] = None, label: str = "ffmpeg",
+                 task: Any = None, interval: float = FFMPEG_PROGRESS_INTERVAL,
+                 redis_client=None):
+        self.total_seconds = total_seconds or None
+        self.label = label
+        self.task = task if task is not None else _current_task()
+        self.task_id = getattr(getattr(self.task, "request", None), "id", None)
+        self.interval = interval
+        self._client = redis_client
+        self._parts: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._started = time.monotonic()
+        self._published = 0.0
+        self._polled = 0.0
+        self._running = 0
+
+    def update(self, part: Hashable, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._parts[part] = snapshot
+        self.publish()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            parts = list(self._parts.values())
+        done = sum(p.get("out_seconds") or 0.0 for p in parts)
+        elapsed = time.monotonic() - self._started
+        speed = done / elapsed if elapsed > 0 and done else None
+        state = {
+            "stage": self.label,
+            "out_seconds": round(done, 2),
+            "total_seconds": self.total_seconds,
+            "percent": None,
+            "speed": round(speed, 2) if speed else None,
+            "fps": round(sum(p.get("fps") or 0.0 for p in parts), 1),
+            "eta_seconds": None,
+        }
+        if self.total_seconds:
+            state["percent"] = round(min(100.0, 100.0 * done / self.total_seconds), 1)
+            if speed:
+                state["eta_seconds"] = round(
+                    max(0.0, self.total_seconds - done) / speed
+                )
+        return state
+
+    def publish(self, force: bool = False) -> None:
+        """Push the aggregate to Celery state and metrics, at most each ``interval``."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._published < self.interval:
+                return
+            self._published = now
+        state = self.snapshot()
+        if state["percent"] is not None:
+            record_metric("gauge", "ffmpeg_progress_percent", state["percent"])
+        if state["speed"] is not None:
+            record_metric("gauge", "ffmpeg_speed", state["speed"])
+        if self.task is None:
+            return
+        position = (
+            f"{state['percent']}%"
+            if state["percent"] is not None
+            else f"{state['out_seconds']}s"
+        )
+        try:
+            self.task.update_state(
+                task_id=self.task_id,
+                state="PROGRESS",
+                meta={"status": f"{self.label}: {position}", **state},
+            )
+        except Exception as e:
+            logger.debug(f"Could not publish ffmpeg progress for {self.task_id}: {e}")
+
+    def cancel(self) -> None:
+        """Stop every ffmpeg process of this job at its next poll."""
+        self._cancel.set()
+
+    def cancelled(self) -> bool:
+        if self._cancel.is_set():
+            return True
+        if not self.task_id:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._polled < FFMPEG_CANCEL_POLL_SECONDS:
+                return False
+            self._polled = now
+        try:
+            # Refresh the marker stop_task uses to choose a cooperative stop
+            _redis(self._client).setex(f"{ACTIVE_KEY_PREFIX}{self.task_id}",
+                                       int(FFMPEG_CANCEL_POLL_SECONDS * 3) + 10, "1")
+        except Exception:
+            pass
+        if cancel_requested(self.task_id, self._client):
+            logger.info(
+                f"Cancellation requested for task {self.task_id} ({self.label})"
+            )
+            self._cancel.set()
+        return self._cancel.is_set()
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._running += 1
+            self._polled = 0.0  # poll (and mark active) as soon as a process starts
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last and self.task_id:
+            try:
+                _redis(self._client).delete(f"{ACTIVE_KEY_PREFIX}{self.task_id}")
+            except Exception:
+                pass
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    # SIGTERM lets ffmpeg close its output; kill only if it does not exit
+    proc.terminate()
+    try:
+        proc.wait(timeout=STOP_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def run_ffmpeg(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    job: Optional[FfmpegJob] = None,
+    part: Optional[Hashable] = 0,
+) -> Dict[str, Any]:
+    """Run ffmpeg with streamed progress; raise ``VODError`` on failure.
+
+    ``part`` identifies this process within ``job`` (segment index); its
+    ``out_time`` counts towards the job total unless ``part`` is ``None``
+    (e.g. a concat pass over already-counted media).  Raises
+    ``FfmpegCancelled`` when the job is cancelled and ``VODError`` with the
+    stderr tail on a timeout or non-zero exit.
+    """
+    job = job or FfmpegJob(label=os.path.basename(cmd[-1]))
+    tail: deque = deque(maxlen=max(1, FFMPEG_STDERR_TAIL_LINES))
+    last: Dict[str, Any] = {}
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(with_progress(cmd), stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, errors="replace")
+    except OSError as e:
+        raise VODError(f"ffmpeg could not start: {e}")
+
+    def read_progress() -> None:
+        for snapshot in parse_progress(proc.stdout):
+            last.update(snapshot)
+            if part is not None:
+                job.update(part, snapshot)
+
+    def read_stderr() -> None:
+        for line in proc.stderr:
+            tail.append(line.rstrip())
+
+    readers = [threading.Thread(target=read_progress, daemon=True),
+               threading.Thread(target=read_stderr, daemon=True)]
+    for reader in readers:
+        reader.start()
+    job._enter()
+    stopped = None
+    try:
+        while True:
+            try:
+                proc.wait(timeout=_WAIT_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if job.cancelled():
+                stopped = "cancelled"
+            elif timeout and time.monotonic() - started > timeout:
+                stopped = "timeout"
+            if stopped:
+                _stop(proc)
+                break
+    finally:
+        if proc.poll() is None:
+            _stop(proc)  # worker shutdown or an exception in this thread
+        for reader in readers:
+            reader.join(timeout=5)
+        job._exit()
+
+    seconds = time.monotonic() - started
+    if stopped == "cancelled":
+        record_metric("increment", "ffmpeg_cancelled")
+        raise FfmpegCancelled(
+            f"ffmpeg cancelled: {job.label}", details={"output": cmd[-1]}
+        )
+    if stopped == "timeout":
+        raise VODError(f"ffmpeg timed out after {timeout}s: {cmd[-1]}")
+    if proc.returncode != 0:
+        raise VODError(
+            "\n".join(tail).strip()[-2000:] or f"ffmpeg exit {proc.returncode}",
+            details={"returncode": proc.returncode, "output": cmd[-1]},
+        )
+    if part is not None:
+        job.publish(force=True)
+    return {"seconds": round(seconds, 2), "progress": last, "stderr": "\n".join(tail)}
+
+
+__all__ = [
+    "FfmpegCancelled",
+    "FfmpegJob",
+    "cancel_requested",
+    "ffmpeg_active",
+    "parse_progress",
+    "request_cancel",
+    "run_ffmpeg",
+    "with_progress",
+]
@@ -20,7 +20,6 @@ Example:
     >>> print(file_details['metadata'])
 """
 
-import json
 import os
 from datetime import datetime
 from typing import Any, Dict, List
@@ -217,23 +216,11 @@ class FileManager:
         return accessible_locations
 
     def _get_video_metadata(self, file_path):
-        """Get video metadata using ffprobe."""
+        """Get video metadata from the shared ffprobe cache."""
         try:
-            import subprocess
-
-            cmd = [
-                "ffprobe",
-                "-v",
-                "quiet",
-                "-print_format",
-                "json",
-                "-show_format",
-                "-show_streams",
-                file_path,
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return json.loads(result.stdout)
+            from core.media_probe import probe_media
+
+            return probe_media(file_path)
         except Exception as e:
             print(f"Error getting video metadata: {e}")
         return None
@@ -0,0 +1,572 @@
+"""Persistent catalog of the media files on every member-city mount.
+
+Finding the file for a VOD used to mean walking each city's mount (and
+several candidate subdirectories) recursively, per VOD, over NFS/SMB.
+Discovery and the transcription watchdog globbed the mounts again on every
+run.  This catalog keeps one SQLite row per video file (path, city, size,
+mtime, extension, depth, recording date, probed duration and whether a
+sibling ``.scc`` exists) plus a token table for indexed lookups.
+
+Refreshes are incremental: every known directory is ``stat``-ed and only
+directories whose mtime changed are listed again, so an unchanged mount
+costs one ``stat`` per directory instead of a full walk.  Files rewritten in
+place do not change their directory's mtime; ``refresh(full=True)`` re-lists
+everything and runs from the periodic beat task.
+
+Key Features:
+- Lookups by VOD id (whole numeric filename tokens), normalized title tokens
+  and recording date, each backed by an index
+- Captioned state follows ``<name>.scc`` appearing next to the video
+- Durations probed lazily (bounded per sweep) rather than during lookups
+- A lookup miss triggers one incremental refresh before giving up
+
+Example:
+    >>> from core.media_catalog import get_media_catalog, find_vod_file
+    >>> get_media_catalog().refresh()
+    {'files': 1873, 'dirs_scanned': 41, 'dirs_unchanged': 0, 'removed': 0, ...}
+    >>> find_vod_file(14233, "City Council Meeting 2024-05-06")
+    '/mnt/flex-1/city_council/14233_City_Council_Meeting.mp4'
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import shutil
+import sqlite3
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from loguru import logger
+
+from core.config import (
+    MEDIA_CATALOG_MAX_AGE_SECONDS,
+    MEDIA_CATALOG_PATH,
+    MEDIA_CATALOG_PROBE_LIMIT,
+    MEMBER_CITIES,
+)
+from core.media_probe import duration_of, get_media_probe
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".m4v", ".avi", ".wmv", ".mpg", ".ts")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    city TEXT NOT NULL,
+    mount TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    recorded_date TEXT,
+    duration REAL,
+    captioned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_city_depth_mtime ON files (city, depth, mtime_ns);
+CREATE INDEX IF NOT EXISTS files_recorded_date ON files (recorded_date);
+CREATE TABLE IF NOT EXISTS file_tokens (
+    token TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (token, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS file_tokens_path ON file_tokens (path);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    city TEXT NOT NULL,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_city ON dirs (city);
+CREATE TABLE IF NOT EXISTS refreshes (
+    city TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+"""
+
+_COLUMNS = ("path", "city", "mount", "dir", "name", "ext", "depth", "size", "mtime_ns",
+            "recorded_date", "duration", "captioned")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Words too common in meeting titles to narrow a lookup
+_TITLE_STOP_WORDS = frozenset(
+    ("a", "an", "and", "the", "of", "for", "in", "on", "at", "to")
+)
+_DATE_PATTERNS = (
+    (
+        re.compile(r"(?<!\d)(20\d\d|19\d\d)[-_.]?(\d\d)[-_.]?(\d\d)(?!\d)"),
+        ("y", "m", "d"),
+    ),
+    (
+        re.compile(r"(?<!\d)(\d\d?)[-_.](\d\d?)[-_.](20\d\d|19\d\d)(?!\d)"),
+        ("m", "d", "y"),
+    ),
+)
+
+
+def title_tokens(text: str) -> List[str]:
+    """Lower-cased alphanumeric tokens of a title or filename, minus filler words."""
+    return [
+        t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _TITLE_STOP_WORDS
+    ]
+
+
+def parse_recorded_date(name: str) -> Optional[str]:
+    """ISO date in a filename (``2024-05-06``, ``20240506`` or ``05_06_2024``)."""
+    for pattern, order in _DATE_PATTERNS:
+        for match in pattern.finditer(name):
+            parts = dict(zip(order, (int(g) for g in match.groups())))
+            try:
+                return date(parts["y"], parts["m"], parts["d"]).isoformat()
+            except ValueError:
+                continue
+    return None
+
+
+def default_roots() -> Dict[str, str]:
+    """Mounted member-city paths, keyed by city id.
+
+    An unmounted mount point is an empty local directory; scanning it would
+    drop every catalogued file of that city.
+    """
+    roots = {
+        city: cfg.get("mount_path", f"/mnt/{city}")
+        for city, cfg in MEMBER_CITIES.items()
+    }
+    return {
+        city: path for city, path in roots.items() if path and os.path.ismount(path)
+    }
+
+
+class MediaCatalog:
+    """SQLite catalog of video files on the member-city mounts."""
+
+    def __init__(self, db_path: str = MEDIA_CATALOG_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    # -- refresh -----------------------------------------------------------
+
+    def refresh(
+        self, roots: Optional[Mapping[str, str]] = None, full: bool = False
+    ) -> Dict[str, Any]:
+        """Bring the catalog in line with the files under ``roots``.
+
+        ``roots`` maps a city id to its mount (default: every mounted city).
+        Only directories whose mtime changed are listed unless ``full``.
+        Unavailable roots are skipped so a dropped mount does not empty the
+        catalog.
+        """
+        roots = default_roots() if roots is None else roots
+        started = time.perf_counter()
+        stats = {"files": 0, "dirs_scanned": 0, "dirs_unchanged": 0, "removed": 0,
+                 "errors": 0, "cities": []}
+        for city, root in roots.items():
+            if not root or not os.path.isdir(root):
+                logger.debug(f"Media catalog: {root} unavailable, skipping")
+                continue
+            stats["cities"].append(city)
+            try:
+                self._refresh_root(city, os.path.abspath(root), full, stats)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(
+                    f"Media catalog refresh failed for {city} at {root}: {e}"
+                )
+                stats["errors"] += 1
+        with self._connect() as conn:
+            stats["files"] = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _refresh_root(
+        self, city: str, root: str, full: bool, stats: Dict[str, Any]
+    ) -> None:
+        with self._connect() as conn:
+            known: Dict[str, int] = {}
+            children: Dict[str, List[str]] = defaultdict(list)
+            for path, parent, mtime_ns in conn.execute(
+                "SELECT path, parent, mtime_ns FROM dirs WHERE city = ?", (city,)
+            ):
+                known[path] = mtime_ns
+                if parent is not None:
+                    children[parent].append(path)
+
+            seen: Set[str] = set()
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(directory)
+                if not full and known.get(directory) == mtime_ns:
+                    stats["dirs_unchanged"] += 1
+                    stack.extend(children.get(directory, ()))
+                    continue
+                try:
+                    subdirs = self._scan_dir(conn, city, root, directory, stats)
+                except OSError as e:
+                    logger.warning(f"Media catalog could not list {directory}: {e}")
+                    stats["errors"] += 1
+                    continue
+                stats["dirs_scanned"] += 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO dirs (path, city, parent, mtime_ns) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        directory,
+                        city,
+                        None if directory == root else os.path.dirname(directory),
+                        mtime_ns,
+                    ),
+                )
+                stack.extend(subdirs)
+
+            for directory in known.keys() - seen:
+                stats["removed"] += self._drop_dir(conn, directory)
+            conn.execute(
+                "INSERT OR REPLACE INTO refreshes (city, refreshed_at) VALUES (?, ?)",
+                (city, time.time()),
+            )
+
+    def _scan_dir(self, conn: sqlite3.Connection, city: str, root: str, directory: str,
+                  stats: Dict[str, Any]) -> List[str]:
+        """Re-list one directory; return its subdirectories."""
+        subdirs: List[str] = []
+        videos: Dict[str, os.stat_result] = {}
+        caption_stems: Set[str] = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext == ".scc":
+                    caption_stems.add(stem)
+                elif ext in VIDEO_EXTENSIONS:
+                    try:
+                        videos[entry.path] = entry.stat()
+                    except OSError:
+                        stats["errors"] += 1
+
+        existing = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in conn.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE dir = ?", (directory,)
+            )
+        }
+        depth = (
+            0
+            if directory == root
+            else os.path.relpath(directory, root).count(os.sep) + 1
+        )
+        for path, st in videos.items():
+            name = os.path.basename(path)
+            stem = os.path.splitext(name)[0]
+            captioned = int(stem in caption_stems)
+            if existing.get(path) == (st.st_size, st.st_mtime_ns):
+                conn.execute(
+                    "UPDATE files SET captioned = ? WHERE path = ?", (captioned, path)
+                )
+                continue
+            recorded = (
+                parse_recorded_date(name)
+                or datetime.fromtimestamp(st.st_mtime).date().isoformat()
+            )
+            # A changed file loses its probed duration; the next sweep re-probes it
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, city, mount, dir, name, ext, "
+                "depth, size, mtime_ns, recorded_date, duration, captioned) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+                (
+                    path,
+                    city,
+                    root,
+                    directory,
+                    name,
+                    os.path.splitext(name)[1].lower(),
+                    depth,
+                    st.st_size,
+                    st.st_mtime_ns,
+                    recorded,
+                    captioned,
+                ),
+            )
+            conn.execute("DELETE FROM file_tokens WHERE path = ?", (path,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO file_tokens (token, path) VALUES (?, ?)",
+                [(token, path) for token in set(title_tokens(stem))],
+            )
+
+        for path in existing.keys() - videos.keys():
+            self._drop_file(conn, path)
+            stats["removed"] += 1
+        return subdirs
+
+    @staticmethod
+    def _drop_file(conn: sqlite3.Connection, path: str) -> None:
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        conn.execute("DELETE FROM file_tokens WHERE path = ?", (path,))
+
+    def _drop_dir(self, conn: sqlite3.Connection, directory: str) -> int:
+        paths = [
+            p
+            for (p,) in conn.execute(
+                "SELECT path FROM files WHERE dir = ?", (directory,)
+            )
+        ]
+        for path in paths:
+            self._drop_file(conn, path)
+        conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+        return len(paths)
+
+    def ensure_fresh(self, max_age: float = MEDIA_CATALOG_MAX_AGE_SECONDS,
+                     roots: Optional[Mapping[str, str]] = None) -> bool:
+        """Refresh cities older than ``max_age`` seconds; return whether any were."""
+        roots = default_roots() if roots is None else roots
+        with self._connect() as conn:
+            refreshed = dict(conn.execute("SELECT city, refreshed_at FROM refreshes"))
+        now = time.time()
+        stale = {city: root for city, root in roots.items()
+                 if now - refreshed.get(city, 0.0) > max_age}
+        if stale:
+            self.refresh(stale)
+        return bool(stale)
+
+    def probe_durations(self, limit: int = MEDIA_CATALOG_PROBE_LIMIT) -> int:
+        """Probe up to ``limit`` files (newest first) whose duration is unknown."""
+        if limit <= 0 or not shutil.which("ffprobe"):
+            return 0
+        with self._connect() as conn:
+            paths = [
+                p
+                for (p,) in conn.execute(
+                    "SELECT path FROM files WHERE duration IS NULL "
+                    "ORDER BY mtime_ns DESC LIMIT ?",
+                    (limit,),
+                )
+            ]
+        probes = get_media_probe().probe_many(paths)
+        durations = [(duration_of(probes[path]), path) for path in paths]
+        with self._connect() as conn:
+            # Unprobeable files get 0 so they are not retried every sweep
+            conn.executemany("UPDATE files SET duration = ? WHERE path = ?",
+                             [(duration or 0.0, path) for duration, path in durations])
+        return sum(1 for duration, _path in durations if duration is not None)
+
+    # -- lookups -----------------------------------------------------------
+
+    def _rows(self, where: str, params: Sequence[Any], order: str = "mtime_ns DESC",
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM files WHERE {where} ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._connect() as conn:
+            rows = conn.execute(sql, list(params)).fetchall()
+        return [self._row_dict(row) for row in rows]
+
+    @staticmethod
+    def _row_dict(row: Tuple) -> Dict[str, Any]:
+        item = dict(zip(_COLUMNS, row))
+        item["captioned"] = bool(item["captioned"])
+        item["mtime"] = item["mtime_ns"] / 1e9
+        return item
+
+    @staticmethod
+    def _city_filter(
+        where: str, params: List[Any], city: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        if city:
+            return f"{where} AND city = ?", params + [city]
+        return where, params
+
+    def lookup_tokens(
+        self, tokens: Iterable[str], city: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Files whose name contains every one of ``tokens``."""
+        tokens = sorted(set(tokens))
+        if not tokens:
+            return []
+        marks = ",".join("?" * len(tokens))
+        where, params = self._city_filter(
+            f"path IN (SELECT path FROM file_tokens WHERE token IN ({marks}) "
+            "GROUP BY path HAVING COUNT(*) = ?)",
+            [*tokens, len(tokens)], city,
+        )
+        return self._rows(where, params)
+
+    def lookup_vod_id(
+        self, vod_id: Any, city: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Files naming ``vod_id`` as a whole token (``14233``, not ``142330``)."""
+        token = str(vod_id).strip().lower()
+        return self.lookup_tokens([token], city) if token and token != "unknown" else []
+
+    def lookup_title(
+        self, title: str, city: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Files whose name contains every significant word of ``title``."""
+        return self.lookup_tokens(title_tokens(title), city)
+
+    def lookup_date(self, day: Any, city: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Files recorded on ``day`` (a ``date`` or ISO string) by filename or mtime."""
+        day = day.isoformat() if isinstance(day, (date, datetime)) else str(day)[:10]
+        where, params = self._city_filter("recorded_date = ?", [day], city)
+        return self._rows(where, params)
+
+    def list_files(self, city: Optional[str] = None, max_depth: Optional[int] = None,
+                   extensions: Optional[Sequence[str]] = None, min_size: int = 0,
+                   captioned: Optional[bool] = None, pattern: Optional[str] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Catalogued files matching the filters, newest first.
+
+        ``pattern`` is a case-sensitive shell glob on the file name, as
+        ``glob.glob`` would apply it.
+        """
+        where, params = "size >= ?", [min_size]
+        where, params = self._city_filter(where, params, city)
+        if max_depth is not None:
+            where += " AND depth <= ?"
+            params.append(max_depth)
+        if extensions:
+            exts = [
+                e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions
+            ]
+            where += f" AND ext IN ({','.join('?' * len(exts))})"
+            params.extend(exts)
+        if captioned is not None:
+            where += " AND captioned = ?"
+            params.append(int(captioned))
+        rows = self._rows(where, params, limit=None if pattern else limit)
+        if pattern:
+            rows = [r for r in rows if fnmatch.fnmatchcase(r["name"], pattern)][:limit]
+        return rows
+
+    def find_vod_file(self, vod_id: Any, title: Optional[str] = None,
+                      city: Optional[str] = None) -> Optional[str]:
+        """Best readable file for a VOD: by id, then by title; ``None`` if absent."""
+        candidates = self.lookup_vod_id(vod_id, city) or (
+            self.lookup_title(title, city) if title else []
+        )
+        preferred = {
+            s.lower()
+            for s in (
+                f"{vod_id}",
+                f"vod_{vod_id}",
+                (title or "").replace(" ", "_").replace("/", "_"),
+            )
+            if s
+        }
+        # Exact names first, then shallower paths, then newest
+        candidates.sort(
+            key=lambda r: (
+                os.path.splitext(r["name"])[0].lower() not in preferred,
+                r["depth"],
+                -r["mtime_ns"],
+            )
+        )
+        for row in candidates:
+            if os.access(row["path"], os.R_OK):
+                return row["path"]
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return file counts and hours per city and the last refresh times."""
+        with self._connect() as conn:
+            cities = {
+                city: {
+                    "files": files,
+                    "captioned": captioned,
+                    "hours": round(hours / 3600.0, 1),
+                }
+                for city, files, captioned, hours in conn.execute(
+                    "SELECT city, COUNT(*), SUM(captioned), COALESCE(SUM(duration), 0) "
+                    "FROM files GROUP BY city"
+                )
+            }
+            refreshed = dict(conn.execute("SELECT city, refreshed_at FROM refreshes"))
+            dirs = conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+        return {
+            "files": sum(c["files"] for c in cities.values()),
+            "dirs": dirs,
+            "cities": cities,
+            "refreshed_at": refreshed,
+            "catalog_bytes": (
+                os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+            ),
+        }
+
+
+# Global per-process handle (the catalog itself is shared on disk)
+_media_catalog: Optional[MediaCatalog] = None
+
+
+def get_media_catalog() -> MediaCatalog:
+    """Get the process-wide media catalog."""
+    global _media_catalog
+    if _media_catalog is None:
+        _media_catalog = MediaCatalog()
+    return _media_catalog
+
+
+def find_vod_file(vod_id: Any, title: Optional[str] = None) -> Optional[str]:
+    """Look a VOD up in the catalog, refreshing once on a miss.
+
+    Returns ``None`` if the catalog is unavailable; callers fall through to
+    their explicit paths and the download.
+    """
+    try:
+        catalog = get_media_catalog()
+        refreshed = catalog.ensure_fresh()
+        path = catalog.find_vod_file(vod_id, title)
+        if path is None and not refreshed:
+            # The file may have landed since the last refresh; directory mtimes make
+            # this cheap
+            catalog.refresh()
+            path = catalog.find_vod_file(vod_id, title)
+        return path
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Media catalog lookup failed for VOD {vod_id}: {e}")
+        return None
+
+
+__all__ = [
+    "MediaCatalog",
+    "find_vod_file",
+    "get_media_catalog",
+    "parse_recorded_date",
+    "title_tokens",
+]
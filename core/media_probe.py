@@ -0,0 +1,378 @@
+"""Shared ffprobe cache for media metadata.
+
+The same file used to be probed over and over: once by
+``validate_video_file``, three more times by ``validate_vod_quality`` (codec,
+duration, subtitle streams), on every file-details API call and again while
+publishing.  Each probe is an ffprobe subprocess reading container headers
+over NFS.  ``MediaProbe`` runs one ``ffprobe -show_format -show_streams``
+JSON call per file version and serves every consumer from the parsed result.
+
+Results are keyed by (path, size, mtime_ns): a rewritten or re-exported file
+is probed again, an unchanged one never is.  Unreadable files are cached too
+(as ``None``) so a broken upload does not cost a subprocess per request.
+
+Key Features:
+- In-process LRU in front of a persistent SQLite store shared by workers
+- ``probe_many`` / ``probe_directory`` batch mode with a bounded thread pool
+- Helpers for the questions callers ask: duration, codecs, subtitle streams
+- Persistent hit/miss counters exposed through ``get_stats()``
+- A broken or unwritable store degrades to plain (LRU-only) ffprobe calls
+
+Example:
+    >>> from core.media_probe import get_media_probe, media_duration
+    >>> info = get_media_probe().probe("/mnt/flex-1/council.mp4")
+    >>> info["format"]["format_name"], media_duration("/mnt/flex-1/council.mp4")
+    ('mov,mp4,m4a,3gp,3g2,mj2', 10843.2)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from core.config import (
+    MEDIA_PROBE_CACHE_PATH,
+    MEDIA_PROBE_LRU_SIZE,
+    MEDIA_PROBE_WORKERS,
+)
+
+PROBE_TIMEOUT_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    data TEXT,
+    error TEXT,
+    probed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_MISSING = object()
+
+
+def run_ffprobe(
+    path: str, timeout: float = PROBE_TIMEOUT_SECONDS
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """One ``-show_format -show_streams`` JSON probe; return ``(info, error)``.
+
+    Raises ``OSError`` / ``subprocess.TimeoutExpired`` when ffprobe could not
+    run to completion, which says nothing about the file itself.
+    """
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        return (
+            None,
+            (result.stderr or "").strip()[-500:] or f"ffprobe exit {result.returncode}",
+        )
+    try:
+        info = json.loads(result.stdout or "{}")
+    except ValueError as e:
+        return None, f"unparseable ffprobe output: {e}"
+    if not isinstance(info, dict):
+        return None, "unexpected ffprobe output"
+    info.setdefault("format", {})
+    info.setdefault("streams", [])
+    return info, None
+
+
+def duration_of(info: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Container duration in seconds, falling back to the longest stream."""
+    if not info:
+        return None
+
+    def seconds(value: Any) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    duration = seconds(info.get("format", {}).get("duration"))
+    if duration <= 0:
+        duration = max(
+            (seconds(s.get("duration")) for s in info.get("streams", [])), default=0.0
+        )
+    return duration or None
+
+
+def streams_of(info: Optional[Dict[str, Any]], codec_type: str) -> List[Dict[str, Any]]:
+    """Streams of ``codec_type`` (``video``, ``audio``, ``subtitle``, ...)."""
+    return [
+        s for s in (info or {}).get("streams", []) if s.get("codec_type") == codec_type
+    ]
+
+
+def codec_names(info: Optional[Dict[str, Any]], codec_type: str) -> List[str]:
+    return [s.get("codec_name", "") for s in streams_of(info, codec_type)]
+
+
+class MediaProbe:
+    """ffprobe results keyed by (path, size, mtime_ns), LRU over SQLite.
+
+    With ``db_path=None`` there is no persistent store, only the LRU.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = MEDIA_PROBE_CACHE_PATH,
+        lru_size: int = MEDIA_PROBE_LRU_SIZE,
+    ):
+        self.db_path = db_path
+        self.lru_size = max(0, lru_size)
+        self._lru: "OrderedDict[Tuple[str, int, int], Optional[Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        if db_path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _bump(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def _remember(
+        self, key: Tuple[str, int, int], info: Optional[Dict[str, Any]]
+    ) -> None:
+        if not self.lru_size:
+            return
+        with self._lock:
+            self._lru[key] = info
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def probe(self, path: str) -> Optional[Dict[str, Any]]:
+        """Parsed ffprobe JSON (``format`` and ``streams``) for ``path``, or ``None``.
+
+        ``None`` means the file is missing or ffprobe could not read it.
+        """
+        abspath = os.path.abspath(path)
+        try:
+            st = os.stat(abspath)
+        except OSError:
+            return None
+        key = (abspath, st.st_size, st.st_mtime_ns)
+
+        with self._lock:
+            cached = self._lru.get(key, _MISSING)
+            if cached is not _MISSING:
+                self._lru.move_to_end(key)
+                # Per-process counter: a SQLite write per hit would cost more than
+                # the hit
+                self._memory_hits += 1
+        if cached is not _MISSING:
+            return cached
+
+        if self.db_path is not None:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT size, mtime_ns, data FROM probes WHERE path = ?",
+                        (abspath,),
+                    ).fetchone()
+                    if row and (row[0], row[1]) == key[1:]:
+                        self._bump(conn, "disk_hits")
+                        info = json.loads(row[2]) if row[2] else None
+                        self._remember(key, info)
+                        return info
+            except sqlite3.Error as e:
+                # A locked or corrupt store must not fail the probe itself
+                logger.warning(f"Media probe cache unreadable, probing {abspath}: {e}")
+
+        try:
+            info, error = run_ffprobe(abspath)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            # Transient (NFS stall, ffprobe missing): not cached, the next call retries
+            logger.warning(f"ffprobe could not run for {abspath}: {e}")
+            return None
+        if error:
+            logger.warning(f"ffprobe failed for {abspath}: {error}")
+        if self.db_path is not None:
+            try:
+                self._store(key, info, error)
+            except sqlite3.Error as e:
+                logger.warning(f"Media probe cache not updated for {abspath}: {e}")
+        self._remember(key, info)
+        return info
+
+    def _store(
+        self,
+        key: Tuple[str, int, int],
+        info: Optional[Dict[str, Any]],
+        error: Optional[str],
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO probes "
+                "(path, size, mtime_ns, data, error, probed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key[0],
+                    key[1],
+                    key[2],
+                    json.dumps(info) if info is not None else None,
+                    error,
+                    time.time(),
+                ),
+            )
+            self._bump(conn, "misses" if error is None else "errors")
+
+    def probe_many(
+        self, paths: Iterable[str], workers: int = MEDIA_PROBE_WORKERS
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Probe ``paths`` concurrently (one ffprobe subprocess each), by input path."""
+        paths = list(dict.fromkeys(paths))
+        if len(paths) <= 1 or workers <= 1:
+            return {path: self.probe(path) for path in paths}
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(paths)), thread_name_prefix="ffprobe"
+        ) as pool:
+            return dict(zip(paths, pool.map(self.probe, paths)))
+
+    def probe_directory(
+        self,
+        directory: str,
+        extensions: Optional[Sequence[str]] = None,
+        recursive: bool = True,
+        workers: int = MEDIA_PROBE_WORKERS,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Probe every video under ``directory`` in parallel (warms the cache)."""
+        if extensions is None:
+            from core.media_catalog import VIDEO_EXTENSIONS as extensions
+        wanted = tuple(e.lower() for e in extensions)
+        found: List[str] = []
+        for root, dirs, files in os.walk(directory):
+            found.extend(
+                os.path.join(root, f) for f in files if f.lower().endswith(wanted)
+            )
+            if not recursive:
+                break
+        return self.probe_many(sorted(found), workers=workers)
+
+    def invalidate(self, path: str) -> None:
+        abspath = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._lru if k[0] == abspath]:
+                del self._lru[key]
+        if self.db_path is None:
+            return
+        with self._connect() as conn:
+            conn.execute("DELETE FROM probes WHERE path = ?", (abspath,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters (memory hits are per process) and store size."""
+        counters: Dict[str, int] = {}
+        entries = failures = 0
+        if self.db_path is not None:
+            with self._connect() as conn:
+                counters = dict(
+                    conn.execute("SELECT name, value FROM counters").fetchall()
+                )
+                entries, failures = conn.execute(
+                    "SELECT COUNT(*), COUNT(error) FROM probes"
+                ).fetchone()
+        hits = self._memory_hits + counters.get("disk_hits", 0)
+        probes = counters.get("misses", 0) + counters.get("errors", 0)
+        return {
+            "memory_hits": self._memory_hits,
+            "disk_hits": counters.get("disk_hits", 0),
+            "probes": probes,
+            "errors": counters.get("errors", 0),
+            "hit_rate": hits / (hits + probes) if hits + probes else 0.0,
+            "entries": entries,
+            "unreadable": failures,
+            "lru_entries": len(self._lru),
+        }
+
+
+# Global per-process handle (the store itself is shared on disk)
+_media_probe: Optional[MediaProbe] = None
+
+
+def get_media_probe() -> MediaProbe:
+    """Get the process-wide media probe cache.
+
+    If the store cannot be created (unwritable directory, broken database)
+    this returns a store-less probe that runs ffprobe directly; the next
+    call tries the store again.
+    """
+    global _media_probe
+    if _media_probe is None:
+        try:
+            _media_probe = MediaProbe()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(
+                f"Media probe cache unavailable at {MEDIA_PROBE_CACHE_PATH}, "
+                f"probing without it: {e}"
+            )
+            return MediaProbe(db_path=None)
+    return _media_probe
+
+
+def probe_media(path: str) -> Optional[Dict[str, Any]]:
+    """Cached ffprobe info for ``path`` (``None`` if unreadable)."""
+    return get_media_probe().probe(path)
+
+
+def media_duration(path: str) -> Optional[float]:
+    """Cached duration of ``path`` in seconds (``None`` if unknown)."""
+    return duration_of(probe_media(path))
+
+
+__all__ = [
+    "MediaProbe",
+    "codec_names",
+    "duration_of",
+    "get_media_probe",
+    "media_duration",
+    "probe_media",
+    "run_ffprobe",
+    "streams_of",
+]
@@ -117,6 +117,7 @@ class VODMetricsCollector:
             ("vod_download_success", MetricType.COUNTER, "Successful VOD downloads"),
             ("vod_download_failed", MetricType.COUNTER, "Failed VOD downloads"),
             ("vod_download_retries", MetricType.COUNTER, "VOD download retry attempts"),
+            ("vod_download_bytes", MetricType.COUNTER, "VOD bytes downloaded"),
             (
                 "caption_generation_total",
                 MetricType.COUNTER,
@@ -184,6 +185,31 @@ class VODMetricsCollector:
             ("queue_size", MetricType.GAUGE, "Current task queue size"),
             ("error_rate", MetricType.GAUGE, "Current error rate percentage"),
             ("retry_success_rate", MetricType.GAUGE, "Retry success rate percentage"),
+            (
+                "vod_download_throughput_mbps",
+                MetricType.GAUGE,
+                "Throughput of the last VOD download in Mbit/s",
+            ),
+            (
+                "vod_download_progress_percent",
+                MetricType.GAUGE,
+                "Progress of the current VOD download",
+            ),
+            (
+                "ffmpeg_progress_percent",
+                MetricType.GAUGE,
+                "Progress of the current ffmpeg job",
+            ),
+            (
+                "ffmpeg_speed",
+                MetricType.GAUGE,
+                "Speed of the current ffmpeg job (x realtime)",
+            ),
+            (
+                "ffmpeg_cancelled",
+                MetricType.COUNTER,
+                "ffmpeg jobs stopped by cancellation",
+            ),
         ]
 
         for name, metric_type, description in core_metrics:
@@ -378,6 +404,20 @@ def get_metrics_collector() -> VODMetricsCollector:
     return _metrics_collector
 
 
+def record_metric(
+    kind: str, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None
+) -> None:
+    """Record ``value`` through the collector method ``kind`` (best-effort).
+
+    ``kind`` is ``"increment"``, ``"gauge"``, ``"histogram"`` or ``"timer"``.
+    Metrics must never fail the work being measured, so errors are ignored.
+    """
+    try:
+        getattr(get_metrics_collector(), kind)(name, value, labels)
+    except Exception:
+        pass
+
+
 def track_vod_processing(func):
     """Decorator to track VOD processing metrics."""
 
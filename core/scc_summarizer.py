@@ -10,6 +10,13 @@ Key Features:
 - Conversion to meeting minutes format
 - Structured output with timestamps
 - CPU-optimized processing
+- Model loaded on first use (or opt-in warm-up) and unloaded when idle
+- Token-budgeted chunks, batched inference and optional map-reduce overview
+- Unchanged chunks reuse memoized summaries (``core.summary_cache``)
+- Float32, int8-quantized torch or CTranslate2 inference (``SUMMARIZATION_BACKEND``)
+- Fast extractive mode (``SUMMARIZATION_MODE=extractive``, see
+  ``core.extractive_summarizer``)
+- Benchmark: ``python scripts/benchmarks/bench_summarize.py --hours 3``
 
 Example:
     >>> from core.scc_summarizer import summarize_scc
@@ -17,93 +24,184 @@ Example:
     >>> print(f"Summary saved to: {summary_path}")
 """
 
+import gc
 import json
-import re
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from loguru import logger
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM  # noqa: F401
-    _transformers_ok = True
-except Exception:
-    pipeline = None  # type: ignore
-    _transformers_ok = False
-import torch
+from core.cea608 import decode_hex, seconds_to_timecode
+from core.scc_parser import load_scc
+from core import summary_cache
+from core.summarization_backends import backend_label, load_summarizer, load_tokenizer
 from core.config import (
     SUMMARIZATION_MODEL, SUMMARIZATION_MAX_LENGTH, 
-    SUMMARIZATION_MIN_LENGTH, SUMMARIZATION_CHUNK_SIZE
+    SUMMARIZATION_MIN_LENGTH, SUMMARIZATION_MAX_INPUT_TOKENS,
+    SUMMARIZATION_BATCH_SIZE, SUMMARIZATION_MAP_REDUCE,
+    SUMMARIZATION_IDLE_UNLOAD_SECONDS, SUMMARIZATION_BACKEND, SUMMARIZATION_MODE,
 )
 
 # Force CPU-only mode for consistency with transcription system
 os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
-torch.cuda.is_available = lambda: False
+
+# BART's encoder limit; used when the tokenizer does not report one
+DEFAULT_MAX_INPUT_TOKENS = 1024
+# Room for the special tokens the pipeline adds around each input
+SPECIAL_TOKEN_MARGIN = 8
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough subword count for English text when no tokenizer is loaded."""
+    return (len(text.split()) * 4 + 2) // 3
+
+
+def token_budget_chunks(token_counts: List[int], budget: int) -> List[Tuple[int, int]]:
+    """Group consecutive items into ``(start, stop)`` runs of at most ``budget`` tokens.
+
+    An item larger than the budget on its own becomes a single-item chunk
+    (the pipeline truncates it) rather than being dropped.
+    """
+    chunks: List[Tuple[int, int]] = []
+    start, used = 0, 0
+    for i, count in enumerate(token_counts):
+        # +1 for the space joining this item to the previous one
+        cost = count + (1 if i > start else 0)
+        if i > start and used + cost > budget:
+            chunks.append((start, i))
+            start, used, cost = i, 0, count
+        used += cost
+    if start < len(token_counts):
+        chunks.append((start, len(token_counts)))
+    return chunks
+
+
+def backend_name(model_name: str, inference: str) -> str:
+    """Summary cache label for ``model_name`` run by the ``inference`` backend."""
+    # Float32 keeps the bare model name so existing memoized summaries stay valid
+    if inference == "torch-float32":
+        return model_name
+    return f"{model_name}@{inference}"
+
+
+def input_token_limit(tokenizer: Any) -> int:
+    """Tokens one forward pass accepts (tokenizer limit unless configured)."""
+    if SUMMARIZATION_MAX_INPUT_TOKENS > 0:
+        return SUMMARIZATION_MAX_INPUT_TOKENS
+    limit = getattr(tokenizer, "model_max_length", None)
+    # Tokenizers without a limit report a huge sentinel value
+    if not limit or limit > 100_000:
+        return DEFAULT_MAX_INPUT_TOKENS
+    return int(limit)
+
+
+def tokenizer_counts(tokenizer: Any, texts: List[str]) -> List[int]:
+    """Token counts for ``texts`` in one tokenizer call (estimated without one)."""
+    if tokenizer is None or not texts:
+        return [estimate_tokens(t) for t in texts]
+    return [
+        len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]
+    ]
 
 class LocalSummaryModel:
     """Local transformer model interface for text summarization."""
-    
-    def __init__(self):
-        """Initialize the local model."""
+
+    def __init__(self, backend: str = SUMMARIZATION_BACKEND):
+        """Load the local model with ``backend`` (``core.summarization_backends``)."""
         self.device = "cpu"
         self.model_name = SUMMARIZATION_MODEL
         self.max_length = SUMMARIZATION_MAX_LENGTH
         self.min_length = SUMMARIZATION_MIN_LENGTH
-        
+        # Chunks that fell back to the simple summarizer despite a loaded model
+        self.fallbacks = 0
+
+        # Which backend actually loaded: "torch-float32", "torch-int8" or
+        # "ctranslate2-int8"
+        self.inference = "simple"
+
         try:
-            if _transformers_ok and pipeline is not None:
-                # Initialize the summarization pipeline
-                self.summarizer = pipeline(
-                    "summarization",
-                    model=self.model_name,
-                    device=0 if torch.cuda.is_available() else -1,
-                    torch_dtype=torch.float32,
-                )
-                logger.info(f"Successfully loaded local summarization model: {self.model_name}")
-            else:
-                raise RuntimeError("transformers pipeline unavailable")
+            self.summarizer, self.inference = load_summarizer(self.model_name, backend)
+            logger.info(
+                f"Successfully loaded local summarization model: {self.model_name} "
+                f"({self.inference})"
+            )
         except Exception as e:
             logger.warning(f"Falling back to simple summarizer: {e}")
             self.summarizer = None
-    
-    def summarize_text(self, text: str, num_points: int = 3) -> str:
+
+    @property
+    def backend(self) -> str:
+        """What produces summaries: the model (and quantization) or the fallback."""
+        if not self.summarizer:
+            return "simple"
+        return backend_name(self.model_name, self.inference)
+
+    @property
+    def max_input_tokens(self) -> int:
+        """Tokens one forward pass accepts (tokenizer limit unless configured)."""
+        return input_token_limit(getattr(self.summarizer, "tokenizer", None))
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Token counts for ``texts`` in one tokenizer call (estimated if no model)."""
+        return tokenizer_counts(getattr(self.summarizer, "tokenizer", None), texts)
+
+    def summarize_batch(self, texts: List[str], num_points: int = 1,
+                        batch_size: int = SUMMARIZATION_BATCH_SIZE) -> List[str]:
         """
-        Summarize text using local transformer model.
+        Summarize several texts with batched forward passes.
         
         Args:
-            text: Text to summarize
-            num_points: Number of key points to extract (used for guidance)
+            texts: Texts to summarize, each within ``max_input_tokens``
+            num_points: Number of key points per text for the fallback summarizer
+            batch_size: Texts per forward pass
             
         Returns:
-            Summarized text
+            One summary per input text, in order
         """
         if not self.summarizer:
-            # Fallback to simple text truncation if model fails
-            return self._simple_summarize(text, num_points)
-        
+            return [self._simple_summarize(text, num_points) for text in texts]
+
         try:
-            # Truncate text if too long
-            if len(text) > 1024:
-                text = text[:1024]
-            
-            # Generate summary
-            summary_result = self.summarizer(
-                text,
+            results = self.summarizer(
+                texts,
+                batch_size=max(1, batch_size),
                 max_length=self.max_length,
                 min_length=self.min_length,
                 do_sample=False,
                 truncation=True
             )
-            
-            if summary_result and len(summary_result) > 0:
-                summary = summary_result[0]['summary_text']
-                logger.debug(f"Generated summary: {summary}")
-                return summary
-            else:
-                return self._simple_summarize(text, num_points)
-                
+            summaries = []
+            for text, result in zip(texts, results):
+                # Some pipeline versions wrap each result in a list
+                if isinstance(result, list):
+                    result = result[0] if result else {}
+                summary = (
+                    result.get('summary_text') if isinstance(result, dict) else None
+                )
+                if not summary:
+                    self.fallbacks += 1
+                    summary = self._simple_summarize(text, num_points)
+                summaries.append(summary)
+            return summaries
         except Exception as e:
-            logger.error(f"Error generating summary: {e}")
-            return self._simple_summarize(text, num_points)
-    
+            logger.error(f"Error generating summaries: {e}")
+            self.fallbacks += len(texts)
+            return [self._simple_summarize(text, num_points) for text in texts]
+
+    def summarize_text(self, text: str, num_points: int = 3) -> str:
+        """
+        Summarize text using local transformer model.
+
+        Args:
+            text: Text to summarize (truncated to the model's input limit)
+            num_points: Number of key points to extract (used for guidance)
+
+        Returns:
+            Summarized text
+        """
+        return self.summarize_batch([text], num_points=num_points, batch_size=1)[0]
+
     def _simple_summarize(self, text: str, num_points: int) -> str:
         """
         Simple fallback summarization using text processing.
@@ -117,23 +215,199 @@ class LocalSummaryModel:
         """
         # Split into sentences
         sentences = [s.strip() for s in text.split('.') if s.strip()]
-        
+
         if not sentences:
             return "No content to summarize"
-        
+
         # Take first few sentences as summary
         summary_sentences = sentences[:min(num_points, len(sentences))]
         summary = '. '.join(summary_sentences)
-        
+
         # Ensure it ends with a period
         if not summary.endswith('.'):
             summary += '.'
-        
+
         logger.debug(f"Simple summary generated: {summary}")
         return summary
 
-# Create a singleton instance
-summarizer = LocalSummaryModel()
+
+class LazySummaryModel:
+    """Process-wide summarizer handle that loads the model on first use.
+
+    Importing this module no longer builds the transformer pipeline, so the
+    API, non-summary Celery workers and scripts start without it.  The model
+    loads on the first ``summarize_text`` call or from ``warm_up()``, and is
+    released again after ``idle_unload_seconds`` without use (0 keeps it).
+    A ``lease()`` pins it for a whole multi-call job such as one meeting.
+
+    Chunking and the summary cache key only need the tokenizer and the
+    configuration, so a rerun whose chunks are all memoized never loads
+    the model at all.
+    """
+
+    def __init__(self, idle_unload_seconds: float = SUMMARIZATION_IDLE_UNLOAD_SECONDS,
+                 factory=LocalSummaryModel):
+        self.idle_unload_seconds = idle_unload_seconds
+        self._factory = factory
+        self._model: Optional[LocalSummaryModel] = None
+        self._lock = threading.RLock()
+        self._last_used = 0.0
+        self._leases = 0
+        # Kept here rather than on the model so an unload/reload cannot reset it
+        self._fallbacks = 0
+        self._reaper: Optional[threading.Thread] = None
+        self._stats = {"loads": 0, "unloads": 0, "load_seconds": 0.0}
+        self.model_name = SUMMARIZATION_MODEL
+        self.max_length = SUMMARIZATION_MAX_LENGTH
+        self.min_length = SUMMARIZATION_MIN_LENGTH
+        # What the cache keys by: the configured backend, known without loading it
+        self.backend = backend_name(
+            self.model_name, backend_label(SUMMARIZATION_BACKEND)
+        )
+        self._tokenizer: Any = None
+        self._tokenizer_loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> LocalSummaryModel:
+        """Return the loaded model, loading it now if needed."""
+        with self._lock:
+            if self._model is None:
+                started = time.perf_counter()
+                self._model = self._factory()
+                elapsed = time.perf_counter() - started
+                self._stats["loads"] += 1
+                self._stats["load_seconds"] += elapsed
+                logger.info(f"Summarization model ready in {elapsed:.1f}s")
+                self._start_reaper()
+            self._last_used = time.monotonic()
+            return self._model
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load the model now, on a daemon thread unless ``background`` is False."""
+        if not background:
+            self.get()
+            return None
+        thread = threading.Thread(
+            target=self.get, name="summarizer-warmup", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def unload(self) -> bool:
+        """Drop the model so its memory can be reclaimed; return whether one was set."""
+        with self._lock:
+            if self._model is None:
+                return False
+            self._model = None
+            self._stats["unloads"] += 1
+        gc.collect()
+        logger.info("Summarization model unloaded")
+        return True
+
+    def unload_if_idle(self) -> bool:
+        with self._lock:
+            idle = time.monotonic() - self._last_used
+            if (
+                self._model is None
+                or self._leases
+                or not self.idle_unload_seconds
+                or idle < self.idle_unload_seconds
+            ):
+                return False
+            return self.unload()
+
+    def _start_reaper(self) -> None:
+        # Called with the lock held; the reaper exits (under the lock) once unloaded
+        if not self.idle_unload_seconds or self._reaper is not None:
+            return
+
+        def reap() -> None:
+            while True:
+                time.sleep(max(1.0, self.idle_unload_seconds / 4))
+                with self._lock:
+                    self.unload_if_idle()
+                    if self._model is None:
+                        self._reaper = None
+                        return
+
+        self._reaper = threading.Thread(
+            target=reap, name="summarizer-idle-unload", daemon=True
+        )
+        self._reaper.start()
+
+    @contextmanager
+    def lease(self) -> Iterator["LazySummaryModel"]:
+        """Keep the idle reaper away until the block exits (leases nest)."""
+        with self._lock:
+            self._leases += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._leases -= 1
+                self._last_used = time.monotonic()
+
+    def summarize_text(self, text: str, num_points: int = 3) -> str:
+        with self.lease():
+            return self.get().summarize_text(text, num_points)
+
+    def summarize_batch(self, texts: List[str], num_points: int = 1,
+                        batch_size: int = SUMMARIZATION_BATCH_SIZE) -> List[str]:
+        with self.lease():
+            model = self.get()
+            before = getattr(model, "fallbacks", 0)
+            summaries = model.summarize_batch(texts, num_points, batch_size)
+            with self._lock:
+                if getattr(model, "backend", self.backend) != self.backend:
+                    # Not what the cache key says (the configured backend failed)
+                    self._fallbacks += len(texts)
+                else:
+                    self._fallbacks += getattr(model, "fallbacks", 0) - before
+            return summaries
+
+    def _standalone_tokenizer(self) -> Any:
+        with self._lock:
+            if not self._tokenizer_loaded:
+                self._tokenizer_loaded = True
+                try:
+                    self._tokenizer = load_tokenizer(self.model_name)
+                except Exception as e:
+                    logger.warning(f"Summarization tokenizer unavailable: {e}")
+            return self._tokenizer
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        model = self._model
+        if model is not None:
+            return model.count_tokens(texts)
+        return tokenizer_counts(self._standalone_tokenizer(), texts)
+
+    @property
+    def max_input_tokens(self) -> int:
+        model = self._model
+        if model is not None:
+            return model.max_input_tokens
+        return input_token_limit(self._standalone_tokenizer())
+
+    @property
+    def fallbacks(self) -> int:
+        return self._fallbacks
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "loaded": self.loaded,
+                    "idle_unload_seconds": self.idle_unload_seconds}
+
+
+# Process-wide handle; nothing is loaded until first use
+summarizer = LazySummaryModel()
+
+
+def get_summarizer() -> LazySummaryModel:
+    """Get the process-wide lazily loaded summarizer."""
+    return summarizer
 
 def parse_scc(file_path: str) -> List[Dict]:
     """
@@ -145,191 +419,173 @@ def parse_scc(file_path: str) -> List[Dict]:
     Returns:
         List of dictionaries with segment information
     """
-    segments = []
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split into lines and process
-        lines = content.strip().split('\n')
-        current_segment = None
-        segment_index = 1
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and header
-            if not line or line.startswith('Scenarist_SCC'):
-                continue
-            
-            # Check if line contains a timestamp
-            if re.match(r'\d{2}:\d{2}:\d{2}[:;]\d{2}', line):
-                # Extract timestamp and hex data
-                parts = line.split('\t', 1)
-                if len(parts) >= 2:
-                    timestamp = parts[0]
-                    hex_data = parts[1]
-                    
-                    # Extract readable text from hex data
-                    text = extract_text_from_hex(hex_data)
-                    
-                    if text and text.strip():
-                        # Parse SMPTE timestamp to seconds
-                        start_seconds = parse_smpte_timestamp(timestamp)
-                        
-                        # Create new segment
-                        segments.append({
-                            "index": str(segment_index),
-                            "start": start_seconds,
-                            "end": start_seconds + 3.0,  # Default 3 second duration
-                            "time": timestamp,
-                            "text": text.strip()
-                        })
-                        segment_index += 1
-        
+        segments = load_scc(file_path).to_dicts()
         logger.info(f"Parsed {len(segments)} segments from SCC file")
         return segments
-        
     except Exception as e:
         logger.error(f"Error parsing SCC file {file_path}: {e}")
         return []
 
-def parse_smpte_timestamp(timestamp: str) -> float:
+
+def extract_text_from_hex(hex_data: str) -> str:
     """
-    Parse SMPTE timestamp (HH:MM:SS;FF or HH:MM:SS:FF) to seconds.
+    Extract readable text from SCC hexadecimal data.
     
     Args:
-        timestamp: SMPTE timestamp string
+        hex_data: Hexadecimal string from SCC file
         
     Returns:
-        Time in seconds
+        Extracted text string
     """
-    try:
-        # Handle both semicolon and colon separators
-        if ';' in timestamp:
-            time_part, frames = timestamp.split(';')
-        elif ':' in timestamp and timestamp.count(':') == 3:
-            parts = timestamp.split(':')
-            time_part = ':'.join(parts[:3])
-            frames = parts[3]
-        else:
-            # No frames, treat as regular time
-            time_part = timestamp
-            frames = '0'
-        
-        # Parse time components
-        hours, minutes, seconds = map(int, time_part.split(':'))
-        frame_num = int(frames)
-        
-        # Convert to total seconds (assume 29.97 fps)
-        total_seconds = hours * 3600 + minutes * 60 + seconds + (frame_num / 29.97)
-        
-        return total_seconds
-        
-    except Exception as e:
-        logger.error(f"Error parsing SMPTE timestamp {timestamp}: {e}")
-        return 0.0
+    return decode_hex(hex_data)
 
-def extract_text_from_hex(hex_data: str) -> str:
+
+def _reduce_summaries(model, texts: List[str], budget: int, batch_size: int) -> str:
+    """Summarize summaries level by level until one meeting-level summary remains."""
+    while len(texts) > 1:
+        groups = token_budget_chunks(model.count_tokens(texts), budget)
+        if len(groups) == len(texts):
+            # No two summaries fit together; settle for one truncated pass
+            groups = [(0, len(texts))]
+        texts = summary_cache.summarize_batch(
+            model,
+            [" ".join(texts[a:b]) for a, b in groups],
+            num_points=3,
+            batch_size=batch_size,
+        )
+    return texts[0] if texts else ""
+
+
+def summarize_captions(
+    captions,
+    model=None,
+    map_reduce: bool = SUMMARIZATION_MAP_REDUCE,
+    batch_size: int = SUMMARIZATION_BATCH_SIZE,
+) -> Dict[str, Any]:
     """
-    Extract readable text from SCC hexadecimal data.
+    Summarize parsed captions into timestamped key points.
+
+    Captions are packed into chunks that fill the model's input window
+    (measured with its tokenizer) and the chunks are summarized in batches.
+    With ``map_reduce`` the chunk summaries are summarized again into an
+    ``overview`` of the whole meeting.
     
     Args:
-        hex_data: Hexadecimal string from SCC file
+        captions: ``SccCaptions`` from ``load_scc``
+        model: Summarizer to use (defaults to the process-wide lazy model)
+        map_reduce: Also produce a meeting-level ``overview``
+        batch_size: Chunks per forward pass
         
     Returns:
-        Extracted text string
+        ``{"summary": [...], "overview": str (map-reduce only), "generation": {...}}``
     """
-    # CEA-608 hex to character mapping (basic implementation)
-    hex_to_char = {
-        '20': ' ', '21': '!', '22': '"', '23': '#', '24': '$', '25': '%', '26': '&', '27': "'",
-        '28': '(', '29': ')', '2A': '*', '2B': '+', '2C': ',', '2D': '-', '2E': '.', '2F': '/',
-        '30': '0', '31': '1', '32': '2', '33': '3', '34': '4', '35': '5', '36': '6', '37': '7',
-        '38': '8', '39': '9', '3A': ':', '3B': ';', '3C': '<', '3D': '=', '3E': '>', '3F': '?',
-        '40': '@', '41': 'A', '42': 'B', '43': 'C', '44': 'D', '45': 'E', '46': 'F', '47': 'G',
-        '48': 'H', '49': 'I', '4A': 'J', '4B': 'K', '4C': 'L', '4D': 'M', '4E': 'N', '4F': 'O',
-        '50': 'P', '51': 'Q', '52': 'R', '53': 'S', '54': 'T', '55': 'U', '56': 'V', '57': 'W',
-        '58': 'X', '59': 'Y', '5A': 'Z', '5B': '[', '5C': '\\', '5D': ']', '5E': '^', '5F': '_',
-        '60': '`', '61': 'a', '62': 'b', '63': 'c', '64': 'd', '65': 'e', '66': 'f', '67': 'g',
-        '68': 'h', '69': 'i', '6A': 'j', '6B': 'k', '6C': 'l', '6D': 'm', '6E': 'n', '6F': 'o',
-        '70': 'p', '71': 'q', '72': 'r', '73': 's', '74': 't', '75': 'u', '76': 'v', '77': 'w',
-        '78': 'x', '79': 'y', '7A': 'z', '7B': '{', '7C': '|', '7D': '}', '7E': '~'
+    model = model or summarizer
+    if isinstance(model, LazySummaryModel):
+        # One lease for the meeting: no idle unload between the chunk batches
+        with model.lease():
+            return _summarize_captions(captions, model, map_reduce, batch_size)
+    return _summarize_captions(captions, model, map_reduce, batch_size)
+
+
+def _summarize_captions(captions, model, map_reduce: bool,
+                        batch_size: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    budget = model.max_input_tokens - SPECIAL_TOKEN_MARGIN
+    texts = [captions.text_at(i) for i in range(len(captions))]
+    chunks = [
+        (a, b) for a, b in token_budget_chunks(model.count_tokens(texts), budget)
+        if captions.joined_text(a, b).strip()
+    ]
+    chunk_summaries = summary_cache.summarize_batch(
+        model,
+        [captions.joined_text(a, b) for a, b in chunks],
+        num_points=1,
+        batch_size=batch_size,
+    )
+    map_seconds = time.perf_counter() - started
+
+    result: Dict[str, Any] = {
+        "summary": [
+            {
+                "speaker": "Unknown",  # Optional: add speaker ID logic
+                "start": seconds_to_timecode(captions.starts[a]),
+                "text": text,
+            }
+            for (a, _b), text in zip(chunks, chunk_summaries)
+        ]
     }
-    
-    # Skip control codes and extract text
-    control_codes = {'94ae', '9420', '942c', '942f', '8080', '947a', '94f2', '9452', '97a2'}
-    
-    text_parts = []
-    hex_words = hex_data.split()
-    
-    for hex_word in hex_words:
-        if hex_word.lower() in control_codes:
-            continue
-            
-        # Process word in pairs of hex characters
-        for i in range(0, len(hex_word), 2):
-            if i + 1 < len(hex_word):
-                hex_char = hex_word[i:i+2].upper()
-                if hex_char in hex_to_char:
-                    text_parts.append(hex_to_char[hex_char])
-    
-    return ''.join(text_parts)
+    if map_reduce and chunk_summaries:
+        result["overview"] = _reduce_summaries(
+            model, list(chunk_summaries), budget, batch_size
+        )
+
+    seconds = time.perf_counter() - started
+    result["generation"] = {
+        "mode": "abstractive",
+        "model": getattr(model, "model_name", SUMMARIZATION_MODEL),
+        "backend": getattr(model, "backend", None),
+        "chunks": len(chunks),
+        "max_input_tokens": budget + SPECIAL_TOKEN_MARGIN,
+        "batch_size": batch_size,
+        "map_reduce": bool(map_reduce),
+        "chunks_per_second": (
+            round(len(chunks) / map_seconds, 2) if map_seconds else 0.0
+        ),
+        "seconds": round(seconds, 3),
+    }
+    return result
 
-def summarize_scc(scc_path: str) -> str:
+
+def summarize_scc(scc_path: str, map_reduce: Optional[bool] = None,
+                  mode: Optional[str] = None) -> str:
     """
     Summarize an SCC (Scenarist Closed Caption) file.
     
     Args:
         scc_path: Path to the SCC file
+        map_reduce: Add a meeting-level overview (default ``SUMMARIZATION_MAP_REDUCE``)
+        mode: ``"abstractive"`` or ``"extractive"`` (default ``SUMMARIZATION_MODE``)
         
     Returns:
         Path to the generated summary file
     """
     try:
         logger.info(f"Starting summarization of SCC file: {scc_path}")
-        
+
         # Parse SCC file
-        segments = parse_scc(scc_path)
-        
-        if not segments:
+        captions = load_scc(scc_path)
+
+        if not len(captions):
             logger.warning(f"No segments found in SCC file: {scc_path}")
             return None
-        
-        summary = []
-        
-        # Group segments into chunks for better context
-        chunk_size = SUMMARIZATION_CHUNK_SIZE
-        for i in range(0, len(segments), chunk_size):
-            chunk = segments[i:i + chunk_size]
-            combined_text = " ".join(seg["text"] for seg in chunk)
-            
-            # Skip empty chunks
-            if not combined_text.strip():
-                continue
-            
-            # Get timestamp of first segment in chunk
-            start_time = chunk[0]["time"]
-            
-            # Generate summary for this chunk
-            chunk_summary = summarizer.summarize_text(combined_text, num_points=1)
-            
-            summary.append({
-                "speaker": "Unknown",  # Optional: add speaker ID logic
-                "start": start_time,
-                "text": chunk_summary
-            })
-        
+
+        map_reduce = SUMMARIZATION_MAP_REDUCE if map_reduce is None else map_reduce
+        if (mode or SUMMARIZATION_MODE) == "extractive":
+            # Imported here so abstractive-only processes skip scipy
+            from core import extractive_summarizer
+
+            result = extractive_summarizer.summarize_captions(
+                captions, map_reduce=map_reduce
+            )
+        else:
+            result = summarize_captions(captions, map_reduce=map_reduce)
+        stats = result["generation"]
+        logger.info(
+            f"Summarized {stats['chunks']} chunks in {stats['seconds']:.1f}s "
+            f"({stats['chunks_per_second']} chunks/s, {stats['mode']})"
+        )
+
         # Create output file path
         summary_path = scc_path.replace(".scc", "_minutes.json")
-        
+
         # Save summary
         with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump({"summary": summary}, f, indent=2)
-        
+            json.dump(result, f, indent=2)
+
         logger.info(f"Summary saved to: {summary_path}")
         return summary_path
-        
+
     except Exception as e:
         logger.error(f"Error summarizing SCC file {scc_path}: {e}")
         return None
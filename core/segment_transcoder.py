@@ -0,0 +1,440 @@
+"""Segment-parallel ffmpeg transcoding for caption burn-in and quality variants.
+
+When a re-encode cannot be avoided (a target that needs burned-in captions,
+or a lower rung of the VOD quality ladder), one ffmpeg process for a
+multi-hour meeting uses a few cores for hours.  This engine splits the
+source at keyframes into segments, encodes the video of each segment in a
+bounded pool of ffmpeg processes, and joins them losslessly with the concat
+demuxer while stream-copying the original audio in the same pass.
+
+Captions are burned in per segment from an SRT shifted to the segment's
+start, so every segment renders exactly the captions on screen during it.
+
+Key Features:
+- Keyframe-aligned split points (no duplicated or dropped frames)
+- Pool size leased from the host CPU budget shared with transcription
+  (``core.cpu_budget``)
+- ``VOD_QUALITY_LOW/MEDIUM/HIGH/ORIGINAL`` encoding profiles
+- Falls back to the single-process path for short files or sources without
+  usable keyframes
+- Progress of all segments summed into one Celery ``PROGRESS`` state, and
+  cooperative cancellation, through ``core.ffmpeg_runner``
+- Benchmark against the single-process path: ``scripts/benchmarks/bench_transcode.py``
+
+Example:
+    >>> from core.segment_transcoder import transcode
+    >>> transcode("council.mp4", "council_low.mp4", quality=VOD_QUALITY_LOW)["speed"]
+    11.4
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from core.caption_sink import SrtWriter
+from core.config import (
+    CAPTION_BURN_IN_TIMEOUT,
+    TRANSCODE_SEGMENT_MIN_SECONDS,
+    TRANSCODE_SEGMENT_THREADS,
+    TRANSCODE_SEGMENTS_PER_WORKER,
+    VOD_QUALITY_HIGH,
+    VOD_QUALITY_LOW,
+    VOD_QUALITY_MEDIUM,
+    VOD_QUALITY_ORIGINAL,
+)
+from core.cpu_budget import get_cpu_budget
+from core.exceptions import VODError
+from core.ffmpeg_runner import FfmpegJob, run_ffmpeg
+from core.media_probe import media_duration
+from core.monitoring.metrics import record_metric
+
+Caption = Tuple[float, float, str]
+
+# Encoding profile per VOD quality level; height None keeps the source size
+QUALITY_PROFILES: Dict[int, Dict[str, Any]] = {
+    VOD_QUALITY_LOW: {"name": "low", "height": 480, "crf": 28, "preset": "veryfast"},
+    VOD_QUALITY_MEDIUM: {
+        "name": "medium",
+        "height": 720,
+        "crf": 23,
+        "preset": "medium",
+    },
+    VOD_QUALITY_HIGH: {"name": "high", "height": 1080, "crf": 20, "preset": "medium"},
+    VOD_QUALITY_ORIGINAL: {
+        "name": "original",
+        "height": None,
+        "crf": 23,
+        "preset": "medium",
+    },
+}
+
+
+def _ffprobe(args: List[str], path: str) -> str:
+    try:
+        result = subprocess.run(["ffprobe", "-v", "error", *args, path],
+                                capture_output=True, text=True, timeout=300)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise VODError(f"ffprobe failed for {path}: {e}")
+    if result.returncode != 0:
+        raise VODError(f"ffprobe failed for {path}: {result.stderr.strip()[-500:]}")
+    return result.stdout
+
+
+def keyframe_times(path: str) -> List[float]:
+    """Presentation times of the video keyframes, from packet flags (no decoding)."""
+    out = _ffprobe(["-select_streams", "v:0", "-show_entries", "packet=pts_time,flags",
+                    "-of", "csv=p=0"], path)
+    times = []
+    for line in out.splitlines():
+        pts, _sep, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                times.append(float(pts))
+            except ValueError:
+                continue
+    return sorted(set(times))
+
+
+def plan_segments(
+    keyframes: Sequence[float],
+    duration: float,
+    count: int,
+    min_seconds: float = TRANSCODE_SEGMENT_MIN_SECONDS,
+) -> List[Tuple[float, float]]:
+    """Split ``[0, duration)`` into up to ``count`` ranges starting at keyframes.
+
+    Each split is the keyframe nearest an even division point; splits closer
+    than ``min_seconds`` to the previous one (or to the end) are dropped.
+    """
+    count = max(1, min(count, int(duration // max(min_seconds, 1e-6)) or 1))
+    splits: List[float] = []
+    candidates = [k for k in keyframes if 0 < k < duration]
+    for i in range(1, count):
+        target = duration * i / count
+        if not candidates:
+            break
+        best = min(candidates, key=lambda k: abs(k - target))
+        previous = splits[-1] if splits else 0.0
+        if best - previous >= min_seconds and duration - best >= min_seconds:
+            splits.append(best)
+    bounds = [0.0, *splits, duration]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def write_shifted_srt(
+    captions: Sequence[Caption], start: float, end: float, path: str
+) -> int:
+    """Write the captions visible in ``[start, end)`` re-timed to start at 0."""
+    writer = SrtWriter()
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for cue_start, cue_end, text in captions:
+            if cue_end <= start or cue_start >= end:
+                continue
+            written += 1
+            f.write(
+                writer.format(
+                    {
+                        "start": max(cue_start, start) - start,
+                        "end": min(cue_end, end) - start,
+                        "text": text,
+                    },
+                    written,
+                )
+            )
+    return written
+
+
+def _subtitle_file(
+    captions: Sequence[Caption], start: float, end: float, path: str
+) -> Optional[str]:
+    # The subtitles filter rejects an empty SRT; caption-free segments skip it
+    return path if write_shifted_srt(captions, start, end, path) else None
+
+
+def filter_path(path: str) -> str:
+    """Quote a path for use as a filtergraph option value."""
+    return "'" + path.replace("\\", "/").replace(":", "\\:").replace("'", "'\\''") + "'"
+
+
+def video_filters(profile: Dict[str, Any], subtitle_path: Optional[str]) -> List[str]:
+    filters = []
+    if profile.get("height"):
+        # Never upscale; keep the width even for yuv420p
+        filters.append(f"scale=-2:'min({profile['height']},ih)'")
+    if subtitle_path:
+        filters.append(f"subtitles=filename={filter_path(subtitle_path)}")
+    return filters
+
+
+def _encoder_args(profile: Dict[str, Any], threads: Optional[int]) -> List[str]:
+    args = [
+        "-c:v",
+        "libx264",
+        "-preset",
+        profile["preset"],
+        "-crf",
+        str(profile["crf"]),
+        "-pix_fmt",
+        "yuv420p",
+    ]
+    if threads:
+        args += ["-threads", str(threads)]
+    return args
+
+
+def segment_command(
+    source: str,
+    start: float,
+    end: float,
+    output: str,
+    profile: Dict[str, Any],
+    subtitle_path: Optional[str] = None,
+    threads: int = TRANSCODE_SEGMENT_THREADS,
+) -> List[str]:
+    """ffmpeg argv encoding the video of ``[start, end)`` (audio is muxed at concat)."""
+    cmd = ["ffmpeg", "-hide_banner", "-nostdin", "-ss", f"{start:.6f}", "-i", source,
+           "-t", f"{end - start:.6f}", "-map", "0:v:0", "-an", "-sn"]
+    filters = video_filters(profile, subtitle_path)
+    if filters:
+        cmd += ["-vf", ",".join(filters)]
+    return cmd + _encoder_args(profile, threads) + ["-y", output]
+
+
+def concat_command(list_path: str, source: str, output: str) -> List[str]:
+    """Join encoded segments losslessly and stream-copy the source audio alongside."""
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostdin",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        list_path,
+        "-i",
+        source,
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a?",
+        "-c",
+        "copy",
+        "-movflags",
+        "+faststart",
+        "-y",
+        output,
+    ]
+
+
+def single_command(source: str, output: str, profile: Dict[str, Any],
+                   subtitle_path: Optional[str] = None) -> List[str]:
+    """The one-process path: whole file through one ffmpeg, audio copied."""
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostdin",
+        "-i",
+        source,
+        "-map",
+        "0:v:0",
+        "-map",
+        "0:a?",
+    ]
+    filters = video_filters(profile, subtitle_path)
+    if filters:
+        cmd += ["-vf", ",".join(filters)]
+    return (
+        cmd
+        + _encoder_args(profile, None)
+        + ["-c:a", "copy", "-movflags", "+faststart", "-y", output]
+    )
+
+
+def quality_profile(quality: Optional[int]) -> Dict[str, Any]:
+    if quality is None:
+        return QUALITY_PROFILES[VOD_QUALITY_ORIGINAL]
+    try:
+        return QUALITY_PROFILES[quality]
+    except KeyError:
+        raise ValueError(f"Unknown VOD quality level: {quality}") from None
+
+
+def transcode(
+    source: str,
+    output: str,
+    quality: Optional[int] = None,
+    captions: Optional[Sequence[Caption]] = None,
+    workers: Optional[int] = None,
+    segmented: bool = True,
+    timeout: int = CAPTION_BURN_IN_TIMEOUT,
+    job: Optional[FfmpegJob] = None,
+) -> Dict[str, Any]:
+    """Re-encode ``source`` to ``output`` at ``quality``, burning in any ``captions``.
+
+    ``workers`` caps the ffmpeg pool (default: as many as the CPU budget
+    grants at ``TRANSCODE_SEGMENT_THREADS`` cores each).  ``segmented=False``
+    forces the single-process path.  ``job`` collects progress and carries
+    cancellation (default: a new job for the calling Celery task).  Raises
+    ``VODError`` on failure, ``FfmpegCancelled`` when cancelled.
+    """
+    profile = quality_profile(quality)
+    started = time.monotonic()
+    record_metric("increment", "video_retranscode_total")
+    duration = media_duration(source)
+    if not duration:
+        raise VODError(f"Cannot read the duration of {source}")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    if job is None:
+        job = FfmpegJob(duration, label=f"transcode {profile['name']}")
+    elif not job.total_seconds:
+        job.total_seconds = duration
+    budget = get_cpu_budget()
+    threads = max(1, TRANSCODE_SEGMENT_THREADS)
+    wanted_slots = (workers * threads) if workers else budget.slots
+
+    workdir = tempfile.mkdtemp(
+        prefix="transcode_", dir=os.path.dirname(os.path.abspath(output))
+    )
+    try:
+        with budget.lease(
+            wanted_slots, minimum=threads, owner=f"transcode {os.path.basename(source)}"
+        ) as slots:
+            pool_size = max(1, slots // threads)
+            ranges: List[Tuple[float, float]] = [(0.0, duration)]
+            if (
+                segmented
+                and pool_size > 1
+                and duration >= 2 * TRANSCODE_SEGMENT_MIN_SECONDS
+            ):
+                ranges = plan_segments(
+                    keyframe_times(source),
+                    duration,
+                    pool_size * max(1, TRANSCODE_SEGMENTS_PER_WORKER),
+                )
+
+            if len(ranges) == 1:
+                subtitle = None
+                if captions:
+                    subtitle = _subtitle_file(captions, 0.0, math.inf,
+                                              os.path.join(workdir, "captions.srt"))
+                logger.info(
+                    f"Transcoding {source} ({profile['name']}) in one ffmpeg process"
+                )
+                run_ffmpeg(
+                    single_command(source, output, profile, subtitle), timeout, job
+                )
+                mode, pool_size = "single", 1
+            else:
+                _encode_segments(source, output, ranges, profile, captions, workdir,
+                                 min(pool_size, len(ranges)), threads, timeout, job)
+                mode = "segmented"
+    except Exception:
+        if os.path.exists(output):
+            os.remove(output)
+        record_metric("increment", "video_retranscode_failed")
+        raise
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    seconds = time.monotonic() - started
+    record_metric("increment", "video_retranscode_success")
+    record_metric("timer", "retranscode_duration", seconds)
+    result = {
+        "output_path": output,
+        "mode": mode,
+        "quality": profile["name"],
+        "segments": len(ranges),
+        "workers": pool_size,
+        "duration": duration,
+        "seconds": round(seconds, 2),
+        "speed": round(duration / seconds, 2) if seconds else None,
+    }
+    logger.info(f"Transcoded {source} -> {output}: {mode}, {len(ranges)} segment(s), "
+                f"{pool_size} worker(s), {result['speed']}x realtime")
+    return result
+
+
+def _encode_segments(
+    source: str,
+    output: str,
+    ranges: Sequence[Tuple[float, float]],
+    profile: Dict[str, Any],
+    captions: Optional[Sequence[Caption]],
+    workdir: str,
+    pool_size: int,
+    threads: int,
+    timeout: int,
+    job: FfmpegJob,
+) -> None:
+    logger.info(f"Transcoding {source} ({profile['name']}) as {len(ranges)} segments "
+                f"across {pool_size} ffmpeg processes")
+    commands = []
+    for index, (start, end) in enumerate(ranges):
+        subtitle = None
+        if captions:
+            subtitle = _subtitle_file(
+                captions, start, end, os.path.join(workdir, f"captions_{index:04d}.srt")
+            )
+        segment = os.path.join(workdir, f"segment_{index:04d}.mp4")
+        commands.append((segment, segment_command(source, start, end, segment, profile,
+                                                  subtitle, threads)))
+
+    with ThreadPoolExecutor(
+        max_workers=pool_size, thread_name_prefix="transcode"
+    ) as pool:
+        futures = [pool.submit(run_ffmpeg, cmd, timeout, job, index)
+                   for index, (_segment, cmd) in enumerate(commands)]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            # Stop the segments still encoding: their output is discarded anyway
+            job.cancel()
+            raise
+
+    list_path = os.path.join(workdir, "segments.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for segment, _cmd in commands:
+            f.write("file '" + segment.replace("'", "'\\''") + "'\n")
+    # The concat pass remuxes media the segments already counted
+    run_ffmpeg(concat_command(list_path, source, output), timeout, job, part=None)
+
+
+def transcode_ladder(
+    source: str,
+    output_base: str,
+    qualities: Sequence[int],
+    captions: Optional[Sequence[Caption]] = None,
+) -> List[Dict[str, Any]]:
+    """Encode one variant per quality level as ``<output_base>_<name>.mp4``."""
+    return [
+        transcode(source, f"{output_base}_{quality_profile(q)['name']}.mp4", quality=q,
+                  captions=captions)
+        for q in qualities
+    ]
+
+
+__all__ = [
+    "QUALITY_PROFILES",
+    "keyframe_times",
+    "plan_segments",
+    "segment_command",
+    "concat_command",
+    "single_command",
+    "transcode",
+    "transcode_ladder",
+    "write_shifted_srt",
+]
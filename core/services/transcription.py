@@ -18,22 +18,33 @@ Example:
 """
 
 import os
-import glob
+import sqlite3
 from typing import Dict, Optional, List
 from loguru import logger
 from core.exceptions import TranscriptionError, handle_transcription_error
 from core.transcription import _transcribe_with_faster_whisper
 from core.scc_summarizer import summarize_scc
-from core.config import WHISPER_MODEL, USE_GPU, LANGUAGE, OUTPUT_DIR, MEMBER_CITIES
+from core.transcription_cache import (
+    get_transcription_cache,
+    materialize_cached_captions,
+)
+from core.summary_cache import get_summary_cache
+from core.media_catalog import get_media_catalog
+from core.config import (
+    WHISPER_MODEL, USE_GPU, LANGUAGE, MEMBER_CITIES,
+    SPEECH_PRESCREEN_ENABLED, SPEECH_PRESCREEN_RANK_LIMIT,
+)
+from core.speech_prescreen import rank_by_speech
+
 
 class TranscriptionService:
     """Service for handling transcription operations with surface-level flex server support."""
-    
+
     def __init__(self):
         self.model = WHISPER_MODEL
         self.use_gpu = USE_GPU
         self.language = LANGUAGE
-    
+
     def discover_video_files(self, flex_server_id: Optional[str] = None, 
                            file_pattern: str = "*.mp4") -> List[Dict]:
         """Discover video files on flex servers (surface-level E: drive structure).
@@ -46,59 +57,67 @@ class TranscriptionService:
             List of dictionaries containing file information
         """
         discovered_files = []
-        
+
         # Determine which flex servers to scan
         if flex_server_id:
             servers_to_scan = {flex_server_id: MEMBER_CITIES[flex_server_id]}
         else:
             servers_to_scan = MEMBER_CITIES
-        
+
         for server_id, server_config in servers_to_scan.items():
             mount_path = server_config['mount_path']
             city_name = server_config['name']
-            
+
             logger.info(f"Scanning {city_name} ({server_id}) at {mount_path}")
-            
+
             if not os.path.ismount(mount_path):
                 logger.warning(f"Flex server {server_id} not mounted at {mount_path}")
                 continue
-            
+
             if not os.access(mount_path, os.R_OK):
                 logger.warning(f"Flex server {server_id} not readable at {mount_path}")
                 continue
-            
+
             try:
-                # Surface-level file discovery (E: drive structure)
-                # Search directly in the mount root, not in subdirectories
-                pattern = os.path.join(mount_path, file_pattern)
-                video_files = glob.glob(pattern)
-                
-                for video_file in video_files:
-                    if os.path.isfile(video_file) and os.path.getsize(video_file) > 1024*1024:  # > 1MB
-                        file_info = {
-                            'file_path': video_file,
-                            'file_name': os.path.basename(video_file),
-                            'file_size': os.path.getsize(video_file),
-                            'modified_time': os.path.getmtime(video_file),
-                            'flex_server': server_id,
-                            'city_name': city_name,
-                            'mount_path': mount_path,
-                            'relative_path': os.path.relpath(video_file, mount_path)
-                        }
-                        discovered_files.append(file_info)
-                        logger.debug(f"Found video: {file_info['file_name']} ({file_info['file_size']} bytes)")
-                
+                # Surface-level file discovery (E: drive structure) from the
+                # media catalog, refreshed incrementally if stale
+                catalog = get_media_catalog()
+                catalog.ensure_fresh(roots={server_id: mount_path})
+                video_files = catalog.list_files(
+                    city=server_id,
+                    max_depth=0,
+                    pattern=file_pattern,
+                    min_size=1024 * 1024 + 1,
+                )
+
+                for entry in video_files:
+                    file_info = {
+                        'file_path': entry['path'],
+                        'file_name': entry['name'],
+                        'file_size': entry['size'],
+                        'modified_time': entry['mtime'],
+                        'flex_server': server_id,
+                        'city_name': city_name,
+                        'mount_path': mount_path,
+                        'relative_path': os.path.relpath(entry['path'], mount_path)
+                    }
+                    discovered_files.append(file_info)
+                    logger.debug(
+                        f"Found video: {file_info['file_name']} "
+                        f"({file_info['file_size']} bytes)"
+                    )
+
                 logger.info(f"Found {len(video_files)} video files on {city_name}")
-                
+
             except Exception as e:
                 logger.error(f"Error scanning {city_name} ({server_id}): {e}")
-        
+
         # Sort by modification time (newest first)
         discovered_files.sort(key=lambda x: x['modified_time'], reverse=True)
-        
+
         logger.info(f"Total video files discovered: {len(discovered_files)}")
         return discovered_files
-    
+
     def find_untranscribed_videos(self, flex_server_id: Optional[str] = None) -> List[Dict]:
         """Find video files that don't have corresponding SCC transcription files.
         
@@ -110,75 +129,84 @@ class TranscriptionService:
         """
         all_videos = self.discover_video_files(flex_server_id)
         untranscribed = []
-        
+
         for video_info in all_videos:
             video_path = video_info['file_path']
             base_name = os.path.splitext(video_info['file_name'])[0]
             mount_path = video_info['mount_path']
-            
-            # Check for existing SCC file (surface-level)
+
+            # Check for existing SCC file (surface-level), then for identical
+            # content already transcribed under another name or mount
             scc_path = os.path.join(mount_path, f"{base_name}.scc")
-            
-            if not os.path.exists(scc_path):
+
+            if os.path.exists(scc_path):
+                logger.debug(f"Already transcribed: {video_info['file_name']}")
+            elif materialize_cached_captions(video_path, scc_path):
+                logger.debug(f"Captions reused from cache: {video_info['file_name']}")
+            else:
                 video_info['scc_path'] = scc_path
                 video_info['needs_transcription'] = True
                 untranscribed.append(video_info)
                 logger.debug(f"Needs transcription: {video_info['file_name']}")
-            else:
-                logger.debug(f"Already transcribed: {video_info['file_name']}")
-        
+
         logger.info(f"Found {len(untranscribed)} videos needing transcription")
         return untranscribed
 
     def pick_newest_uncaptioned(self, max_per_city: int = 1, scan_limit: int = 50) -> Dict[str, List[str]]:
         """Pick newest uncaptioned videos per city (surface-level), newest-first.
 
+        With the speech pre-screen enabled the newest candidates are ranked by
+        speech ratio (newest first within a ratio band) and files with no
+        speech go last; they are only captioned as such and dropped when
+        ``SPEECH_PRESCREEN_SKIP_NO_SPEECH`` is set.
+
         Args:
             max_per_city: max items to pick per city
-            scan_limit: max files to scan per city before picking
+            scan_limit: max uncaptioned catalog entries considered per city
 
         Returns:
             Dict mapping city_id -> list of absolute video paths
         """
         picks: Dict[str, List[str]] = {}
+        catalog = get_media_catalog()
         # Iterate configured member cities; stay surface-level by design
         for city_id, cfg in MEMBER_CITIES.items():
             mount_path = cfg.get('mount_path')
-            if not mount_path or not os.path.isdir(mount_path):
+            # An unmounted mount point would empty the city's catalog entries
+            if not mount_path or not os.path.ismount(mount_path):
                 continue
-            # Discover surface-level videos newest-first
-            videos = []
+            # Newest uncaptioned surface-level videos from the media catalog
             try:
-                with os.scandir(mount_path) as it:
-                    for e in it:
-                        if not e.is_file():
-                            continue
-                        name = e.name.lower()
-                        if not (name.endswith('.mp4') or name.endswith('.mkv') or name.endswith('.mov') or name.endswith('.ts')):
-                            continue
-                        try:
-                            st = e.stat()
-                            videos.append((st.st_mtime, e.path))
-                        except OSError:
-                            continue
-            except PermissionError:
+                catalog.ensure_fresh(roots={city_id: mount_path})
+                entries = catalog.list_files(
+                    city=city_id,
+                    max_depth=0,
+                    extensions=('.mp4', '.mkv', '.mov', '.ts'),
+                    captioned=False,
+                    limit=scan_limit or None,
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Media catalog unavailable for {city_id}: {e}")
                 continue
-            videos.sort(reverse=True)
-            if scan_limit:
-                videos = videos[:scan_limit]
-            # Filter to uncaptioned
+            wanted = max_per_city + (
+                SPEECH_PRESCREEN_RANK_LIMIT if SPEECH_PRESCREEN_ENABLED else 0
+            )
             picked: List[str] = []
-            for _mtime, path in videos:
+            for entry in entries:
+                path = entry['path']
                 base, _ = os.path.splitext(path)
+                # The catalog may be up to a refresh behind; confirm on disk
                 if os.path.exists(base + '.scc'):
                     continue
                 picked.append(path)
-                if len(picked) >= max_per_city:
+                if len(picked) >= wanted:
                     break
+            if SPEECH_PRESCREEN_ENABLED:
+                picked = rank_by_speech(picked)[:max_per_city]
             if picked:
                 picks[city_id] = picked
         return picks
-    
+
     @handle_transcription_error
     def transcribe_file(self, file_path: str, output_dir: Optional[str] = None) -> Dict:
         """Transcribe a video/audio file using WhisperX, always producing SCC output.
@@ -192,17 +220,17 @@ class TranscriptionService:
         """
         if not os.path.exists(file_path):
             raise TranscriptionError(f"File not found: {file_path}")
-        
+
         logger.info(f"Starting transcription of {file_path}")
-        
+
         try:
             # Use the same directory as the video file for output (surface-level structure)
             if output_dir is None:
                 output_dir = os.path.dirname(file_path)
-            
+
             # Perform transcription
             result = _transcribe_with_faster_whisper(video_path=file_path)
-            
+
             return {
                 'output_path': result.get('output_path', ''),
                 'status': 'completed',
@@ -211,11 +239,11 @@ class TranscriptionService:
                 'model_used': result.get('model_used', self.model),
                 'language': result.get('language', self.language)
             }
-            
+
         except Exception as e:
             logger.error(f"Transcription failed for {file_path}: {e}")
             raise TranscriptionError(f"Transcription failed: {str(e)}")
-    
+
     @handle_transcription_error
     def transcribe_flex_server_videos(self, flex_server_id: str, limit: Optional[int] = None) -> Dict:
         """Transcribe all untranscribed videos on a specific flex server.
@@ -228,13 +256,13 @@ class TranscriptionService:
             Dictionary containing batch transcription results
         """
         logger.info(f"Starting batch transcription for flex server {flex_server_id}")
-        
+
         # Find untranscribed videos
         untranscribed = self.find_untranscribed_videos(flex_server_id)
-        
+
         if limit:
             untranscribed = untranscribed[:limit]
-        
+
         results = {
             'flex_server': flex_server_id,
             'total_videos': len(untranscribed),
@@ -243,13 +271,13 @@ class TranscriptionService:
             'results': [],
             'errors': []
         }
-        
+
         for video_info in untranscribed:
             try:
                 logger.info(f"Transcribing {video_info['file_name']}")
-                
+
                 result = self.transcribe_file(video_info['file_path'])
-                
+
                 results['results'].append({
                     'file_name': video_info['file_name'],
                     'file_path': video_info['file_path'],
@@ -257,50 +285,53 @@ class TranscriptionService:
                     'status': 'completed'
                 })
                 results['completed'] += 1
-                
+
                 logger.info(f"Completed transcription of {video_info['file_name']}")
-                
+
             except Exception as e:
                 error_msg = f"Failed to transcribe {video_info['file_name']}: {str(e)}"
                 logger.error(error_msg)
-                
+
                 results['errors'].append({
                     'file_name': video_info['file_name'],
                     'file_path': video_info['file_path'],
                     'error': error_msg
                 })
                 results['failed'] += 1
-        
+
         logger.info(f"Batch transcription completed: {results['completed']} successful, {results['failed']} failed")
         return results
-    
+
     @handle_transcription_error
-    def summarize_transcription(self, scc_path: str) -> Dict:
+    def summarize_transcription(
+        self, scc_path: str, mode: Optional[str] = None
+    ) -> Dict:
         """Summarize an SCC transcription file.
         
         Args:
             scc_path: Path to the SCC file
+            mode: ``"abstractive"`` or ``"extractive"`` (default ``SUMMARIZATION_MODE``)
             
         Returns:
             Dictionary containing summary results
         """
         if not os.path.exists(scc_path):
             raise TranscriptionError(f"SCC file not found: {scc_path}")
-        
+
         logger.info(f"Starting summarization of {scc_path}")
-        
+
         try:
-            summary_path = summarize_scc(scc_path)
+            summary_path = summarize_scc(scc_path, mode=mode)
             if summary_path:
                 logger.info(f"Summarization completed for {scc_path}")
                 return {'summary_path': summary_path, 'status': 'completed'}
             else:
                 raise TranscriptionError("Summarization failed to produce output file")
-            
+
         except Exception as e:
             logger.error(f"Summarization failed for {scc_path}: {e}")
             raise TranscriptionError(f"Summarization failed: {str(e)}")
-    
+
     @handle_transcription_error
     def create_captions(self, video_path: str, scc_path: str, output_path: Optional[str] = None) -> str:
         """Create captioned video from SCC file.
@@ -315,23 +346,23 @@ class TranscriptionService:
         """
         if not os.path.exists(video_path):
             raise TranscriptionError(f"Video file not found: {video_path}")
-        
+
         if not os.path.exists(scc_path):
             raise TranscriptionError(f"SCC file not found: {scc_path}")
-        
+
         logger.info(f"Creating captions for {video_path}")
-        
+
         try:
             # For now, return the original video path since captioning is not implemented
             # TODO: Implement actual captioning functionality
             captioned_path = output_path or video_path.replace('.mp4', '_captioned.mp4')
             logger.info(f"Caption creation placeholder: {captioned_path}")
             return captioned_path
-            
+
         except Exception as e:
             logger.error(f"Caption creation failed for {video_path}: {e}")
             raise TranscriptionError(f"Caption creation failed: {str(e)}")
-    
+
     @handle_transcription_error
     def process_video_pipeline(self, video_path: str, output_dir: Optional[str] = None) -> Dict:
         """Complete video processing pipeline: transcribe, summarize, and caption.
@@ -344,21 +375,21 @@ class TranscriptionService:
             Dictionary containing all processing results
         """
         logger.info(f"Starting complete pipeline for {video_path}")
-        
+
         try:
             # Step 1: Transcribe
             transcription_result = self.transcribe_file(video_path, output_dir)
             scc_path = transcription_result.get('output_path')
-            
+
             if not scc_path or not os.path.exists(scc_path):
                 raise TranscriptionError("Transcription failed to produce SCC file")
-            
+
             # Step 2: Summarize
             summary_result = self.summarize_transcription(scc_path)
-            
+
             # Step 3: Create captions
             captioned_path = self.create_captions(video_path, scc_path, output_dir)
-            
+
             # Combine results
             pipeline_result = {
                 'video_path': video_path,
@@ -367,14 +398,14 @@ class TranscriptionService:
                 'captioned_video': captioned_path,
                 'status': 'completed'
             }
-            
+
             logger.info(f"Pipeline completed for {video_path}")
             return pipeline_result
-            
+
         except Exception as e:
             logger.error(f"Pipeline failed for {video_path}: {e}")
             raise TranscriptionError(f"Processing pipeline failed: {str(e)}")
-    
+
     def get_transcription_status(self, file_path: str) -> Dict:
         """Get the status of a transcription job.
         
@@ -388,10 +419,10 @@ class TranscriptionService:
         # For now, we'll check if output files exist
         base_name = os.path.splitext(os.path.basename(file_path))[0]
         output_dir = os.path.dirname(file_path)
-        
+
         scc_path = os.path.join(output_dir, f"{base_name}.scc")
         summary_path = os.path.join(output_dir, f"{base_name}_summary.txt")
-        
+
         status = {
             'file_path': file_path,
             'transcription_exists': os.path.exists(scc_path),
@@ -399,5 +430,21 @@ class TranscriptionService:
             'scc_path': scc_path if os.path.exists(scc_path) else None,
             'summary_path': summary_path if os.path.exists(summary_path) else None
         }
+
+        return status
+
+    def get_result_cache_stats(self) -> Dict:
+        """Get hit/miss statistics of the content-addressed transcription cache.
         
-        return status 
\ No newline at end of file
+        Returns:
+            Dictionary with hits, misses, hit_rate and index size
+        """
+        return get_transcription_cache().get_stats()
+
+    def get_summary_cache_stats(self) -> Dict:
+        """Get hit/miss statistics of the chunk summary memo.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entry count
+        """
+        return get_summary_cache().get_stats()
@@ -0,0 +1,423 @@
+"""Speech-activity pre-screen over staged audio.
+
+Flex mounts hold recordings that are mostly test patterns, pre-meeting slates,
+bumpers or hours of room silence, and some contain no speech at all.  Each
+still cost a full Whisper model load and decode.  This module runs a cheap
+vectorised energy pass over the staged PCM first:
+
+- frames louder than an adaptive noise floor *and* showing syllabic level
+  modulation count as speech (steady tones and hum do not),
+- short gaps are bridged and isolated blips dropped,
+- the resulting intervals give a speech ratio and a decode plan that cuts
+  long leading, trailing and internal silences and maps timestamps back to
+  the source timeline.
+
+Key Features:
+- Files under ``SPEECH_PRESCREEN_MIN_RATIO`` rank last, and are captioned "no
+  speech" without Whisper only with ``SPEECH_PRESCREEN_SKIP_NO_SPEECH``
+- ``DecodePlan`` gathers only speech ranges and remaps segment times
+- Analyses persisted next to the staged PCM and evicted with it
+- ``rank_by_speech`` orders backfill/autopriority candidates by speech ratio,
+  from staged audio when present and otherwise from a few short samples
+
+Example:
+    >>> from core.speech_prescreen import get_speech_analysis, plan_decode
+    >>> analysis = get_speech_analysis("/mnt/flex-1/council.mp4")
+    >>> analysis.speech_ratio
+    0.62
+    >>> plan_decode(analysis).ranges[:2]
+    [(312.4, 1840.9), (1862.0, 5010.3)]
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from core.audio_cache import SAMPLE_RATE, to_float32
+from core.config import (
+    AUDIO_CACHE_ENABLED,
+    SPEECH_PRESCREEN_MIN_RATIO,
+    SPEECH_PRESCREEN_MIN_CUT_SECONDS,
+    SPEECH_PRESCREEN_PAD_SECONDS,
+    SPEECH_PRESCREEN_SAMPLE_COUNT,
+    SPEECH_PRESCREEN_SAMPLE_SECONDS,
+    SPEECH_PRESCREEN_SKIP_NO_SPEECH,
+)
+from core.monitoring.metrics import record_metric
+
+FRAME_SECONDS = 0.03
+# Bump when the detector changes so persisted analyses are recomputed
+ANALYSIS_VERSION = 1
+
+
+def frame_energies_db(
+    samples: np.ndarray,
+    frame_seconds: float = FRAME_SECONDS,
+    sample_rate: int = SAMPLE_RATE,
+    block_frames: int = 20000,
+) -> np.ndarray:
+    """Return per-frame RMS level in dBFS.
+
+    Works block-by-block so a memory-mapped multi-hour recording is never
+    fully materialised.
+    """
+    frame_len = max(1, int(frame_seconds * sample_rate))
+    n_frames = len(samples) // frame_len
+    out = np.empty(n_frames, dtype=np.float32)
+    for first in range(0, n_frames, block_frames):
+        last = min(n_frames, first + block_frames)
+        block = to_float32(np.asarray(samples[first * frame_len:last * frame_len]))
+        block = block.reshape(last - first, frame_len)
+        rms = np.sqrt(np.mean(block * block, axis=1))
+        out[first:last] = 20.0 * np.log10(rms + 1e-10)
+    return out
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(starts, ends)`` frame indices of the True runs in ``mask``."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return edges[0::2], edges[1::2]
+
+
+def _local_std(values: np.ndarray, width: int) -> np.ndarray:
+    """Centred moving standard deviation via cumulative sums."""
+    if width <= 1 or len(values) == 0:
+        return np.zeros(len(values), dtype=np.float32)
+    padded = np.pad(
+        values.astype(np.float64), (width // 2, width - 1 - width // 2), mode="edge"
+    )
+    c1 = np.concatenate(([0.0], np.cumsum(padded)))
+    c2 = np.concatenate(([0.0], np.cumsum(padded * padded)))
+    mean = (c1[width:] - c1[:-width]) / width
+    var = (c2[width:] - c2[:-width]) / width - mean * mean
+    return np.sqrt(np.maximum(var, 0.0)).astype(np.float32)
+
+
+def speech_mask(energies_db: np.ndarray, frame_seconds: float = FRAME_SECONDS,
+                margin_db: float = 12.0, floor_db: float = -55.0,
+                modulation_db: float = 2.0, modulation_seconds: float = 0.3,
+                max_gap: float = 0.3, min_speech: float = 0.25) -> np.ndarray:
+    """Classify frames as speech.
+
+    A frame is speech when it is ``margin_db`` above the recording's noise
+    floor (10th percentile, never below ``floor_db``) and the level varies by
+    at least ``modulation_db`` over ``modulation_seconds``; stationary test
+    tones and hum fail the second test.  Gaps up to ``max_gap`` are bridged,
+    then runs shorter than ``min_speech`` are dropped.
+    """
+    if len(energies_db) == 0:
+        return np.zeros(0, dtype=bool)
+    levels = np.maximum(energies_db, -100.0)
+    threshold = max(floor_db, float(np.percentile(levels, 10)) + margin_db)
+    width = max(1, int(round(modulation_seconds / frame_seconds)))
+    mask = (levels > threshold) & (_local_std(levels, width) >= modulation_db)
+
+    starts, ends = _runs(~mask)
+    short_gaps = (ends - starts) * frame_seconds <= max_gap
+    for s, e in zip(starts[short_gaps], ends[short_gaps]):
+        if s > 0 and e < len(mask):  # only bridge gaps with speech on both sides
+            mask[s:e] = True
+
+    starts, ends = _runs(mask)
+    for s, e in zip(starts, ends):
+        if (e - s) * frame_seconds < min_speech:
+            mask[s:e] = False
+    return mask
+
+
+@dataclass
+class SpeechAnalysis:
+    """Speech intervals (seconds) detected in one recording."""
+
+    duration: float
+    intervals: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.intervals)
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_seconds / self.duration if self.duration else 0.0
+
+    def has_speech(self, min_ratio: float = SPEECH_PRESCREEN_MIN_RATIO) -> bool:
+        return bool(self.intervals) and self.speech_ratio >= min_ratio
+
+    def speech_between(self, start: float, end: float) -> float:
+        """Seconds of speech inside ``[start, end)``."""
+        return sum(max(0.0, min(end, e) - max(start, s)) for s, e in self.intervals)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": ANALYSIS_VERSION,
+            "duration": self.duration,
+            "speech_ratio": self.speech_ratio,
+            "intervals": [[s, e] for s, e in self.intervals],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpeechAnalysis":
+        return cls(
+            float(data["duration"]),
+            [(float(s), float(e)) for s, e in data["intervals"]],
+        )
+
+
+def analyze_energies(energies_db: np.ndarray, duration: float,
+                     frame_seconds: float = FRAME_SECONDS) -> SpeechAnalysis:
+    """Build a ``SpeechAnalysis`` from precomputed frame energies."""
+    starts, ends = _runs(speech_mask(energies_db, frame_seconds))
+    intervals = [
+        (
+            round(float(s) * frame_seconds, 3),
+            round(min(duration, float(e) * frame_seconds), 3),
+        )
+        for s, e in zip(starts, ends)
+    ]
+    return SpeechAnalysis(duration, intervals)
+
+
+def analyze_samples(
+    samples: np.ndarray, sample_rate: int = SAMPLE_RATE
+) -> SpeechAnalysis:
+    """Run the pre-screen over a PCM array or memmap."""
+    energies = frame_energies_db(samples, sample_rate=sample_rate)
+    return analyze_energies(energies, len(samples) / sample_rate)
+
+
+@dataclass
+class DecodePlan:
+    """Source ranges to decode back-to-back, and the mapping back to source time."""
+
+    ranges: List[Tuple[float, float]]
+    source_duration: float
+
+    def __post_init__(self) -> None:
+        lengths = [end - start for start, end in self.ranges]
+        self._offsets = np.concatenate(([0.0], np.cumsum(lengths)))
+
+    @property
+    def decoded_duration(self) -> float:
+        return float(self._offsets[-1])
+
+    @property
+    def trimmed_seconds(self) -> float:
+        return self.source_duration - self.decoded_duration
+
+    @property
+    def is_contiguous(self) -> bool:
+        return len(self.ranges) <= 1
+
+    def to_source(self, t: float, end: bool = False) -> float:
+        """Map a time in the decoded audio back onto the source timeline.
+
+        A time exactly on a range boundary maps to the start of the next range,
+        or with ``end=True`` (segment end times) to the end of the previous one.
+        """
+        if not self.ranges:
+            return t
+        index = (
+            int(np.searchsorted(self._offsets, t, side="left" if end else "right")) - 1
+        )
+        index = min(max(index, 0), len(self.ranges) - 1)
+        start, end = self.ranges[index]
+        return min(end, start + (t - float(self._offsets[index])))
+
+    def gather(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+        """Return the planned ranges of ``samples`` as one float32 array."""
+        parts = [
+            samples[int(s * sample_rate):int(e * sample_rate)] for s, e in self.ranges
+        ]
+        if not parts:
+            return np.zeros(0, dtype=np.float32)
+        if len(parts) == 1 and parts[0].dtype == np.float32:
+            return parts[0]  # contiguous float32 slice of the memmap, no copy
+        return np.concatenate([to_float32(part) for part in parts])
+
+
+def plan_decode(analysis: SpeechAnalysis, start: float = 0.0,
+                pad: float = SPEECH_PRESCREEN_PAD_SECONDS,
+                min_cut: float = SPEECH_PRESCREEN_MIN_CUT_SECONDS) -> DecodePlan:
+    """Plan which source ranges to decode from ``start`` onwards.
+
+    Speech intervals are padded by ``pad``; silences shorter than ``min_cut``
+    stay in the decode so Whisper keeps its context.  When cutting would save
+    less than ``min_cut`` in total the whole range is decoded as-is.
+    """
+    duration = analysis.duration
+    full = DecodePlan([(start, duration)] if duration > start else [], duration)
+    merged: List[List[float]] = []
+    for s, e in analysis.intervals:
+        s, e = max(start, s - pad), min(duration, e + pad)
+        if e <= s:
+            continue
+        if merged and s - merged[-1][1] < min_cut:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    plan = DecodePlan([(s, e) for s, e in merged], duration)
+    if full.decoded_duration - plan.decoded_duration < min_cut:
+        return full
+    return plan
+
+
+def get_speech_analysis(
+    video_path: str, stage: bool = True
+) -> Optional[SpeechAnalysis]:
+    """Return the persisted analysis for ``video_path``, computing it if needed.
+
+    With ``stage=False`` only already-staged audio is considered, so the call
+    never triggers an ffmpeg extraction (analysing the memory-mapped PCM is
+    a vectorised pass).
+    """
+    if not AUDIO_CACHE_ENABLED:
+        return None
+    from core.audio_cache import get_audio_cache
+
+    cache = get_audio_cache()
+    staged = cache.get(video_path) if stage else cache.lookup(video_path)
+    if staged is None:
+        return None
+    sidecar = staged.sidecar(".speech.json")
+    try:
+        with open(sidecar) as f:
+            data = json.load(f)
+        if data.get("version") == ANALYSIS_VERSION:
+            return SpeechAnalysis.from_dict(data)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    analysis = analyze_samples(staged.samples, staged.sample_rate)
+    try:
+        with open(sidecar + ".part", "w") as f:
+            json.dump(analysis.to_dict(), f)
+        os.replace(sidecar + ".part", sidecar)
+    except OSError as e:
+        logger.debug(f"Could not persist speech analysis for {video_path}: {e}")
+    record_metric("histogram", "speech_prescreen_ratio", analysis.speech_ratio)
+    return analysis
+
+
+def mark_no_speech(video_path: str) -> bool:
+    """Write the "no speech" placeholder SCC so the file leaves the backlog."""
+    from core.transcription import _scc_path_for, _write_empty_scc
+
+    scc_path = _scc_path_for(video_path)
+    if os.path.exists(scc_path):
+        return False
+    try:
+        _write_empty_scc(scc_path)
+    except OSError as e:
+        logger.warning(f"Could not mark {video_path} as no speech: {e}")
+        return False
+    logger.info(f"No speech detected in {video_path}; wrote placeholder captions")
+    record_metric("increment", "speech_prescreen_no_speech")
+    return True
+
+
+# Sampled ratios per (path, size, mtime_ns); candidates repeat across passes
+_SAMPLED_RATIOS: "OrderedDict[Tuple[str, int, int], Optional[float]]" = OrderedDict()
+_SAMPLED_RATIOS_MAX = 1024
+
+
+def sample_speech_ratio(
+    video_path: str,
+    count: int = SPEECH_PRESCREEN_SAMPLE_COUNT,
+    seconds: float = SPEECH_PRESCREEN_SAMPLE_SECONDS,
+) -> Optional[float]:
+    """Estimate the speech ratio from ``count`` short samples spread over the file.
+
+    Each sample is a seeked ffmpeg decode of ``seconds`` of audio, so the cost
+    is bounded regardless of the recording's length and nothing is staged.
+    Returns ``None`` when the file cannot be probed or decoded.
+    """
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    key = (video_path, st.st_size, st.st_mtime_ns)
+    if key in _SAMPLED_RATIOS:
+        _SAMPLED_RATIOS.move_to_end(key)
+        return _SAMPLED_RATIOS[key]
+
+    from core.audio_cache import decode_pcm
+    from core.media_probe import media_duration
+
+    ratio: Optional[float] = None
+    try:
+        duration = media_duration(video_path)
+        if duration:
+            seconds = min(seconds, duration / max(1, count))
+            starts = [(i + 0.5) * duration / count - seconds / 2 for i in range(count)]
+            samples = np.concatenate(
+                [decode_pcm(video_path, start, seconds) for start in starts]
+            )
+            if len(samples):
+                ratio = analyze_samples(samples).speech_ratio
+    except Exception as e:
+        logger.debug(f"Speech sample failed for {video_path}: {e}")
+
+    _SAMPLED_RATIOS[key] = ratio
+    while len(_SAMPLED_RATIOS) > _SAMPLED_RATIOS_MAX:
+        _SAMPLED_RATIOS.popitem(last=False)
+    return ratio
+
+
+def rank_by_speech(
+    paths: Sequence[str], mark: bool = SPEECH_PRESCREEN_SKIP_NO_SPEECH
+) -> List[str]:
+    """Order candidate videos by speech ratio, files with no speech last.
+
+    ``paths`` should arrive in the caller's preferred order (usually newest
+    first); ratios are compared in 10% buckets so that order still breaks
+    ties.  Staged audio is analysed in full; other files are estimated with
+    ``sample_speech_ratio`` (never staged), and files that cannot be sampled
+    rank as if half speech.  With ``mark``, files whose full analysis finds
+    no speech are captioned as such and dropped; otherwise (and always for
+    sampled estimates) they stay queued, last, and are re-checked every pass.
+    """
+    scored: List[Tuple[int, str]] = []
+    for path in paths:
+        analysis = None
+        try:
+            analysis = get_speech_analysis(path, stage=False)
+        except Exception as e:
+            logger.debug(f"Speech pre-screen failed for {path}: {e}")
+        if analysis is not None:
+            if mark and not analysis.has_speech():
+                mark_no_speech(path)
+                continue
+            ratio: Optional[float] = analysis.speech_ratio
+        else:
+            ratio = sample_speech_ratio(path)
+        if ratio is None:
+            ratio = 0.5
+        if ratio < SPEECH_PRESCREEN_MIN_RATIO:
+            scored.append((-1, path))
+            continue
+        scored.append((math.floor(ratio * 10), path))
+    scored.sort(key=lambda item: -item[0])  # stable: keeps caller order within a bucket
+    return [path for _bucket, path in scored]
+
+
+__all__ = [
+    "DecodePlan",
+    "SpeechAnalysis",
+    "analyze_energies",
+    "analyze_samples",
+    "frame_energies_db",
+    "get_speech_analysis",
+    "mark_no_speech",
+    "plan_decode",
+    "rank_by_speech",
+    "sample_speech_ratio",
+    "speech_mask",
+]
@@ -0,0 +1,241 @@
+"""Inference backends for the local summarization model.
+
+``LocalSummaryModel`` originally ran BART as a float32 PyTorch pipeline on
+CPU, which is slow and holds gigabytes next to Whisper on the same box.  This
+module builds the same pipeline-shaped callable three ways so the rest of the
+summarizer does not care which one it got:
+
+- ``torch``: the float32 ``transformers`` pipeline (reference quality)
+- ``torch-int8``: the same pipeline with its ``Linear`` layers dynamically
+  quantized to int8
+- ``ctranslate2``: the model converted once to CTranslate2 (already installed
+  with faster-whisper) and run with an int8 compute type
+
+Every loader returns ``(summarizer, label)``; anything that fails falls back
+to the float32 pipeline so a broken conversion never stops minutes.
+
+Example:
+    >>> from core.summarization_backends import load_summarizer
+    >>> summarizer, label = load_summarizer("facebook/bart-large-cnn", "ctranslate2")
+    >>> label
+    'ctranslate2-int8'
+    >>> summarizer(["The council met..."], max_length=100, min_length=30)
+    [{'summary_text': '...'}]
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from core.config import (
+    SUMMARIZATION_CPU_THREADS,
+    SUMMARIZATION_CT2_COMPUTE_TYPE,
+    SUMMARIZATION_CT2_DIR,
+)
+
+BACKENDS = ("torch", "torch-int8", "ctranslate2")
+
+# BART-CNN's own generation settings, used when the model config has none
+_GENERATION_DEFAULTS = {
+    "num_beams": 4,
+    "length_penalty": 2.0,
+    "no_repeat_ngram_size": 3,
+}
+
+
+def _torch_pipeline(model_name: str):
+    # Imported here so processes that never summarize skip torch entirely
+    import torch
+    from transformers import pipeline
+
+    torch.cuda.is_available = lambda: False
+    if SUMMARIZATION_CPU_THREADS > 0:
+        torch.set_num_threads(SUMMARIZATION_CPU_THREADS)
+    return pipeline(
+        "summarization", model=model_name, device=-1, torch_dtype=torch.float32
+    )
+
+
+def load_torch(model_name: str) -> Tuple[Any, str]:
+    """Float32 ``transformers`` summarization pipeline."""
+    return _torch_pipeline(model_name), "torch-float32"
+
+
+def load_torch_int8(model_name: str) -> Tuple[Any, str]:
+    """Float32 pipeline whose ``Linear`` layers are dynamically quantized to int8."""
+    import torch
+
+    summarizer = _torch_pipeline(model_name)
+    summarizer.model = torch.quantization.quantize_dynamic(
+        summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return summarizer, "torch-int8"
+
+
+def ct2_model_dir(model_name: str, compute_type: str = SUMMARIZATION_CT2_COMPUTE_TYPE,
+                  root: str = SUMMARIZATION_CT2_DIR) -> str:
+    """Where the converted copy of ``model_name`` lives."""
+    return os.path.join(root, f"{model_name.replace('/', '--')}-{compute_type}")
+
+
+def convert_to_ct2(model_name: str, output_dir: str,
+                   compute_type: str = SUMMARIZATION_CT2_COMPUTE_TYPE) -> str:
+    """Convert a Hugging Face model once; concurrent workers race harmlessly."""
+    if os.path.exists(os.path.join(output_dir, "model.bin")):
+        return output_dir
+    from ctranslate2.converters import TransformersConverter
+
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".converting-", dir=parent)
+    try:
+        logger.info(
+            f"Converting {model_name} to CTranslate2 ({compute_type}) in {output_dir}"
+        )
+        TransformersConverter(model_name).convert(
+            staging, quantization=compute_type, force=True
+        )
+        try:
+            os.replace(staging, output_dir)
+        except OSError:
+            # Another worker finished first; its copy is just as good
+            if not os.path.exists(os.path.join(output_dir, "model.bin")):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return output_dir
+
+
+class CTranslate2Summarizer:
+    """Pipeline-shaped wrapper around a CTranslate2 ``Translator``.
+
+    Called like the ``transformers`` pipeline and returns the same
+    ``[{"summary_text": ...}]`` shape, so ``LocalSummaryModel`` batches,
+    counts tokens and falls back exactly as before.
+    """
+
+    def __init__(self, translator: Any, tokenizer: Any,
+                 generation: Optional[Dict[str, Any]] = None):
+        self.translator = translator
+        self.tokenizer = tokenizer
+        self.generation = {**_GENERATION_DEFAULTS, **(generation or {})}
+
+    @classmethod
+    def load(
+        cls,
+        model_name: str,
+        model_dir: Optional[str] = None,
+        compute_type: str = SUMMARIZATION_CT2_COMPUTE_TYPE,
+    ) -> "CTranslate2Summarizer":
+        import ctranslate2
+        from transformers import AutoConfig, AutoTokenizer
+
+        model_dir = convert_to_ct2(
+            model_name,
+            model_dir or ct2_model_dir(model_name, compute_type),
+            compute_type,
+        )
+        translator = ctranslate2.Translator(
+            model_dir, device="cpu", compute_type=compute_type,
+            intra_threads=max(0, SUMMARIZATION_CPU_THREADS),
+        )
+        config = AutoConfig.from_pretrained(model_name)
+        generation = {key: getattr(config, key) for key in _GENERATION_DEFAULTS
+                      if getattr(config, key, None) is not None}
+        return cls(translator, AutoTokenizer.from_pretrained(model_name), generation)
+
+    def __call__(
+        self,
+        texts: List[str],
+        batch_size: int = 8,
+        max_length: int = 100,
+        min_length: int = 30,
+        truncation: bool = True,
+        **_ignored,
+    ) -> List[Dict[str, str]]:
+        limit = getattr(self.tokenizer, "model_max_length", None)
+        encoded = self.tokenizer(
+            list(texts), truncation=truncation,
+            max_length=limit if limit and limit < 100_000 else None,
+        )["input_ids"]
+        sources = [self.tokenizer.convert_ids_to_tokens(ids) for ids in encoded]
+        results = self.translator.translate_batch(
+            sources,
+            max_batch_size=max(1, batch_size),
+            beam_size=self.generation["num_beams"],
+            length_penalty=self.generation["length_penalty"],
+            no_repeat_ngram_size=self.generation["no_repeat_ngram_size"],
+            max_decoding_length=max_length,
+            min_decoding_length=min_length,
+        )
+        return [
+            {"summary_text": self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                skip_special_tokens=True,
+            ).strip()}
+            for result in results
+        ]
+
+
+def load_ctranslate2(model_name: str) -> Tuple[Any, str]:
+    """CTranslate2 translator over a converted copy of ``model_name``."""
+    return (CTranslate2Summarizer.load(model_name),
+            f"ctranslate2-{SUMMARIZATION_CT2_COMPUTE_TYPE}")
+
+
+def backend_label(backend: str) -> str:
+    """The label ``load_summarizer`` returns when ``backend`` loads as configured."""
+    if backend == "torch-int8":
+        return "torch-int8"
+    if backend == "ctranslate2":
+        return f"ctranslate2-{SUMMARIZATION_CT2_COMPUTE_TYPE}"
+    return "torch-float32"
+
+
+def load_tokenizer(model_name: str) -> Any:
+    """Just the tokenizer of ``model_name``: enough to chunk, no model weights."""
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+_LOADERS = {
+    "torch": load_torch,
+    "torch-int8": load_torch_int8,
+    "ctranslate2": load_ctranslate2,
+}
+
+
+def load_summarizer(model_name: str, backend: str = "torch") -> Tuple[Any, str]:
+    """Load ``backend``, falling back to the float32 pipeline if it fails.
+
+    Raises whatever the float32 pipeline raises when even that cannot load;
+    the caller then uses its simple text summarizer.
+    """
+    loader = _LOADERS.get(backend)
+    if loader is None:
+        logger.warning(f"Unknown summarization backend {backend!r}; using torch")
+    elif backend != "torch":
+        try:
+            return loader(model_name)
+        except Exception as e:
+            logger.warning(
+                f"Summarization backend {backend} unavailable, using torch: {e}"
+            )
+    return load_torch(model_name)
+
+
+__all__ = [
+    "BACKENDS",
+    "CTranslate2Summarizer",
+    "backend_label",
+    "convert_to_ct2",
+    "ct2_model_dir",
+    "load_summarizer",
+    "load_tokenizer",
+]
@@ -0,0 +1,195 @@
+"""Latency, memory and quality benchmark for the summarization backends.
+
+Summarizes a fixture transcript with each ``SUMMARIZATION_BACKEND`` (float32
+torch, int8 dynamic quantization, CTranslate2) and reports model load time,
+median summarization time, seconds per chunk and peak RSS.  Quality is ROUGE-1,
+ROUGE-2 and ROUGE-L F1 of each backend's chunk summaries against the float32
+output, so the numbers answer "how much do we lose by quantizing".  Each
+backend runs in a fresh spawned process so peak RSS belongs to that backend
+alone and the summary memo is disabled.
+
+Key Features:
+- ``tests/test_caption.scc`` by default, or any SCC / synthetic meeting
+- Reports the backend that actually loaded, so silent fallbacks are visible
+- Machine-readable JSON results
+
+Example:
+    $ python scripts/benchmarks/bench_summarize_backends.py --backends torch,ctranslate2
+    $ python scripts/benchmarks/bench_summarize_backends.py --hours 1 --output out.json
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import platform
+import re
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from core.transcription_benchmark import _environment, _usage
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FIXTURE = REPO_ROOT / "tests" / "test_caption.scc"
+REFERENCE_BACKEND = "torch"
+RESULTS_SCHEMA = 1
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _f1(overlap: int, candidate: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate: str, reference: str, n: int = 1) -> float:
+    """ROUGE-N F1 over lower-cased word n-grams."""
+    def grams(words: List[str]) -> Counter:
+        return Counter(tuple(words[i:i + n]) for i in range(len(words) - n + 1))
+
+    cand, ref = grams(_words(candidate)), grams(_words(reference))
+    return _f1(sum((cand & ref).values()), sum(cand.values()), sum(ref.values()))
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """ROUGE-L F1 from the longest common word subsequence."""
+    cand, ref = _words(candidate), _words(reference)
+    previous = [0] * (len(ref) + 1)
+    for word in cand:
+        current = [0]
+        for j, other in enumerate(ref):
+            current.append(
+                previous[j] + 1 if word == other else max(previous[j + 1], current[j])
+            )
+        previous = current
+    return _f1(previous[-1], len(cand), len(ref))
+
+
+def rouge_scores(
+    candidates: Sequence[str], references: Sequence[str]
+) -> Dict[str, float]:
+    """Mean ROUGE-1/2/L F1 over aligned summary pairs."""
+    pairs = list(zip(candidates, references))
+    if not pairs:
+        return {"rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
+    return {
+        "rouge1": statistics.fmean(rouge_n(c, r, 1) for c, r in pairs),
+        "rouge2": statistics.fmean(rouge_n(c, r, 2) for c, r in pairs),
+        "rougeL": statistics.fmean(rouge_l(c, r) for c, r in pairs),
+    }
+
+
+def _backend_environment(backend: str) -> Dict[str, str]:
+    """Settings read by ``core.config`` in the benchmark child."""
+    return {
+        "SUMMARIZATION_BACKEND": backend,
+        "SUMMARY_CACHE_ENABLED": "false",
+        "SUMMARIZATION_IDLE_UNLOAD_SECONDS": "0",
+    }
+
+
+def _run_backend(
+    backend: str, scc_path: str, batch_size: int, repeats: int
+) -> Dict[str, Any]:
+    """Benchmark child: summarize ``scc_path`` ``repeats`` times with ``backend``."""
+    from core.scc_parser import load_scc
+    from core.scc_summarizer import LocalSummaryModel, summarize_captions
+
+    started = time.perf_counter()
+    model = LocalSummaryModel(backend)
+    load_seconds = time.perf_counter() - started
+    captions = load_scc(scc_path)
+
+    timings, result = [], {}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = summarize_captions(
+            captions, model=model, map_reduce=False, batch_size=batch_size
+        )
+        timings.append(time.perf_counter() - started)
+
+    seconds = statistics.median(timings)
+    chunks = result["generation"]["chunks"]
+    return {
+        "backend": backend,
+        "loaded": model.inference,
+        "model_load_seconds": load_seconds,
+        "seconds": seconds,
+        "seconds_per_chunk": seconds / chunks if chunks else 0.0,
+        "chunks": chunks,
+        "fallbacks": model.fallbacks,
+        "peak_rss_mb": _usage()["rss_mb"],
+        "summaries": [item["text"] for item in result["summary"]],
+    }
+
+
+def run_benchmark(backends: Sequence[str], scc_path: str, batch_size: int = 8,
+                  repeats: int = 1) -> Dict[str, Any]:
+    """Run every backend in a fresh process and score it against the float32 output."""
+    if REFERENCE_BACKEND not in backends:
+        backends = [REFERENCE_BACKEND, *backends]
+    spawn = multiprocessing.get_context("spawn")
+    results: List[Dict[str, Any]] = []
+    for backend in backends:
+        with _environment(_backend_environment(backend)), \
+                ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            try:
+                results.append(pool.submit(_run_backend, backend, scc_path, batch_size,
+                                           repeats).result())
+            except Exception as e:
+                results.append({"backend": backend, "error": str(e)})
+
+    reference = next(
+        (r for r in results if r["backend"] == REFERENCE_BACKEND and "error" not in r),
+        None,
+    )
+    for r in results:
+        if reference is not None and "error" not in r:
+            r["quality"] = rouge_scores(r["summaries"], reference["summaries"])
+            r["speedup"] = reference["seconds"] / r["seconds"] if r["seconds"] else None
+    return {
+        "schema": RESULTS_SCHEMA,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "fixture": scc_path,
+        "batch_size": batch_size,
+        "repeats": repeats,
+        "reference": REFERENCE_BACKEND,
+        "results": results,
+    }
+
+
+def format_table(document: Dict[str, Any]) -> str:
+    header = (
+        f"{'backend':<14} {'loaded':<18} {'load s':>7} {'sum s':>8} {'s/chunk':>8} "
+        f"{'RSS MB':>8} {'speedup':>8} {'R-1':>6} {'R-2':>6} {'R-L':>6}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in document["results"]:
+        if "error" in r:
+            lines.append(f"{r['backend']:<14} ERROR {r['error']}")
+            continue
+        quality = r.get("quality", {})
+        lines.append(
+            f"{r['backend']:<14} {r['loaded']:<18} {r['model_load_seconds']:>7.1f} "
+            f"{r['seconds']:>8.2f} {r['seconds_per_chunk']:>8.3f} "
+            f"{r['peak_rss_mb']:>8.0f} {r.get('speedup') or 0:>7.2f}x "
+            f"{quality.get('rouge1', 0):>6.3f} "
+            f"{quality.get('rouge2', 0):>6.3f} {quality.get('rougeL', 0):>6.3f}"
+        )
+    return "\n".join(lines)
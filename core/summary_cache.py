@@ -0,0 +1,263 @@
+"""Persistent memo of chunk summaries keyed by content hash.
+
+Re-running minutes for the same SCC (after a retry, a relink or a minutes
+re-export) used to summarize every chunk again on CPU.  Chunk boundaries are
+deterministic for a given transcript and token budget, so a summary can be
+reused whenever the model, the generation parameters and the chunk text are
+unchanged.  Only edited or new chunks go back through the model.
+
+Key Features:
+- Key: SHA-1 over backend, generation parameters and chunk text
+- SQLite index shared by every worker process (WAL, short-lived connections)
+- Bounded size with least-recently-used eviction
+- Hit/miss counters persisted and mirrored into the metrics collector
+
+Example:
+    >>> from core.summary_cache import get_summary_cache
+    >>> cache = get_summary_cache()
+    >>> cache.summarize_batch(model, chunk_texts, num_points=1, batch_size=8)
+    ['The council approved the consent agenda...', ...]
+    >>> cache.get_stats()["hit_rate"]
+    0.93
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from loguru import logger
+
+from core.config import (
+    SUMMARY_CACHE_ENABLED,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_PATH,
+)
+from core.monitoring.metrics import record_metric
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def model_signature(model: Any, num_points: int) -> str:
+    """Everything besides the text that changes what the model would produce."""
+    return json.dumps(
+        {
+            "backend": getattr(
+                model, "backend", getattr(model, "model_name", type(model).__name__)
+            ),
+            "max_length": getattr(model, "max_length", None),
+            "min_length": getattr(model, "min_length", None),
+            "max_input_tokens": getattr(model, "max_input_tokens", None),
+            "num_points": num_points,
+        },
+        sort_keys=True,
+    )
+
+
+def summary_key(signature: str, text: str) -> str:
+    digest = hashlib.sha1(signature.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Bounded SQLite memo of ``(model, parameters, text) -> summary``."""
+
+    def __init__(
+        self,
+        db_path: str = SUMMARY_CACHE_PATH,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        """Return cached summaries for whichever ``keys`` are present."""
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                marks = ",".join("?" * len(batch))
+                found.update(conn.execute(
+                    f"SELECT key, summary FROM summaries WHERE key IN ({marks})", batch
+                ).fetchall())
+            if found:
+                conn.executemany(
+                    "UPDATE summaries SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key in found],
+                )
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        """Store ``key -> summary`` pairs, evicting the least recently used."""
+        if not items:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, created, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, summary, now, now) for key, summary in items.items()],
+            )
+            if self.max_entries > 0:
+                conn.execute(
+                    "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries "
+                    "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def summarize_batch(self, model: Any, texts: List[str], num_points: int = 1,
+                        batch_size: int = 8) -> List[str]:
+        """``model.summarize_batch`` that only runs the model for uncached texts."""
+        signature = model_signature(model, num_points)
+        keys = [summary_key(signature, text) for text in texts]
+        try:
+            cached = self.get_many(keys)
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache unavailable: {e}")
+            return model.summarize_batch(
+                texts, num_points=num_points, batch_size=batch_size
+            )
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        hits = len(texts) - len(missing)
+        if missing:
+            fallbacks = getattr(model, "fallbacks", 0)
+            fresh = model.summarize_batch(
+                [texts[i] for i in missing],
+                num_points=num_points,
+                batch_size=batch_size,
+            )
+            results = dict(cached)
+            results.update({keys[i]: summary for i, summary in zip(missing, fresh)})
+            # Never memoize fallback output under the model's key
+            if getattr(model, "fallbacks", 0) == fallbacks:
+                try:
+                    self.put_many(
+                        {keys[i]: summary for i, summary in zip(missing, fresh)}
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not store chunk summaries: {e}")
+        else:
+            results = cached
+
+        self._count("hits", hits)
+        self._count("misses", len(missing))
+        self._publish(hits, len(missing))
+        if texts:
+            logger.debug(f"Summary cache: {hits}/{len(texts)} chunks reused")
+        return [results[key] for key in keys]
+
+    def _count(self, name: str, amount: int) -> None:
+        if not amount:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, amount),
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Summary cache counter {name} not updated: {e}")
+
+    def _publish(self, hits: int, misses: int) -> None:
+        """Mirror counters and the lifetime hit rate into the metrics collector."""
+        record_metric("increment", "summary_cache_hits", hits)
+        record_metric("increment", "summary_cache_misses", misses)
+        try:
+            hit_rate = self.get_stats()["hit_rate"]
+        except sqlite3.Error:
+            return
+        record_metric("gauge", "summary_cache_hit_rate", hit_rate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return persistent hit/miss counters and the number of stored summaries."""
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+        }
+
+
+# Global per-process handle (the memo itself is shared on disk)
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get the process-wide summary cache."""
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SummaryCache()
+    return _summary_cache
+
+
+def summarize_batch(
+    model: Any, texts: List[str], num_points: int = 1, batch_size: int = 8
+) -> List[str]:
+    """Summarize through the cache when enabled, else straight through the model."""
+    if not SUMMARY_CACHE_ENABLED:
+        return model.summarize_batch(
+            texts, num_points=num_points, batch_size=batch_size
+        )
+    try:
+        cache = get_summary_cache()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Summary cache unavailable: {e}")
+        return model.summarize_batch(
+            texts, num_points=num_points, batch_size=batch_size
+        )
+    return cache.summarize_batch(
+        model, texts, num_points=num_points, batch_size=batch_size
+    )
+
+
+__all__ = [
+    "SummaryCache",
+    "get_summary_cache",
+    "model_signature",
+    "summarize_batch",
+    "summary_key",
+]
@@ -15,7 +15,8 @@ Example:
 """
 
 from celery import Celery
-from core.config import REDIS_URL
+from core.config import CELERY_VISIBILITY_TIMEOUT, REDIS_URL
+from core.vod_pipeline import task_routes
 from loguru import logger
 import os
 from core.logging_config import setup_logging
@@ -34,6 +35,7 @@ celery_app = Celery(
         "core.tasks.caption_checks",
         "core.tasks.vod_processing",
         "core.tasks.transcription",
+        "core.tasks.vod_pipeline",
         "core.tasks.transcription_linking",
         "core.tasks.health_checks",
         "core.tasks.helo",
@@ -51,6 +53,14 @@ celery_app.conf.accept_content = ["json"]
 celery_app.conf.result_expires = 86400
 celery_app.conf.timezone = os.getenv("CELERY_TIMEZONE", "UTC")
 celery_app.conf.enable_utc = True
+# Late-acked tasks (transcription) are redelivered only after this timeout,
+# which must outlast a multi-hour council meeting
+celery_app.conf.broker_transport_options = {
+    "visibility_timeout": CELERY_VISIBILITY_TIMEOUT
+}
+# VOD pipeline stages go to per-resource queues (see core.vod_pipeline);
+# everything else stays on the default "celery" queue
+celery_app.conf.task_routes = task_routes()
 
 # Initialize logging early for workers/beat so logs go to file and journal
 try:
@@ -86,6 +96,13 @@ try:
 except Exception as e:
     logger.error(f"Failed to import transcription tasks: {e}")
 
+# Ensure VOD pipeline stage tasks are imported and registered
+try:
+    import core.tasks.vod_pipeline  # noqa: E402,F401
+    logger.info("VOD pipeline tasks imported successfully")
+except Exception as e:
+    logger.error(f"Failed to import VOD pipeline tasks: {e}")
+
 # Ensure transcription linking tasks are imported and registered
 try:
     import core.tasks.transcription_linking  # noqa: E402,F401
@@ -118,4 +135,4 @@ for task in vod_tasks:
 for task in transcription_tasks:
     logger.debug(f"  - {task}") 
 
-# HELO tasks are imported via Celery include list above
\ No newline at end of file
+# HELO tasks are imported via Celery include list above
@@ -96,6 +96,24 @@ schedule_updates = {
             "schedule": crontab(minute="*/10"),
             "options": {"timezone": tz},
         },
+        # Reconcile the transcript search index with the flex mounts hourly
+        "transcript-search-reindex": {
+            "task": "transcription.index_transcripts",
+            "schedule": crontab(minute=20),
+            "options": {"timezone": tz},
+        },
+        # Incremental media catalog refresh every 15 minutes, full re-list nightly
+        "media-catalog-refresh": {
+            "task": "vod_processing.refresh_media_catalog",
+            "schedule": crontab(minute="*/15"),
+            "options": {"timezone": tz},
+        },
+        "media-catalog-full-refresh": {
+            "task": "vod_processing.refresh_media_catalog",
+            "schedule": crontab(minute=10, hour=1),
+            "kwargs": {"full": True},
+            "options": {"timezone": tz},
+        },
 }
 
 if vod2_parsed is not None:
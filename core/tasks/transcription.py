@@ -10,7 +10,9 @@ Key Features:
 - Integration with VOD processing pipeline
 """
 
-from celery import current_task
+from celery import chain, chord
+from celery.result import AsyncResult
+from celery.signals import worker_process_init
 from loguru import logger
 from typing import Dict, Optional, List, Set
 import os
@@ -19,14 +21,58 @@ import glob
 import redis
 
 from core.tasks import celery_app
-from core.config import MEMBER_CITIES, REDIS_URL, OUTPUT_DIR
+from core.config import (
+    MEMBER_CITIES,
+    REDIS_URL,
+    OUTPUT_DIR,
+    WHISPER_MODEL_WARMUP,
+    TRANSCRIPT_SEARCH_ENABLED,
+    SUMMARIZATION_WARMUP,
+    SUMMARIZATION_MODE,
+)
 from core.services.transcription import TranscriptionService
 from core.monitoring.autopriority_metrics import increment_counters
 from core.transcription import _transcribe_with_faster_whisper as sync_transcribe
+from core.whisper_model_pool import get_model_pool
+from core.transcription_checkpoint import get_checkpoint
+from core.transcription_cache import materialize_cached_captions
+from core.transcript_search import get_transcript_index, index_transcript
 
 
-@celery_app.task(name="transcription.run_whisper", bind=True)
-def run_whisper_transcription(self, video_path: str) -> Dict:
+@worker_process_init.connect
+def warm_whisper_model_pool(**_kwargs) -> None:
+    """Load the default Whisper model when a worker process starts (opt-in).
+
+    The model then stays resident in the process-wide pool so the first
+    transcription job does not pay the load time.  Off by default so
+    transcode, upload and beat workers do not hold a model they never use;
+    set ``WHISPER_MODEL_WARMUP=true`` for the ASR workers.
+    """
+    if not WHISPER_MODEL_WARMUP:
+        return
+    if get_model_pool().warm_up():
+        logger.info("Whisper model pool warmed up for worker process")
+
+
+@worker_process_init.connect
+def warm_summarizer(**_kwargs) -> None:
+    """Start loading the summarization model in the background (opt-in).
+
+    Off by default so workers that never summarize do not pay for BART,
+    and skipped in extractive mode, which never loads it.
+    """
+    if SUMMARIZATION_WARMUP and SUMMARIZATION_MODE != "extractive":
+        from core.scc_summarizer import get_summarizer
+
+        get_summarizer().warm_up(background=True)
+
+
+# acks_late + reject_on_worker_lost: a worker that dies mid-file gets the task
+# redelivered, and the checkpoint journal lets it continue where it stopped
+@celery_app.task(name="transcription.run_whisper", bind=True, acks_late=True,
+                 reject_on_worker_lost=True)
+def run_whisper_transcription(self, video_path: str, mode: Optional[str] = None,
+                              workers: Optional[int] = None) -> Dict:
     """
     Transcribe a video file using WhisperX via Celery.
     
@@ -36,6 +82,8 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
     
     Args:
         video_path: Path to the video file to transcribe
+        mode: ``"serial"`` or ``"chunked"`` (defaults to ``TRANSCRIPTION_MODE``)
+        workers: Process pool size when ``mode="chunked"``
         
     Returns:
         Dictionary containing transcription results:
@@ -51,22 +99,57 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
     Raises:
         Exception: If transcription fails
     """
-    task_id = self.request.id
+    return transcribe_in_task(self, video_path, mode, workers)
+
+
+def transcribe_in_task(
+    task,
+    video_path: str,
+    mode: Optional[str] = None,
+    workers: Optional[int] = None,
+    resume: Optional[Dict] = None,
+) -> Dict:
+    """Transcribe ``video_path`` on behalf of the running Celery ``task``.
+
+    Shared by ``run_whisper_transcription`` and the VOD pipeline's transcribe
+    stage: saves resume state (``resume`` overrides how ``task`` is
+    recreated), reports progress through ``task.update_state`` and indexes
+    the result.
+    """
+    task_id = task.request.id
     logger.info(f"Starting Celery transcription task {task_id} for {video_path}")
-    
+
     try:
         # Validate input file
         if not os.path.exists(video_path):
             error_msg = f"Video file not found: {video_path}"
             logger.error(f"Task {task_id}: {error_msg}")
-            self.update_state(
+            task.update_state(
                 state='FAILURE',
                 meta={'error': error_msg, 'video_path': video_path}
             )
             raise FileNotFoundError(error_msg)
-        
+
+        # Record how to recreate this task so resume_task can continue it
+        from core.unified_queue_manager import save_task_state
+        checkpoint = get_checkpoint(video_path)
+        save_task_state(task_id, {
+            'task_name': task.name,
+            'args': [video_path],
+            'kwargs': {'mode': mode, 'workers': workers},
+            'video_path': video_path,
+            'progress': 0,
+            **(resume or {}),
+        })
+        if checkpoint:
+            logger.info(
+                f"Task {task_id}: resuming from checkpoint at "
+                f"{checkpoint['offset']:.1f}s "
+                f"({checkpoint['segments']} segments journalled)"
+            )
+
         # Update task state to processing
-        self.update_state(
+        task.update_state(
             state='PROGRESS',
             meta={
                 'status': 'processing',
@@ -75,9 +158,9 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
                 'video_path': video_path
             }
         )
-        
+
         # Update progress
-        self.update_state(
+        task.update_state(
             state='PROGRESS',
             meta={
                 'status': 'processing',
@@ -86,13 +169,33 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
                 'video_path': video_path
             }
         )
-        
+
+        def report_progress(fraction: float, segments_written: int) -> None:
+            # Captions stream out as they decode; map 0..1 onto the 10-90% band
+            task.update_state(
+                state='PROGRESS',
+                meta={
+                    'status': 'processing',
+                    'progress': 10 + int(fraction * 80),
+                    'segments': segments_written,
+                    'status_message': (
+                        f'Transcribing... {fraction:.0%} of audio processed'
+                    ),
+                    'video_path': video_path,
+                },
+            )
+
         # Perform transcription using synchronous helper
         logger.info(f"Task {task_id}: Starting transcription of {video_path}")
-        result = sync_transcribe(video_path=video_path)
-        
+        result = sync_transcribe(
+            video_path=video_path,
+            mode=mode,
+            workers=workers,
+            progress_callback=report_progress,
+        )
+
         # Update progress to completion
-        self.update_state(
+        task.update_state(
             state='PROGRESS',
             meta={
                 'status': 'processing',
@@ -101,7 +204,7 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
                 'video_path': video_path
             }
         )
-        
+
         # Prepare final result
         final_result = {
             'output_path': result.get('output_path', ''),
@@ -110,21 +213,27 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
             'duration': result.get('duration', 0),
             'video_path': video_path,
             'task_id': task_id,
+            'mode': result.get('mode'),
+            'real_time_factor': result.get('real_time_factor'),
+            'resumed_from_offset': result.get('resumed_from_offset'),
             'progress': 100,
             'status_message': 'Transcription completed successfully'
         }
-        
+
         logger.info(f"Task {task_id}: Transcription completed successfully")
         logger.info(f"Task {task_id}: Output saved to {final_result['output_path']}")
-        
+
+        # Searchable as soon as it is written, not at the next reindex sweep
+        index_transcript(final_result['output_path'], video_path)
+
         return final_result
-        
+
     except Exception as e:
         error_msg = f"Transcription failed for {video_path}: {str(e)}"
         logger.error(f"Task {task_id}: {error_msg}")
-        
+
         # Update task state to failure
-        self.update_state(
+        task.update_state(
             state='FAILURE',
             meta={
                 'error': error_msg,
@@ -133,11 +242,32 @@ def run_whisper_transcription(self, video_path: str) -> Dict:
                 'status': 'failed'
             }
         )
-        
+
         # Re-raise the exception for Celery to handle
         raise
 
 
+def queue_batch_transcription(video_paths: List[str],
+                              priority: Optional[int] = None) -> AsyncResult:
+    """Queue the batch chord; the returned result's id yields ``batch_summary``.
+
+    Callers that report a batch id to a client (the batch API) should queue
+    through this rather than ``batch_transcription.delay``, whose own task
+    id finishes as soon as the chord is queued.
+    """
+    options = {'priority': priority} if priority is not None else {}
+    items = [
+        chain(transcribe_batch_item.s(video_path).set(**options),
+              caption_batch_item.s().set(**options))
+        for video_path in video_paths
+    ]
+    batch = chord(items)(batch_summary.s(video_paths))
+    logger.info(
+        f"Queued batch {batch.id}: {len(video_paths)} transcription/caption chains"
+    )
+    return batch
+
+
 @celery_app.task(name="transcription.batch_process")
 def batch_transcription(video_paths: list, priority: Optional[int] = None) -> Dict:
     """
@@ -147,15 +277,59 @@ def batch_transcription(video_paths: list, priority: Optional[int] = None) -> Di
     for VOD processing pipelines that need to transcribe multiple files.
     It integrates with the captioning workflow to generate SCC captions.
     
+    Each video becomes a ``batch_item`` (ASR queue) -> ``caption_batch_item``
+    (transcode queue) chain; the chains run as a chord whose callback,
+    ``batch_summary``, collects the results.  Nothing here waits on another
+    task, so transcription of one file overlaps captioning of the previous.
+
     Args:
         video_paths: List of video file paths to transcribe
         priority: Optional priority level for the batch
         
     Returns:
-        Dictionary containing batch processing results
+        Dictionary with the batch (chord) id and per-video task ids; the
+        batch results are the return value of the batch id
     """
     logger.info(f"Starting batch transcription for {len(video_paths)} videos")
-    
+    batch = queue_batch_transcription(video_paths, priority)
+    return {
+        'total_videos': len(video_paths),
+        'status': 'queued',
+        'batch_id': batch.id,
+        'message': f"Batch queued; results will be available from task {batch.id}"
+    }
+
+
+@celery_app.task(name="transcription.batch_item", bind=True, acks_late=True,
+                 reject_on_worker_lost=True)
+def transcribe_batch_item(self, video_path: str) -> Dict:
+    """Transcribe one batch video; failures are returned so the chord completes."""
+    try:
+        return transcribe_in_task(self, video_path)
+    except Exception as e:
+        return {
+            'video_path': video_path,
+            'status': 'failed',
+            'error': f"Failed to transcribe {video_path}: {str(e)}",
+            'task_id': self.request.id
+        }
+
+
+@celery_app.task(name="transcription.caption_batch_item")
+def caption_batch_item(result: Dict) -> Dict:
+    """Generate the captioned video for a transcribed batch video."""
+    if result.get('status') != 'completed':
+        return result
+    scc_path = result.get('output_path')
+    if scc_path and os.path.exists(scc_path):
+        # Generate captioned video using VOD processing workflow
+        result['captioning'] = generate_captioned_video(result['video_path'], scc_path)
+    return result
+
+
+@celery_app.task(name="transcription.batch_summary")
+def batch_summary(item_results: List[Dict], video_paths: list) -> Dict:
+    """Chord callback: the batch results in the original ``batch_process`` shape."""
     results = {
         'total_videos': len(video_paths),
         'completed': 0,
@@ -164,60 +338,37 @@ def batch_transcription(video_paths: list, priority: Optional[int] = None) -> Di
         'errors': [],
         'captioning_results': []
     }
-    
-    # Process videos sequentially to avoid overwhelming the system
-    for i, video_path in enumerate(video_paths):
-        try:
-            logger.info(f"Processing video {i+1}/{len(video_paths)}: {video_path}")
-            
-            # Submit individual transcription task
-            task = run_whisper_transcription.delay(video_path)
-            
-            # Wait for completion (with timeout)
-            result = task.get(timeout=3600)  # 1 hour timeout
-            
-            if result and result.get('status') == 'completed':
-                # Transcription successful, now integrate with captioning workflow
-                scc_path = result.get('output_path')
-                if scc_path and os.path.exists(scc_path):
-                    # Generate captioned video using VOD processing workflow
-                    captioning_result = generate_captioned_video(video_path, scc_path)
-                    results['captioning_results'].append({
-                        'video_path': video_path,
-                        'scc_path': scc_path,
-                        'captioning_success': captioning_result.get('success', False),
-                        'captioned_video_path': captioning_result.get('output_path')
-                    })
-                
-                results['results'].append({
-                    'video_path': video_path,
-                    'task_id': task.id,
-                    'status': 'completed',
-                    'result': result
-                })
-                results['completed'] += 1
-                
-                logger.info(f"Completed transcription and captioning for {video_path}")
-            else:
-                # Transcription failed
-                error_msg = f"Transcription failed for {video_path}"
-                results['errors'].append({
+
+    for result in item_results:
+        video_path = result.get('video_path')
+        if result.get('status') != 'completed':
+            results['errors'].append(
+                {
                     'video_path': video_path,
-                    'error': error_msg,
-                    'task_id': task.id
-                })
-                results['failed'] += 1
-                
-        except Exception as e:
-            error_msg = f"Failed to transcribe {video_path}: {str(e)}"
-            logger.error(error_msg)
-            
-            results['errors'].append({
+                    'error': result.get('error')
+                    or f"Transcription failed for {video_path}",
+                    'task_id': result.get('task_id'),
+                }
+            )
+            results['failed'] += 1
+            continue
+
+        captioning = result.pop('captioning', None)
+        if captioning is not None:
+            results['captioning_results'].append({
                 'video_path': video_path,
-                'error': error_msg
+                'scc_path': result.get('output_path'),
+                'captioning_success': captioning.get('success', False),
+                'captioned_video_path': captioning.get('output_path')
             })
-            results['failed'] += 1
-    
+        results['results'].append({
+            'video_path': video_path,
+            'task_id': result.get('task_id'),
+            'status': 'completed',
+            'result': result
+        })
+        results['completed'] += 1
+
     logger.info(f"Batch transcription completed: {results['completed']} successful, {results['failed']} failed")
     return results
 
@@ -234,7 +385,7 @@ def generate_captioned_video(video_path: str, scc_path: str) -> Dict:
         Dictionary with captioning results
     """
     try:
-        from core.tasks.vod_processing import create_captioned_video
+        from core.caption_muxer import embed_captions
         
         # Create output path for captioned video
         video_dir = os.path.dirname(video_path)
@@ -242,14 +393,16 @@ def generate_captioned_video(video_path: str, scc_path: str) -> Dict:
         name_without_ext = os.path.splitext(video_name)[0]
         output_path = os.path.join(video_dir, f"{name_without_ext}_captioned.mp4")
         
-        # Generate captioned video
-        success = create_captioned_video(video_path, scc_path, output_path)
+        # Generate captioned video (stream copy unless the policy requires burn-in)
+        result = embed_captions(video_path, scc_path, output_path)
+        output_path = result['output_path'] or output_path
         
-        if success and os.path.exists(output_path):
+        if result['success'] and os.path.exists(output_path):
             logger.info(f"Captioned video generated: {output_path}")
             return {
                 'success': True,
                 'output_path': output_path,
+                'caption_mode': result['mode'],
                 'message': 'Captioned video generated successfully'
             }
         else:
@@ -419,7 +572,8 @@ def _list_recent_videos_for_city(mount_path: str, max_scan: int = 100) -> List[s
 def _is_already_captioned(video_path: str) -> bool:
     """Return True if there is a matching SCC for the given video.
 
-    Checks adjacent file, common sibling caption folders, and the global OUTPUT_DIR.
+    Checks adjacent file, common sibling caption folders, and the global OUTPUT_DIR,
+    then the transcription result cache (which writes the adjacent SCC on a hit).
     """
     try:
         base_dir = os.path.dirname(video_path)
@@ -440,6 +594,10 @@ def _is_already_captioned(video_path: str) -> bool:
         for p in candidates:
             if os.path.exists(p):
                 return True
+
+        # Same content already transcribed under another name or mount
+        if materialize_cached_captions(video_path, candidates[0]):
+            return True
     except Exception:
         pass
     return False
@@ -565,10 +723,31 @@ def autoprioritize_newest(max_per_city: int = 1, scan_limit_per_city: int = 50)
 
     return results
 
+
+@celery_app.task(name="transcription.index_transcripts")
+def index_transcripts() -> Dict:
+    """Reconcile the transcript search index with the SCC files on the flex mounts.
+
+    Completed transcriptions are indexed immediately; this sweep picks up
+    captions written by other tools and drops transcripts that were removed.
+    """
+    if not TRANSCRIPT_SEARCH_ENABLED:
+        return {'skipped': 'disabled'}
+    stats = get_transcript_index().update_from_directories()
+    logger.info(
+        f"Transcript search reindex: {stats['indexed']} indexed, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed, "
+        f"{stats['errors']} errors in {stats['seconds']}s"
+    )
+    return stats
+
+
 # Export for backward compatibility
 __all__ = [
     'run_whisper_transcription',
-    'batch_transcription', 
+    'batch_transcription',
+    'queue_batch_transcription',
     'cleanup_transcription_temp_files',
-    'enqueue_transcription'
-] 
\ No newline at end of file
+    'enqueue_transcription',
+    'index_transcripts'
+]
@@ -4,16 +4,23 @@ from __future__ import annotations
 # PURPOSE: Ensure captioning stays active by backfilling transcription jobs when none are running
 # DEPENDENCIES: celery_app, core.config.MEMBER_CITIES, core.tasks.transcription.run_whisper_transcription
 # MODIFICATION NOTES: v1.0 - Initial watchdog/backfill task
+#                     v1.1 - Candidates ranked by speech ratio; silent files queued last
+#                     v1.2 - Candidates come from the media catalog, not globbing mounts
 """
 
 import os
-import glob
 from typing import List
 
 from loguru import logger
 
 from core.tasks import celery_app
-from core.config import MEMBER_CITIES
+from core.config import (
+    MEMBER_CITIES,
+    SPEECH_PRESCREEN_ENABLED,
+    SPEECH_PRESCREEN_RANK_LIMIT,
+)
+from core.speech_prescreen import rank_by_speech
+from core.media_catalog import get_media_catalog
 
 
 def _is_any_transcription_running() -> bool:
@@ -40,9 +47,23 @@ def _is_any_transcription_running() -> bool:
 
 
 def _find_candidate_videos(max_total: int) -> List[str]:
-    """Find up to max_total surface-level videos on writable mounts that lack SCC."""
+    """Find up to max_total surface-level videos on writable mounts that lack SCC.
+
+    With the speech pre-screen enabled, a wider newest-first pool is ranked by
+    speech ratio (staged audio, or a few short samples) and files with no
+    speech go last.
+    """
+    if SPEECH_PRESCREEN_ENABLED:
+        pool = _collect_candidate_videos(max_total + SPEECH_PRESCREEN_RANK_LIMIT)
+        return rank_by_speech(pool)[:max_total]
+    return _collect_candidate_videos(max_total)
+
+
+def _collect_candidate_videos(max_total: int) -> List[str]:
+    """Newest-first surface-level videos lacking SCC on writable mounts."""
     candidates: List[str] = []
-    video_exts = ("*.mp4", "*.mov", "*.mkv", "*.m4v", "*.avi", "*.wmv")
+    video_exts = (".mp4", ".mov", ".mkv", ".m4v", ".avi", ".wmv")
+    catalog = get_media_catalog()
     for city_id, cfg in MEMBER_CITIES.items():
         mount = cfg.get("mount_path")
         if not mount or not os.path.ismount(mount):
@@ -50,17 +71,15 @@ def _find_candidate_videos(max_total: int) -> List[str]:
         if not os.access(mount, os.W_OK):
             logger.debug(f"Mount not writable, skip backfill: {mount}")
             continue
-        # surface-level only
-        files: List[str] = []
-        for ext in video_exts:
-            files.extend(glob.glob(os.path.join(mount, ext)))
-        files = [p for p in files if os.path.isfile(p) and os.path.getsize(p) > 5 * 1024 * 1024]
-        # prefer newest first
-        files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-        for p in files:
+        # surface-level only, newest first, from the media catalog
+        catalog.ensure_fresh(roots={city_id: mount})
+        files = catalog.list_files(city=city_id, max_depth=0, extensions=video_exts,
+                                   min_size=5 * 1024 * 1024 + 1, captioned=False)
+        for entry in files:
+            p = entry["path"]
             base, _ = os.path.splitext(p)
-            scc = base + ".scc"
-            if not os.path.exists(scc):
+            # The catalog may be up to a refresh behind; confirm before queueing
+            if not os.path.exists(base + ".scc"):
                 candidates.append(p)
                 if len(candidates) >= max_total:
                     return candidates
@@ -96,5 +115,3 @@ def transcription_backfill() -> dict:
             logger.error(f"Backfill failed to queue {path}: {exc}")
 
     return {"enqueued": len(task_ids), "task_ids": task_ids, "videos": videos}
-
-
@@ -0,0 +1,224 @@
+"""Celery stage tasks and canvas for the end-to-end VOD pipeline.
+
+See ``core.vod_pipeline`` for the stage plan, queue routing and DAG state.
+``start_vod_pipeline`` links the stages into one chain per VOD::
+
+    locate -> probe -> transcribe -> caption_mux -> upload -> validate
+
+Each stage receives the pipeline context returned by the previous one and
+returns it extended with its own output (``video_path``, ``scc_path``,
+``captioned_video_path`` and a summary under the stage name).  A stage that
+finds nothing left to do (the VOD is already captioned) sets
+``skip_reason`` and the remaining stages pass the context through.  A
+failing stage raises, which stops the chain and records the failure.
+"""
+
+import functools
+import uuid
+from typing import Any, Dict, Optional, Sequence
+
+from celery import chain
+from celery.exceptions import Retry
+from loguru import logger
+
+from core.exceptions import VODError
+from core.media_probe import codec_names, duration_of, probe_media, streams_of
+from core.tasks import celery_app
+from core.tasks.transcription import transcribe_in_task
+from core.tasks.vod_processing import (
+    embed_vod_captions,
+    locate_vod,
+    upload_captioned_vod,
+    validate_vod_quality,
+)
+from core.vod_pipeline import STAGES, get_pipeline_store
+
+CABLECAST_RETRY_SECONDS = 300
+
+
+def _record(pipeline_id: str, stage: str, status: str, **details: Any) -> None:
+    # Pipeline state is for observability; a Redis hiccup must not fail the stage
+    try:
+        get_pipeline_store().update(pipeline_id, stage, status, **details)
+    except Exception as e:
+        logger.warning(
+            f"Could not record pipeline {pipeline_id} {stage} -> {status}: {e}"
+        )
+
+
+def pipeline_stage(stage: str):
+    """Run a bound stage task with DAG bookkeeping and skip pass-through."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, ctx: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
+            pipeline_id = ctx['pipeline_id']
+            if ctx.get('skip_reason'):
+                _record(pipeline_id, stage, 'skipped', task_id=self.request.id)
+                return ctx
+            _record(pipeline_id, stage, 'running', task_id=self.request.id)
+            try:
+                ctx = func(self, ctx, *args, **kwargs)
+            except Retry:
+                raise  # the stage runs again; only a final failure is recorded
+            except Exception as e:
+                _record(pipeline_id, stage, 'failed', error=str(e))
+                raise
+            summary = ctx.get(stage) or {}
+            if summary.get('skipped'):
+                _record(pipeline_id, stage, 'skipped', result=summary,
+                        skip_reason=ctx.get('skip_reason'))
+            else:
+                _record(pipeline_id, stage, 'done', result=summary)
+            return ctx
+
+        return wrapper
+
+    return decorator
+
+
+@celery_app.task(name="vod_pipeline.locate", bind=True, max_retries=3)
+@pipeline_stage("locate")
+def locate(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Find the video on the flex mounts (or via Cablecast) and check storage."""
+    try:
+        located = locate_vod(ctx['vod_id'], ctx['city_id'], ctx.get('video_path'))
+    except VODError as e:
+        if e.details.get('deferred'):
+            raise self.retry(exc=e, countdown=CABLECAST_RETRY_SECONDS)
+        raise
+    ctx = {**ctx, 'video_path': located['video_path'], 'locate': located}
+    if located.get('skipped'):
+        ctx['skip_reason'] = located['skipped']
+    return ctx
+
+
+@celery_app.task(name="vod_pipeline.probe", bind=True)
+@pipeline_stage("probe")
+def probe(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate the video from the shared probe cache (later stages reuse the probe)."""
+    info = probe_media(ctx['video_path'])
+    video_codecs = codec_names(info, 'video')
+    if not video_codecs:
+        raise VODError(f"Video file validation failed for {ctx['video_path']}")
+    return {**ctx, 'probe': {
+        'duration': duration_of(info),
+        'video_codec': video_codecs[0],
+        'subtitle_streams': len(streams_of(info, 'subtitle')),
+    }}
+
+
+# acks_late + reject_on_worker_lost as for run_whisper: a lost worker's file
+# is redelivered and continues from its checkpoint journal
+@celery_app.task(name="vod_pipeline.transcribe", bind=True, acks_late=True,
+                 reject_on_worker_lost=True)
+@pipeline_stage("transcribe")
+def transcribe(self, ctx: Dict[str, Any], mode: Optional[str] = None,
+               workers: Optional[int] = None) -> Dict[str, Any]:
+    """Transcribe to SCC on the ASR queue."""
+    result = transcribe_in_task(self, ctx['video_path'], mode, workers, resume={
+        'args': [ctx],
+        'pipeline_id': ctx['pipeline_id'],
+        'stage': 'transcribe',
+    })
+    return {**ctx, 'scc_path': result['output_path'], 'transcribe': {
+        'scc_path': result['output_path'],
+        'segments': result.get('segments'),
+        'mode': result.get('mode'),
+        'real_time_factor': result.get('real_time_factor'),
+    }}
+
+
+@celery_app.task(name="vod_pipeline.caption_mux", bind=True)
+@pipeline_stage("caption_mux")
+def caption_mux(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Embed the captions on the transcode queue (stream copy unless burning in)."""
+    embed = embed_vod_captions(ctx['video_path'], ctx['scc_path'], ctx['city_id'])
+    return {**ctx, 'captioned_video_path': embed['output_path'], 'caption_mux': {
+        'output_path': embed['output_path'],
+        'mode': embed['mode'],
+        'seconds': embed['seconds'],
+        'time_saved_seconds': embed['time_saved_seconds'],
+    }}
+
+
+@celery_app.task(name="vod_pipeline.upload", bind=True, max_retries=3)
+@pipeline_stage("upload")
+def upload(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Upload the captioned video and SCC to Cablecast."""
+    if str(ctx['vod_id']).startswith('flex_'):
+        # Found on a flex mount only: there is no Cablecast VOD to upload to
+        return {**ctx, 'upload': {'skipped': 'no_cablecast_vod'}}
+    result = upload_captioned_vod(
+        ctx['vod_id'], ctx['captioned_video_path'], ctx['scc_path']
+    )
+    if not result['success']:
+        raise self.retry(
+            exc=VODError(result['error']), countdown=CABLECAST_RETRY_SECONDS
+        )
+    return {**ctx, 'upload': {'video_uploaded': True, 'caption_uploaded': True}}
+
+
+@celery_app.task(name="vod_pipeline.validate", bind=True)
+@pipeline_stage("validate")
+def validate(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Score the captioned output (integrity, size, duration, caption track)."""
+    result = validate_vod_quality(ctx['vod_id'], ctx['captioned_video_path'])
+    if not result['success']:
+        raise VODError(result['error'])
+    return {**ctx, 'validate': {
+        'quality_score': result['quality_score'],
+        'validation_results': result['validation_results'],
+    }}
+
+
+STAGE_TASKS = {
+    'locate': locate,
+    'probe': probe,
+    'transcribe': transcribe,
+    'caption_mux': caption_mux,
+    'upload': upload,
+    'validate': validate,
+}
+
+
+def _chain(ctx: Dict[str, Any], stages: Sequence[str], task_ids: Dict[str, str]):
+    """Chain ``stages`` starting from ``ctx``; queues come from ``task_routes``.
+
+    Task ids are assigned up front so the DAG state can name every stage
+    before any of them runs.
+    """
+    first, rest = stages[0], stages[1:]
+    return chain(
+        STAGE_TASKS[first].s(ctx).set(task_id=task_ids[first]),
+        *[STAGE_TASKS[stage].s().set(task_id=task_ids[stage]) for stage in rest],
+    )
+
+
+def start_vod_pipeline(
+    vod_id, city_id: str, video_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Queue the full pipeline for one VOD; returns its id and stage task ids."""
+    pipeline_id = uuid.uuid4().hex
+    ctx = {'pipeline_id': pipeline_id, 'vod_id': vod_id, 'city_id': city_id,
+           'video_path': video_path}
+    task_ids = {stage: str(uuid.uuid4()) for stage in STAGES}
+    get_pipeline_store().create(pipeline_id, vod_id, city_id, video_path, task_ids)
+    _chain(ctx, STAGES, task_ids).apply_async()
+    logger.info(f"Started VOD pipeline {pipeline_id} for {vod_id} ({city_id})")
+    return {'pipeline_id': pipeline_id, 'task_ids': task_ids}
+
+
+def resume_vod_pipeline(ctx: Dict[str, Any], stage: str) -> Dict[str, str]:
+    """Re-queue ``stage`` and everything after it with the context it received.
+
+    Used by ``UnifiedQueueManager.resume_task``: re-sending only the stage
+    task would drop the rest of the chain.
+    """
+    stages = STAGES[STAGES.index(stage):]
+    task_ids = {name: str(uuid.uuid4()) for name in stages}
+    for name, task_id in task_ids.items():
+        _record(ctx['pipeline_id'], name, 'queued', task_id=task_id)
+    _chain(ctx, stages, task_ids).apply_async()
+    logger.info(f"Resumed VOD pipeline {ctx['pipeline_id']} from {stage}")
+    return task_ids
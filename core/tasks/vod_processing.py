@@ -16,10 +16,10 @@ Tasks:
 - caption_vod: Generate captions for a specific VOD
 - retranscode_vod: Retranscode video with embedded captions
 - validate_vod_quality: Quality assurance for processed VODs
+- refresh_media_catalog: Keep the flex-mount media catalog current
 """
 
 import os
-import subprocess
 import tempfile
 import requests
 import re
@@ -32,6 +32,12 @@ from loguru import logger
 from core.config import MEMBER_CITIES, OUTPUT_DIR
 from core.cablecast_client import CablecastAPIClient
 from core.services import TranscriptionService
+from core.media_catalog import find_vod_file, get_media_catalog
+from core.vod_downloader import RangeDownloader
+from core.caption_muxer import embed_captions
+from core.ffmpeg_runner import FfmpegCancelled
+from core.media_probe import codec_names, duration_of, probe_media, streams_of
+from core.exceptions import VODError
 
 try:
     from core.utils.alerts import send_alert
@@ -92,7 +98,12 @@ def extract_vod_url_from_cablecast(vod_data: Dict) -> Optional[str]:
     reraise=True
 )
 def download_vod_content(vod_url: str, output_path: str, timeout: int = 1800) -> bool:
-    """Download VOD content from direct URL with retries."""
+    """Download VOD content from direct URL with retries.
+
+    Segments are fetched concurrently with HTTP Range requests (see
+    ``core.vod_downloader``); a tenacity retry resumes from the segments
+    already on disk instead of starting over.
+    """
     import time
     metrics = get_metrics_collector()
     start_time = time.time()
@@ -100,31 +111,19 @@ def download_vod_content(vod_url: str, output_path: str, timeout: int = 1800) ->
     logger.info(f"Downloading VOD content from: {vod_url}")
     metrics.increment("vod_download_total")
     
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
     try:
-        response = requests.get(vod_url, stream=True, timeout=timeout)
-        response.raise_for_status()
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded_size = 0
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded_size += len(chunk)
-                    if downloaded_size % (10 * 1024 * 1024) == 0:
-                        progress = (downloaded_size / total_size * 100) if total_size > 0 else 0
-                        logger.info(f"Download progress: {progress:.1f}% ({downloaded_size / (1024*1024):.1f}MB)")
-        
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-            duration = time.time() - start_time
-            metrics.increment("vod_download_success")
-            metrics.timer("download_duration", duration)
-            logger.info(f"VOD content downloaded successfully: {output_path}")
-            return True
-        else:
-            metrics.increment("vod_download_failed")
-            logger.error(f"Download verification failed: {output_path}")
-            return False
+        # timeout bounds each connect/read, not the whole multi-GB transfer
+        RangeDownloader(vod_url, output_path, timeout=min(timeout, 120)).download()
+        duration = time.time() - start_time
+        metrics.increment("vod_download_success")
+        metrics.timer("download_duration", duration)
+        logger.info(f"VOD content downloaded successfully: {output_path}")
+        return True
+    except VODError as e:
+        # Size/checksum mismatch: the partial file is already discarded
+        metrics.increment("vod_download_failed")
+        logger.error(f"Download verification failed: {output_path}: {e}")
+        return False
     except Exception as e:
         duration = time.time() - start_time
         metrics.increment("vod_download_failed")
@@ -148,64 +147,11 @@ def get_vod_file_path(vod_data: Dict) -> Optional[str]:
         vod_data.get('flex_path')
     ]
     
-    # Add common flex server paths
-    for city_id, city_config in MEMBER_CITIES.items():
-        mount_path = city_config.get('mount_path', f'/mnt/{city_id}')
-        if mount_path and os.path.ismount(mount_path):
-            # Check for VOD files in common directories
-            vod_dirs = [
-                os.path.join(mount_path, 'videos'),
-                os.path.join(mount_path, 'vod_content'),
-                os.path.join(mount_path, 'city_council'),
-                os.path.join(mount_path, 'meetings'),
-                os.path.join(mount_path, 'content'),
-                mount_path  # Root directory
-            ]
-            
-            for vod_dir in vod_dirs:
-                if os.path.exists(vod_dir):
-                    # Look for files that might match this VOD
-                    possible_files = [
-                        f"{vod_id}.mp4",
-                        f"{vod_id}.mov",
-                        f"{vod_id}.avi",
-                        f"{vod_id}.mkv",
-                        f"vod_{vod_id}.mp4",
-                        f"VOD_{vod_id}.mp4"
-                    ]
-                    
-                    # Also check for files with title-based names
-                    title = vod_data.get('title', '').replace(' ', '_').replace('/', '_')
-                    if title:
-                        possible_files.extend([
-                            f"{title}.mp4",
-                            f"{title}.mov",
-                            f"{title}.avi",
-                            f"{title}.mkv"
-                        ])
-                    
-                    for filename in possible_files:
-                        file_path = os.path.join(vod_dir, filename)
-                        if os.path.exists(file_path) and os.access(file_path, os.R_OK):
-                            logger.info(f"Found VOD file on mounted drive: {file_path}")
-                            return file_path
-                    
-                    # Search recursively for video files that might match
-                    try:
-                        for root, dirs, files in os.walk(vod_dir):
-                            for file in files:
-                                if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.m4v')):
-                                    file_path = os.path.join(root, file)
-                                    # Check if this file might be our VOD
-                                    if (str(vod_id) in file or 
-                                        title.lower() in file.lower() or
-                                        vod_data.get('title', '').lower() in file.lower()):
-                                        if os.access(file_path, os.R_OK):
-                                            logger.info(f"Found matching VOD file: {file_path}")
-                                            return file_path
-                    except OSError as e:
-                        logger.warning(f"Error searching directory {vod_dir}: {e}")
-                        continue
+    # Look the VOD up in the media catalog instead of walking every mount
+    catalog_path = find_vod_file(vod_id, vod_data.get('title'))
+    if catalog_path:
+        logger.info(f"Found VOD file on mounted drive: {catalog_path}")
+        return catalog_path
     
     # Add local paths to the search list
     local_paths.extend([
@@ -258,55 +204,59 @@ def get_vod_file_path(vod_data: Dict) -> Optional[str]:
 def validate_video_file(video_path: str) -> bool:
     """Validate video file integrity and format."""
     try:
-        # Use ffprobe to check video file
-        result = subprocess.run([
-            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
-            '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', video_path
-        ], capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0 and result.stdout.strip():
+        # Served from the shared probe cache; later quality checks reuse the probe
+        if codec_names(probe_media(video_path), 'video'):
             logger.info(f"Video validation passed: {video_path}")
             return True
-        else:
-            logger.error(f"Video validation failed: {video_path}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"Video validation error for {video_path}: {e}")
+        logger.error(f"Video validation failed: {video_path}")
         return False
 
-def create_captioned_video(video_path: str, scc_path: str, output_path: str) -> bool:
-    """Create video with embedded captions using ffmpeg."""
-    try:
-        # Use ffmpeg to embed SCC captions into video
-        cmd = [
-            'ffmpeg', '-i', video_path,
-            '-vf', f'subtitles={scc_path}',
-            '-c:a', 'copy',  # Copy audio without re-encoding
-            '-c:v', 'libx264',  # Use H.264 codec
-            '-preset', 'medium',  # Balance between speed and quality
-            '-crf', '23',  # Constant rate factor for quality
-            '-y',  # Overwrite output file
-            output_path
-        ]
-        
-        logger.info(f"Starting video retranscoding: {video_path}")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
-        
-        if result.returncode == 0:
-            logger.info(f"Video retranscoding completed: {output_path}")
-            return True
-        else:
-            logger.error(f"Video retranscoding failed: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error(f"Video retranscoding timed out: {video_path}")
-        return False
     except Exception as e:
-        logger.error(f"Video retranscoding error: {e}")
+        logger.error(f"Video validation error for {video_path}: {e}")
         return False
 
+
+def create_captioned_video(video_path: str, scc_path: str, output_path: str,
+                           modes: Optional[List[str]] = None) -> bool:
+    """Create video with embedded captions using ffmpeg.
+
+    Defaults to burning the captions in, which keeps ``output_path`` exact;
+    pass ``modes`` (see ``core.caption_muxer``) to allow stream-copy muxing.
+    Progress streams to the calling task; ``FfmpegCancelled`` propagates when
+    the task is stopped.
+    """
+    result = embed_captions(
+        video_path, scc_path, output_path, modes=modes or ["burn_in"]
+    )
+    if not result['success']:
+        logger.error(f"Video retranscoding failed: {result['error']}")
+    return result['success']
+
+
+def embed_vod_captions(video_path: str, scc_path: str, city_id: str) -> Dict[str, Any]:
+    """Embed captions into ``<name>_captioned`` in the city's VOD storage.
+
+    Uses the cheapest mode this city's targets accept; burn-in (a full
+    re-encode) only when the policy requires it.  Returns the
+    ``embed_captions`` result and raises when no non-empty output was made.
+    """
+    city_storage_path = get_city_vod_storage_path(city_id)
+    os.makedirs(city_storage_path, exist_ok=True)
+
+    name_without_ext = os.path.splitext(os.path.basename(video_path))[0]
+    output_path = os.path.join(city_storage_path, f"{name_without_ext}_captioned.mp4")
+
+    embed = embed_captions(video_path, scc_path, output_path, city_id=city_id)
+    if not embed['success']:
+        raise Exception(f"Video retranscoding failed: {embed['error']}")
+    output_path = embed['output_path']
+
+    if not os.path.exists(output_path):
+        raise Exception(f"Output file not created: {output_path}")
+    if os.path.getsize(output_path) == 0:
+        raise Exception("Output file is empty")
+    return embed
+
 def get_city_vod_storage_path(city_id: str) -> str:
     """Get storage path for VOD files for a specific city."""
     city_config = MEMBER_CITIES.get(city_id, {})
@@ -346,107 +296,116 @@ def process_recent_vods() -> Dict[str, Any]:
         Dictionary with processing results for each city
     """
     logger.info("Starting VOD processing for all member cities")
-    
+
     client = CablecastAPIClient()
     transcription_service = TranscriptionService()
     results = {}
-    
+
     # Import transcription function for integration
     from core.transcription import _transcribe_with_faster_whisper
-    
+
     for city_id, city_config in MEMBER_CITIES.items():
         city_name = city_config['name']
         mount_path = city_config['mount_path']
         logger.info(f"Processing VODs for {city_name} ({city_id}) from {mount_path}")
-        
+
         try:
             # Check if flex server mount is accessible
             if not os.path.ismount(mount_path):
                 logger.warning(f"Flex server {city_id} not mounted at {mount_path}")
                 results[city_id] = {'processed': 0, 'errors': ['Flex server not mounted'], 'message': 'Mount not available'}
                 continue
-            
+
             if not os.access(mount_path, os.R_OK):
                 logger.warning(f"Flex server {city_id} not readable at {mount_path}")
                 results[city_id] = {'processed': 0, 'errors': ['Flex server not readable'], 'message': 'Mount not accessible'}
                 continue
-            
+
             # Get recent VODs from flex server (direct file access)
             recent_vods = get_recent_vods_from_flex_server(mount_path, city_id, limit=5)
-            
+
             if not recent_vods:
                 logger.info(f"No recent VODs found for {city_name} on {mount_path}")
                 results[city_id] = {'processed': 0, 'errors': [], 'message': 'No VODs found on flex server'}
                 continue
-            
+
             # Filter VODs by city-specific patterns
             city_patterns = map_city_to_vod_pattern(city_id)
             filtered_vods = []
-            
+
             for vod in recent_vods:
                 vod_title = vod.get('title', '').lower()
                 if any(pattern in vod_title for pattern in city_patterns):
                     filtered_vods.append(vod)
                     logger.info(f"Found city-specific VOD: {vod.get('title')} (Path: {vod.get('file_path')})")
-            
+
             if not filtered_vods:
                 logger.info(f"No city-specific VODs found for {city_name}")
                 results[city_id] = {'processed': 0, 'errors': [], 'message': 'No city-specific VODs found'}
                 continue
-            
+
             city_results = {
                 'processed': 0,
                 'errors': [],
                 'vods_processed': []
             }
-            
-            # Process videos one at a time (sequential processing)
+
+            # One pipeline per VOD; stage queues overlap consecutive VODs
+            from core.tasks.vod_pipeline import start_vod_pipeline
             for i, vod in enumerate(filtered_vods[:5]):
                 try:
-                    # Add to task queue for sequential processing
                     vod_id = vod.get('id', f"flex_{city_id}_{i}")
                     vod_title = vod.get('title', 'Unknown')
                     vod_path = vod.get('file_path', '')
-                    
-                    # Create a unique job name for the VOD
-                    job_name = f"VOD_{vod_id}_{city_id}"
-                    
-                    # Process individual VOD with Celery (one at a time)
-                    vod_result = process_single_vod.delay(vod_id, city_id, vod_path)
-                    
+
+                    pipeline = start_vod_pipeline(vod_id, city_id, vod_path)
+
                     city_results['vods_processed'].append({
                         'vod_id': vod_id,
                         'title': vod_title,
                         'file_path': vod_path,
-                        'task_id': vod_result.id,
+                        'task_id': pipeline['task_ids']['locate'],
+                        'pipeline_id': pipeline['pipeline_id'],
                         'status': 'queued',
                         'position': i + 1
                     })
                     city_results['processed'] += 1
-                    
-                    logger.info(f"Queued VOD {vod_id} ({vod_title}) for sequential processing")
-                    
+
+                    logger.info(
+                        f"Queued VOD pipeline {pipeline['pipeline_id']} "
+                        f"for {vod_id} ({vod_title})"
+                    )
+
                 except Exception as e:
                     error_msg = f"Failed to queue VOD {vod.get('id', 'unknown')}: {e}"
                     logger.error(error_msg)
                     city_results['errors'].append(error_msg)
-            
+
             results[city_id] = city_results
-            logger.info(f"Queued {city_results['processed']} VODs for {city_name} (sequential processing)")
-            
+            logger.info(
+                f"Queued {city_results['processed']} VOD pipelines for {city_name}"
+            )
+
         except Exception as e:
             error_msg = f"Error processing VODs for {city_name}: {e}"
             logger.error(error_msg)
             results[city_id] = {'processed': 0, 'errors': [error_msg]}
-    
+
     # Send summary alert
     total_processed = sum(r.get('processed', 0) for r in results.values())
     total_errors = sum(len(r.get('errors', [])) for r in results.values())
-    
+
     if total_processed > 0:
-        send_alert("info", f"VOD processing completed: {total_processed} VODs queued for sequential processing, {total_errors} errors")
-    
-    logger.info(f"VOD processing completed: {total_processed} VODs queued across all cities (sequential processing)")
+        send_alert(
+            "info",
+            f"VOD processing completed: {total_processed} VOD pipelines queued, "
+            f"{total_errors} errors",
+        )
+
+    logger.info(
+        f"VOD processing completed: {total_processed} VOD pipelines queued "
+        "across all cities"
+    )
     return results
 
 def get_recent_vods_from_flex_server(mount_path: str, city_id: str, limit: int = 5) -> List[Dict]:
@@ -503,117 +462,114 @@ def get_recent_vods_from_flex_server(mount_path: str, city_id: str, limit: int =
         logger.error(f"Error listing recent VODs for {city_id} via service: {e}")
         return []
 
+
+def locate_vod(
+    vod_id, city_id: str, video_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Find the VOD's video and check it still needs captions and has storage.
+
+    Returns ``{'video_path': ...}``, or ``{'skipped': reason}`` when the VOD
+    is already captioned.  Raises ``VODError`` with ``details['deferred']``
+    when the Cablecast API is unavailable (worth retrying) and an exception
+    when the file cannot be found or storage is unusable.
+    """
+    client = CablecastAPIClient()
+    # Prioritize local file access from mounted drives
+    if video_path and os.path.exists(video_path):
+        logger.info(f"Processing local file: {video_path}")
+        local_video_path = video_path
+    else:
+        # Try to find the file on mounted drives first
+        logger.info(f"Searching for VOD {vod_id} on mounted drives")
+
+        # Create a minimal VOD data structure for local file search
+        vod_data = {
+            'id': vod_id,
+            'title': f"VOD_{vod_id}",
+            'city_id': city_id
+        }
+
+        # Search for the file on mounted drives
+        local_video_path = get_vod_file_path(vod_data)
+
+        if not local_video_path:
+            # Fallback to Cablecast API only if local file not found
+            logger.info(
+                f"No local file found, attempting to get VOD {vod_id} "
+                "from Cablecast API"
+            )
+            try:
+                vod_data = client.get_vod(vod_id)
+                if vod_data:
+                    local_video_path = get_vod_file_path(vod_data)
+            except Exception as api_exc:
+                logger.error(f"Cablecast API error: {api_exc}")
+                send_alert(
+                    "error",
+                    f"Cablecast API error: {api_exc}",
+                    vod_id=vod_id,
+                    city_id=city_id,
+                )
+                raise VODError(
+                    f"Cablecast API unavailable: {api_exc}", details={'deferred': True}
+                )
+
+        if not local_video_path:
+            raise Exception(
+                f"No video file found for VOD {vod_id} on mounted drives or via API"
+            )
+
+    # Check if VOD already has captions (only if we have VOD ID from API)
+    if vod_id and not str(vod_id).startswith('flex_'):
+        try:
+            existing_captions = client.get_vod_captions(vod_id)
+            if existing_captions:
+                logger.info(f"VOD {vod_id} already has captions, skipping captioning")
+                return {'video_path': local_video_path, 'skipped': 'captions_exist'}
+        except Exception as e:
+            logger.warning(f"Could not check for existing captions: {e}")
+
+    # --- Storage check before generating captions ---
+    city_storage_path = get_city_vod_storage_path(city_id)
+    storage_mount = os.path.dirname(city_storage_path)
+    if not os.path.ismount(storage_mount):
+        logger.error(f"Storage mount unavailable: {storage_mount}")
+        send_alert("error", f"Storage mount unavailable: {storage_mount}")
+        raise Exception(f"Storage mount unavailable: {storage_mount}")
+    if not os.access(storage_mount, os.W_OK):
+        logger.error(f"Storage not writable: {storage_mount}")
+        send_alert("error", f"Storage not writable: {storage_mount}")
+        raise Exception(f"Storage not writable: {storage_mount}")
+
+    return {'video_path': local_video_path}
+
+
 @celery_app.task(name="vod_processing.process_single_vod")
 @track_vod_processing
 def process_single_vod(vod_id: int, city_id: str, video_path: str = None) -> Dict[str, Any]:
-    """Process a single VOD: download, caption, retranscode, and validate."""
+    """Process a single VOD: locate, probe, transcribe, caption, upload, validate.
+
+    Starts the VOD pipeline chain (``core.tasks.vod_pipeline``) and returns;
+    each stage runs on its own queue and reports into the pipeline state.
+    """
     logger.info(f"Processing VOD {vod_id} for city {city_id}")
     if video_path:
         logger.info(f"Using direct file path: {video_path}")
-    
-    # Import transcription function for integration
-    from core.transcription import _transcribe_with_faster_whisper
-    
-    client = CablecastAPIClient()
-    transcription_service = TranscriptionService()
+
+    from core.tasks.vod_pipeline import start_vod_pipeline
     try:
-        # Prioritize local file access from mounted drives
-        if video_path and os.path.exists(video_path):
-            logger.info(f"Processing local file: {video_path}")
-            local_video_path = video_path
-        else:
-            # Try to find the file on mounted drives first
-            logger.info(f"Searching for VOD {vod_id} on mounted drives")
-            
-            # Create a minimal VOD data structure for local file search
-            vod_data = {
-                'id': vod_id,
-                'title': f"VOD_{vod_id}",
-                'city_id': city_id
-            }
-            
-            # Search for the file on mounted drives
-            local_video_path = get_vod_file_path(vod_data)
-            
-            if not local_video_path:
-                # Fallback to Cablecast API only if local file not found
-                logger.info(f"No local file found, attempting to get VOD {vod_id} from Cablecast API")
-                try:
-                    vod_data = client.get_vod(vod_id)
-                    if vod_data:
-                        local_video_path = get_vod_file_path(vod_data)
-                except Exception as api_exc:
-                    logger.error(f"Cablecast API error: {api_exc}")
-                    send_alert("error", f"Cablecast API error: {api_exc}", vod_id=vod_id, city_id=city_id)
-                    return {
-                        'vod_id': vod_id,
-                        'city_id': city_id,
-                        'status': 'deferred',
-                        'error': str(api_exc),
-                        'message': 'Cablecast API unavailable, task deferred'
-                    }
-            
-            if not local_video_path:
-                raise Exception(f"No video file found for VOD {vod_id} on mounted drives or via API")
-        
-        # Validate video file
-        if not validate_video_file(local_video_path):
-            raise Exception(f"Video file validation failed for {local_video_path}")
-        
-        # Check if VOD already has captions (only if we have VOD ID from API)
-        if vod_id and not vod_id.startswith('flex_'):
-            try:
-                existing_captions = client.get_vod_captions(vod_id)
-                if existing_captions:
-                    logger.info(f"VOD {vod_id} already has captions, skipping captioning")
-                    return {
-                        'vod_id': vod_id,
-                        'city_id': city_id,
-                        'status': 'skipped',
-                        'reason': 'captions_exist',
-                        'message': 'VOD already has captions'
-                    }
-            except Exception as e:
-                logger.warning(f"Could not check for existing captions: {e}")
-        
-        # --- Storage check before generating captions ---
-        city_storage_path = get_city_vod_storage_path(city_id)
-        storage_mount = os.path.dirname(city_storage_path)
-        if not os.path.ismount(storage_mount):
-            logger.error(f"Storage mount unavailable: {storage_mount}")
-            send_alert("error", f"Storage mount unavailable: {storage_mount}")
-            return {
-                'vod_id': vod_id,
-                'city_id': city_id,
-                'status': 'failed',
-                'error': 'Storage unavailable',
-                'message': f'Storage mount unavailable: {storage_mount}'
-            }
-        if not os.access(storage_mount, os.W_OK):
-            logger.error(f"Storage not writable: {storage_mount}")
-            send_alert("error", f"Storage not writable: {storage_mount}")
-            return {
-                'vod_id': vod_id,
-                'city_id': city_id,
-                'status': 'failed',
-                'error': 'Storage not writable',
-                'message': f'Storage not writable: {storage_mount}'
-            }
-        
-        # Queue transcription via Celery; do not block inside this task
-        from core.tasks.transcription import run_whisper_transcription as transcribe_task
-        async_result = transcribe_task.delay(local_video_path)
-        logger.info(f"Queued transcription task {async_result.id} for VOD {vod_id}")
+        pipeline = start_vod_pipeline(vod_id, city_id, video_path)
         return {
             'vod_id': vod_id,
             'city_id': city_id,
             'status': 'queued',
-            'transcription_task_id': async_result.id,
-            'message': 'Transcription queued; downstream steps will run asynchronously'
+            'pipeline_id': pipeline['pipeline_id'],
+            'task_ids': pipeline['task_ids'],
+            'message': (
+                'VOD pipeline queued: locate, probe, transcribe, caption, upload, '
+                'validate'
+            ),
         }
-        
-        # Note: Upload and validation tasks are now handled asynchronously
-        # to avoid the "Never call result.get() within a task!" error
     except Exception as e:
         error_msg = f"VOD processing failed for {vod_id}: {e}"
         logger.error(error_msg)
@@ -750,28 +706,9 @@ def retranscode_vod_with_captions(vod_id: int, video_path: str, scc_path: str, c
     logger.info(f"Retranscoding VOD {vod_id} with captions")
     
     try:
-        # Create output path for captioned video
-        city_storage_path = get_city_vod_storage_path(city_id)
-        os.makedirs(city_storage_path, exist_ok=True)
-        
-        video_name = os.path.basename(video_path)
-        name_without_ext = os.path.splitext(video_name)[0]
-        output_path = os.path.join(city_storage_path, f"{name_without_ext}_captioned.mp4")
-        
-        # Create captioned video
-        success = create_captioned_video(video_path, scc_path, output_path)
-        
-        if not success:
-            raise Exception("Video retranscoding failed")
-        
-        # Validate output file
-        if not os.path.exists(output_path):
-            raise Exception(f"Output file not created: {output_path}")
-        
-        # Get file size for validation
+        embed = embed_vod_captions(video_path, scc_path, city_id)
+        output_path = embed['output_path']
         file_size = os.path.getsize(output_path)
-        if file_size == 0:
-            raise Exception("Output file is empty")
         
         logger.info(f"Video retranscoding completed for VOD {vod_id}: {output_path}")
         
@@ -779,7 +716,10 @@ def retranscode_vod_with_captions(vod_id: int, video_path: str, scc_path: str, c
             'success': True,
             'output_path': output_path,
             'file_size': file_size,
-            'message': 'Video retranscoding completed successfully'
+            'caption_mode': embed['mode'],
+            'seconds': embed['seconds'],
+            'time_saved_seconds': embed['time_saved_seconds'],
+            'message': f"Captions embedded ({embed['mode']}) successfully"
         }
         
     except Exception as e:
@@ -788,6 +728,7 @@ def retranscode_vod_with_captions(vod_id: int, video_path: str, scc_path: str, c
         return {
             'success': False,
             'error': str(e),
+            'cancelled': isinstance(e, FfmpegCancelled),
             'message': error_msg
         }
 
@@ -853,8 +794,11 @@ def validate_vod_quality(vod_id: int, video_path: str) -> Dict[str, Any]:
         quality_score = 0
         validation_results = {}
         
+        # One cached ffprobe answers the integrity, duration and caption checks
+        info = probe_media(video_path)
+
         # Check file integrity
-        if validate_video_file(video_path):
+        if codec_names(info, 'video'):
             quality_score += 25
             validation_results['file_integrity'] = True
         else:
@@ -869,37 +813,17 @@ def validate_vod_quality(vod_id: int, video_path: str) -> Dict[str, Any]:
             validation_results['file_size'] = False
         
         # Check video duration (basic check)
-        try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', video_path
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and result.stdout.strip():
-                duration = float(result.stdout.strip())
-                if duration > 0:
-                    quality_score += 25
-                    validation_results['duration'] = True
-                else:
-                    validation_results['duration'] = False
-            else:
-                validation_results['duration'] = False
-        except:
+        if (duration_of(info) or 0) > 0:
+            quality_score += 25
+            validation_results['duration'] = True
+        else:
             validation_results['duration'] = False
         
         # Check for caption stream (if embedded)
-        try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'error', '-select_streams', 's',
-                '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', video_path
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and result.stdout.strip():
-                quality_score += 25
-                validation_results['captions_embedded'] = True
-            else:
-                validation_results['captions_embedded'] = False
-        except:
+        if streams_of(info, 'subtitle'):
+            quality_score += 25
+            validation_results['captions_embedded'] = True
+        else:
             validation_results['captions_embedded'] = False
         
         logger.info(f"Quality validation completed for VOD {vod_id}: {quality_score}/100")
@@ -961,4 +885,23 @@ def cleanup_temp_files() -> Dict[str, Any]:
             'success': False,
             'error': str(e),
             'message': error_msg
-        } 
\ No newline at end of file
+        }
+
+
+@celery_app.task(name="vod_processing.refresh_media_catalog")
+def refresh_media_catalog(full: bool = False) -> Dict[str, Any]:
+    """Refresh the media catalog and probe durations of new files.
+
+    Lookups refresh stale cities themselves; this sweep keeps the catalog
+    warm and, with ``full``, picks up files rewritten in place.
+    """
+    catalog = get_media_catalog()
+    stats = catalog.refresh(full=full)
+    stats['probed'] = catalog.probe_durations()
+    logger.info(
+        f"Media catalog refresh ({'full' if full else 'incremental'}): "
+        f"{stats['files']} files, "
+        f"{stats['dirs_scanned']} dirs listed, {stats['dirs_unchanged']} unchanged, "
+        f"{stats['removed']} removed, {stats['probed']} probed in {stats['seconds']}s"
+    )
+    return stats
@@ -0,0 +1,154 @@
+"""Single-process vs segment-parallel transcoding benchmark.
+
+Generates a test video with ffmpeg's ``testsrc2`` and ``sine`` sources (a
+keyframe every two seconds, like the flex-server recordings) plus a
+synthetic caption track, then transcodes it with caption burn-in once
+through one ffmpeg process and once through ``core.segment_transcoder``'s
+segment pool.  Reports wall time, speed (x realtime), speedup, output size
+and the output frame count, so a concat that drops or duplicates frames
+shows up as a mismatch.
+
+Example:
+    $ python scripts/benchmarks/bench_transcode.py --minutes 10 --workers 4
+    $ python scripts/benchmarks/bench_transcode.py --quality 1 \
+          --output transcode_bench.json
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from core.segment_transcoder import transcode
+
+RESULTS_SCHEMA = 1
+
+
+def generate_test_video(
+    path: str, seconds: float, size: str = "1280x720", rate: int = 30
+) -> str:
+    """Write an H.264/AAC test pattern with a keyframe every two seconds."""
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostdin",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size={size}:rate={rate}",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=440:sample_rate=48000",
+            "-t",
+            str(seconds),
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            str(rate * 2),
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-y",
+            path,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return path
+
+
+def synthetic_captions(seconds: float, cue_seconds: float = 4.0) -> List[tuple]:
+    return [(t, t + cue_seconds - 0.5, f"Caption {i}: the council discusses item {i}")
+            for i, t in enumerate(range(0, int(seconds), int(cue_seconds)))]
+
+
+def frame_count(path: str) -> Optional[int]:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-count_packets",
+         "-show_entries", "stream=nb_read_packets", "-of", "csv=p=0", path],
+        capture_output=True, text=True,
+    )
+    try:
+        return int(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def run_benchmark(minutes: float, workers: int, quality: Optional[int] = None,
+                  burn_in: bool = True) -> Dict[str, Any]:
+    seconds = minutes * 60
+    results = []
+    with tempfile.TemporaryDirectory(prefix="transcode_bench_") as tmp:
+        source = generate_test_video(os.path.join(tmp, "source.mp4"), seconds)
+        captions = synthetic_captions(seconds) if burn_in else None
+        source_frames = frame_count(source)
+        for label, segmented in (("single", False), ("segmented", True)):
+            output = os.path.join(tmp, f"{label}.mp4")
+            started = time.perf_counter()
+            try:
+                stats = transcode(source, output, quality=quality, captions=captions,
+                                  workers=workers, segmented=segmented)
+            except Exception as e:
+                results.append({"path": label, "error": str(e)})
+                continue
+            wall = time.perf_counter() - started
+            results.append({
+                "path": label,
+                "mode": stats["mode"],
+                "segments": stats["segments"],
+                "workers": stats["workers"],
+                "seconds": round(wall, 2),
+                "speed": round(seconds / wall, 2),
+                "size_mb": round(os.path.getsize(output) / 1024 ** 2, 1),
+                "frames": frame_count(output),
+            })
+    single = next(
+        (r for r in results if r["path"] == "single" and "error" not in r), None
+    )
+    for r in results:
+        if single and "error" not in r:
+            r["speedup"] = round(single["seconds"] / r["seconds"], 2)
+    return {
+        "schema": RESULTS_SCHEMA,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "source_seconds": seconds,
+        "source_frames": source_frames,
+        "quality": quality,
+        "burn_in": burn_in,
+        "results": results,
+    }
+
+
+def format_table(document: Dict[str, Any]) -> str:
+    header = (f"{'path':<10} {'segments':>8} {'workers':>7} {'wall s':>8} {'speed':>7} "
+              f"{'speedup':>8} {'MB':>7} {'frames':>8}")
+    lines = [header, "-" * len(header)]
+    for r in document["results"]:
+        if "error" in r:
+            lines.append(f"{r['path']:<10} ERROR {r['error'][-200:]}")
+            continue
+        lines.append(
+            f"{r['path']:<10} {r['segments']:>8} {r['workers']:>7} "
+            f"{r['seconds']:>8.2f} {r['speed']:>6.2f}x {r.get('speedup', 0):>7.2f}x "
+            f"{r['size_mb']:>7.1f} "
+            f"{r['frames'] if r['frames'] is not None else '-':>8}"
+        )
+    lines.append(f"source frames: {document['source_frames']}")
+    return "\n".join(lines)
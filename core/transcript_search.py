@@ -0,0 +1,449 @@
+"""Persistent full-text search over every transcript on the flex mounts.
+
+Finding where a topic came up in a meeting used to mean grepping SCC files
+on nine NFS mounts, which took minutes and could not see the hex-encoded
+CEA-608 captions at all.  This index keeps an on-disk inverted index (SQLite
+FTS5) of caption text, so a query resolves to transcripts *and* the caption
+timestamps within them in milliseconds.
+
+Each caption is one FTS row.  Its rowid packs the transcript id and the
+caption's position (``transcript_id << 20 | index``), so dropping or
+re-indexing a transcript is a single rowid range delete and no separate
+caption table is needed.
+
+Key Features:
+- Incremental: transcripts are re-read only when size or mtime changes,
+  and finished transcriptions are indexed as soon as the task completes
+- Phrase (``"motion to approve"``), prefix (``budg*``) and plain AND queries
+- Paginated, BM25-ranked hits with start/end seconds, SMPTE timecode and a
+  highlighted snippet
+- Periodic reconciliation scan that also prunes transcripts that vanished
+
+Example:
+    >>> from core.transcript_search import get_transcript_index
+    >>> index = get_transcript_index()
+    >>> index.update_from_directories({"flex1": "/mnt/flex-1"})
+    {'indexed': 412, 'unchanged': 0, 'removed': 0, 'errors': 0, ...}
+    >>> index.search('"street reconstruction" budg*', page=1, per_page=20)["total"]
+    37
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from core.caption_sink import CAPTION_WRITERS
+from core.cea608 import seconds_to_timecode
+from core.config import (
+    FLEX_PATHS,
+    TRANSCRIPT_SEARCH_ENABLED,
+    TRANSCRIPT_SEARCH_INDEX_PATH,
+)
+from core.monitoring.metrics import record_metric
+from core.scc_parser import iter_captions
+
+# Caption position bits in the FTS rowid (a meeting never has a million captions)
+CAPTION_BITS = 20
+MAX_PER_PAGE = 100
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".m4v", ".avi", ".wmv", ".mpg", ".ts")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    scc_path TEXT NOT NULL UNIQUE,
+    video_path TEXT,
+    title TEXT NOT NULL,
+    mount TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    duration REAL NOT NULL DEFAULT 0,
+    captions INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcripts_mount ON transcripts (mount);
+CREATE VIRTUAL TABLE IF NOT EXISTS captions_fts USING fts5(
+    text,
+    start UNINDEXED,
+    end UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r"\w+")
+
+
+def build_match_query(query: str) -> str:
+    """Translate a user query into an FTS5 ``MATCH`` expression.
+
+    Quoted text is a phrase, a trailing ``*`` makes a prefix query and every
+    term must match.  Everything is re-quoted, so FTS5 operators and syntax
+    characters in user input are matched as text rather than parsed.
+    """
+    parts: List[str] = []
+    for phrase, term in _QUERY_TOKEN_RE.findall(query or ""):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                parts.append('"' + " ".join(words) + '"')
+            continue
+        prefix = term.endswith("*")
+        words = _WORD_RE.findall(term)
+        if not words:
+            continue
+        quoted = '"' + " ".join(words) + '"'
+        parts.append(quoted + "*" if prefix else quoted)
+    if not parts:
+        raise ValueError("Search query has no searchable terms")
+    return " ".join(parts)
+
+
+def _find_video(scc_path: str) -> Optional[str]:
+    base = os.path.splitext(scc_path)[0]
+    for ext in VIDEO_EXTENSIONS:
+        for candidate in (base + ext, base + ext.upper()):
+            if os.path.exists(candidate):
+                return candidate
+    return None
+
+
+def _is_primary_scc(name: str) -> bool:
+    """True for ``meeting.scc`` but not a second format's ``meeting.scc608.scc``."""
+    lower = name.lower()
+    if not lower.endswith(".scc"):
+        return False
+    stem = lower[:-4]
+    return "." not in stem or stem.rsplit(".", 1)[1] not in CAPTION_WRITERS
+
+
+class TranscriptSearchIndex:
+    """SQLite FTS5 index of caption text keyed by transcript and timestamp."""
+
+    def __init__(self, index_path: str = TRANSCRIPT_SEARCH_INDEX_PATH):
+        self.index_path = index_path
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across forked workers
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _rowid_range(transcript_id: int) -> Tuple[int, int]:
+        low = transcript_id << CAPTION_BITS
+        return low, low + (1 << CAPTION_BITS) - 1
+
+    def _delete_captions(self, conn: sqlite3.Connection, transcript_id: int) -> None:
+        conn.execute("DELETE FROM captions_fts WHERE rowid BETWEEN ? AND ?",
+                     self._rowid_range(transcript_id))
+
+    def add_transcript(self, scc_path: str, video_path: Optional[str] = None,
+                       mount: Optional[str] = None, force: bool = False) -> bool:
+        """Index ``scc_path``; return ``False`` when it was already up to date."""
+        scc_path = os.path.abspath(scc_path)
+        st = os.stat(scc_path)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, size, mtime_ns FROM transcripts WHERE scc_path = ?",
+                (scc_path,),
+            ).fetchone()
+        if row and not force and row[1] == st.st_size and row[2] == st.st_mtime_ns:
+            return False
+
+        captions = []
+        for i, (start, end, text) in enumerate(iter_captions(scc_path)):
+            if i >> CAPTION_BITS:
+                logger.warning(
+                    f"Transcript {scc_path} truncated at {i} captions for search"
+                )
+                break
+            captions.append((i, text, start, end))
+        duration = max((c[3] for c in captions), default=0.0)
+
+        with self._connect() as conn:
+            values = (
+                video_path or _find_video(scc_path),
+                os.path.splitext(os.path.basename(scc_path))[0],
+                mount,
+                st.st_size,
+                st.st_mtime_ns,
+                duration,
+                len(captions),
+                time.time(),
+            )
+            if row:
+                transcript_id = row[0]
+                self._delete_captions(conn, transcript_id)
+                conn.execute(
+                    "UPDATE transcripts SET video_path = ?, title = ?, "
+                    "mount = COALESCE(?, mount), size = ?, mtime_ns = ?, duration = ?, "
+                    "captions = ?, indexed_at = ? WHERE id = ?",
+                    values + (transcript_id,),
+                )
+            else:
+                transcript_id = conn.execute(
+                    "INSERT INTO transcripts (scc_path, video_path, title, mount, "
+                    "size, mtime_ns, duration, captions, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (scc_path,) + values,
+                ).lastrowid
+            base = transcript_id << CAPTION_BITS
+            conn.executemany(
+                "INSERT INTO captions_fts (rowid, text, start, end) "
+                "VALUES (?, ?, ?, ?)",
+                [(base + i, text, start, end) for i, text, start, end in captions],
+            )
+        return True
+
+    def remove_transcript(self, scc_path: str) -> bool:
+        """Drop ``scc_path`` from the index; return whether it was present."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id FROM transcripts WHERE scc_path = ?",
+                (os.path.abspath(scc_path),),
+            ).fetchone()
+            if not row:
+                return False
+            self._delete_captions(conn, row[0])
+            conn.execute("DELETE FROM transcripts WHERE id = ?", (row[0],))
+        return True
+
+    def get_transcript(self, transcript_id: int) -> Optional[Dict[str, Any]]:
+        """Return the stored metadata for one transcript, or ``None``."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, scc_path, video_path, title, mount, duration, captions, "
+                "indexed_at FROM transcripts WHERE id = ?",
+                (transcript_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(
+            zip(
+                (
+                    "id",
+                    "scc_path",
+                    "video_path",
+                    "title",
+                    "mount",
+                    "duration",
+                    "captions",
+                    "indexed_at",
+                ),
+                row,
+            )
+        )
+
+    def update_from_directories(
+        self, roots: Optional[Mapping[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Bring the index in line with the SCC files under ``roots``.
+
+        ``roots`` maps a mount name to its path (default: every flex mount).
+        Only new or changed files are parsed; indexed files under a scanned
+        root that no longer exist are removed.  Unmounted roots are skipped
+        so a dropped NFS mount does not empty the index.
+        """
+        roots = FLEX_PATHS if roots is None else roots
+        started = time.perf_counter()
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0, "errors": 0, "roots": []}
+        for mount, root in roots.items():
+            if not os.path.isdir(root):
+                logger.debug(f"Transcript search: {root} unavailable, skipping")
+                continue
+            root = os.path.abspath(root)
+            stats["roots"].append(mount)
+            prefix = root + os.sep
+            with self._connect() as conn:
+                known = {
+                    path: (size, mtime_ns)
+                    for path, size, mtime_ns in conn.execute(
+                        "SELECT scc_path, size, mtime_ns FROM transcripts "
+                        "WHERE substr(scc_path, 1, ?) = ?", (len(prefix), prefix)
+                    )
+                }
+            seen = set()
+            for dirpath, _dirs, names in os.walk(root):
+                for name in names:
+                    if not _is_primary_scc(name):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    seen.add(path)
+                    try:
+                        st = os.stat(path)
+                        if known.get(path) == (st.st_size, st.st_mtime_ns):
+                            stats["unchanged"] += 1
+                            continue
+                        self.add_transcript(path, mount=mount, force=True)
+                        stats["indexed"] += 1
+                    except (OSError, sqlite3.Error, UnicodeError) as e:
+                        logger.warning(f"Could not index transcript {path}: {e}")
+                        stats["errors"] += 1
+
+            for path in known.keys() - seen:
+                if self.remove_transcript(path):
+                    stats["removed"] += 1
+
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def search(self, query: str, page: int = 1, per_page: int = 20,
+               mount: Optional[str] = None) -> Dict[str, Any]:
+        """Return one page of BM25-ranked caption hits for ``query``.
+
+        Raises ``ValueError`` for a query with no searchable terms.
+        """
+        match = build_match_query(query)
+        page = max(1, int(page))
+        per_page = min(max(1, int(per_page)), MAX_PER_PAGE)
+        where = "captions_fts MATCH ?"
+        params: List[Any] = [match]
+        if mount:
+            where += (
+                f" AND (captions_fts.rowid >> {CAPTION_BITS}) IN "
+                "(SELECT id FROM transcripts WHERE mount = ?)"
+            )
+            params.append(mount)
+
+        started = time.perf_counter()
+        with self._connect() as conn:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM captions_fts WHERE {where}", params
+            ).fetchone()[0]
+            rows = conn.execute(
+                "SELECT captions_fts.rowid, captions_fts.start, captions_fts.end, "
+                "captions_fts.text, "
+                "snippet(captions_fts, 0, '[', ']', '...', 16), "
+                "t.id, t.scc_path, t.video_path, t.title, t.mount "
+                "FROM captions_fts JOIN transcripts t "
+                f"ON t.id = (captions_fts.rowid >> {CAPTION_BITS}) "
+                f"WHERE {where} ORDER BY bm25(captions_fts) LIMIT ? OFFSET ?",
+                params + [per_page, (page - 1) * per_page],
+            ).fetchall()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record_metric("histogram", "transcript_search_ms", elapsed_ms)
+
+        hits = [
+            {
+                "transcript_id": transcript_id,
+                "title": title,
+                "mount": hit_mount,
+                "scc_path": scc_path,
+                "video_path": video_path,
+                "caption_index": rowid & ((1 << CAPTION_BITS) - 1),
+                "start": start,
+                "end": end,
+                "timecode": seconds_to_timecode(start),
+                "text": text,
+                "snippet": snippet,
+            }
+            for (
+                rowid,
+                start,
+                end,
+                text,
+                snippet,
+                transcript_id,
+                scc_path,
+                video_path,
+                title,
+                hit_mount,
+            ) in rows
+        ]
+        return {
+            "query": query,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page,
+            "took_ms": round(elapsed_ms, 2),
+            "hits": hits,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return transcript/caption counts overall and per mount."""
+        with self._connect() as conn:
+            transcripts, captions, hours, last = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(captions), 0), "
+                "COALESCE(SUM(duration), 0) / 3600.0, MAX(indexed_at) FROM transcripts"
+            ).fetchone()
+            mounts = {
+                mount or "": count
+                for mount, count in conn.execute(
+                    "SELECT mount, COUNT(*) FROM transcripts GROUP BY mount"
+                )
+            }
+        return {
+            "transcripts": transcripts,
+            "captions": captions,
+            "hours": round(hours, 1),
+            "mounts": mounts,
+            "last_indexed": last,
+            "index_bytes": (
+                os.path.getsize(self.index_path)
+                if os.path.exists(self.index_path)
+                else 0
+            ),
+        }
+
+
+# Global per-process handle (the index itself is shared on disk)
+_transcript_index: Optional[TranscriptSearchIndex] = None
+
+
+def get_transcript_index() -> TranscriptSearchIndex:
+    """Get the process-wide transcript search index."""
+    global _transcript_index
+    if _transcript_index is None:
+        _transcript_index = TranscriptSearchIndex()
+    return _transcript_index
+
+
+def _mount_for(path: str) -> Optional[str]:
+    path = os.path.abspath(path)
+    for mount, root in FLEX_PATHS.items():
+        if path.startswith(os.path.abspath(root) + os.sep):
+            return mount
+    return None
+
+
+def index_transcript(scc_path: str, video_path: Optional[str] = None) -> bool:
+    """Completion hook: add a freshly written transcript to the search index.
+
+    Returns ``False`` when search is disabled, the file is missing or the
+    index is unavailable; transcription never fails because of search.
+    """
+    if not TRANSCRIPT_SEARCH_ENABLED or not scc_path or not os.path.exists(scc_path):
+        return False
+    try:
+        get_transcript_index().add_transcript(
+            scc_path, video_path, mount=_mount_for(scc_path), force=True
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Could not add {scc_path} to transcript search: {e}")
+        return False
+
+
+__all__ = [
+    "TranscriptSearchIndex",
+    "build_match_query",
+    "get_transcript_index",
+    "index_transcript",
+]
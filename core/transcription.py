@@ -3,142 +3,401 @@
 # PURPOSE: Expose direct Whisper transcription utils and Celery wrapper used across VOD/tests
 # DEPENDENCIES: faster_whisper (optional at runtime), celery (for task path), loguru
 # MODIFICATION NOTES: v1.1 - Re-export save_scc_file for tests expecting it here
+#                     v1.2 - Models come from core.whisper_model_pool
+#                     v1.3 - Captions stream through core.caption_sink
+#                     v1.4 - Serial path journals segments and resumes from checkpoints
+#                     v1.5 - Results cached by content fingerprint
+#                            (core.transcription_cache)
+#                     v1.6 - Speech pre-screen skips silent files and trims the
+#                            decode range
 """
 
 import os
 import subprocess
 import tempfile
 import time
-from typing import Dict
+from typing import Dict, Iterable, Optional
 from loguru import logger
 from celery import current_task
-from core.config import WHISPER_MODEL, USE_GPU, LANGUAGE, COMPUTE_TYPE, BATCH_SIZE
+from core.config import (
+    WHISPER_MODEL,
+    USE_GPU,
+    LANGUAGE,
+    COMPUTE_TYPE,
+    BATCH_SIZE,
+    TRANSCRIPTION_MODE,
+    AUDIO_CACHE_ENABLED,
+    CAPTION_OUTPUT_FORMATS,
+    TRANSCRIPTION_CHECKPOINT_ENABLED,
+    TRANSCRIPTION_CACHE_ENABLED,
+    SPEECH_PRESCREEN_ENABLED,
+    SPEECH_PRESCREEN_SKIP_NO_SPEECH,
+)
+from core.whisper_model_pool import get_whisper_model
+from core.monitoring.metrics import record_metric
+# _seconds_to_scc_timestamp is re-exported under its legacy name
+from core.caption_sink import (  # noqa: F401
+    ProgressCallback,
+    StreamingCaptionSink,
+    seconds_to_scc_timestamp as _seconds_to_scc_timestamp,
+)
+from core.transcription_checkpoint import TranscriptionJournal
+from core.audio_cache import SAMPLE_RATE as STAGED_SAMPLE_RATE
+from core.speech_prescreen import DecodePlan, SpeechAnalysis, plan_decode
 
 
-def _transcribe_with_faster_whisper(video_path: str) -> Dict:
+# Decoding options shared by the serial and chunked transcription paths
+TRANSCRIBE_OPTIONS = dict(
+    language=LANGUAGE,
+    beam_size=5,
+    word_timestamps=True,
+    vad_filter=True,  # Filter out non-speech segments
+    vad_parameters=dict(min_silence_duration_ms=500),  # Reduce silence gaps
+)
+
+
+def _transcribe_with_faster_whisper(
+    video_path: str,
+    mode: Optional[str] = None,
+    workers: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    use_cache: bool = True,
+    options: Optional[Dict] = None,
+) -> Dict:
     """Direct transcription using faster-whisper library.
-    
+
     This function performs transcription directly without going through the service layer
     to avoid circular imports. It uses faster-whisper to transcribe the video and
     generates SCC format output for automatic captioning.
-    
+
     Args:
         video_path: Path to the video file to transcribe
-        
+        mode: ``"serial"`` or ``"chunked"`` (defaults to ``TRANSCRIPTION_MODE``)
+        workers: Process pool size for chunked mode
+        progress_callback: Called with ``(fraction, segments_written)`` as captions
+            stream out
+        use_cache: Consult the content-addressed result cache before decoding
+        options: faster-whisper decode options (defaults to ``TRANSCRIBE_OPTIONS``);
+            forwarded to chunked-mode workers
+
     Returns:
         Dictionary containing transcription results with SCC output path
     """
+    mode = (mode or TRANSCRIPTION_MODE).lower()
+    cached = _cached_transcription(video_path) if use_cache else None
+    if cached:
+        return cached
+    # Cheap energy pass before any model is loaded
+    speech = _speech_prescreen(video_path)
+    if speech is not None and not speech.has_speech():
+        if SPEECH_PRESCREEN_SKIP_NO_SPEECH:
+            return _no_speech_result(video_path, speech)
+        # Too little to trust a cut plan: let Whisper (and its VAD) hear everything
+        logger.info(
+            f"Pre-screen found {speech.speech_ratio:.1%} speech in {video_path}; "
+            "decoding it in full"
+        )
+        speech = None
+    if mode == "chunked":
+        # Chunked runs are not journalled: windows finish out of order, so an
+        # interrupted run re-decodes from the start
+        from core.chunked_transcription import transcribe_chunked
+        return transcribe_chunked(
+            video_path,
+            workers=workers,
+            progress_callback=progress_callback,
+            options=options,
+        )
+    if mode != "serial":
+        raise ValueError(f"Unknown transcription mode: {mode}")
+
     try:
-        from faster_whisper import WhisperModel
-        
-        # Initialize the model with optimized settings for caption generation
-        logger.info(f"Loading Whisper model: {WHISPER_MODEL}")
-        model = WhisperModel(
+        started = time.perf_counter()
+
+        # Reuse the process-resident model instead of loading one per job
+        model = get_whisper_model(
             WHISPER_MODEL,
-            device="cuda" if USE_GPU else "cpu",
             compute_type=COMPUTE_TYPE,
-            cpu_threads=BATCH_SIZE
+            cpu_threads=BATCH_SIZE,
+            device="cuda" if USE_GPU else "cpu",
         )
-        
+
+        scc_path = _scc_path_for(video_path)
+        journal = (
+            TranscriptionJournal(video_path, scc_path)
+            if TRANSCRIPTION_CHECKPOINT_ENABLED
+            else None
+        )
+        resume = journal.load() if journal else None
+
+        audio = _audio_input(video_path)
+        options = dict(TRANSCRIBE_OPTIONS if options is None else options)
+        start_offset = resume.offset if resume else 0.0
+        if start_offset > 0:
+            logger.info(
+                f"Resuming transcription of {video_path} at {start_offset:.1f}s "
+                f"({len(resume.segments)} journalled segments)"
+            )
+        plan: Optional[DecodePlan] = None
+        if isinstance(audio, str):
+            if start_offset > 0:
+                # Unstaged source: decode from the resume point ourselves and
+                # shift timestamps back (clip_timestamps is missing before
+                # faster-whisper 1.0 and is not honoured with vad_filter)
+                from core.audio_cache import decode_pcm
+                audio = decode_pcm(video_path, start=start_offset)
+                source_duration = start_offset + len(audio) / STAGED_SAMPLE_RATE
+                plan = DecodePlan(
+                    [(start_offset, source_duration)] if len(audio) else [],
+                    source_duration,
+                )
+        else:
+            # Staged audio: decode only the planned ranges (from the resume
+            # point, minus long silences) and map timestamps back afterwards
+            source_duration = len(audio) / STAGED_SAMPLE_RATE
+            plan = plan_decode(speech, start=start_offset) if speech is not None \
+                else DecodePlan([(start_offset, source_duration)], source_duration)
+            if plan.trimmed_seconds > start_offset:
+                logger.info(
+                    f"Pre-screen trimmed {plan.trimmed_seconds - start_offset:.0f}s "
+                    f"of silence from {video_path} ({len(plan.ranges)} speech ranges)"
+                )
+            if plan.ranges != [(0.0, source_duration)]:
+                audio = plan.gather(audio)
+
         # Transcribe the audio with optimized settings for captions
         logger.info(f"Starting transcription of {video_path}")
-        segments, info = model.transcribe(
-            video_path,
-            language=LANGUAGE,
-            beam_size=5,
-            word_timestamps=True,
-            vad_filter=True,  # Filter out non-speech segments
-            vad_parameters=dict(min_silence_duration_ms=500)  # Reduce silence gaps
-        )
-        
-        # Convert segments to list for processing
-        segments_list = list(segments)
-        
-        if not segments_list:
+        if plan is not None and not plan.ranges:
+            # Nothing left to decode after the resume point
+            segments, info = iter(()), None
+        else:
+            segments, info = model.transcribe(audio, **options)
+
+        if plan is not None:
+            duration = plan.source_duration
+        else:
+            duration = info.duration if hasattr(info, 'duration') else 0
+        language = info.language if hasattr(info, 'language') else LANGUAGE
+        remap = plan is not None and plan.ranges[:1] != [(0.0, plan.source_duration)]
+
+        # Stream segments to disk as they are decoded so memory stays flat;
+        # the journal lets a retried job pick up from the last checkpoint
+        if journal:
+            try:
+                journal.open(resume)
+            except OSError as e:
+                logger.warning(
+                    f"Transcription checkpoints disabled for {video_path}: {e}"
+                )
+                journal = None
+        try:
+            with StreamingCaptionSink(
+                scc_path,
+                formats=CAPTION_OUTPUT_FORMATS,
+                duration=duration,
+                progress_callback=progress_callback,
+            ) as sink:
+                for segment in (resume.segments if resume else ()):
+                    sink.write(segment)
+                for segment in segments:
+                    if remap:
+                        segment = {
+                            'start': plan.to_source(segment.start),
+                            'end': plan.to_source(segment.end, end=True),
+                            'text': segment.text,
+                            'words': [
+                                {
+                                    'start': plan.to_source(w.start),
+                                    'end': plan.to_source(w.end, end=True),
+                                    'word': w.word,
+                                }
+                                for w in (getattr(segment, 'words', None) or [])
+                            ],
+                        }
+                    sink.write(segment)
+                    if journal:
+                        journal.append(segment)
+        finally:
+            if journal:
+                journal.close()
+        if journal:
+            journal.discard()
+        segment_count = sink.count
+
+        if not segment_count:
             logger.warning(f"No speech segments found in {video_path}")
-            # Create empty SCC file
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            output_dir = os.path.dirname(video_path)
-            scc_path = os.path.join(output_dir, f"{base_name}.scc")
-            
-            with open(scc_path, 'w', encoding='utf-8') as f:
-                f.write("Scenarist_SCC V1.0\n\n")
-                f.write("00:00:00:00\t00:00:05:00\n")
-                f.write("[No speech detected]\n\n")
-            
-            return {
+            _write_empty_scc(scc_path)
+
+            return _remember_transcription(video_path, {
                 'output_path': scc_path,
                 'scc_path': scc_path,  # Correct SCC path
                 'segments': 0,
-                'duration': info.duration if hasattr(info, 'duration') else 0,
-                'language': info.language if hasattr(info, 'language') else LANGUAGE,
+                'duration': duration,
+                'language': language,
                 'status': 'completed',
                 'warning': 'No speech detected'
-            }
-        
-        # Generate output paths
-        base_name = os.path.splitext(os.path.basename(video_path))[0]
-        output_dir = os.path.dirname(video_path)
-        
-        # Generate SCC file
-        scc_path = os.path.join(output_dir, f"{base_name}.scc")
-        
-        # Write SCC file with proper formatting for broadcast captions
-        with open(scc_path, 'w', encoding='utf-8') as f:
-            f.write("Scenarist_SCC V1.0\n\n")
-            
-            for i, segment in enumerate(segments_list, 1):
-                # Convert timestamps to SCC format (HH:MM:SS:FF)
-                start_time = segment.start
-                end_time = segment.end
-                
-                # Convert to SCC timestamp format
-                start_scc = _seconds_to_scc_timestamp(start_time)
-                end_scc = _seconds_to_scc_timestamp(end_time)
-                
-                # Clean and format text for captions
-                caption_text = segment.text.strip()
-                # Remove extra whitespace and normalize
-                caption_text = ' '.join(caption_text.split())
-                
-                # Write caption entry
-                f.write(f"{start_scc}\t{end_scc}\n")
-                f.write(f"{caption_text}\n\n")
-        
+            })
+
+        processing_time = time.perf_counter() - started
+        rtf = (processing_time / duration) if duration else None
+        _record_real_time_factor('serial', rtf)
+
         logger.info(f"Transcription completed. SCC saved to: {scc_path}")
-        logger.info(f"Generated {len(segments_list)} caption segments")
-        
-        return {
-            'output_path': scc_path,
-            'scc_path': scc_path,  # Correct SCC path
-            'segments': len(segments_list),
-            'duration': info.duration if hasattr(info, 'duration') else 0,
-            'language': info.language if hasattr(info, 'language') else LANGUAGE,
-            'status': 'completed',
-            'model_used': WHISPER_MODEL,
-            'processing_time': time.time() if 'time' in globals() else None
-        }
-        
+        logger.info(f"Generated {segment_count} caption segments")
+
+        return _remember_transcription(
+            video_path,
+            {
+                'output_path': scc_path,
+                'scc_path': scc_path,  # Correct SCC path
+                'segments': segment_count,
+                'duration': duration,
+                'language': language,
+                'status': 'completed',
+                'model_used': WHISPER_MODEL,
+                'mode': 'serial',
+                'processing_time': processing_time,
+                'real_time_factor': rtf,
+                'resumed_from_offset': resume.offset if resume else None,
+                'speech_ratio': speech.speech_ratio if speech is not None else None,
+                'trimmed_seconds': (
+                    plan.trimmed_seconds - start_offset if plan is not None else 0.0
+                ),
+            },
+        )
+
     except Exception as e:
         logger.error(f"Direct transcription failed: {e}")
         raise
 
 
-def _seconds_to_scc_timestamp(seconds: float) -> str:
-    """Convert seconds to SCC timestamp format (HH:MM:SS:FF).
-    
-    Args:
-        seconds: Time in seconds
-        
-    Returns:
-        SCC timestamp string in format HH:MM:SS:FF
+def _cached_transcription(video_path: str) -> Optional[Dict]:
+    """Return a completed result if identical media was transcribed before.
+
+    Only consulted when no SCC exists yet, so an explicit re-transcription of
+    a captioned file still decodes.  A miss on the file fingerprint falls back
+    to the staged-audio fingerprint; the staging is reused by the decode.
+    """
+    scc_path = _scc_path_for(video_path)
+    if not TRANSCRIPTION_CACHE_ENABLED or os.path.exists(scc_path):
+        return None
+    try:
+        from core.transcription_cache import get_transcription_cache
+        entry = get_transcription_cache().materialize(
+            video_path, scc_path, use_audio=True
+        )
+    except Exception as e:
+        logger.warning(f"Transcription cache unavailable: {e}")
+        return None
+    if not entry:
+        return None
+    return {
+        'output_path': scc_path,
+        'scc_path': scc_path,
+        'segments': entry.get('segments') or 0,
+        'duration': entry.get('duration'),
+        'language': LANGUAGE,
+        'status': 'completed',
+        'model_used': WHISPER_MODEL,
+        'mode': 'cached',
+        'processing_time': 0.0,
+        'real_time_factor': 0.0,
+        'cache_hit': True,
+        'cached_from': entry.get('source_path'),
+    }
+
+
+def _remember_transcription(video_path: str, result: Dict) -> Dict:
+    """Add a finished result to the content-addressed cache and return it."""
+    if TRANSCRIPTION_CACHE_ENABLED:
+        try:
+            from core.transcription_cache import get_transcription_cache
+            get_transcription_cache().store(
+                video_path, result['scc_path'],
+                duration=result.get('duration'), segments=result.get('segments'),
+            )
+        except Exception as e:
+            logger.warning(f"Transcription cache unavailable: {e}")
+    return result
+
+
+def _speech_prescreen(video_path: str) -> Optional[SpeechAnalysis]:
+    """Run (or load) the energy-based speech pre-screen over staged audio."""
+    if not SPEECH_PRESCREEN_ENABLED or not AUDIO_CACHE_ENABLED:
+        return None
+    try:
+        from core.speech_prescreen import get_speech_analysis
+        return get_speech_analysis(video_path)
+    except Exception as e:
+        logger.warning(f"Speech pre-screen failed for {video_path}: {e}")
+        return None
+
+
+def _no_speech_result(video_path: str, speech: SpeechAnalysis) -> Dict:
+    """Caption a file the pre-screen found silent without loading Whisper."""
+    scc_path = _scc_path_for(video_path)
+    logger.info(
+        f"Pre-screen found {speech.speech_ratio:.1%} speech in {video_path}; "
+        f"skipping Whisper"
+    )
+    _write_empty_scc(scc_path)
+    return _remember_transcription(video_path, {
+        'output_path': scc_path,
+        'scc_path': scc_path,
+        'segments': 0,
+        'duration': speech.duration,
+        'language': LANGUAGE,
+        'status': 'completed',
+        'mode': 'prescreen',
+        'processing_time': 0.0,
+        'speech_ratio': speech.speech_ratio,
+        'warning': 'No speech detected',
+    })
+
+
+def _audio_input(video_path: str):
+    """Return staged 16 kHz PCM for ``video_path``, or the path if staging fails.
+
+    Reading the memory-mapped cache avoids decoding the container off the
+    flex mount again on every transcription.
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    frames = int((seconds % 1) * 30)  # 30 fps for SCC
-    
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}:{frames:02d}"
+    if not AUDIO_CACHE_ENABLED:
+        return video_path
+    try:
+        from core.audio_cache import get_audio_cache
+        staged = get_audio_cache().get(video_path)
+        return staged.samples if staged.dtype == "float32" else staged.read()
+    except Exception as e:
+        logger.warning(f"Audio staging failed for {video_path}, decoding directly: {e}")
+        return video_path
+
+
+def _record_real_time_factor(mode: str, rtf: Optional[float]) -> None:
+    """Record processing-time / audio-duration so serial and chunked runs compare."""
+    if rtf is None:
+        return
+    record_metric("histogram", "transcription_real_time_factor", rtf, {"mode": mode})
+
+
+def _scc_path_for(video_path: str) -> str:
+    """Return the SCC path written next to the source video."""
+    base_name = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(os.path.dirname(video_path), f"{base_name}.scc")
+
+
+def _write_empty_scc(scc_path: str) -> None:
+    """Write the placeholder SCC used when no speech was detected."""
+    with open(scc_path, 'w', encoding='utf-8') as f:
+        f.write("Scenarist_SCC V1.0\n\n")
+        f.write("00:00:00:00\t00:00:05:00\n")
+        f.write("[No speech detected]\n\n")
+
+
+def _write_scc(segments: Iterable, scc_path: str) -> None:
+    """Write segments (objects or ``start``/``end``/``text`` dicts) as SCC captions."""
+    with StreamingCaptionSink(scc_path, formats=CAPTION_OUTPUT_FORMATS) as sink:
+        for segment in segments:
+            sink.write(segment)
 
 
 def run_whisper_transcription(*args, **kwargs):
@@ -155,6 +414,11 @@ def run_whisper_transcription(*args, **kwargs):
     video_path : str
         Path to the video file to transcribe.  This can be passed either as a
         positional argument or via the ``video_path`` keyword.
+    mode : str, optional
+        ``"serial"`` (single decode) or ``"chunked"`` (silence-split windows
+        transcribed in a process pool).  Defaults to ``TRANSCRIPTION_MODE``.
+    workers : int, optional
+        Number of pool workers for chunked mode.
 
     Returns
     -------
@@ -170,18 +434,23 @@ def run_whisper_transcription(*args, **kwargs):
     if not video_path:
         raise ValueError("video_path is required")
 
+    mode = kwargs.get("mode")
+    workers = kwargs.get("workers")
+
     try:
         if current_task:
             logger.debug(
                 "Running transcription directly inside Celery worker for %s",
                 video_path,
             )
-            return _transcribe_with_faster_whisper(video_path)
+            return _transcribe_with_faster_whisper(
+                video_path, mode=mode, workers=workers
+            )
 
         # Otherwise dispatch the Celery task and wait for completion.
         from core.tasks.transcription import run_whisper_transcription as task
 
-        async_result = task.delay(video_path)
+        async_result = task.delay(video_path, mode=mode, workers=workers)
         logger.debug(
             "Dispatched Celery transcription task %s for %s", async_result.id, video_path
         )
@@ -190,7 +459,7 @@ def run_whisper_transcription(*args, **kwargs):
         logger.error(
             "Celery transcription failed (%s); falling back to direct transcription", exc
         )
-        return _transcribe_with_faster_whisper(video_path)
+        return _transcribe_with_faster_whisper(video_path, mode=mode, workers=workers)
 
 # Compatibility export for tests referencing save_scc_file in this module
 try:  # pragma: no cover - import path may not exist in minimal envs
@@ -203,4 +472,3 @@ except Exception:  # pragma: no cover
         raise ImportError(
             "save_scc_file is not available; install whisperx helper dependencies"
         )
-
@@ -0,0 +1,329 @@
+"""Throughput benchmark for the transcription path.
+
+Runs ``_transcribe_with_faster_whisper`` over a matrix of Whisper settings
+(model, compute type, ``cpu_threads``, beam size, VAD, serial/chunked mode)
+against bundled and synthetic fixtures, and reports wall time, real-time
+factor, peak RSS, CPU utilisation and segments per second.  Each
+configuration runs in a fresh spawned process so environment-driven settings
+take effect and peak RSS is not polluted by earlier runs.
+
+Key Features:
+- Cartesian configuration matrix from comma-separated CLI lists
+- ``tests/test_audio.wav`` plus long fixtures synthesised by tiling it
+- Machine-readable JSON results
+- Baseline comparison that exits non-zero on a real-time-factor regression
+
+The command line lives in ``scripts/benchmarks/bench_transcription.py``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+# Nothing from ``core`` is imported here directly; configuration reaches the
+# benchmark children through their environment (see ``_environment``).
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FIXTURE = REPO_ROOT / "tests" / "test_audio.wav"
+SAMPLE_RATE = 16000
+RESULTS_SCHEMA = 1
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """One point in the configuration matrix."""
+
+    model: str
+    compute_type: str
+    cpu_threads: int
+    beam_size: int
+    vad_filter: bool
+    mode: str = "serial"
+
+    @property
+    def id(self) -> str:
+        vad = "vad" if self.vad_filter else "novad"
+        return (f"{self.model}/{self.compute_type}/t{self.cpu_threads}/"
+                f"b{self.beam_size}/{vad}/{self.mode}")
+
+    def environment(self, work_dir: str) -> Dict[str, str]:
+        """Settings read by ``core.config`` in the benchmark child."""
+        return {
+            "WHISPER_MODEL": self.model,
+            "COMPUTE_TYPE": self.compute_type,
+            "BATCH_SIZE": str(self.cpu_threads),
+            "TRANSCRIPTION_MODE": self.mode,
+            "WHISPER_MODEL_WARMUP": "false",
+            "TRANSCRIPTION_CACHE_ENABLED": "false",
+            "TRANSCRIPTION_CHECKPOINT_ENABLED": "false",
+            "AUDIO_CACHE_DIR": os.path.join(work_dir, "audio_cache"),
+        }
+
+
+@dataclass
+class Fixture:
+    name: str
+    path: str
+    duration: float
+
+
+def expand_matrix(
+    models: Sequence[str],
+    compute_types: Sequence[str],
+    threads: Sequence[int],
+    beam_sizes: Sequence[int],
+    vad: Sequence[bool],
+    modes: Sequence[str] = ("serial",),
+) -> List[BenchmarkConfig]:
+    """Return every combination of the given settings."""
+    return [
+        BenchmarkConfig(m, c, t, b, v, mode)
+        for m, c, t, b, v, mode in itertools.product(
+            models, compute_types, threads, beam_sizes, vad, modes
+        )
+    ]
+
+
+def read_wav_mono(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Read a PCM WAV as mono float32 resampled (linearly) to ``sample_rate``."""
+    with wave.open(path, "rb") as w:
+        channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+    if width != 2:
+        raise ValueError(f"{path}: only 16-bit PCM WAV fixtures are supported")
+    audio = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate:
+        positions = np.arange(int(len(audio) * sample_rate / rate)) * (
+            rate / sample_rate
+        )
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def write_wav(path: str, audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> None:
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+
+
+def synthesize_long_audio(source: str, out_path: str, minutes: float,
+                          gap_seconds: float = 1.0, seed: int = 0) -> float:
+    """Tile ``source`` with jittered silent gaps up to ``minutes``; return seconds.
+
+    Real speech keeps the VAD and decoder honest, and the gaps give chunked
+    mode silences to cut at, like pauses in a council meeting.
+    """
+    clip = read_wav_mono(source)
+    rng = np.random.default_rng(seed)
+    target = int(minutes * 60 * SAMPLE_RATE)
+    parts: List[np.ndarray] = []
+    total = 0
+    while total < target:
+        gap = np.zeros(
+            int(SAMPLE_RATE * gap_seconds * rng.uniform(0.5, 2.0)), dtype=np.float32
+        )
+        # Vary the gain so repeated tiles do not decode identically
+        parts.extend((clip * np.float32(rng.uniform(0.6, 1.0)), gap))
+        total += len(clip) + len(gap)
+    audio = np.concatenate(parts)[:target]
+    write_wav(out_path, audio)
+    return len(audio) / SAMPLE_RATE
+
+
+def prepare_fixtures(work_dir: str, source: str = str(DEFAULT_FIXTURE),
+                     long_minutes: Sequence[float] = ()) -> List[Fixture]:
+    """Copy the bundled fixture into ``work_dir`` and synthesise long ones."""
+    fixtures: List[Fixture] = []
+    copied = os.path.join(work_dir, os.path.basename(source))
+    shutil.copyfile(source, copied)
+    fixtures.append(
+        Fixture(Path(source).stem, copied, len(read_wav_mono(copied)) / SAMPLE_RATE)
+    )
+    for minutes in long_minutes:
+        name = f"synthetic_{minutes:g}min"
+        path = os.path.join(work_dir, f"{name}.wav")
+        fixtures.append(
+            Fixture(name, path, synthesize_long_audio(source, path, minutes))
+        )
+    return fixtures
+
+
+@contextmanager
+def _environment(env: Dict[str, str]) -> Iterator[None]:
+    """Temporarily export ``env`` so spawned children see it from startup.
+
+    Importing ``core`` reads ``core.config``, so the settings must be in the
+    environment before the child interpreter starts, not set afterwards.
+    """
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _usage() -> Dict[str, float]:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "cpu": own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime,
+        # ru_maxrss is KiB on Linux
+        "rss_mb": max(own.ru_maxrss, children.ru_maxrss) / 1024.0,
+    }
+
+
+def _run_config(
+    config: BenchmarkConfig, fixture: Fixture, repeats: int
+) -> Dict[str, Any]:
+    """Benchmark child: transcribe ``fixture`` ``repeats`` times with ``config``."""
+    from core import transcription
+    from core.config import USE_GPU
+    from core.whisper_model_pool import get_whisper_model
+
+    # Passed explicitly: chunked windows decode in their own spawned workers
+    options = dict(transcription.TRANSCRIBE_OPTIONS, beam_size=config.beam_size,
+                   vad_filter=config.vad_filter)
+
+    started = time.perf_counter()
+    get_whisper_model(
+        config.model,
+        compute_type=config.compute_type,
+        cpu_threads=config.cpu_threads,
+        device="cuda" if USE_GPU else "cpu",
+    )
+    load_seconds = time.perf_counter() - started
+
+    runs = []
+    for _ in range(repeats):
+        before = _usage()
+        started = time.perf_counter()
+        result = transcription._transcribe_with_faster_whisper(
+            fixture.path, mode=config.mode, use_cache=False, options=options
+        )
+        wall = time.perf_counter() - started
+        after = _usage()
+        runs.append({
+            "wall_seconds": wall,
+            "cpu_seconds": after["cpu"] - before["cpu"],
+            "segments": int(result.get("segments") or 0),
+            "audio_seconds": float(result.get("duration") or fixture.duration),
+        })
+
+    wall = statistics.median(r["wall_seconds"] for r in runs)
+    cpu = statistics.median(r["cpu_seconds"] for r in runs)
+    audio_seconds = runs[-1]["audio_seconds"] or fixture.duration
+    segments = runs[-1]["segments"]
+    return {
+        "config_id": config.id,
+        "config": asdict(config),
+        "fixture": fixture.name,
+        "audio_seconds": audio_seconds,
+        "model_load_seconds": load_seconds,
+        "wall_seconds": wall,
+        "real_time_factor": wall / audio_seconds if audio_seconds else None,
+        "cpu_seconds": cpu,
+        "cpu_utilization": cpu / (wall * (os.cpu_count() or 1)) if wall else 0.0,
+        "peak_rss_mb": _usage()["rss_mb"],
+        "segments": segments,
+        "segments_per_second": segments / wall if wall else 0.0,
+        "runs": runs,
+    }
+
+
+def run_benchmark(configs: Sequence[BenchmarkConfig], fixtures: Sequence[Fixture],
+                  work_dir: str, repeats: int = 1) -> Dict[str, Any]:
+    """Run every configuration against every fixture, one fresh process each."""
+    spawn = multiprocessing.get_context("spawn")
+    results: List[Dict[str, Any]] = []
+    for config in configs:
+        for fixture in fixtures:
+            with _environment(config.environment(work_dir)), \
+                    ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                try:
+                    results.append(
+                        pool.submit(_run_config, config, fixture, repeats).result()
+                    )
+                except Exception as e:
+                    results.append({"config_id": config.id, "config": asdict(config),
+                                    "fixture": fixture.name, "error": str(e)})
+    return {
+        "schema": RESULTS_SCHEMA,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "repeats": repeats,
+        "fixtures": [asdict(f) for f in fixtures],
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        max_regression: float = 0.10,
+                        metric: str = "real_time_factor") -> List[Dict[str, Any]]:
+    """Return entries whose ``metric`` grew by more than ``max_regression``.
+
+    Lower is better for the metric (real-time factor, wall seconds, RSS).
+    Configurations missing from the baseline are not regressions.
+    """
+    previous = {
+        (r["config_id"], r["fixture"]): r.get(metric)
+        for r in baseline.get("results", []) if r.get(metric) is not None
+    }
+    regressions = []
+    for r in current.get("results", []):
+        old = previous.get((r["config_id"], r["fixture"]))
+        new = r.get(metric)
+        if old is None or new is None or old <= 0:
+            continue
+        change = (new - old) / old
+        if change > max_regression:
+            regressions.append({"config_id": r["config_id"], "fixture": r["fixture"],
+                                "metric": metric, "baseline": old, "current": new,
+                                "change": change})
+    return regressions
+
+
+def format_table(document: Dict[str, Any]) -> str:
+    header = (
+        f"{'config':<42} {'fixture':<22} {'wall s':>8} {'RTF':>7} {'RSS MB':>8} "
+        f"{'CPU %':>6} {'seg/s':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in document["results"]:
+        if "error" in r:
+            lines.append(f"{r['config_id']:<42} {r['fixture']:<22} ERROR {r['error']}")
+            continue
+        lines.append(
+            f"{r['config_id']:<42} {r['fixture']:<22} {r['wall_seconds']:>8.2f} "
+            f"{r['real_time_factor'] or 0:>7.3f} {r['peak_rss_mb']:>8.0f} "
+            f"{r['cpu_utilization'] * 100:>6.1f} {r['segments_per_second']:>7.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,430 @@
+"""Content-addressed cache of finished transcriptions.
+
+The same meeting regularly lands on more than one flex server (the combined
+Dellwood/Grant/Willernie storage mirrors city uploads) or is re-exported under
+a new filename.  Discovery only looked for a sibling ``.scc`` by basename, so
+identical audio was transcribed again.  This cache keys finished captions by
+content instead of by path and copies them next to any duplicate it sees.
+
+Two fingerprints are recorded for every result:
+
+- ``file:`` - SHA-1 over the file size and evenly spaced byte ranges (head,
+  tail and interior samples).  Cheap enough for discovery scans and catches
+  byte-identical copies under any name.
+- ``pcm:`` - SHA-1 over the staged 16 kHz PCM length (i.e. the duration) and
+  sampled blocks of audio.  Catches remuxed or rewrapped exports whose
+  container bytes differ but whose decoded audio does not.  Only computed
+  when the audio is staged anyway, right before transcription.
+
+Key Features:
+- Persistent SQLite index shared by every worker process
+- Per-path fingerprint memo keyed by (size, mtime_ns) so rescans stay cheap
+- Cached captions stored locally, materialised atomically for new paths
+- Persistent hit/miss counters exposed through ``get_stats()``
+
+Example:
+    >>> from core.transcription_cache import get_transcription_cache
+    >>> cache = get_transcription_cache()
+    >>> copy = "/mnt/flex-2/council_copy"
+    >>> cache.materialize(copy + ".mp4", copy + ".scc")
+    {'fingerprint': 'file:3f2a...', 'source_path': '/mnt/flex-1/council.mp4', ...}
+    >>> cache.get_stats()["hit_rate"]
+    0.31
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from core.config import (
+    WHISPER_MODEL,
+    AUDIO_CACHE_ENABLED,
+    TRANSCRIPTION_CACHE_ENABLED,
+    TRANSCRIPTION_CACHE_DIR,
+    TRANSCRIPTION_CACHE_SAMPLE_COUNT,
+    TRANSCRIPTION_CACHE_SAMPLE_BYTES,
+)
+from core.monitoring.metrics import record_metric
+
+# Sampled PCM blocks hashed for the audio fingerprint (one second each)
+PCM_SAMPLE_BLOCKS = 16
+PCM_BLOCK_SAMPLES = 16000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    fingerprint TEXT NOT NULL,
+    model TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    duration REAL,
+    segments INTEGER,
+    created REAL NOT NULL,
+    last_hit REAL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (fingerprint, model)
+);
+CREATE TABLE IF NOT EXISTS path_fingerprints (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def file_fingerprint(path: str, sample_count: int = TRANSCRIPTION_CACHE_SAMPLE_COUNT,
+                     sample_bytes: int = TRANSCRIPTION_CACHE_SAMPLE_BYTES) -> str:
+    """Hash the file size and ``sample_count`` evenly spaced byte ranges.
+
+    Small files are hashed whole.  Reads at most ``sample_count * sample_bytes``
+    bytes regardless of file size, so fingerprinting a 6 GB recording on the
+    NFS mount costs about a megabyte of I/O.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(f"{size}|".encode("ascii"))
+    with open(path, "rb") as f:
+        if size <= sample_count * sample_bytes:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        else:
+            span = size - sample_bytes
+            for i in range(sample_count):
+                f.seek(span * i // (sample_count - 1))
+                digest.update(f.read(sample_bytes))
+    return "file:" + digest.hexdigest()
+
+
+def pcm_fingerprint(samples: np.ndarray, blocks: int = PCM_SAMPLE_BLOCKS,
+                    block_samples: int = PCM_BLOCK_SAMPLES) -> str:
+    """Hash the staged PCM length and evenly spaced blocks of samples."""
+    total = len(samples)
+    digest = hashlib.sha1(f"{total}|{samples.dtype.str}|".encode("ascii"))
+    if total <= blocks * block_samples:
+        digest.update(np.ascontiguousarray(samples).tobytes())
+    else:
+        span = total - block_samples
+        for i in range(blocks):
+            first = span * i // (blocks - 1)
+            digest.update(
+                np.ascontiguousarray(samples[first:first + block_samples]).tobytes()
+            )
+    return "pcm:" + digest.hexdigest()
+
+
+def _model_tag(model: str) -> str:
+    """Filename-safe tag for a model name (which may be a local path)."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model).strip("._") or "model"
+
+
+def _staged_pcm_fingerprint(video_path: str) -> Optional[str]:
+    """Fingerprint the staged audio for ``video_path`` (stages it if needed)."""
+    if not AUDIO_CACHE_ENABLED:
+        return None
+    try:
+        from core.audio_cache import get_audio_cache
+        return pcm_fingerprint(get_audio_cache().get(video_path).samples)
+    except Exception as e:
+        logger.debug(f"No audio fingerprint for {video_path}: {e}")
+        return None
+
+
+def _caption_suffixes() -> List[str]:
+    """File suffixes the caption writers can produce next to an SCC.
+
+    A format writes ``<base>.<extension>``, or ``<base>.<format>.<extension>``
+    when another format already claimed the extension (see ``caption_paths``).
+    """
+    from core.caption_sink import CAPTION_WRITERS
+
+    suffixes: List[str] = []
+    for fmt, writer in CAPTION_WRITERS.items():
+        if writer.extension in suffixes:
+            suffixes.append(f"{fmt}.{writer.extension}")
+        else:
+            suffixes.append(writer.extension)
+    return suffixes
+
+
+def _caption_target(scc_path: str, suffix: str) -> str:
+    return scc_path if suffix == "scc" else f"{os.path.splitext(scc_path)[0]}.{suffix}"
+
+
+def _caption_siblings(scc_path: str) -> Dict[str, str]:
+    """Map suffix -> path for the SCC and any same-named caption files."""
+    found = {"scc": scc_path}
+    for suffix in _caption_suffixes():
+        candidate = _caption_target(scc_path, suffix)
+        if suffix != "scc" and os.path.exists(candidate):
+            found[suffix] = candidate
+    return found
+
+
+class TranscriptionResultCache:
+    """Persistent fingerprint -> captions index shared across workers."""
+
+    def __init__(
+        self, cache_dir: str = TRANSCRIPTION_CACHE_DIR, model: str = WHISPER_MODEL
+    ):
+        self.cache_dir = cache_dir
+        self.model = model
+        self.blob_dir = os.path.join(cache_dir, "captions")
+        self.db_path = os.path.join(cache_dir, "index.sqlite")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def fingerprint(self, path: str) -> str:
+        """Return the file fingerprint, reusing the memo while size/mtime match."""
+        st = os.stat(path)
+        abspath = os.path.abspath(path)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT size, mtime_ns, fingerprint FROM path_fingerprints "
+                "WHERE path = ?",
+                (abspath,),
+            ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+        fp = file_fingerprint(path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO path_fingerprints "
+                "(path, size, mtime_ns, fingerprint) VALUES (?, ?, ?, ?)",
+                (abspath, st.st_size, st.st_mtime_ns, fp),
+            )
+        return fp
+
+    def _blob_paths(self, blob: str) -> Dict[str, str]:
+        paths = {
+            suffix: os.path.join(self.blob_dir, f"{blob}.{suffix}")
+            for suffix in _caption_suffixes()
+        }
+        return {suffix: path for suffix, path in paths.items() if os.path.exists(path)}
+
+    def _find(self, fingerprints: List[str]) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            for fp in fingerprints:
+                row = conn.execute(
+                    "SELECT fingerprint, blob, source_path, duration, segments, "
+                    "created FROM entries WHERE fingerprint = ? AND model = ?",
+                    (fp, self.model),
+                ).fetchone()
+                if row:
+                    return dict(
+                        zip(
+                            (
+                                "fingerprint",
+                                "blob",
+                                "source_path",
+                                "duration",
+                                "segments",
+                                "created",
+                            ),
+                            row,
+                        )
+                    )
+        return None
+
+    def lookup(
+        self, video_path: str, use_audio: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``video_path`` without touching counters.
+
+        With ``use_audio`` a file-fingerprint miss falls back to the PCM
+        fingerprint, which stages the audio through the audio cache.
+        """
+        entry = self._find([self.fingerprint(video_path)])
+        if entry is None and use_audio:
+            pcm_fp = _staged_pcm_fingerprint(video_path)
+            if pcm_fp:
+                entry = self._find([pcm_fp])
+        if entry is not None and "scc" not in self._blob_paths(entry["blob"]):
+            return None  # index row survived a manual cleanup of the blobs
+        return entry
+
+    def materialize(self, video_path: str, scc_path: str,
+                    use_audio: bool = False) -> Optional[Dict[str, Any]]:
+        """Copy cached captions for ``video_path`` to ``scc_path`` on a hit.
+
+        Returns the cache entry (with ``scc_path`` filled in) on a hit and
+        ``None`` on a miss or when the destination is not writable.  Existing
+        caption files at the destination are never overwritten.
+        """
+        try:
+            entry = self.lookup(video_path, use_audio=use_audio)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Transcription cache lookup failed for {video_path}: {e}")
+            return None
+        if entry is None:
+            self._count("misses")
+            return None
+
+        try:
+            for suffix, blob_path in self._blob_paths(entry["blob"]).items():
+                target = _caption_target(scc_path, suffix)
+                if os.path.exists(target):
+                    continue
+                tmp = target + ".part"
+                shutil.copyfile(blob_path, tmp)
+                os.replace(tmp, target)
+        except OSError as e:
+            logger.warning(f"Could not materialise cached captions at {scc_path}: {e}")
+            self._count("materialize_errors")
+            return None
+
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE entries SET hits = hits + 1, last_hit = ? "
+                "WHERE fingerprint = ? AND model = ?",
+                (time.time(), entry["fingerprint"], self.model),
+            )
+        kind = entry["fingerprint"].split(":", 1)[0]
+        self._count("hits")
+        self._count(f"hits_{kind}")
+        if entry.get("duration"):
+            self._count("seconds_saved", int(entry["duration"]))
+        logger.info(
+            f"Transcription cache hit for {video_path} ({kind} fingerprint, "
+            f"originally {entry['source_path']})"
+        )
+        return {**entry, "scc_path": scc_path}
+
+    def store(self, video_path: str, scc_path: str, duration: Optional[float] = None,
+              segments: Optional[int] = None, use_audio: bool = True) -> Optional[str]:
+        """Record finished captions for ``video_path``; return the file fingerprint."""
+        try:
+            fp = self.fingerprint(video_path)
+            fingerprints = [fp]
+            pcm_fp = _staged_pcm_fingerprint(video_path) if use_audio else None
+            if pcm_fp:
+                fingerprints.append(pcm_fp)
+
+            # Rows are per (fingerprint, model), so blobs are too
+            blob = f"{fp.split(':', 1)[1]}-{_model_tag(self.model)}"
+            for suffix, path in _caption_siblings(scc_path).items():
+                dest = os.path.join(self.blob_dir, f"{blob}.{suffix}")
+                shutil.copyfile(path, dest + ".part")
+                os.replace(dest + ".part", dest)
+
+            now = time.time()
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (fingerprint, model, blob, "
+                    "source_path, duration, segments, created, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                    [
+                        (
+                            f,
+                            self.model,
+                            blob,
+                            os.path.abspath(video_path),
+                            duration,
+                            segments,
+                            now,
+                        )
+                        for f in fingerprints
+                    ],
+                )
+            self._count("stores")
+            return fp
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not cache transcription of {video_path}: {e}")
+            return None
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, amount),
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Transcription cache counter {name} not updated: {e}")
+        record_metric("increment", f"transcription_cache_{name}", amount)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return persistent hit/miss counters and index size."""
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, blobs = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT blob) FROM entries WHERE model = ?",
+                (self.model,),
+            ).fetchone()
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "hits_file": counters.get("hits_file", 0),
+            "hits_pcm": counters.get("hits_pcm", 0),
+            "stores": counters.get("stores", 0),
+            "materialize_errors": counters.get("materialize_errors", 0),
+            "seconds_saved": counters.get("seconds_saved", 0),
+            "entries": entries,
+            "transcriptions": blobs,
+            "model": self.model,
+        }
+
+
+# Global per-process handle (the index itself is shared on disk)
+_transcription_cache: Optional[TranscriptionResultCache] = None
+
+
+def get_transcription_cache() -> TranscriptionResultCache:
+    """Get the process-wide transcription result cache."""
+    global _transcription_cache
+    if _transcription_cache is None:
+        _transcription_cache = TranscriptionResultCache()
+    return _transcription_cache
+
+
+def materialize_cached_captions(video_path: str, scc_path: str) -> bool:
+    """Discovery hook: copy cached captions to ``scc_path`` if the content is known.
+
+    Uses only the file fingerprint so scans never trigger audio extraction.
+    Returns ``False`` when the cache is disabled or unavailable.
+    """
+    if not TRANSCRIPTION_CACHE_ENABLED:
+        return False
+    try:
+        return get_transcription_cache().materialize(video_path, scc_path) is not None
+    except Exception as e:
+        logger.warning(f"Transcription cache unavailable: {e}")
+        return False
+
+
+__all__ = [
+    "TranscriptionResultCache",
+    "file_fingerprint",
+    "get_transcription_cache",
+    "materialize_cached_captions",
+    "pcm_fingerprint",
+]
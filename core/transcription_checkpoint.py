@@ -0,0 +1,240 @@
+"""Checkpoint journal for resumable transcription jobs.
+
+A worker restart mid-transcription (OOM, deploy, node reboot) used to throw
+away hours of decoding.  The serial transcription path now appends every
+emitted segment to a sidecar journal and periodically fsyncs a checkpoint
+record with the last audio offset.  A retried job reloads the journal, seeks
+to the checkpoint and merges the journalled segments into the final SCC.
+
+Journal format (JSON lines):
+    {"type": "header", "source": ..., "size": ..., "mtime_ns": ..., "model": ...}
+    {"type": "segment", "start": ..., "end": ..., "text": ...,
+     "words": [[start, end, word], ...]}
+    {"type": "checkpoint", "offset": ..., "segments": ..., "time": ...}
+
+Segments written after the last checkpoint are ignored on load, so a torn
+final line never corrupts a resume.
+
+Example:
+    >>> from core.transcription_checkpoint import get_checkpoint
+    >>> get_checkpoint("/mnt/flex-1/council.mp4")
+    {'offset': 5423.1, 'segments': 1210, 'journal_path': '...'}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, TextIO
+
+from loguru import logger
+
+from core.caption_sink import clean_caption_text, segment_field
+from core.config import (
+    WHISPER_MODEL,
+    TRANSCRIPTION_CHECKPOINT_DIR,
+    TRANSCRIPTION_CHECKPOINT_INTERVAL,
+)
+
+
+@dataclass
+class ResumePoint:
+    """Segments recovered from a journal and the audio offset to continue from."""
+
+    offset: float
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def journal_path_for(video_path: str, scc_path: str) -> str:
+    """Return the journal location: next to the SCC, or under the checkpoint dir."""
+    if TRANSCRIPTION_CHECKPOINT_DIR:
+        digest = hashlib.sha1(os.path.abspath(video_path).encode("utf-8")).hexdigest()
+        return os.path.join(TRANSCRIPTION_CHECKPOINT_DIR, f"{digest}.journal")
+    return scc_path + ".journal"
+
+
+class TranscriptionJournal:
+    """Append-only segment journal with periodic fsynced checkpoints."""
+
+    def __init__(self, video_path: str, scc_path: str, model: str = WHISPER_MODEL,
+                 interval: float = TRANSCRIPTION_CHECKPOINT_INTERVAL):
+        self.video_path = video_path
+        self.path = journal_path_for(video_path, scc_path)
+        self.model = model
+        self.interval = interval
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._last_checkpoint = 0.0
+        self._last_end = 0.0
+
+    def _header(self) -> Dict[str, Any]:
+        st = os.stat(self.video_path)
+        return {
+            "type": "header",
+            "source": os.path.abspath(self.video_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "model": self.model,
+            "created": time.time(),
+        }
+
+    def load(self) -> Optional[ResumePoint]:
+        """Return the last checkpoint if the journal matches the current source."""
+        if not os.path.exists(self.path):
+            return None
+        expected = self._header()
+        segments: List[Dict[str, Any]] = []
+        confirmed: Optional[ResumePoint] = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("type") != "header" or any(
+                    header.get(k) != expected[k]
+                    for k in ("source", "size", "mtime_ns", "model")
+                ):
+                    logger.info(f"Discarding stale transcription journal {self.path}")
+                    self.discard()
+                    return None
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn write at the tail
+                    if record.get("type") == "segment":
+                        segments.append({
+                            "start": record["start"],
+                            "end": record["end"],
+                            "text": record["text"],
+                            "words": [
+                                {"start": start, "end": end, "word": word}
+                                for start, end, word in record.get("words", ())
+                            ],
+                        })
+                    elif record.get("type") == "checkpoint":
+                        confirmed = ResumePoint(float(record["offset"]), list(segments))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Unreadable transcription journal {self.path}: {e}")
+            return None
+        return confirmed
+
+    def open(self, resume: Optional[ResumePoint] = None) -> "TranscriptionJournal":
+        """Start a fresh journal, carrying over segments from ``resume``."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._header()) + "\n")
+            if resume:
+                for seg in resume.segments:
+                    f.write(json.dumps(self._segment_record(seg)) + "\n")
+                f.write(
+                    json.dumps(
+                        {
+                            "type": "checkpoint",
+                            "offset": resume.offset,
+                            "segments": len(resume.segments),
+                            "time": time.time(),
+                        }
+                    )
+                    + "\n"
+                )
+        os.replace(tmp, self.path)
+        self.count = len(resume.segments) if resume else 0
+        self._last_end = resume.offset if resume else 0.0
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._last_checkpoint = time.monotonic()
+        return self
+
+    @staticmethod
+    def _segment_record(segment: Any) -> Dict[str, Any]:
+        # Word timings are kept so a resumed run still writes complete JSON words
+        return {
+            "type": "segment",
+            "start": float(segment_field(segment, "start", 0.0)),
+            "end": float(segment_field(segment, "end", 0.0)),
+            "text": clean_caption_text(segment_field(segment, "text", "")),
+            "words": [
+                [
+                    float(segment_field(w, "start", 0.0)),
+                    float(segment_field(w, "end", 0.0)),
+                    str(segment_field(w, "word", "")),
+                ]
+                for w in (segment_field(segment, "words") or [])
+            ],
+        }
+
+    def append(self, segment: Any) -> None:
+        """Journal one segment and checkpoint if the interval has elapsed."""
+        if self._file is None:
+            return
+        end = float(segment_field(segment, "end", 0.0))
+        self._file.write(json.dumps(self._segment_record(segment)) + "\n")
+        self.count += 1
+        self._last_end = max(self._last_end, end)
+        if time.monotonic() - self._last_checkpoint >= self.interval:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Durably record that everything up to the last segment end is done."""
+        if self._file is None:
+            return
+        self._file.write(
+            json.dumps(
+                {
+                    "type": "checkpoint",
+                    "offset": self._last_end,
+                    "segments": self.count,
+                    "time": time.time(),
+                }
+            )
+            + "\n"
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_checkpoint = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Remove the journal once the final SCC has been published."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def get_checkpoint(
+    video_path: str, scc_path: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Describe the resumable checkpoint for ``video_path``, if any."""
+    if scc_path is None:
+        base = os.path.splitext(video_path)[0]
+        scc_path = base + ".scc"
+    try:
+        journal = TranscriptionJournal(video_path, scc_path)
+        resume = journal.load()
+    except OSError:
+        return None
+    if resume is None:
+        return None
+    return {
+        "offset": resume.offset,
+        "segments": len(resume.segments),
+        "journal_path": journal.path,
+    }
+
+
+__all__ = [
+    "ResumePoint",
+    "TranscriptionJournal",
+    "get_checkpoint",
+    "journal_path_for",
+]
@@ -9,6 +9,8 @@ Enhanced Features:
 - Task reordering through priority-based queue management
 - Failed task cleanup with configurable retention policies
 - Task state persistence and recovery
+- Cooperative cancellation of running ffmpeg work (``core.ffmpeg_runner``)
+- End-to-end VOD pipeline state and stage queues (``core.vod_pipeline``)
 """
 
 from typing import Dict, List, Optional, Any
@@ -20,34 +22,61 @@ import redis
 from loguru import logger
 
 from core.tasks import celery_app
-from core.config import REDIS_URL
+from core.config import REDIS_URL, VOD_STAGE_QUEUES_ENABLED
+from core.ffmpeg_runner import ffmpeg_active, request_cancel
+from core.transcription_checkpoint import get_checkpoint
+from core.vod_pipeline import (
+    STAGE_TASKS,
+    get_pipeline_store,
+    stage_concurrency,
+    stage_queues,
+)
+
+TASK_STATE_PREFIX = "archivist:task_state:"
+
+
+def save_task_state(task_id: str, state: Dict[str, Any], ttl: int = 86400) -> bool:
+    """Persist resumable task state from inside a worker.
+
+    Long-running tasks call this so ``UnifiedQueueManager.resume_task`` can
+    recreate them after a worker restart.
+    """
+    try:
+        client = redis.from_url(REDIS_URL)
+        state = {**state, 'saved_at': datetime.now().isoformat()}
+        client.setex(f"{TASK_STATE_PREFIX}{task_id}", ttl, json.dumps(state))
+        return True
+    except Exception as e:
+        logger.warning(f"Could not save task state for {task_id}: {e}")
+        return False
+
 
 class UnifiedQueueManager:
     """Unified queue manager for Celery tasks with enhanced capabilities."""
-    
+
     def __init__(self):
         self._task_cache = {}
         self._cache_lock = threading.Lock()
         self._redis_client = redis.from_url(REDIS_URL)
-        
+
         # Task state persistence keys
-        self._task_state_prefix = "archivist:task_state:"
+        self._task_state_prefix = TASK_STATE_PREFIX
         self._failed_task_prefix = "archivist:failed_tasks:"
         self._task_priority_prefix = "archivist:task_priority:"
-        
+
         # Start background cache refresh
         self._start_cache_refresh()
-    
+
     def get_all_tasks(self) -> List[Dict[str, Any]]:
         """Get all tasks from Celery."""
         try:
             tasks = []
-            
+
             # Get Celery tasks
             inspect = celery_app.control.inspect()
             active_tasks = inspect.active() or {}
             reserved_tasks = inspect.reserved() or {}
-            
+
             # Process active tasks
             for worker, worker_tasks in active_tasks.items():
                 for task in worker_tasks:
@@ -56,7 +85,7 @@ class UnifiedQueueManager:
                         'queue_type': 'celery',
                         'name': task['name'],
                         'status': 'active',
-                        'progress': 0,  # Celery doesn't provide progress
+                        'progress': self._task_progress(task['id']),
                         'created_at': task.get('time_start'),
                         'started_at': task.get('time_start'),
                         'ended_at': None,
@@ -65,7 +94,7 @@ class UnifiedQueueManager:
                         'error': None,
                         'position': 0
                     })
-            
+
             # Process reserved tasks
             for worker, worker_tasks in reserved_tasks.items():
                 for task in worker_tasks:
@@ -83,36 +112,36 @@ class UnifiedQueueManager:
                         'error': None,
                         'position': 0
                     })
-            
+
             # Sort by creation time (newest first)
             tasks.sort(key=lambda x: x.get('created_at', 0) or 0, reverse=True)
-            
+
             return tasks
-            
+
         except Exception as e:
             logger.error(f"Error getting all tasks: {e}")
             return []
-    
+
     def get_task_summary(self) -> Dict[str, Any]:
         """Get summary statistics for Celery tasks."""
         try:
             tasks = self.get_all_tasks()
-            
+
             # Count by queue type
             rq_tasks = [t for t in tasks if t['queue_type'] == 'rq']
             celery_tasks = [t for t in tasks if t['queue_type'] == 'celery']
-            
+
             # Count by status
             status_counts = {}
             for task in tasks:
                 status = task['status']
                 status_counts[status] = status_counts.get(status, 0) + 1
-            
+
             # Get worker information
             inspect = celery_app.control.inspect()
             stats = inspect.stats()
             ping = inspect.ping()
-            
+
             return {
                 'total_tasks': len(tasks),
                 'rq_tasks': len(rq_tasks),
@@ -128,7 +157,7 @@ class UnifiedQueueManager:
                     'celery_healthy': len([t for t in celery_tasks if t['status'] == 'failed']) == 0
                 }
             }
-            
+
         except Exception as e:
             logger.error(f"Error getting task summary: {e}")
             return {
@@ -140,7 +169,7 @@ class UnifiedQueueManager:
                 'workers': {'active_workers': 0, 'total_workers': 0, 'worker_status': 'unhealthy'},
                 'queue_health': {'rq_healthy': False, 'celery_healthy': False}
             }
-    
+
     def get_task_details(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a specific Celery task."""
         try:
@@ -151,25 +180,43 @@ class UnifiedQueueManager:
                 'status': result.status,
                 'result': result.result if result.ready() else None,
                 'error': str(result.info) if result.failed() else None,
+                'progress': result.info if result.status == 'PROGRESS' else None,
                 'created_at': None,
                 'started_at': None,
                 'ended_at': None
             }
-                
+
         except Exception as e:
             logger.error(f"Error getting task details for {task_id}: {e}")
             return None
-    
+
+    def _task_progress(self, task_id: str) -> float:
+        """Percent reported in ``PROGRESS`` state (e.g. by ``core.ffmpeg_runner``)."""
+        try:
+            result = celery_app.AsyncResult(task_id)
+            if result.status == 'PROGRESS' and isinstance(result.info, dict):
+                return result.info.get('percent') or 0
+        except Exception as e:
+            logger.debug(f"No progress for task {task_id}: {e}")
+        return 0
+
     def stop_task(self, task_id: str) -> bool:
-        """Stop a running Celery task."""
+        """Stop a running Celery task.
+
+        Tasks running ffmpeg through ``core.ffmpeg_runner`` are stopped
+        cooperatively: the worker sees the cancel request, stops ffmpeg and
+        removes partial output.  Any other task is terminated.
+        """
         try:
-            celery_app.control.revoke(task_id, terminate=True)
+            request_cancel(task_id, self._redis_client)
+            cooperative = ffmpeg_active(task_id, self._redis_client)
+            celery_app.control.revoke(task_id, terminate=not cooperative)
             return True
-                
+
         except Exception as e:
             logger.error(f"Error stopping task {task_id}: {e}")
             return False
-    
+
     def pause_task(self, task_id: str) -> bool:
         """Attempt to pause a Celery task.
 
@@ -180,11 +227,11 @@ class UnifiedQueueManager:
         try:
             celery_app.control.revoke(task_id, terminate=False)
             return True
-                
+
         except Exception as e:
             logger.error(f"Error pausing task {task_id}: {e}")
             return False
-    
+
     def resume_task(self, task_id: str) -> bool:
         """Resume a paused or failed task by recreating it with preserved state.
         
@@ -193,6 +240,10 @@ class UnifiedQueueManager:
         1. Retrieving the original task state from Redis
         2. Recreating the task with the same parameters
         3. Preserving any progress or intermediate results
+
+        Transcription tasks continue from their checkpoint journal (see
+        ``core.transcription_checkpoint``) instead of starting from zero.
+        A VOD pipeline stage is re-queued together with the stages after it.
         """
         try:
             # Get the original task state
@@ -200,23 +251,60 @@ class UnifiedQueueManager:
             if not task_state:
                 logger.warning(f"No saved state found for task {task_id}")
                 return False
-            
+
             # Get the current task result to check if it's actually resumable
             result = celery_app.AsyncResult(task_id)
             if result.status in ['SUCCESS', 'PENDING']:
                 logger.warning(f"Task {task_id} is not in a resumable state: {result.status}")
                 return False
-            
+
             # Extract task information from state
             task_name = task_state.get('task_name')
             task_args = task_state.get('args', [])
             task_kwargs = task_state.get('kwargs', {})
             task_progress = task_state.get('progress', 0)
-            
+
             if not task_name:
                 logger.error(f"No task name found in state for {task_id}")
                 return False
-            
+
+            # Transcriptions journal their progress; continue from the last
+            # checkpoint rather than treating the old progress as a guess
+            resume_offset = None
+            if task_name in ('transcription.run_whisper', 'transcription.batch_item',
+                             STAGE_TASKS['transcribe']):
+                video_path = task_state.get('video_path') or (
+                    task_args[0] if task_args else task_kwargs.get('video_path')
+                )
+                checkpoint = get_checkpoint(video_path) if video_path else None
+                if checkpoint:
+                    resume_offset = checkpoint['offset']
+                    duration = task_state.get('duration') or 0
+                    if duration:
+                        task_progress = max(
+                            task_progress, int(100 * resume_offset / duration)
+                        )
+                    logger.info(
+                        f"Task {task_id} will resume {video_path} from checkpoint at "
+                        f"{resume_offset:.1f}s "
+                        f"({checkpoint['segments']} segments journalled)"
+                    )
+
+            # Stop the old task first so it cannot race the new one on shared output
+            if result.status == 'STARTED':
+                celery_app.control.revoke(task_id, terminate=True)
+
+            if task_state.get('pipeline_id') and task_state.get('stage'):
+                # Re-sending only the stage task would drop the rest of the chain
+                from core.tasks.vod_pipeline import resume_vod_pipeline
+                new_ids = resume_vod_pipeline(task_args[0], task_state['stage'])
+                self._delete_task_state(task_id)
+                logger.info(
+                    f"Resumed pipeline {task_state['pipeline_id']} stage task "
+                    f"{task_id} as {new_ids[task_state['stage']]}"
+                )
+                return True
+
             # Recreate the task with preserved state
             new_task = celery_app.send_task(
                 task_name,
@@ -224,32 +312,30 @@ class UnifiedQueueManager:
                 kwargs=task_kwargs,
                 countdown=0  # Start immediately
             )
-            
+
             # Transfer any progress or intermediate results
-            if task_progress > 0:
+            if task_progress > 0 or resume_offset is not None:
                 self._save_task_state(new_task.id, {
+                    **task_state,
                     'task_name': task_name,
                     'args': task_args,
                     'kwargs': task_kwargs,
                     'progress': task_progress,
+                    'resume_offset': resume_offset,
                     'resumed_from': task_id,
                     'resumed_at': datetime.now().isoformat()
                 })
-            
+
             # Clean up the old task state
             self._delete_task_state(task_id)
-            
-            # Revoke the old task if it's still running
-            if result.status == 'STARTED':
-                celery_app.control.revoke(task_id, terminate=True)
-            
+
             logger.info(f"Successfully resumed task {task_id} as {new_task.id}")
             return True
-                
+
         except Exception as e:
             logger.error(f"Error resuming task {task_id}: {e}")
             return False
-    
+
     def remove_task(self, task_id: str) -> bool:
         """Remove a Celery task from the queue and backend."""
         try:
@@ -257,11 +343,11 @@ class UnifiedQueueManager:
             result = celery_app.AsyncResult(task_id)
             result.forget()
             return True
-                
+
         except Exception as e:
             logger.error(f"Error removing task {task_id}: {e}")
             return False
-    
+
     def reorder_task(self, task_id: str, position: int) -> bool:
         """Reorder a task by adjusting its priority.
         
@@ -276,23 +362,23 @@ class UnifiedQueueManager:
             if result.status not in ['PENDING', 'RETRY']:
                 logger.warning(f"Cannot reorder task {task_id} in state {result.status}")
                 return False
-            
+
             # Calculate priority based on position (lower number = higher priority)
             # Position 0 = highest priority (priority 0)
             # Position 100 = lower priority (priority 100)
             priority = max(0, min(100, position))
-            
+
             # Store the priority for this task
             self._set_task_priority(task_id, priority)
-            
+
             # For pending tasks, we can influence their execution order
             # by adjusting the queue priority. This is a best-effort approach
             # since Celery doesn't guarantee strict ordering.
-            
+
             # Get all pending tasks and their priorities
             inspect = celery_app.control.inspect()
             reserved_tasks = inspect.reserved() or {}
-            
+
             # Create a priority map for all tasks
             task_priorities = {}
             for worker, tasks in reserved_tasks.items():
@@ -303,21 +389,21 @@ class UnifiedQueueManager:
                         # Get existing priority or use default
                         existing_priority = self._get_task_priority(task['id'])
                         task_priorities[task['id']] = existing_priority
-            
+
             # Sort tasks by priority
             sorted_tasks = sorted(task_priorities.items(), key=lambda x: x[1])
-            
+
             # Update priorities for all tasks to maintain order
             for i, (tid, _) in enumerate(sorted_tasks):
                 self._set_task_priority(tid, i)
-            
+
             logger.info(f"Successfully reordered task {task_id} to position {position} (priority {priority})")
             return True
-                
+
         except Exception as e:
             logger.error(f"Error reordering task {task_id}: {e}")
             return False
-    
+
     def cleanup_failed_tasks(self) -> Dict[str, int]:
         """Clean up failed Celery tasks with configurable retention policies.
         
@@ -334,57 +420,57 @@ class UnifiedQueueManager:
                 'temp_files_cleaned': 0,
                 'errors': []
             }
-            
+
             # Get failed tasks from result backend
             inspect = celery_app.control.inspect()
             stats = inspect.stats()
-            
+
             if not stats:
                 logger.warning("No worker stats available for cleanup")
                 return cleanup_stats
-            
+
             # Define retention policies (in hours)
             retention_policies = {
                 'transcription': 24,      # Keep transcription failures for 24 hours
                 'vod_processing': 48,     # Keep VOD processing failures for 48 hours
                 'default': 12             # Default retention for other tasks
             }
-            
+
             current_time = datetime.now()
-            
+
             # Scan for failed tasks in the result backend
             # Note: This is a simplified approach. In production, you might want
             # to use Celery's result backend inspection capabilities
-            
+
             # Clean up task state entries older than retention period
             state_keys = self._redis_client.keys(f"{self._task_state_prefix}*")
             for key in state_keys:
                 try:
                     task_id = key.decode().split(':')[-1]
                     state_data = self._redis_client.get(key)
-                    
+
                     if state_data:
                         state = json.loads(state_data)
                         saved_at = datetime.fromisoformat(state.get('saved_at', '1970-01-01T00:00:00'))
                         task_name = state.get('task_name', 'default')
-                        
+
                         # Determine retention period
                         retention_hours = retention_policies.get(
                             task_name.split('.')[0] if '.' in task_name else 'default',
                             retention_policies['default']
                         )
-                        
+
                         # Check if task state should be cleaned up
                         if (current_time - saved_at).total_seconds() > (retention_hours * 3600):
                             self._redis_client.delete(key)
                             cleanup_stats['state_cleaned'] += 1
                             logger.debug(f"Cleaned up old task state: {task_id}")
-                            
+
                 except Exception as e:
                     error_msg = f"Error cleaning up task state {key}: {e}"
                     cleanup_stats['errors'].append(error_msg)
                     logger.warning(error_msg)
-            
+
             # Clean up priority entries older than 24 hours
             priority_keys = self._redis_client.keys(f"{self._task_priority_prefix}*")
             for key in priority_keys:
@@ -396,36 +482,36 @@ class UnifiedQueueManager:
                     elif ttl <= 0:  # Expired, delete
                         self._redis_client.delete(key)
                         cleanup_stats['state_cleaned'] += 1
-                        
+
                 except Exception as e:
                     error_msg = f"Error cleaning up priority entry {key}: {e}"
                     cleanup_stats['errors'].append(error_msg)
                     logger.warning(error_msg)
-            
+
             # Clean up temporary files associated with failed tasks
             temp_cleanup_result = self._cleanup_temp_files_for_failed_tasks()
             cleanup_stats['temp_files_cleaned'] = temp_cleanup_result.get('files_cleaned', 0)
             cleanup_stats['errors'].extend(temp_cleanup_result.get('errors', []))
-            
+
             logger.info(f"Failed task cleanup completed: {cleanup_stats['state_cleaned']} state entries, "
                        f"{cleanup_stats['temp_files_cleaned']} temp files cleaned")
-            
+
             return cleanup_stats
 
         except Exception as e:
             logger.error(f"Error cleaning up failed tasks: {e}")
             return {'error': str(e), 'tasks_cleaned': 0, 'state_cleaned': 0, 'temp_files_cleaned': 0, 'errors': [str(e)]}
-    
+
     def _cleanup_temp_files_for_failed_tasks(self) -> Dict[str, Any]:
         """Clean up temporary files associated with failed tasks."""
         import os
         import glob
-        
+
         cleanup_result = {
             'files_cleaned': 0,
             'errors': []
         }
-        
+
         try:
             # Common temporary file patterns for failed tasks
             temp_patterns = [
@@ -436,15 +522,15 @@ class UnifiedQueueManager:
                 '/var/tmp/*whisper*',
                 '/var/tmp/*transcription*'
             ]
-            
+
             cutoff_time = datetime.now() - timedelta(hours=6)  # Clean files older than 6 hours
-            
+
             for pattern in temp_patterns:
                 try:
                     for file_path in glob.glob(pattern):
                         if os.path.isfile(file_path):
                             file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                            
+
                             if file_time < cutoff_time:
                                 try:
                                     os.remove(file_path)
@@ -454,19 +540,19 @@ class UnifiedQueueManager:
                                     error_msg = f"Failed to remove temp file {file_path}: {e}"
                                     cleanup_result['errors'].append(error_msg)
                                     logger.warning(error_msg)
-                                    
+
                 except Exception as e:
                     error_msg = f"Error processing temp pattern {pattern}: {e}"
                     cleanup_result['errors'].append(error_msg)
                     logger.warning(error_msg)
-                    
+
         except Exception as e:
             error_msg = f"Error in temp file cleanup: {e}"
             cleanup_result['errors'].append(error_msg)
             logger.error(error_msg)
-        
+
         return cleanup_result
-    
+
     def trigger_celery_task(self, task_name: str, **kwargs) -> Dict[str, Any]:
         """Trigger a Celery task."""
         try:
@@ -480,14 +566,15 @@ class UnifiedQueueManager:
                 'generate_vod_captions': 'vod_processing.generate_vod_captions',
                 'retranscode_vod_with_captions': 'vod_processing.retranscode_vod_with_captions',
                 'upload_captioned_vod': 'vod_processing.upload_captioned_vod',
-                'validate_vod_quality': 'vod_processing.validate_vod_quality'
+                'validate_vod_quality': 'vod_processing.validate_vod_quality',
+                'batch_transcription': 'transcription.batch_process'
             }
-            
+
             actual_task_name = task_mapping.get(task_name, task_name)
-            
+
             # Send task to Celery
             task = celery_app.send_task(actual_task_name, kwargs=kwargs)
-            
+
             return {
                 'success': True,
                 'task_id': task.id,
@@ -495,7 +582,7 @@ class UnifiedQueueManager:
                 'actual_task_name': actual_task_name,
                 'message': f'Task {task_name} triggered successfully'
             }
-            
+
         except Exception as e:
             logger.error(f"Error triggering Celery task {task_name}: {e}")
             return {
@@ -503,8 +590,8 @@ class UnifiedQueueManager:
                 'error': str(e),
                 'task_name': task_name
             }
-    
-    
+
+
     def get_worker_status(self) -> Dict[str, Any]:
         """Get detailed worker status information."""
         try:
@@ -513,7 +600,7 @@ class UnifiedQueueManager:
             ping = inspect.ping()
             active = inspect.active()
             reserved = inspect.reserved()
-            
+
             workers = {}
             if stats:
                 for worker_name, worker_stats in stats.items():
@@ -523,7 +610,7 @@ class UnifiedQueueManager:
                         'active_tasks': len(active.get(worker_name, [])),
                         'reserved_tasks': len(reserved.get(worker_name, []))
                     }
-            
+
             return {
                 'workers': workers,
                 'summary': {
@@ -534,7 +621,7 @@ class UnifiedQueueManager:
                     'total_reserved_tasks': sum(len(tasks) for tasks in reserved.values()) if reserved else 0
                 }
             }
-            
+
         except Exception as e:
             logger.error(f"Error getting worker status: {e}")
             return {
@@ -548,7 +635,71 @@ class UnifiedQueueManager:
                     'total_reserved_tasks': 0
                 }
             }
-    
+
+    def start_vod_pipeline(self, vod_id, city_id: str,
+                           video_path: Optional[str] = None) -> Dict[str, Any]:
+        """Queue the locate -> ... -> validate chain for one VOD."""
+        try:
+            from core.tasks.vod_pipeline import start_vod_pipeline
+            started = start_vod_pipeline(vod_id, city_id, video_path)
+            return {'success': True, **started}
+        except Exception as e:
+            logger.error(f"Error starting VOD pipeline for {vod_id}: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def get_pipeline(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        """DAG state of one VOD pipeline (stage statuses, task ids, timings)."""
+        try:
+            return get_pipeline_store().get(pipeline_id)
+        except Exception as e:
+            logger.error(f"Error getting pipeline {pipeline_id}: {e}")
+            return None
+
+    def list_pipelines(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent VOD pipelines first."""
+        try:
+            return get_pipeline_store().list(limit)
+        except Exception as e:
+            logger.error(f"Error listing pipelines: {e}")
+            return []
+
+    def get_pipeline_stages(self) -> Dict[str, Any]:
+        """Stage -> queue routing with each queue's limit and current load."""
+        routed = stage_queues()
+        limits = stage_concurrency()
+        queues = {
+            # The default queue is shared with every other task: no stage limit
+            queue: {
+                'concurrency': limits.get(queue),
+                'active': 0,
+                'reserved': 0,
+                'workers': [],
+            }
+            for queue in dict.fromkeys(routed.values())
+        }
+        try:
+            inspect = celery_app.control.inspect()
+            for field, tasks_by_worker in (('active', inspect.active() or {}),
+                                           ('reserved', inspect.reserved() or {})):
+                for worker_name, tasks in tasks_by_worker.items():
+                    for task in tasks:
+                        queue = (task.get('delivery_info') or {}).get('routing_key')
+                        if queue in queues:
+                            queues[queue][field] += 1
+                            if worker_name not in queues[queue]['workers']:
+                                queues[queue]['workers'].append(worker_name)
+        except Exception as e:
+            logger.warning(f"Could not inspect pipeline queues: {e}")
+
+        return {
+            'routing_enabled': VOD_STAGE_QUEUES_ENABLED,
+            'stages': [
+                {'stage': stage, 'task': STAGE_TASKS[stage], 'queue': queue}
+                for stage, queue in routed.items()
+            ],
+            'queues': queues
+        }
+
     def _start_cache_refresh(self):
         """Start background cache refresh thread."""
         def refresh_cache():
@@ -565,28 +716,28 @@ class UnifiedQueueManager:
                 except Exception as e:
                     logger.error(f"Error refreshing cache: {e}")
                     time.sleep(60)  # Wait longer on error
-        
+
         thread = threading.Thread(target=refresh_cache, daemon=True)
         thread.start()
-    
+
     def get_cached_data(self) -> Dict[str, Any]:
         """Get cached data for quick access."""
         with self._cache_lock:
             cached_data = self._task_cache.copy()
-            
+
             # Convert datetime objects to ISO format strings for JSON serialization
             if 'timestamp' in cached_data and isinstance(cached_data['timestamp'], datetime):
                 cached_data['timestamp'] = cached_data['timestamp'].isoformat()
-            
+
             # Convert datetime objects in tasks
             if 'tasks' in cached_data:
                 for task in cached_data['tasks']:
                     for key, value in task.items():
                         if isinstance(value, datetime):
                             task[key] = value.isoformat()
-            
+
             return cached_data
-    
+
     def _save_task_state(self, task_id: str, state: Dict[str, Any]) -> bool:
         """Save task state to Redis for potential resuming."""
         try:
@@ -597,7 +748,7 @@ class UnifiedQueueManager:
         except Exception as e:
             logger.error(f"Error saving task state for {task_id}: {e}")
             return False
-    
+
     def _get_task_state(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve saved task state from Redis."""
         try:
@@ -609,7 +760,7 @@ class UnifiedQueueManager:
         except Exception as e:
             logger.error(f"Error retrieving task state for {task_id}: {e}")
             return None
-    
+
     def _delete_task_state(self, task_id: str) -> bool:
         """Delete saved task state from Redis."""
         try:
@@ -619,7 +770,7 @@ class UnifiedQueueManager:
         except Exception as e:
             logger.error(f"Error deleting task state for {task_id}: {e}")
             return False
-    
+
     def _get_task_priority(self, task_id: str) -> int:
         """Get task priority from Redis."""
         try:
@@ -628,7 +779,7 @@ class UnifiedQueueManager:
             return int(priority) if priority else 0
         except Exception:
             return 0
-    
+
     def _set_task_priority(self, task_id: str, priority: int) -> bool:
         """Set task priority in Redis."""
         try:
@@ -647,4 +798,4 @@ def get_unified_queue_manager() -> UnifiedQueueManager:
     global _unified_queue_manager
     if _unified_queue_manager is None:
         _unified_queue_manager = UnifiedQueueManager()
-    return _unified_queue_manager 
\ No newline at end of file
+    return _unified_queue_manager
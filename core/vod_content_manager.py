@@ -16,7 +16,6 @@ Example:
 """
 
 import os
-import subprocess
 import json
 import os
 from typing import Dict, List, Optional, Any
@@ -26,6 +25,7 @@ from core.models import TranscriptionResultORM, CablecastShowORM, CablecastVODOR
 from core.app import db
 from core.config import CABLECAST_LOCATION_ID, VOD_DEFAULT_QUALITY
 from core.cablecast_client import CablecastAPIClient
+from core.media_probe import media_duration
 
 class VODContentManager:
     """Manages content flow from Archivist to VOD system"""
@@ -322,15 +322,11 @@ class VODContentManager:
             }
     
     def _get_video_duration(self, video_path: str) -> Optional[int]:
-        """Get video duration using ffprobe"""
+        """Get video duration from the shared ffprobe cache"""
         try:
-            cmd = [
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return int(float(result.stdout.strip()))
+            duration = media_duration(video_path)
+            if duration:
+                return int(duration)
         except Exception as e:
             logger.error(f"Error getting video duration: {e}")
         return None
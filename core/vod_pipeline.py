@@ -0,0 +1,269 @@
+"""End-to-end VOD pipeline: stage plan, queue routing and DAG state.
+
+``process_single_vod`` used to queue a transcription and return; captioning,
+upload and validation were never chained.  Each VOD now runs as one Celery
+chain (built in ``core.tasks.vod_pipeline``)::
+
+    locate -> probe -> transcribe -> caption_mux -> upload -> validate
+
+Every stage is routed to the queue of the resource it uses: ``cpu_asr`` for
+Whisper, ``cpu_transcode`` for ffmpeg, ``io_upload`` for mount lookups,
+probes and Cablecast uploads.  With one worker per queue, started with that
+queue's ``VOD_STAGE_CONCURRENCY``, a transcode of one VOD overlaps the
+transcription of the next and the upload of a third.  The routing is only
+installed with ``VOD_STAGE_QUEUES_ENABLED``; otherwise every stage runs on
+Celery's default queue like the rest of the tasks.
+
+This module has no Celery dependency.  It holds the stage plan, the
+per-queue concurrency limits and the Redis-backed DAG state that the stages
+write and the unified queue API reads.
+
+Example:
+    $ python scripts/deployment/stage_worker_commands.py   # one per stage queue
+    celery -A core.tasks worker -Q cpu_asr -c 1 -n cpu_asr@%h -Ofair \
+        --prefetch-multiplier=1
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from core.config import (
+    REDIS_URL,
+    VOD_PIPELINE_STATE_TTL,
+    VOD_QUEUE_ASR,
+    VOD_QUEUE_IO,
+    VOD_QUEUE_TRANSCODE,
+    VOD_STAGE_CONCURRENCY,
+    VOD_STAGE_QUEUES_ENABLED,
+)
+
+STAGES = ("locate", "probe", "transcribe", "caption_mux", "upload", "validate")
+STAGE_QUEUES = {
+    "locate": VOD_QUEUE_IO,
+    "probe": VOD_QUEUE_IO,
+    "transcribe": VOD_QUEUE_ASR,
+    "caption_mux": VOD_QUEUE_TRANSCODE,
+    "upload": VOD_QUEUE_IO,
+    "validate": VOD_QUEUE_IO,
+}
+# Celery's task_default_queue, used for every stage while routing is disabled
+DEFAULT_QUEUE = "celery"
+STAGE_TASKS = {stage: f"vod_pipeline.{stage}" for stage in STAGES}
+# Batch transcription (``transcription.batch_process``) reuses the CPU queues
+BATCH_QUEUES = {
+    "transcription.batch_item": VOD_QUEUE_ASR,
+    "transcription.caption_batch_item": VOD_QUEUE_TRANSCODE,
+}
+
+PIPELINE_KEY_PREFIX = "archivist:vod_pipeline:"
+PIPELINE_INDEX_KEY = "archivist:vod_pipelines"
+PIPELINE_INDEX_MAX = 1000
+
+# Stage statuses; a pipeline is finished once every stage is done or skipped
+FINISHED = ("done", "skipped")
+
+
+def parse_concurrency(spec: str) -> Dict[str, int]:
+    """Parse ``"cpu_asr=1,cpu_transcode=2"``; malformed entries are ignored."""
+    limits: Dict[str, int] = {}
+    for entry in (spec or "").split(","):
+        queue, sep, value = entry.partition("=")
+        try:
+            if sep and queue.strip():
+                limits[queue.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid VOD_STAGE_CONCURRENCY entry: {entry!r}")
+    return limits
+
+
+def stage_concurrency(spec: str = VOD_STAGE_CONCURRENCY) -> Dict[str, int]:
+    """Worker concurrency per pipeline queue (1 when not configured)."""
+    limits = parse_concurrency(spec)
+    return {
+        queue: limits.get(queue, 1) for queue in dict.fromkeys(STAGE_QUEUES.values())
+    }
+
+
+def stage_queues(enabled: bool = VOD_STAGE_QUEUES_ENABLED) -> Dict[str, str]:
+    """Queue each stage is actually sent to."""
+    return dict(STAGE_QUEUES) if enabled else {stage: DEFAULT_QUEUE for stage in STAGES}
+
+
+def task_routes(enabled: bool = VOD_STAGE_QUEUES_ENABLED) -> Dict[str, Dict[str, str]]:
+    """``celery_app.conf.task_routes`` entries for the pipeline and batch tasks.
+
+    Empty unless routing is enabled: nothing consumes the stage queues until
+    their workers (``worker_commands``) are started.
+    """
+    if not enabled:
+        return {}
+    routes = {
+        STAGE_TASKS[stage]: {"queue": queue} for stage, queue in STAGE_QUEUES.items()
+    }
+    routes.update({name: {"queue": queue} for name, queue in BATCH_QUEUES.items()})
+    return routes
+
+
+def worker_command(queue: str, concurrency: Optional[int] = None) -> List[str]:
+    """argv for a worker that consumes only ``queue`` at its concurrency limit.
+
+    ``-Ofair`` with a prefetch of one keeps an hour-long job from holding
+    back tasks another idle process could run.
+    """
+    if concurrency is None:
+        concurrency = stage_concurrency().get(queue, 1)
+    return [
+        "celery", "-A", "core.tasks", "worker", "-Q", queue, "-c", str(concurrency),
+        "-n", f"{queue}@%h", "-Ofair", "--prefetch-multiplier=1",
+    ]
+
+
+def worker_commands(enabled: bool = VOD_STAGE_QUEUES_ENABLED) -> List[List[str]]:
+    """One worker argv per stage queue, or none while routing is disabled."""
+    return [worker_command(queue) for queue in stage_concurrency()] if enabled else []
+
+
+def pipeline_status(state: Dict[str, Any]) -> str:
+    stages = state.get("stages", {})
+    statuses = [stages.get(stage, {}).get("status", "queued") for stage in STAGES]
+    if "failed" in statuses:
+        return "failed"
+    if all(status in FINISHED for status in statuses):
+        return "skipped" if state.get("skip_reason") else "completed"
+    if any(status != "queued" for status in statuses):
+        return "running"
+    return "queued"
+
+
+def current_stage(state: Dict[str, Any]) -> Optional[str]:
+    stages = state.get("stages", {})
+    return next(
+        (s for s in STAGES if stages.get(s, {}).get("status") not in FINISHED), None
+    )
+
+
+class PipelineStore:
+    """Per-pipeline DAG state as JSON in Redis, with a recency index.
+
+    Stages of one pipeline run strictly one after another, so a plain
+    read-modify-write per update is race-free.
+    """
+
+    def __init__(self, client=None, ttl: int = VOD_PIPELINE_STATE_TTL):
+        if client is None:
+            import redis
+
+            client = redis.from_url(REDIS_URL)
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, pipeline_id: str) -> str:
+        return f"{PIPELINE_KEY_PREFIX}{pipeline_id}"
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        state["updated_at"] = time.time()
+        state["status"] = pipeline_status(state)
+        state["current_stage"] = current_stage(state)
+        self.client.setex(self._key(state["pipeline_id"]), self.ttl, json.dumps(state))
+
+    def create(
+        self,
+        pipeline_id: str,
+        vod_id: Any,
+        city_id: str,
+        video_path: Optional[str],
+        task_ids: Dict[str, str],
+    ) -> Dict[str, Any]:
+        now = time.time()
+        state = {
+            "pipeline_id": pipeline_id,
+            "vod_id": vod_id,
+            "city_id": city_id,
+            "video_path": video_path,
+            "created_at": now,
+            "stages": {
+                stage: {
+                    "status": "queued",
+                    "queue": queue,
+                    "task_id": task_ids.get(stage),
+                }
+                for stage, queue in stage_queues().items()
+            },
+        }
+        self._save(state)
+        self.client.zadd(PIPELINE_INDEX_KEY, {pipeline_id: now})
+        self.client.zremrangebyrank(PIPELINE_INDEX_KEY, 0, -PIPELINE_INDEX_MAX - 1)
+        return state
+
+    def get(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        data = self.client.get(self._key(pipeline_id))
+        return json.loads(data) if data else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent pipelines first (expired entries are skipped)."""
+        ids = self.client.zrevrange(PIPELINE_INDEX_KEY, 0, max(0, limit - 1))
+        states = []
+        for pipeline_id in ids:
+            if isinstance(pipeline_id, bytes):
+                pipeline_id = pipeline_id.decode()
+            state = self.get(pipeline_id)
+            if state:
+                states.append(state)
+        return states
+
+    def update(self, pipeline_id: str, stage: str, status: str,
+               skip_reason: Optional[str] = None, **details: Any) -> None:
+        """Record ``stage`` as ``queued``/``running``/``done``/``failed``/``skipped``.
+
+        ``skip_reason`` marks the whole pipeline as having nothing left to
+        do (e.g. the VOD is already captioned); ``details`` are stored on
+        the stage.
+        """
+        state = self.get(pipeline_id)
+        if state is None:
+            logger.warning(
+                f"Pipeline {pipeline_id} has no state; {stage} -> {status} not recorded"
+            )
+            return
+        entry = state["stages"].setdefault(stage, {"queue": stage_queues().get(stage)})
+        entry["status"] = status
+        if status == "running":
+            entry["started_at"] = time.time()
+        elif status != "queued":
+            entry["finished_at"] = time.time()
+        entry.update({k: v for k, v in details.items() if v is not None})
+        if skip_reason:
+            state["skip_reason"] = skip_reason
+        self._save(state)
+
+
+# Global per-process handle (the state lives in Redis)
+_pipeline_store: Optional[PipelineStore] = None
+
+
+def get_pipeline_store() -> PipelineStore:
+    """Get the process-wide pipeline state store."""
+    global _pipeline_store
+    if _pipeline_store is None:
+        _pipeline_store = PipelineStore()
+    return _pipeline_store
+
+
+__all__ = [
+    "STAGES",
+    "STAGE_QUEUES",
+    "PipelineStore",
+    "get_pipeline_store",
+    "parse_concurrency",
+    "pipeline_status",
+    "stage_concurrency",
+    "stage_queues",
+    "task_routes",
+    "worker_command",
+    "worker_commands",
+]
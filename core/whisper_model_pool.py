@@ -0,0 +1,310 @@
+"""Process-resident Whisper model pool for Archivist transcription.
+
+Loading a faster-whisper model (especially ``large-v2``) takes several seconds
+and allocates multiple GB.  Every transcription entry point used to build a
+fresh ``WhisperModel`` per call; this module keeps loaded models resident for
+the lifetime of the worker process instead.
+
+Key Features:
+- Models keyed by (model name, compute type, cpu threads, device, replicas)
+- LRU eviction under a configurable memory budget
+- Optional warm-up when a Celery worker process starts
+- Hit/miss/load-time statistics, mirrored into the VOD metrics collector
+
+Example:
+    >>> from core.whisper_model_pool import get_whisper_model
+    >>> model = get_whisper_model()
+    >>> segments, info = model.transcribe("meeting.mp4")
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from core.config import (
+    WHISPER_MODEL,
+    USE_GPU,
+    COMPUTE_TYPE,
+    BATCH_SIZE,
+    WHISPER_MODEL_POOL_MAX_MB,
+)
+from core.monitoring.metrics import record_metric
+
+ModelKey = Tuple[str, str, int, str, int]
+
+# Approximate resident size (MB) of each model at float16.  Used only for
+# budget accounting, so rough figures are fine.
+_MODEL_SIZE_MB_FP16 = {
+    "tiny": 75,
+    "tiny.en": 75,
+    "base": 145,
+    "base.en": 145,
+    "small": 485,
+    "small.en": 485,
+    "medium": 1530,
+    "medium.en": 1530,
+    "large-v1": 3100,
+    "large-v2": 3100,
+    "large-v3": 3100,
+    "large": 3100,
+    "distil-large-v2": 1520,
+    "distil-large-v3": 1520,
+}
+
+_COMPUTE_TYPE_FACTOR = {
+    "float32": 2.0,
+    "float16": 1.0,
+    "bfloat16": 1.0,
+    "int8_float16": 0.55,
+    "int8_float32": 0.55,
+    "int8": 0.5,
+}
+
+
+def estimate_model_size_mb(model_name: str, compute_type: str) -> int:
+    """Return an approximate resident size in MB for a model/compute type pair."""
+    base = _MODEL_SIZE_MB_FP16.get(model_name)
+    if base is None:
+        # Unknown names are usually local paths to large checkpoints
+        base = _MODEL_SIZE_MB_FP16["large-v2"]
+    return int(base * _COMPUTE_TYPE_FACTOR.get(compute_type, 1.0))
+
+
+def _default_loader(model_name: str, compute_type: str, cpu_threads: int, device: str,
+                    num_workers: int = 1) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        model_name,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+@dataclass
+class _PooledModel:
+    model: Any
+    size_mb: int
+    load_seconds: float
+    loaded_at: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+class WhisperModelPool:
+    """LRU pool of loaded Whisper models bounded by a memory budget."""
+
+    def __init__(
+        self,
+        max_memory_mb: int = WHISPER_MODEL_POOL_MAX_MB,
+        loader: Optional[Callable[..., Any]] = None,
+    ):
+        self.max_memory_mb = max_memory_mb
+        self._loader = loader or _default_loader
+        self._models: "OrderedDict[ModelKey, _PooledModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Keys being loaded right now; other callers wait on the future
+        self._loading: Dict[ModelKey, "Future[Any]"] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "evictions": 0,
+            "load_seconds_total": 0.0,
+        }
+
+    @staticmethod
+    def make_key(
+        model_name: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
+        device: Optional[str] = None,
+        num_workers: int = 1,
+    ) -> ModelKey:
+        """Normalise arguments into a pool key, filling in config defaults.
+
+        ``num_workers`` is the number of CTranslate2 replicas: that many
+        threads can decode on the one model concurrently (weights are shared),
+        each using ``cpu_threads`` threads.
+        """
+        return (
+            model_name or WHISPER_MODEL,
+            compute_type or COMPUTE_TYPE,
+            int(cpu_threads if cpu_threads is not None else BATCH_SIZE),
+            device or ("cuda" if USE_GPU else "cpu"),
+            max(1, int(num_workers)),
+        )
+
+    def get(
+        self,
+        model_name: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
+        device: Optional[str] = None,
+        num_workers: int = 1,
+    ) -> Any:
+        """Return a loaded model for the given configuration, loading it on a miss.
+
+        The load runs outside the pool lock, so a multi-second load of one key
+        never blocks lookups of the others; concurrent callers asking for the
+        key being loaded wait for that one load instead of starting another.
+        """
+        key = self.make_key(model_name, compute_type, cpu_threads, device, num_workers)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                entry.uses += 1
+                self._stats["hits"] += 1
+                record_metric("increment", "whisper_model_pool_hits")
+                return entry.model
+
+            pending = self._loading.get(key)
+            if pending is not None:
+                self._stats["hits"] += 1
+                record_metric("increment", "whisper_model_pool_hits")
+            else:
+                self._stats["misses"] += 1
+                record_metric("increment", "whisper_model_pool_misses")
+                size_mb = estimate_model_size_mb(key[0], key[1])
+                self._evict_for(size_mb)
+                loading = self._loading[key] = Future()
+
+        if pending is not None:
+            model = pending.result()
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    entry.uses += 1
+            return model
+
+        logger.info(
+            f"Loading Whisper model {key[0]} ({key[1]}, {key[2]} threads "
+            f"x {key[4]}) on {key[3]}"
+        )
+        started = time.perf_counter()
+        try:
+            model = self._loader(*key)
+        except Exception as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._models[key] = _PooledModel(
+                model=model, size_mb=size_mb, load_seconds=elapsed, uses=1
+            )
+            self._stats["loads"] += 1
+            self._stats["load_seconds_total"] += elapsed
+            del self._loading[key]
+            memory_mb = self.memory_mb
+        loading.set_result(model)
+        record_metric("timer", "whisper_model_load_duration", elapsed)
+        record_metric("gauge", "whisper_model_pool_memory_mb", memory_mb)
+        logger.info(f"Whisper model {key[0]} loaded in {elapsed:.2f}s")
+        return model
+
+    def warm_up(self, *args, **kwargs) -> bool:
+        """Load a model ahead of the first job; never raises."""
+        try:
+            self.get(*args, **kwargs)
+            return True
+        except Exception as e:
+            logger.warning(f"Whisper model warm-up failed: {e}")
+            return False
+
+    def evict(self, key: ModelKey) -> bool:
+        """Drop a specific model from the pool."""
+        with self._lock:
+            if self._models.pop(key, None) is None:
+                return False
+            self._stats["evictions"] += 1
+            return True
+
+    def clear(self) -> None:
+        """Drop every pooled model."""
+        with self._lock:
+            self._stats["evictions"] += len(self._models)
+            self._models.clear()
+
+    @property
+    def memory_mb(self) -> int:
+        return sum(entry.size_mb for entry in self._models.values())
+
+    def _evict_for(self, incoming_mb: int) -> None:
+        # Called with the lock held.  A model larger than the whole budget is
+        # still admitted, it just evicts everything else first.
+        while self._models and self.memory_mb + incoming_mb > self.max_memory_mb:
+            key, entry = self._models.popitem(last=False)
+            self._stats["evictions"] += 1
+            record_metric("increment", "whisper_model_pool_evictions")
+            logger.info(
+                f"Evicted Whisper model {key[0]} ({key[1]}) to free {entry.size_mb}MB"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool statistics suitable for health/metrics endpoints."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": (self._stats["hits"] / lookups) if lookups else 0.0,
+                "memory_mb": self.memory_mb,
+                "max_memory_mb": self.max_memory_mb,
+                "models": [
+                    {
+                        "model": key[0],
+                        "compute_type": key[1],
+                        "cpu_threads": key[2],
+                        "device": key[3],
+                        "num_workers": key[4],
+                        "size_mb": entry.size_mb,
+                        "load_seconds": round(entry.load_seconds, 3),
+                        "uses": entry.uses,
+                    }
+                    for key, entry in self._models.items()
+                ],
+            }
+
+
+# Global per-process pool instance
+_model_pool: Optional[WhisperModelPool] = None
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Get the process-wide Whisper model pool."""
+    global _model_pool
+    if _model_pool is None:
+        _model_pool = WhisperModelPool()
+    return _model_pool
+
+
+def get_whisper_model(
+    model_name: Optional[str] = None,
+    compute_type: Optional[str] = None,
+    cpu_threads: Optional[int] = None,
+    device: Optional[str] = None,
+    num_workers: int = 1,
+) -> Any:
+    """Shortcut for ``get_model_pool().get(...)``."""
+    return get_model_pool().get(
+        model_name, compute_type, cpu_threads, device, num_workers
+    )
+
+
+__all__ = [
+    "WhisperModelPool",
+    "estimate_model_size_mb",
+    "get_model_pool",
+    "get_whisper_model",
+]
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Benchmark CEA-608 SCC generation for a long synthetic transcript."""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.cea608 import benchmark  # noqa: E402
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CEA-608 SCC generation")
+    parser.add_argument("--hours", type=float, default=5.0)
+    parser.add_argument("--mode", choices=("popon", "rollup"), default="popon")
+    parser.add_argument("--rows", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    result = benchmark(args.hours, args.mode, args.rows)
+    print(
+        f"{result['hours']:g}h transcript, {result['segments']} segments ({result['mode']}): "
+        f"{result['seconds']:.3f}s, {result['segments_per_second']} segments/s, "
+        f"{result['bytes'] / 1024:.0f} KiB SCC"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Benchmark bulk SCC parsing over directories or a generated archive."""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.bench_fixtures import synthetic_scc_archive  # noqa: E402
+from core.scc_parser import bulk_parse  # noqa: E402
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bulk SCC parsing")
+    parser.add_argument("directories", nargs="*", help="Directories to scan for .scc files")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--synthetic", type=int, default=50,
+                        help="Files to generate when no directory is given")
+    parser.add_argument("--hours", type=float, default=2.0, help="Length of each synthetic file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="scc_bench_") as tmp:
+        if args.directories:
+            paths = [
+                os.path.join(root, name)
+                for directory in args.directories
+                for root, _dirs, names in os.walk(directory)
+                for name in names if name.lower().endswith(".scc")
+            ]
+        else:
+            paths = synthetic_scc_archive(tmp, args.synthetic, args.hours)
+        result = bulk_parse(paths, workers=args.workers)
+
+    print(
+        f"{result['files']} files, {result['captions']} captions, {result['megabytes']} MB: "
+        f"{result['seconds']:.3f}s ({result['files_per_second']} files/s, "
+        f"{result['megabytes_per_second']} MB/s, {args.workers} worker(s))"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
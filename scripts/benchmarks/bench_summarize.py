@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Time meeting-minutes generation end to end for a synthetic meeting."""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.bench_fixtures import synthetic_scc_archive  # noqa: E402
+from core.config import SUMMARIZATION_BATCH_SIZE  # noqa: E402
+from core.scc_parser import load_scc  # noqa: E402
+from core.scc_summarizer import summarize_captions, summarizer  # noqa: E402
+
+
+def benchmark(hours: float = 3.0, batch_size: int = SUMMARIZATION_BATCH_SIZE,
+              map_reduce: bool = True) -> Dict[str, Any]:
+    """Time minutes generation end to end for a synthetic ``hours``-long meeting."""
+    with tempfile.TemporaryDirectory(prefix="summary_bench_") as tmp:
+        scc_path = synthetic_scc_archive(tmp, 1, hours)[0]
+        load_started = time.perf_counter()
+        summarizer.get()
+        load_seconds = time.perf_counter() - load_started
+
+        started = time.perf_counter()
+        captions = load_scc(scc_path)
+        result = summarize_captions(captions, map_reduce=map_reduce, batch_size=batch_size)
+        with open(scc_path.replace(".scc", "_minutes.json"), "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        total = time.perf_counter() - started
+
+    return {
+        **result["generation"],
+        "hours": hours,
+        "captions": len(captions),
+        "model_loaded": summarizer.get().summarizer is not None,
+        "model_load_seconds": round(load_seconds, 2),
+        "end_to_end_seconds": round(total, 3),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark meeting minutes generation")
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--batch-size", type=int, default=SUMMARIZATION_BATCH_SIZE)
+    parser.add_argument("--no-map-reduce", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = benchmark(args.hours, args.batch_size, not args.no_map_reduce)
+    backend = result["model"] if result["model_loaded"] else "fallback (model unavailable)"
+    print(
+        f"{result['hours']}h meeting, {result['captions']} captions -> {result['chunks']} chunks "
+        f"via {backend}: {result['chunks_per_second']} chunks/s, "
+        f"minutes in {result['end_to_end_seconds']:.2f}s (model load {result['model_load_seconds']}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Compare latency, peak RSS and ROUGE of the summarization backends."""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.bench_fixtures import synthetic_scc_archive  # noqa: E402
+from core.summarization_benchmark import DEFAULT_FIXTURE, format_table, run_benchmark  # noqa: E402
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the summarization backends")
+    parser.add_argument("--backends", default="torch,torch-int8,ctranslate2",
+                        help="Comma-separated SUMMARIZATION_BACKEND values")
+    parser.add_argument("--scc", default=str(DEFAULT_FIXTURE), help="Fixture transcript")
+    parser.add_argument("--hours", type=float, default=0.0,
+                        help="Use a synthetic meeting of this length instead of --scc")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--output", help="Write JSON results here")
+    args = parser.parse_args(argv)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    with tempfile.TemporaryDirectory(prefix="summarize_bench_") as tmp:
+        scc_path = args.scc
+        if args.hours > 0:
+            scc_path = synthetic_scc_archive(tmp, 1, args.hours)[0]
+        document = run_benchmark(backends, scc_path, args.batch_size, args.repeats)
+
+    print(format_table(document))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    return 0 if all("error" not in r for r in document["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Benchmark caption burn-in: one ffmpeg process vs the segment pool."""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.transcode_benchmark import format_table, run_benchmark  # noqa: E402
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark segment-parallel transcoding")
+    parser.add_argument("--minutes", type=float, default=10.0, help="Length of the generated video")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--quality", type=int, help="VOD quality level (default: original size)")
+    parser.add_argument("--no-burn-in", action="store_true", help="Transcode without captions")
+    parser.add_argument("--output", help="Write JSON results here")
+    args = parser.parse_args(argv)
+
+    document = run_benchmark(args.minutes, args.workers, args.quality, not args.no_burn_in)
+    print(format_table(document))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    return 0 if all("error" not in r for r in document["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
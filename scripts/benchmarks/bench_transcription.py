@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Transcription throughput benchmark with a real-time-factor regression gate.
+
+Example:
+    $ python scripts/benchmarks/bench_transcription.py --models base,small --threads 4,8 \\
+          --long-minutes 10 --output bench.json
+    $ python scripts/benchmarks/bench_transcription.py --models base --baseline bench.json \\
+          --max-regression 0.10
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.transcription_benchmark import (  # noqa: E402
+    DEFAULT_FIXTURE,
+    compare_to_baseline,
+    expand_matrix,
+    format_table,
+    prepare_fixtures,
+    run_benchmark,
+)
+
+
+def _csv(cast):
+    return lambda value: [cast(v.strip()) for v in value.split(",") if v.strip()]
+
+
+def _bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "on", "yes", "vad")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the transcription path")
+    parser.add_argument("--models", type=_csv(str), default=[os.getenv("WHISPER_MODEL", "large-v2")])
+    parser.add_argument("--compute-types", type=_csv(str), default=["int8"])
+    parser.add_argument("--threads", type=_csv(int), default=[int(os.getenv("BATCH_SIZE", "16"))])
+    parser.add_argument("--beam-sizes", type=_csv(int), default=[5])
+    parser.add_argument("--vad", type=_csv(_bool), default=[True], help="e.g. on,off")
+    parser.add_argument("--modes", type=_csv(str), default=["serial"], help="serial,chunked")
+    parser.add_argument("--fixture", default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--long-minutes", type=_csv(float), default=[],
+                        help="Synthesise long fixtures of these lengths")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--output", help="Write JSON results here")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Allowed real-time-factor growth before failing (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    configs = expand_matrix(args.models, args.compute_types, args.threads,
+                            args.beam_sizes, args.vad, args.modes)
+    work_dir = tempfile.mkdtemp(prefix="archivist_bench_")
+    try:
+        fixtures = prepare_fixtures(work_dir, args.fixture, args.long_minutes)
+        document = run_benchmark(configs, fixtures, work_dir, repeats=args.repeats)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(format_table(document))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    failed = any("error" in r for r in document["results"])
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(document, json.load(f), args.max_regression)
+        for reg in regressions:
+            print(f"REGRESSION {reg['config_id']} on {reg['fixture']}: RTF "
+                  f"{reg['baseline']:.3f} -> {reg['current']:.3f} ({reg['change']:+.1%})")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
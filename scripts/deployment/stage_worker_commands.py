@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Print one Celery worker command per VOD pipeline stage queue."""
+
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.config import VOD_STAGE_QUEUES_ENABLED  # noqa: E402
+from core.vod_pipeline import worker_commands  # noqa: E402
+
+
+def main() -> int:
+    if not VOD_STAGE_QUEUES_ENABLED:
+        print("# VOD_STAGE_QUEUES_ENABLED is off: stages run on the default queue")
+    for command in worker_commands(enabled=True):
+        print(" ".join(command))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
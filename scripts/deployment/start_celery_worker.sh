@@ -142,6 +142,10 @@ main() {
                 echo "  --name NAME         Set worker name (default: vod_worker@%h)"
                 echo "  --log-level LEVEL   Set log level (default: info)"
                 echo "  --help              Show this help message"
+                echo ""
+                echo "With VOD_STAGE_QUEUES_ENABLED=true, VOD pipeline stages run on their own"
+                echo "queues; start one worker per queue (commands: scripts/deployment/stage_worker_commands.py),"
+                echo "e.g. $0 --queues cpu_asr --concurrency 1 --name cpu_asr@%h"
                 exit 0
                 ;;
             *)
@@ -345,6 +345,7 @@ class ServiceManager:
             logger.info(f"Starting Celery worker with command: {' '.join(worker_cmd)}")
             
             self.processes["celery_worker"] = worker_process
+            self._start_stage_workers(venv_celery)
             
             # Wait for worker to start with multiple checks
             for attempt in range(30):  # Try for up to 30 seconds (increased for ML model loading)
@@ -366,6 +367,24 @@ class ServiceManager:
             logger.error(f"❌ Failed to start Celery worker: {e}")
             return False
     
+    def _start_stage_workers(self, celery_bin: str) -> None:
+        """Start one worker per VOD pipeline stage queue (when stage routing is enabled)."""
+        from core.vod_pipeline import worker_commands
+
+        for command in worker_commands():
+            queue = command[command.index("-Q") + 1]
+            worker_cmd = [celery_bin, *command[1:], "--loglevel=info"]
+            try:
+                self.processes[f"celery_worker_{queue}"] = subprocess.Popen(
+                    worker_cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.config.project_root
+                )
+                logger.info(f"Starting {queue} stage worker with command: {' '.join(worker_cmd)}")
+            except Exception as e:
+                logger.error(f"❌ Failed to start {queue} stage worker: {e}")
+    
     def _start_celery_beat(self) -> bool:
         """Start Celery beat scheduler."""
         try:
@@ -10,6 +10,7 @@ import os
 import sys
 import time
 import subprocess
+import tempfile
 import threading
 from pathlib import Path
 
@@ -56,6 +57,47 @@ def start_celery_worker():
         print_status("❌ Celery worker failed to start", "\033[31m")
         return None
 
+def start_stage_workers():
+    """Start one worker per VOD pipeline stage queue (when stage routing is enabled)."""
+    from core.vod_pipeline import worker_commands
+
+    launched = []
+    for command in worker_commands():
+        queue = command[command.index("-Q") + 1]
+        # A file rather than a pipe: nobody drains a running worker's log output
+        stderr = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                command + ["--loglevel=info"],
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+                cwd=Path.cwd()
+            )
+        except OSError as e:
+            stderr.close()
+            print_status(f"❌ Failed to start {queue} stage worker: {e}", "\033[31m")
+            continue
+        launched.append((queue, process, stderr))
+
+    if launched:
+        # Wait a moment for startup
+        time.sleep(3)
+
+    processes = []
+    for queue, process, stderr in launched:
+        if process.poll() is None:
+            print_status(f"✅ {queue} stage worker started", "\033[32m")
+            processes.append(process)
+        else:
+            stderr.seek(0)
+            output = stderr.read().decode(errors="replace").strip()
+            print_status(
+                f"❌ {queue} stage worker exited with code {process.returncode}: {output}",
+                "\033[31m"
+            )
+        stderr.close()
+    return processes
+
 def start_celery_beat():
     """Start Celery beat scheduler."""
     print_status("⏰ Starting Celery beat scheduler...", "\033[34m")
@@ -171,6 +213,7 @@ def main():
     worker_process = start_celery_worker()
     if worker_process:
         processes.append(worker_process)
+    processes.extend(start_stage_workers())
     
     # Start Celery beat
     beat_process = start_celery_beat()
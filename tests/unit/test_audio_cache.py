@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pytest
+
+import core.audio_cache as audio_cache
+from core.audio_cache import AudioCache, SAMPLE_RATE
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    calls = []
+
+    def fake_extract(source_path, pcm_path, dtype="float32"):
+        calls.append(source_path)
+        samples = np.linspace(-0.5, 0.5, SAMPLE_RATE * 2, dtype=np.float32)
+        if dtype == "int16":
+            samples = (samples * 32767).astype(np.int16)
+        samples.tofile(pcm_path)
+        return len(samples)
+
+    monkeypatch.setattr(audio_cache, "extract_pcm", fake_extract)
+    return calls
+
+
+def _source(tmp_path, name="meeting.mp4", payload=b"x" * 1024):
+    path = tmp_path / name
+    path.write_bytes(payload)
+    return str(path)
+
+
+def test_extracts_once_and_serves_memmap(tmp_path, fake_ffmpeg):
+    cache = AudioCache(cache_dir=str(tmp_path / "cache"), max_bytes=10**9)
+    source = _source(tmp_path)
+
+    first = cache.get(source)
+    second = cache.get(source)
+
+    assert fake_ffmpeg == [source]
+    assert isinstance(second.samples, np.memmap)
+    assert second.duration == pytest.approx(2.0)
+    assert np.allclose(first.read(0, 1), second.samples[:SAMPLE_RATE])
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["bytes_saved"] == 1024
+
+
+def test_modified_source_is_re_extracted(tmp_path, fake_ffmpeg):
+    cache = AudioCache(cache_dir=str(tmp_path / "cache"), max_bytes=10**9)
+    source = _source(tmp_path)
+    cache.get(source)
+
+    with open(source, "ab") as f:
+        f.write(b"more")
+    cache.get(source)
+
+    assert len(fake_ffmpeg) == 2
+
+
+def test_int16_read_is_scaled_float32(tmp_path, fake_ffmpeg):
+    cache = AudioCache(cache_dir=str(tmp_path / "cache"), max_bytes=10**9, dtype="int16")
+    staged = cache.get(_source(tmp_path))
+
+    window = staged.read(0, 0.5)
+    assert window.dtype == np.float32
+    assert window.min() >= -1.0 and window.max() <= 1.0
+
+
+def test_lru_eviction_keeps_newest_entry(tmp_path, fake_ffmpeg):
+    entry_bytes = SAMPLE_RATE * 2 * 4
+    cache = AudioCache(cache_dir=str(tmp_path / "cache"), max_bytes=int(entry_bytes * 1.5))
+
+    old = cache.get(_source(tmp_path, "a.mp4"))
+    os.utime(old.pcm_path, (1, 1))
+    new = cache.get(_source(tmp_path, "b.mp4"))
+
+    assert not os.path.exists(old.pcm_path)
+    assert os.path.exists(new.pcm_path)
+    assert cache.get_stats()["evictions"] == 1
@@ -0,0 +1,29 @@
+from celery.backends.cache import CacheBackend
+
+import core.tasks.transcription as tasks
+from core.tasks import celery_app
+
+
+def test_batch_id_polls_to_the_aggregated_results(monkeypatch):
+    backend = CacheBackend(app=celery_app, backend="memory")
+    monkeypatch.setattr(celery_app._local, "backend", backend, raising=False)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    # Eager tasks only store results when asked; the client polls the callback
+    monkeypatch.setattr(tasks.batch_summary, "store_eager_result", True)
+
+    def transcribe(task, video_path):
+        if video_path == "broken.mp4":
+            raise RuntimeError("moov atom not found")
+        return {"video_path": video_path, "status": "completed",
+                "output_path": video_path[:-4] + ".scc"}
+
+    monkeypatch.setattr(tasks, "transcribe_in_task", transcribe)
+
+    batch_id = tasks.queue_batch_transcription(["a.mp4", "broken.mp4", "b.mp4"]).id
+    result = celery_app.AsyncResult(batch_id)
+
+    assert result.state == "SUCCESS"
+    summary = result.get(timeout=1)
+    assert (summary["total_videos"], summary["completed"], summary["failed"]) == (3, 2, 1)
+    assert [r["video_path"] for r in summary["results"]] == ["a.mp4", "b.mp4"]
+    assert "moov atom" in summary["errors"][0]["error"]
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from core.caption_index import CaptionIndexStore, CaptionTimeIndex, write_index
+
+
+def _scc(path, cues):
+    path.write_text("".join(f"{start}\t{end}\n{text}\n\n" for start, end, text in cues))
+    return path
+
+
+def test_point_and_range_queries(tmp_path):
+    path = str(tmp_path / "t.idx")
+    # Out of order, with an overlong caption overlapping its neighbours
+    write_index(path, [
+        (10.0, 12.0, "second"),
+        (0.0, 2.0, "first"),
+        (11.0, 30.0, "long caption é"),
+        (20.0, 22.0, "third"),
+    ], source_size=1, source_mtime_ns=2)
+    index = CaptionTimeIndex(path)
+
+    assert len(index) == 4 and list(index.starts) == [0.0, 10.0, 11.0, 20.0]
+    assert index.at(1.0) == [(0.0, 2.0, "first")]
+    assert index.at(5.0) == []
+    assert [c[2] for c in index.at(21.0)] == ["long caption é", "third"]
+    assert [c[2] for c in index.between(1.5, 10.5)] == ["first", "second"]
+    assert [c[2] for c in index.between(25.0, 40.0)] == ["long caption é"]
+    assert index.between(2.0, 10.0) == []  # end-exclusive on both sides
+    assert index.index_before(10.5) == 1 and index.index_before(-1.0) == -1
+    assert index[-1] == (20.0, 22.0, "third")
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "empty.idx")
+    write_index(path, [], 0, 0)
+    index = CaptionTimeIndex(path)
+
+    assert len(index) == 0 and index.at(3.0) == [] and index.between(0, 100) == []
+
+
+def test_store_builds_lazily_persists_and_rebuilds_when_stale(tmp_path):
+    scc = _scc(tmp_path / "council.scc", [
+        ("00:00:01:00", "00:00:04:00", "Call to order"),
+        ("00:01:00:00", "00:01:05:00", "Roll call"),
+    ])
+    store = CaptionIndexStore(str(tmp_path / "idx"), max_open=4)
+
+    first = store.get(str(scc))
+    assert first.at(2.0)[0][2] == "Call to order"
+    assert store.get(str(scc)) is first
+    assert os.path.exists(store.index_path(str(scc)))
+
+    # A fresh process reuses the file on disk instead of reparsing
+    other = CaptionIndexStore(str(tmp_path / "idx"))
+    assert other.get(str(scc)).at(62.0)[0][2] == "Roll call"
+    assert other.get_stats()["loads"] == 1 and other.get_stats()["builds"] == 0
+
+    _scc(scc, [("00:00:01:00", "00:00:04:00", "Meeting adjourned")])
+    os.utime(scc, ns=(1, 1))
+    assert store.get(str(scc)).at(2.0)[0][2] == "Meeting adjourned"
+    assert store.get_stats()["builds"] == 2
+
+
+def test_store_lru_eviction(tmp_path):
+    store = CaptionIndexStore(str(tmp_path / "idx"), max_open=2)
+    paths = [_scc(tmp_path / f"m{i}.scc", [("00:00:01:00", "00:00:02:00", f"m{i}")]) for i in range(3)]
+    for path in paths:
+        store.get(str(path))
+
+    stats = store.get_stats()
+    assert stats["open"] == 2 and stats["evictions"] == 1
+
+
+def test_corrupt_index_file_is_rebuilt(tmp_path):
+    scc = _scc(tmp_path / "council.scc", [("00:00:01:00", "00:00:04:00", "Call to order")])
+    store = CaptionIndexStore(str(tmp_path / "idx"))
+    with open(store.index_path(str(scc)), "wb") as f:
+        f.write(b"garbage" * 10)
+
+    assert store.get(str(scc)).at(2.0)[0][2] == "Call to order"
+    with pytest.raises(ValueError):
+        CaptionTimeIndex(str(tmp_path / "council.scc"))
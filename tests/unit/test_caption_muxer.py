@@ -0,0 +1,134 @@
+import json
+import subprocess
+
+import pytest
+
+import core.caption_muxer as caption_muxer
+import core.media_probe as media_probe
+import core.segment_transcoder as segment_transcoder
+from core.cpu_budget import CpuBudget
+from core.exceptions import VODError
+from core.media_probe import MediaProbe
+from core.caption_muxer import (
+    allowed_modes,
+    build_command,
+    embed_captions,
+    is_cea608_scc,
+    plan_modes,
+    write_caption_track,
+)
+
+PLAIN_SCC = "Scenarist_SCC V1.0\n\n00:00:01:00\t00:00:03:00\nCall to order.\n\n"
+
+
+class FakeFfmpeg:
+    """Records ffmpeg/ffprobe calls; fails any command containing a rejected codec."""
+
+    def __init__(self, reject=(), duration="3600.0"):
+        self.reject, self.duration, self.calls = set(reject), duration, []
+
+    def __call__(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        if "-show_format" in cmd:
+            out = json.dumps({"format": {"duration": self.duration}, "streams": []})
+        else:
+            out = ""  # no keyframe packets: burn-in takes the single-process path
+        return subprocess.CompletedProcess(cmd, 0, stdout=out, stderr="")
+
+    def ffmpeg(self, cmd, timeout=None, job=None, part=0):
+        self.calls.append(cmd)
+        if self.reject & set(cmd):
+            raise VODError("codec not supported")
+        with open(cmd[-1], "wb") as f:
+            f.write(b"\0" * 64)
+        return {"seconds": 0.0, "progress": {}, "stderr": ""}
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(subprocess, "run", self)
+        monkeypatch.setattr(caption_muxer, "run_ffmpeg", self.ffmpeg)
+        monkeypatch.setattr(segment_transcoder, "run_ffmpeg", self.ffmpeg)
+        return self
+
+
+@pytest.fixture(autouse=True)
+def probe_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_probe, "_media_probe", MediaProbe(str(tmp_path / "probe.sqlite")))
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "in.mp4"
+    path.write_bytes(b"\0" * 128)
+    return str(path)
+
+
+@pytest.fixture
+def scc(tmp_path):
+    path = tmp_path / "council.scc"
+    path.write_text(PLAIN_SCC)
+    return str(path)
+
+
+def test_policy_resolution_prefers_most_specific_entry():
+    policy = "default=mov_text|cea608|burn_in;flex3=burn_in;flex1.broadcast=cea608;bogus=hardsub"
+
+    assert allowed_modes("flex1", policy=policy) == ["mov_text", "cea608", "burn_in"]
+    assert allowed_modes("flex1", "broadcast", policy=policy) == ["cea608"]
+    assert allowed_modes("FLEX3", policy=policy) == ["burn_in"]
+    assert plan_modes(["burn_in", "cea608", "mov_text"]) == ["cea608", "mov_text", "burn_in"]
+
+
+def test_stream_copy_command_never_reencodes_video():
+    cmd = build_command("mov_text", "in.mp4", "captions.srt", "out.mp4")
+
+    assert cmd[cmd.index("-c:v") + 1] == "copy" and cmd[cmd.index("-c:a") + 1] == "copy"
+    assert cmd[cmd.index("-c:s") + 1] == "mov_text" and "-vf" not in cmd
+
+
+def test_plain_scc_is_converted_for_each_mode(scc, tmp_path):
+    srt = write_caption_track(scc, "mov_text", str(tmp_path))
+    cea = write_caption_track(scc, "cea608", str(tmp_path))
+
+    assert open(srt).read() == "1\n00:00:01,000 --> 00:00:03,000\nCall to order.\n\n"
+    assert not is_cea608_scc(scc) and is_cea608_scc(cea)
+    assert write_caption_track(cea, "cea608", str(tmp_path)) == cea
+
+
+def test_embed_uses_stream_copy_and_reports_time_saved(video, scc, tmp_path, monkeypatch):
+    fake = FakeFfmpeg()
+    fake.install(monkeypatch)
+
+    result = embed_captions(video, scc, str(tmp_path / "out" / "in_captioned.mp4"),
+                            city_id="flex1")
+
+    assert result["success"] and result["mode"] == "mov_text"
+    assert result["output_path"].endswith("in_captioned.mp4")
+    assert result["estimated_burn_in_seconds"] == 2400.0
+    assert result["time_saved_seconds"] > 2000
+    assert not any("libx264" in cmd for cmd in fake.calls)
+
+
+def test_embed_falls_back_to_next_allowed_mode(video, scc, tmp_path, monkeypatch):
+    fake = FakeFfmpeg(reject={"mov_text"})
+    fake.install(monkeypatch)
+
+    result = embed_captions(video, scc, str(tmp_path / "in_captioned.mp4"),
+                            modes=["mov_text", "cea608"])
+
+    assert result["mode"] == "cea608" and result["output_path"].endswith("in_captioned.mov")
+    assert [a["mode"] for a in result["attempts"]] == ["mov_text", "cea608"]
+    assert not (tmp_path / "in_captioned.mp4").exists()
+
+
+def test_burn_in_only_when_policy_requires_it(video, scc, tmp_path, monkeypatch):
+    fake = FakeFfmpeg(reject={"libx264"})
+    fake.install(monkeypatch)
+    monkeypatch.setattr("core.segment_transcoder.get_cpu_budget",
+                        lambda: CpuBudget(2, str(tmp_path / "cpu")))
+    monkeypatch.setattr(caption_muxer, "CAPTION_EMBED_POLICY", "default=mov_text;flex3=burn_in")
+
+    assert embed_captions(video, scc, str(tmp_path / "a.mp4"), city_id="flex1")["success"]
+    failed = embed_captions(video, scc, str(tmp_path / "b.mp4"), city_id="flex3")
+
+    assert not failed["success"] and failed["error"] == "codec not supported"
+    assert [a["mode"] for a in failed["attempts"]] == ["burn_in"]
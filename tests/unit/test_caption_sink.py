@@ -0,0 +1,129 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import core.transcription as transcription
+from core.caption_sink import StreamingCaptionSink, caption_paths, seconds_to_srt_timestamp
+from core.scc_summarizer import parse_scc
+from core.whisperx_helper import save_scc_file
+
+
+def _seg(start, end, text):
+    return SimpleNamespace(start=start, end=end, text=text)
+
+
+def test_flushes_on_buffer_and_publishes_atomically(tmp_path):
+    scc = tmp_path / "meeting.scc"
+    sink = StreamingCaptionSink(str(scc), buffer_segments=2).open()
+
+    sink.write(_seg(0.0, 1.0, " hello "))
+    assert "hello" not in open(sink.part_path("scc")).read()
+    sink.write(_seg(1.0, 2.5, "world"))
+    # Buffer reached its bound, so both captions are on disk before close
+    assert "world" in open(sink.part_path("scc")).read()
+    assert not scc.exists()
+
+    sink.close()
+    assert not os.path.exists(sink.part_path("scc"))
+    content = scc.read_text()
+    assert content.startswith("Scenarist_SCC V1.0")
+    assert "00:00:01:00\t00:00:02:15\nworld" in content
+
+
+def test_failure_keeps_partial_output(tmp_path):
+    scc = tmp_path / "meeting.scc"
+    with pytest.raises(RuntimeError):
+        with StreamingCaptionSink(str(scc), buffer_segments=100) as sink:
+            sink.write(_seg(0.0, 1.0, "partial"))
+            raise RuntimeError("worker died")
+
+    assert not scc.exists()
+    assert "partial" in open(str(scc) + ".part").read()
+
+
+def test_progress_and_extra_formats(tmp_path):
+    scc = tmp_path / "meeting.scc"
+    progress = []
+    with StreamingCaptionSink(str(scc), formats=("scc", "srt"), duration=10.0,
+                              progress_callback=lambda f, n: progress.append((f, n))) as sink:
+        for i in range(10):
+            sink.write({"start": i, "end": i + 1, "text": f"line {i}"})
+
+    assert progress[-1] == (1.0, 10)
+    srt = (tmp_path / "meeting.srt").read_text()
+    assert srt.startswith("1\n00:00:00,000 --> 00:00:01,000\nline 0")
+    assert "10\n00:00:09,000 --> 00:00:10,000\nline 9" in srt
+
+
+def test_srt_timestamp_rounding():
+    assert seconds_to_srt_timestamp(3723.4567) == "01:02:03,457"
+
+
+def test_one_pass_writes_every_format(tmp_path):
+    scc = tmp_path / "meeting.scc"
+    words = [{"start": 0.5, "end": 0.9, "word": " Call"}, {"start": 1.0, "end": 1.4, "word": " to"}]
+    with StreamingCaptionSink(str(scc), formats=("scc", "scc608", "srt", "vtt", "words")) as sink:
+        sink.write({"start": 0.5, "end": 2.0, "text": " Call to order ", "words": words})
+        sink.write(_seg(3661.25, 3662.0, "Roll call"))
+
+    assert set(sink.timings) == {"scc", "scc608", "srt", "vtt", "words"}
+    assert (tmp_path / "meeting.scc608.scc").read_text().startswith("Scenarist_SCC V1.0\n\n00:00:00;00\t9420")
+    vtt = (tmp_path / "meeting.vtt").read_text()
+    assert vtt.startswith("WEBVTT\n\n00:00:00.500 --> 00:00:02.000\nCall to order\n\n")
+    assert "01:01:01.250 --> 01:01:02.000\nRoll call" in vtt
+    data = json.loads((tmp_path / "meeting.words.json").read_text())
+    assert data["segments"] == [
+        [0.5, 2.0, "Call to order", [[0.5, 0.9, "Call"], [1.0, 1.4, "to"]]],
+        [3661.25, 3662.0, "Roll call", []],
+    ]
+
+
+def test_caption_paths_give_the_output_path_to_the_first_matching_format():
+    assert caption_paths("/v/m.scc", ["scc608", "scc", "vtt"]) == {
+        "scc608": "/v/m.scc", "scc": "/v/m.scc.scc", "vtt": "/v/m.vtt",
+    }
+    with pytest.raises(ValueError):
+        caption_paths("/v/m.scc", ["ttml"])
+
+
+def test_save_scc_file_round_trips_through_parser(tmp_path):
+    scc = tmp_path / "out" / "meeting.scc"
+    save_scc_file([{"start": 1.5, "end": 3.0, "text": "Motion carries."}], str(scc))
+
+    lines = scc.read_text().splitlines()
+    assert lines[0] == "Scenarist_SCC V1.0"
+    # Pre-loaded 14 frames early so EOC lands on 00:00:01;15; row 15, column 8
+    assert lines[2].startswith("00:00:01;01\t9420 9420 94ae 94ae 94f4 94f4 cdef")
+    assert lines[2].endswith("942f 942f")
+    assert lines[4] == "00:00:03;00\t942c 942c"
+    assert "Motion carries." in " ".join(c["text"] for c in parse_scc(str(scc)))
+
+
+def test_serial_transcription_streams_segments(tmp_path, monkeypatch):
+    video = tmp_path / "meeting.mp4"
+    video.write_bytes(b"")
+    consumed = []
+
+    def generate():
+        for i in range(3):
+            consumed.append(i)
+            yield _seg(i * 10.0, i * 10.0 + 5, f"caption {i}")
+
+    model = SimpleNamespace(
+        transcribe=lambda _audio, **_kw: (generate(), SimpleNamespace(duration=30.0, language="en"))
+    )
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(transcription, "SPEECH_PRESCREEN_ENABLED", False)
+    monkeypatch.setattr(transcription, "get_whisper_model", lambda *a, **k: model)
+    monkeypatch.setattr(transcription, "_audio_input", lambda path: path)
+
+    progress = []
+    result = transcription._transcribe_with_faster_whisper(
+        str(video), mode="serial", progress_callback=lambda f, n: progress.append(n)
+    )
+
+    assert result["segments"] == 3
+    assert progress == [1, 2, 3]
+    assert "caption 2" in (tmp_path / "meeting.scc").read_text()
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from core.cea608 import (
+    PARITY,
+    Cea608Encoder,
+    benchmark,
+    decode_hex,
+    encode_text,
+    frames_to_timecode,
+    pac,
+    seconds_to_frames,
+    timecode_to_frames,
+    to_hex,
+    wrap,
+)
+
+FIXTURE = Path(__file__).resolve().parents[1] / "test_caption.scc"
+
+
+def _lines(scc):
+    return [line.split("\t") for line in scc.strip().split("\n\n")]
+
+
+def test_parity_table_and_control_codes():
+    assert all(bin(b).count("1") % 2 == 1 for b in PARITY)
+    assert to_hex(b"\x14\x20\x14\x2f\x14\x2c") == "9420 942f 942c"
+    assert to_hex(pac(15)) == "9470" and to_hex(pac(14)) == "94d0"
+    assert to_hex(pac(15, 6)) == "94f2 97a2"  # indent 4 plus tab offset 2
+
+
+def test_drop_frame_timecodes_round_trip():
+    assert frames_to_timecode(1799) == "00:00:59;29"
+    assert frames_to_timecode(1800) == "00:01:00;02"
+    assert frames_to_timecode(17982) == "00:10:00;00"
+    assert frames_to_timecode(seconds_to_frames(3600)) == "01:00:00;00"
+    for frame in (0, 1800, 1801, 17981, 107892, 539460):
+        assert timecode_to_frames(frames_to_timecode(frame)) == frame
+
+
+def test_special_and_extended_characters_round_trip():
+    text = "Señor — café ♪ “quoted” *50% {x}"
+    data = encode_text(text)
+
+    assert b"\x11\x37" in data  # music note
+    assert decode_hex(to_hex(data)) == text
+
+
+def test_wrap_respects_32_columns():
+    lines = wrap("The proposed budget includes road repairs, park maintenance, and supercalifragilisticexpialidocious-upgrades.")
+
+    assert all(len(line) <= 32 for line in lines)
+    assert " ".join(lines).replace(" ", "") == (
+        "The proposed budget includes road repairs, park maintenance, and "
+        "supercalifragilisticexpialidocious-upgrades."
+    ).replace(" ", "")
+
+
+def test_popon_eoc_lands_on_start_frame_and_clears_gaps():
+    encoder = Cea608Encoder(mode="popon", rows=2)
+    scc = encoder.encode(10.0, 12.0, "Call to order.") + encoder.encode(20.0, 21.0, "Roll call.")
+    scc += encoder.finish()
+    lines = _lines(scc)
+
+    timecode, words = lines[0]
+    eoc = words.split().index("942f")
+    assert timecode_to_frames(timecode) + eoc == seconds_to_frames(10.0)
+    assert lines[1] == [frames_to_timecode(seconds_to_frames(12.0)), "942c 942c"]
+    assert decode_hex(lines[2][1]) == "Roll call."
+    assert lines[-1][1] == "942c 942c"
+
+
+def test_popon_splits_long_segments_by_rows():
+    encoder = Cea608Encoder(mode="popon", rows=2)
+    text = "We expect to begin implementation by the end of the fiscal year and report back in the spring."
+    lines = _lines(encoder.encode(0.0, 8.0, text))
+
+    assert len(lines) == 2
+    assert " ".join(decode_hex(words) for _, words in lines) == text
+
+
+def test_rollup_emits_one_line_per_row():
+    encoder = Cea608Encoder(mode="rollup", rows=2)
+    lines = _lines(encoder.encode(5.0, 9.0, "Thank you for your attention. We will now open the floor."))
+
+    assert len(lines) == 2
+    assert lines[0][0] == frames_to_timecode(seconds_to_frames(5.0))
+    assert lines[0][1].startswith("9425 9425 94ad 94ad 9470 9470")
+
+
+def test_fixture_decodes_and_re_encodes():
+    captions = [
+        line.split("\t") for line in FIXTURE.read_text().splitlines() if "\t" in line
+    ]
+    texts = [decode_hex(words) for _, words in captions]
+    assert texts[0] == "This is a test caption file for Archivist integration."
+
+    encoder = Cea608Encoder(mode="popon", rows=3)
+    for (timecode, _), text in zip(captions, texts):
+        start = timecode_to_frames(timecode) / (30000 / 1001)
+        encoded = _lines(encoder.encode(start, start + 3.0, text))
+        assert " ".join(decode_hex(words) for _, words in encoded) == text
+        # EOC on the fixture's frame, unless pre-loading would start before 00:00:00;00
+        words = encoded[-1][1].split()
+        preload = words.index("942f")
+        assert timecode_to_frames(encoded[-1][0]) == max(timecode_to_frames(timecode) - preload, 0)
+
+
+def test_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        Cea608Encoder(mode="paint-on")
+
+
+def test_benchmark_reports_throughput():
+    result = benchmark(hours=0.1)
+
+    assert result["segments"] == 90 and result["bytes"] > 0
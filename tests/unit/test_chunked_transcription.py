@@ -0,0 +1,202 @@
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+import core.chunked_transcription as chunked
+import core.transcription as transcription
+from core.audio_cache import StagedAudio
+from core.chunked_transcription import (
+    SAMPLE_RATE,
+    TranscribedSegment,
+    TranscribedWord,
+    _WindowJob,
+    frame_energies_db,
+    plan_windows,
+    stitch_windows,
+)
+
+
+def _tone_with_gaps(duration, gaps, level=0.3, syllable_hz=0.0):
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = level * np.sin(2 * np.pi * 220 * t)
+    if syllable_hz:
+        # Speech-like level modulation so the pre-screen counts it as speech
+        audio *= 0.55 + 0.45 * np.sin(2 * np.pi * syllable_hz * t)
+    audio = audio.astype(np.float32)
+    for start, end in gaps:
+        audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0.0
+    return audio
+
+
+def test_frame_energies_detect_silence():
+    audio = _tone_with_gaps(4.0, [(1.0, 2.0)])
+    energies = frame_energies_db(audio, block_frames=7)
+
+    assert energies.shape == (len(audio) // int(0.03 * SAMPLE_RATE),)
+    assert energies[10] > -20
+    assert energies[int(1.5 / 0.03)] < -100
+
+
+def test_plan_windows_snaps_to_silence():
+    audio = _tone_with_gaps(60.0, [(18.0, 19.0), (41.0, 42.0)])
+    windows = plan_windows(frame_energies_db(audio), 60.0, 3)
+
+    assert len(windows) == 3
+    assert windows[0][0] == 0.0 and windows[-1][1] == 60.0
+    assert abs(windows[0][1] - 18.5) < 0.1
+    assert abs(windows[1][1] - 41.5) < 0.1
+
+
+def test_plan_windows_without_silence_keeps_equal_split():
+    energies = np.zeros(2000, dtype=np.float32)
+    windows = plan_windows(energies, 60.0, 4)
+
+    assert len(windows) == 4
+    assert all(abs((end - start) - 15.0) < 15.0 / 4 for start, end in windows)
+
+
+def _job(index, own_start, own_end):
+    return _WindowJob(index, "", "float32", 0, own_start - 1, own_end + 1, own_start, own_end, ("base", "int8", 1, "cpu"))
+
+
+def test_stitch_drops_words_outside_owned_range_and_duplicates():
+    jobs = [_job(0, 0.0, 10.0), _job(1, 10.0, float("inf"))]
+    first = [TranscribedSegment(8.0, 10.6, " hello there", [
+        TranscribedWord(8.0, 8.5, " hello"),
+        TranscribedWord(9.0, 9.9, " there"),
+        TranscribedWord(10.1, 10.6, " friend"),
+    ])]
+    second = [TranscribedSegment(9.5, 12.0, " there friend again", [
+        TranscribedWord(9.5, 9.95, " there"),
+        TranscribedWord(10.1, 10.6, " friend"),
+        TranscribedWord(11.0, 12.0, " again"),
+    ])]
+
+    stitched = stitch_windows(jobs, [first, second])
+
+    assert [s.text for s in stitched] == ["hello there", "friend again"]
+    assert stitched[1].start == 10.1
+
+
+def test_transcribe_chunked_offsets_windows(monkeypatch, tmp_path):
+    video = tmp_path / "meeting.mp4"
+    video.write_bytes(b"")
+    audio = _tone_with_gaps(40.0, [(19.5, 20.5)], syllable_hz=4.0)
+
+    pcm_path = tmp_path / "audio.pcm"
+    audio.tofile(pcm_path)
+    staged = StagedAudio(str(video), str(pcm_path), "float32", len(audio))
+
+    seen_options = []
+
+    class FakeModel:
+        def transcribe(self, window, **kwargs):
+            seen_options.append(kwargs)
+            length = len(window) / SAMPLE_RATE
+            word = SimpleNamespace(start=length / 2 - 0.2, end=length / 2 + 0.2, word=" word")
+            return iter([SimpleNamespace(start=word.start, end=word.end, text=" word", words=[word])]), None
+
+    monkeypatch.setattr(chunked, "get_audio_cache", lambda: SimpleNamespace(get=lambda _p: staged))
+    monkeypatch.setattr(chunked, "_make_executor", lambda n, _threads: ThreadPoolExecutor(max_workers=n))
+    monkeypatch.setattr(chunked, "TRANSCRIPTION_CHUNK_MIN_DURATION", 0)
+    monkeypatch.setattr("core.transcription.TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr("core.whisper_model_pool.get_whisper_model", lambda *a, **k: FakeModel())
+
+    result = chunked.transcribe_chunked(str(video), workers=2, options={"beam_size": 1})
+
+    assert result["mode"] == "chunked"
+    assert seen_options == [{"beam_size": 1}] * 2
+    assert result["chunks"] == 2
+    assert result["segments"] == 2
+    assert result["real_time_factor"] is not None
+    content = (tmp_path / "meeting.scc").read_text()
+    # Second window is decoded from 19s (cut at 20s minus padding)
+    assert "00:00:10:08" in content and "00:00:29:08" in content
+
+
+def test_transcribe_chunked_skips_windows_without_speech(monkeypatch, tmp_path):
+    video = tmp_path / "meeting.mp4"
+    video.write_bytes(b"")
+    # Steady test tone for the first half, speech-like audio after the break
+    audio = np.concatenate([
+        _tone_with_gaps(20.0, [(19.0, 20.0)]),
+        _tone_with_gaps(20.0, [], syllable_hz=4.0),
+    ])
+    pcm_path = tmp_path / "audio.pcm"
+    audio.tofile(pcm_path)
+    staged = StagedAudio(str(video), str(pcm_path), "float32", len(audio))
+    decoded = []
+
+    class FakeModel:
+        def transcribe(self, window, **_kwargs):
+            decoded.append(len(window) / SAMPLE_RATE)
+            return iter([]), None
+
+    monkeypatch.setattr(chunked, "get_audio_cache", lambda: SimpleNamespace(get=lambda _p: staged))
+    monkeypatch.setattr(chunked, "_make_executor", lambda n, _threads: ThreadPoolExecutor(max_workers=n))
+    monkeypatch.setattr(chunked, "TRANSCRIPTION_CHUNK_MIN_DURATION", 0)
+    monkeypatch.setattr("core.transcription.TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr("core.whisper_model_pool.get_whisper_model", lambda *a, **k: FakeModel())
+
+    result = chunked.transcribe_chunked(str(video), workers=2)
+
+    assert result["chunks"] == 1
+    assert len(decoded) == 1
+
+
+def test_threaded_windows_share_one_model_with_a_replica_per_thread(monkeypatch, tmp_path):
+    video = tmp_path / "meeting.mp4"
+    video.write_bytes(b"")
+    audio = _tone_with_gaps(40.0, [(19.5, 20.5)], syllable_hz=4.0)
+    pcm_path = tmp_path / "audio.pcm"
+    audio.tofile(pcm_path)
+    staged = StagedAudio(str(video), str(pcm_path), "float32", len(audio))
+    keys = []
+
+    class FakeModel:
+        def transcribe(self, window, **_kwargs):
+            return iter([]), None
+
+    def fake_get_whisper_model(*key):
+        keys.append(key)
+        return FakeModel()
+
+    # Inside a Celery prefork child: no process pool, threads instead
+    monkeypatch.setattr(chunked, "_use_threads", lambda: True)
+    monkeypatch.setattr(chunked, "get_cpu_budget",
+                        lambda: SimpleNamespace(lease=lambda n, owner: contextlib.nullcontext(n)))
+    monkeypatch.setattr(chunked, "get_audio_cache", lambda: SimpleNamespace(get=lambda _p: staged))
+    monkeypatch.setattr(chunked, "TRANSCRIPTION_CHUNK_MIN_DURATION", 0)
+    monkeypatch.setattr(chunked, "BATCH_SIZE", 8)
+    monkeypatch.setattr("core.transcription.TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr("core.whisper_model_pool.get_whisper_model", fake_get_whisper_model)
+
+    chunked.transcribe_chunked(str(video), workers=2)
+
+    assert len(keys) == 2 and len(set(keys)) == 1
+    _model, _compute, cpu_threads, _device, num_workers = keys[0]
+    # One replica per thread, and the replicas together use the full thread budget
+    assert num_workers == 2
+    assert cpu_threads * num_workers == 8
+
+
+def test_short_files_fall_back_to_serial_with_progress(monkeypatch, tmp_path):
+    staged = SimpleNamespace(duration=30.0)
+    calls = []
+
+    def fake_serial(video_path, **kwargs):
+        calls.append(kwargs)
+        return {"mode": "serial"}
+
+    def progress(fraction, segments):
+        pass
+
+    monkeypatch.setattr(chunked, "get_audio_cache", lambda: SimpleNamespace(get=lambda _p: staged))
+    monkeypatch.setattr("core.transcription._transcribe_with_faster_whisper", fake_serial)
+
+    assert chunked.transcribe_chunked(str(tmp_path / "short.mp4"), workers=4,
+                                      progress_callback=progress) == {"mode": "serial"}
+    assert calls == [{"mode": "serial", "progress_callback": progress, "use_cache": False,
+                      "options": transcription.TRANSCRIBE_OPTIONS}]
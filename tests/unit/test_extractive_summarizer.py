@@ -0,0 +1,72 @@
+import json
+
+from core.cea608 import seconds_to_timecode
+from core.extractive_summarizer import split_sentences, summarize_captions
+from core.scc_parser import SccCaptions
+from core.scc_summarizer import summarize_scc
+
+MEETING = [
+    "Good evening everyone.",
+    "The council will now consider the road repair budget for this year.",
+    "The budget includes $2.4 million for road repairs on Main Street.",
+    "Thank you.",
+    "Public comment on the road repair budget is now open.",
+    "A resident asked whether the Main Street road repairs include sidewalks.",
+    "The motion to approve the road repair budget carries unanimously.",
+    "We will reconvene tomorrow at 7:45 p.m.",
+]
+
+
+def _captions(texts):
+    return SccCaptions.from_captions((i * 4.0, i * 4.0 + 3.0, t) for i, t in enumerate(texts))
+
+
+def test_split_sentences_keeps_numbers_and_abbreviations_whole():
+    text = "It costs $2.4 million. We meet tomorrow at 7:45 p.m. Really?!"
+
+    assert [s for _o, s in split_sentences(text)] == [
+        "It costs $2.4 million.", "We meet tomorrow at 7:45 p.m.", "Really?!",
+    ]
+    assert [o for o, _s in split_sentences(text)] == [0, 23, 53]
+
+
+def test_key_points_are_central_sentences_with_their_timestamps():
+    result = summarize_captions(_captions(MEETING), points=2, overview_sentences=2)
+
+    [section] = result["summary"]
+    assert "road repair" in section["text"] and "Thank you" not in section["text"]
+    first = next(i for i, t in enumerate(MEETING) if section["text"].startswith(t))
+    assert section["start"] == seconds_to_timecode(first * 4.0)
+    assert result["overview"].count(".") >= 2
+    assert result["generation"]["mode"] == "extractive"
+    assert result["generation"]["sentences"] == len(MEETING)
+
+
+def test_sections_skip_near_duplicate_points():
+    repeated = MEETING * 40
+    result = summarize_captions(_captions(repeated), points=1, section_tokens=60)
+
+    texts = [item["text"] for item in result["summary"]]
+    assert len(texts) == len(set(texts))
+    assert len(texts) <= len(MEETING)
+
+
+def test_summarize_scc_extractive_mode_writes_minutes(tmp_path, monkeypatch):
+    import core.scc_summarizer as scc_summarizer
+
+    monkeypatch.setattr(scc_summarizer, "load_scc", lambda path: _captions(MEETING))
+    scc_path = str(tmp_path / "meeting.scc")
+
+    out = summarize_scc(scc_path, mode="extractive")
+
+    with open(out, encoding="utf-8") as f:
+        minutes = json.load(f)
+    assert out.endswith("meeting_minutes.json")
+    assert minutes["generation"]["model"] == "textrank-tfidf"
+    assert minutes["summary"] and set(minutes["summary"][0]) == {"speaker", "start", "text"}
+
+
+def test_empty_transcript():
+    result = summarize_captions(_captions([]))
+
+    assert result["summary"] == [] and "overview" not in result
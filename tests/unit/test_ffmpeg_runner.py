@@ -0,0 +1,145 @@
+import os
+import stat
+import sys
+import textwrap
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import core.ffmpeg_runner as ffmpeg_runner
+from core.exceptions import VODError
+from core.ffmpeg_runner import (
+    FfmpegCancelled,
+    FfmpegJob,
+    ffmpeg_active,
+    parse_progress,
+    request_cancel,
+    run_ffmpeg,
+)
+
+# Stand-in ffmpeg: behaviour chosen by the output name, progress on stdout as with -progress pipe:1
+FAKE_FFMPEG = textwrap.dedent("""\
+    #!{python}
+    import sys, time
+    assert sys.argv[1:4] == ["-progress", "pipe:1", "-nostats"], sys.argv
+    output = sys.argv[-1]
+    for i in range(5000):
+        print(f"[h264 @ 0x55] warning line {{i}}", file=sys.stderr)
+    steps = 300 if output.endswith("slow.mp4") else 3
+    for i in range(1, steps + 1):
+        print(f"frame={{i * 300}}\\nfps=75.0\\nout_time_us={{i * 10_000_000}}\\n"
+              f"out_time=00:00:{{i * 10:02d}}.000000\\nspeed=2.5x\\n"
+              f"progress={{'end' if i == steps else 'continue'}}", flush=True)
+        if steps > 3:
+            time.sleep(0.1)
+    if output.endswith("fail.mp4"):
+        print("Conversion failed!", file=sys.stderr)
+        sys.exit(1)
+    open(output, "wb").write(b"\\0" * 64)
+""")
+
+
+class FakeTask:
+    def __init__(self, task_id="task-1"):
+        self.request = SimpleNamespace(id=task_id)
+        self.states = []
+
+    def update_state(self, task_id=None, state=None, meta=None):
+        self.states.append((task_id, state, meta))
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data, self.writes = {}, []
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.writes.append(key)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture(autouse=True)
+def fake_ffmpeg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(ffmpeg_runner, "FFMPEG_STDERR_TAIL_LINES", 50)
+    monkeypatch.setattr(ffmpeg_runner, "FFMPEG_CANCEL_POLL_SECONDS", 0.1)
+
+
+def test_parse_progress_blocks():
+    lines = ["frame=10", "fps=N/A", "out_time_ms=1500000", "speed=N/A", "progress=continue",
+             "out_time=01:02:03.500000", "speed=1.25x", "progress=end"]
+
+    first, last = parse_progress(lines)
+
+    assert (first["out_seconds"], first["speed"], first["fps"], first["frame"]) == (1.5, None, None, 10)
+    assert (last["out_seconds"], last["speed"], last["done"]) == (3723.5, 1.25, True)
+
+
+def test_progress_reaches_task_state_and_stderr_is_bounded(tmp_path):
+    task = FakeTask()
+    job = FfmpegJob(60.0, label="captions mov_text", task=task, redis_client=FakeRedis())
+
+    result = run_ffmpeg(["ffmpeg", "-i", "in.mp4", str(tmp_path / "ok.mp4")], 30, job)
+
+    assert result["progress"]["out_seconds"] == 30.0 and result["progress"]["done"]
+    assert len(result["stderr"].splitlines()) == 50
+    task_id, state, meta = task.states[-1]
+    assert (task_id, state) == ("task-1", "PROGRESS")
+    assert meta["percent"] == 50.0 and meta["status"] == "captions mov_text: 50.0%"
+    assert meta["fps"] == 75.0
+
+
+def test_failure_reports_stderr_tail(tmp_path):
+    with pytest.raises(VODError) as excinfo:
+        run_ffmpeg(["ffmpeg", "-i", "in.mp4", str(tmp_path / "fail.mp4")], 30)
+
+    assert excinfo.value.message.endswith("Conversion failed!")
+    assert "warning line 4999" in excinfo.value.message
+    assert "warning line 0\n" not in excinfo.value.message
+    assert excinfo.value.details["returncode"] == 1
+
+
+def test_cancel_request_stops_ffmpeg(tmp_path):
+    client = FakeRedis()
+    job = FfmpegJob(3000.0, label="transcode low", task=FakeTask("task-2"), redis_client=client)
+    threading.Timer(0.5, request_cancel, ("task-2", client)).start()
+
+    started = time.monotonic()
+    with pytest.raises(FfmpegCancelled):
+        run_ffmpeg(["ffmpeg", "-i", "in.mp4", str(tmp_path / "slow.mp4")], 60, job)
+
+    assert time.monotonic() - started < 10
+    assert "archivist:ffmpeg_active:task-2" in client.writes
+    assert not ffmpeg_active("task-2", client)
+
+
+def test_timeout_stops_ffmpeg(tmp_path):
+    with pytest.raises(VODError, match="timed out after 1s"):
+        run_ffmpeg(["ffmpeg", "-i", "in.mp4", str(tmp_path / "slow.mp4")], 1)
+
+
+def test_job_picks_up_the_running_celery_task_only():
+    celery = pytest.importorskip("celery")
+    app = celery.Celery("test_ffmpeg_runner", set_as_current=False)
+
+    @app.task(bind=True)
+    def encode(self):
+        job = FfmpegJob(60.0, label="transcode low", redis_client=FakeRedis())
+        return job.task is self and job.task_id
+
+    # No task executing: celery.current_task is a falsy proxy, not None
+    job = FfmpegJob(60.0, label="captions mov_text", redis_client=FakeRedis())
+    assert job.task is None and job.task_id is None
+    assert encode.apply(task_id="task-3").get() == "task-3"
@@ -0,0 +1,78 @@
+import subprocess
+import sys
+import time
+
+from core.scc_summarizer import LazySummaryModel
+
+
+class FakeModel:
+    instances = 0
+
+    def __init__(self):
+        FakeModel.instances += 1
+
+    def summarize_text(self, text, num_points=3):
+        return text.upper()
+
+
+def test_import_does_not_load_torch():
+    code = "import sys, core.scc_summarizer; print('torch' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert out.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_model_loads_on_first_use_only():
+    FakeModel.instances = 0
+    handle = LazySummaryModel(idle_unload_seconds=0, factory=FakeModel)
+
+    assert not handle.loaded and FakeModel.instances == 0
+    assert handle.summarize_text("motion carries") == "MOTION CARRIES"
+    handle.summarize_text("again")
+    assert FakeModel.instances == 1 and handle.get_stats()["loads"] == 1
+
+
+def test_background_warm_up():
+    handle = LazySummaryModel(idle_unload_seconds=0, factory=FakeModel)
+    handle.warm_up(background=True).join(timeout=5)
+
+    assert handle.loaded
+
+
+def test_idle_unload_and_reload(monkeypatch):
+    handle = LazySummaryModel(idle_unload_seconds=60, factory=FakeModel)
+    monkeypatch.setattr(handle, "_start_reaper", lambda: None)
+    handle.get()
+
+    assert not handle.unload_if_idle()
+    handle._last_used = time.monotonic() - 61
+    assert handle.unload_if_idle() and not handle.loaded
+
+    handle.summarize_text("reloaded")
+    stats = handle.get_stats()
+    assert stats["loads"] == 2 and stats["unloads"] == 1
+
+
+class FlakyModel(FakeModel):
+    def __init__(self):
+        super().__init__()
+        self.fallbacks = 0
+
+    def summarize_batch(self, texts, num_points=1, batch_size=1):
+        self.fallbacks += 1
+        return [text.upper() for text in texts]
+
+
+def test_lease_blocks_idle_unload_and_fallbacks_survive_reload(monkeypatch):
+    handle = LazySummaryModel(idle_unload_seconds=60, factory=FlakyModel)
+    monkeypatch.setattr(handle, "_start_reaper", lambda: None)
+
+    with handle.lease():
+        handle.summarize_batch(["first chunk"])
+        handle._last_used = time.monotonic() - 61
+        assert not handle.unload_if_idle() and handle.loaded
+
+    handle._last_used = time.monotonic() - 61
+    assert handle.unload_if_idle()
+    handle.summarize_batch(["after reload"])
+    assert handle.fallbacks == 2 and handle.get_stats()["loads"] == 2
@@ -0,0 +1,93 @@
+import os
+
+from core.media_catalog import MediaCatalog, parse_recorded_date, title_tokens
+
+
+def _touch(path, size=10):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    return str(path)
+
+
+def _catalog(tmp_path):
+    return MediaCatalog(str(tmp_path / "catalog.sqlite"))
+
+
+def test_lookups_by_vod_id_title_and_date(tmp_path):
+    root = tmp_path / "flex1"
+    by_id = _touch(root / "city_council" / "14233_City_Council_2024-05-06.mp4")
+    _touch(root / "142330_Planning.mp4")
+    by_title = _touch(root / "meetings" / "Parks_and_Recreation_Board.mov")
+    _touch(root / "notes.txt")
+    catalog = _catalog(tmp_path)
+
+    stats = catalog.refresh({"flex1": str(root)})
+
+    assert stats["files"] == 3
+    assert [r["path"] for r in catalog.lookup_vod_id(14233)] == [by_id]
+    assert [r["path"] for r in catalog.lookup_title("Parks & Recreation board")] == [by_title]
+    assert [r["path"] for r in catalog.lookup_date("2024-05-06")] == [by_id]
+    assert catalog.find_vod_file(99999, "parks recreation board") == by_title
+    assert catalog.find_vod_file(99999, "zoning") is None
+
+
+def test_incremental_refresh_only_lists_changed_directories(tmp_path):
+    root = tmp_path / "flex1"
+    _touch(root / "a" / "one.mp4")
+    _touch(root / "b" / "two.mp4")
+    catalog = _catalog(tmp_path)
+    catalog.refresh({"flex1": str(root)})
+
+    stats = catalog.refresh({"flex1": str(root)})
+    assert (stats["dirs_scanned"], stats["dirs_unchanged"]) == (0, 3)
+
+    _touch(root / "b" / "three.mp4")
+    os.remove(root / "a" / "one.mp4")
+    stats = catalog.refresh({"flex1": str(root)})
+
+    assert stats["dirs_scanned"] == 2 and stats["removed"] == 1
+    assert sorted(r["name"] for r in catalog.list_files("flex1")) == ["three.mp4", "two.mp4"]
+
+
+def test_surface_listing_tracks_captioned_state(tmp_path):
+    root = tmp_path / "flex1"
+    _touch(root / "old.mp4", size=200)
+    newer = _touch(root / "new.mp4", size=200)
+    _touch(root / "small.mp4", size=10)
+    _touch(root / "deep" / "nested.mp4", size=200)
+    os.utime(newer, (2_000_000_000, 2_000_000_000))
+    catalog = _catalog(tmp_path)
+    catalog.refresh({"flex1": str(root)})
+
+    uncaptioned = catalog.list_files("flex1", max_depth=0, min_size=100, captioned=False)
+    assert [r["name"] for r in uncaptioned] == ["new.mp4", "old.mp4"]
+
+    _touch(root / "new.scc")
+    catalog.refresh({"flex1": str(root)})
+    assert [r["name"] for r in catalog.list_files("flex1", max_depth=0, min_size=100,
+                                                  captioned=False)] == ["old.mp4"]
+    assert [r["name"] for r in catalog.list_files("flex1", pattern="*.mp4", max_depth=0,
+                                                  captioned=True)] == ["new.mp4"]
+
+
+def test_vanished_directory_is_dropped_but_missing_root_is_ignored(tmp_path):
+    root = tmp_path / "flex1"
+    _touch(root / "gone" / "clip.mp4")
+    catalog = _catalog(tmp_path)
+    catalog.refresh({"flex1": str(root)})
+
+    catalog.refresh({"flex1": str(tmp_path / "unmounted")})
+    assert catalog.get_stats()["files"] == 1
+
+    os.remove(root / "gone" / "clip.mp4")
+    os.rmdir(root / "gone")
+    catalog.refresh({"flex1": str(root)})
+    assert catalog.get_stats()["files"] == 0
+
+
+def test_filename_parsing():
+    assert parse_recorded_date("Council_05_06_2024.mp4") == "2024-05-06"
+    assert parse_recorded_date("council-20240506-final.mp4") == "2024-05-06"
+    assert parse_recorded_date("14233_council.mp4") is None
+    assert title_tokens("The City of Birchwood: Council") == ["city", "birchwood", "council"]
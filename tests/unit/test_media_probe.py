@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+import core.media_probe as media_probe
+from core.media_probe import MediaProbe, codec_names, duration_of, streams_of
+
+INFO = {
+    "format": {"duration": "10843.2", "format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264"},
+        {"codec_type": "audio", "codec_name": "aac"},
+        {"codec_type": "subtitle", "codec_name": "mov_text"},
+    ],
+}
+
+
+class FakeFfprobe:
+    """Counts ffprobe calls; ``broken`` files fail, ``raise_error`` simulates a stall."""
+
+    def __init__(self):
+        self.calls, self.broken, self.raise_error = [], set(), None
+
+    def __call__(self, cmd, **kwargs):
+        self.calls.append(cmd[-1])
+        if self.raise_error:
+            raise self.raise_error
+        if os.path.basename(cmd[-1]) in self.broken:
+            return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="moov atom not found")
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(INFO), stderr="")
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeFfprobe()
+    monkeypatch.setattr(media_probe.subprocess, "run", fake)
+    return fake
+
+
+def make_video(directory, name, content=b"\0" * 128):
+    path = directory / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_one_probe_serves_every_consumer(fake, tmp_path):
+    video = make_video(tmp_path, "council.mp4")
+    probe = MediaProbe(str(tmp_path / "probe.sqlite"))
+
+    info = probe.probe(video)
+    assert probe.probe(video) == info
+    # A new process (fresh LRU) answers from the shared SQLite store
+    assert MediaProbe(str(tmp_path / "probe.sqlite")).probe(video) == info
+
+    assert len(fake.calls) == 1
+    assert codec_names(info, "video") == ["h264"] and len(streams_of(info, "subtitle")) == 1
+    stats = probe.get_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["probes"]) == (1, 1, 1)
+
+
+def test_changed_file_is_probed_again(fake, tmp_path):
+    video = make_video(tmp_path, "council.mp4")
+    probe = MediaProbe(str(tmp_path / "probe.sqlite"))
+
+    probe.probe(video)
+    make_video(tmp_path, "council.mp4", b"\0" * 256)
+    probe.probe(video)
+
+    assert len(fake.calls) == 2
+    assert probe.get_stats()["entries"] == 1
+
+
+def test_unreadable_files_are_cached_but_stalls_are_not(fake, tmp_path):
+    broken = make_video(tmp_path, "broken.mp4")
+    stalled = make_video(tmp_path, "stalled.mp4")
+    fake.broken.add("broken.mp4")
+    probe = MediaProbe(str(tmp_path / "probe.sqlite"))
+
+    assert probe.probe(broken) is None and probe.probe(broken) is None
+    fake.raise_error = subprocess.TimeoutExpired("ffprobe", 60)
+    assert probe.probe(stalled) is None
+    fake.raise_error = None
+    assert probe.probe(stalled) == INFO
+
+    assert fake.calls.count(broken) == 1 and fake.calls.count(stalled) == 2
+    assert probe.probe(str(tmp_path / "missing.mp4")) is None
+    assert probe.get_stats()["unreadable"] == 1
+
+
+def test_probe_directory_probes_videos_in_parallel(fake, tmp_path):
+    (tmp_path / "flex1").mkdir()
+    videos = [make_video(tmp_path / "flex1", f"meeting{i}.mp4") for i in range(5)]
+    make_video(tmp_path / "flex1", "notes.txt")
+    probe = MediaProbe(str(tmp_path / "probe.sqlite"))
+
+    results = probe.probe_directory(str(tmp_path / "flex1"), workers=3)
+
+    assert sorted(results) == sorted(videos) and all(results.values())
+    assert sorted(fake.calls) == sorted(videos)
+
+
+def test_duration_falls_back_to_streams():
+    assert duration_of(INFO) == 10843.2
+    assert duration_of({"format": {}, "streams": [{"duration": "12.5"}, {"duration": "N/A"}]}) == 12.5
+    assert duration_of({"format": {"duration": "N/A"}, "streams": []}) is None
+    assert duration_of(None) is None
+
+
+def test_broken_store_falls_back_to_plain_ffprobe(fake, tmp_path):
+    video = make_video(tmp_path, "council.mp4")
+    probe = MediaProbe(str(tmp_path / "probe.sqlite"))
+    (tmp_path / "probe.sqlite").write_bytes(b"not a database" * 64)
+
+    assert codec_names(probe.probe(video), "video") == ["h264"]
+    assert probe.probe(video) is not None and len(fake.calls) == 1  # LRU still works
+
+
+def test_unwritable_store_location_probes_without_cache(fake, tmp_path, monkeypatch):
+    video = make_video(tmp_path, "council.mp4")
+    blocker = make_video(tmp_path, "not_a_dir")
+
+    class UnderAFile(MediaProbe):
+        def __init__(self, db_path=os.path.join(blocker, "probe.sqlite")):
+            super().__init__(db_path)
+
+    monkeypatch.setattr(media_probe, "MediaProbe", UnderAFile)
+    monkeypatch.setattr(media_probe, "_media_probe", None)
+
+    assert media_probe.media_duration(video) == 10843.2
+    assert media_probe._media_probe is None  # the store is retried next time
@@ -0,0 +1,84 @@
+import io
+from pathlib import Path
+
+from core.bench_fixtures import PHRASES, synthetic_scc_archive, synthetic_transcript
+from core.caption_sink import StreamingCaptionSink
+from core.cea608 import Cea608Encoder, FRAME_RATE
+from core.scc_parser import DEFAULT_DURATION, SccCaptions, bulk_parse, iter_captions, load_scc
+from core.scc_summarizer import parse_scc
+
+FIXTURE = Path(__file__).resolve().parents[1] / "test_caption.scc"
+
+
+def _encoded(*segments):
+    encoder = Cea608Encoder(mode="popon", rows=2)
+    body = "".join(encoder.encode(*seg) for seg in segments) + encoder.finish()
+    return io.BytesIO(("Scenarist_SCC V1.0\n\n" + body).encode())
+
+
+def test_popon_timing_follows_eoc_and_edm():
+    captions = list(iter_captions(_encoded((10.0, 12.0, "Call to order."), (12.5, 15.0, "Roll call."))))
+
+    assert [text for _, _, text in captions] == ["Call to order.", "Roll call."]
+    start, end, _ = captions[0]
+    assert abs(start - 10.0) < 1 / FRAME_RATE
+    # Replaced by the next caption's EOC rather than cleared (gap under 1s)
+    assert abs(end - 12.5) < 1 / FRAME_RATE
+    assert abs(captions[1][1] - 15.0) < 1 / FRAME_RATE
+
+
+def test_fixture_parses_with_parity_and_default_duration():
+    captions = load_scc(str(FIXTURE))
+
+    assert len(captions) == 5
+    assert captions.text_at(0) == "This is a test caption file for Archivist integration."
+    assert captions.ends[0] == captions.starts[1]
+    assert captions[-1][1] - captions[-1][0] == DEFAULT_DURATION
+
+
+def test_columnar_storage_and_legacy_dicts():
+    captions = SccCaptions.from_captions([(1.0, 2.0, "alpha"), (2.0, 3.5, "beta gamma")])
+
+    assert captions.starts.typecode == "d" and list(captions.offsets) == [0, 5, 15]
+    assert captions.text == "alphabeta gamma"
+    assert captions[1] == (2.0, 3.5, "beta gamma")
+    assert captions.joined_text(0, 5) == "alpha beta gamma"
+    assert captions.to_dicts()[1] == {
+        "index": "2", "start": 2.0, "end": 3.5, "time": "00:00:02;00", "text": "beta gamma",
+    }
+
+
+def test_reads_plain_text_scc_dialect(tmp_path):
+    scc = tmp_path / "meeting.scc"
+    with StreamingCaptionSink(str(scc)) as sink:
+        sink.write({"start": 1.5, "end": 3.0, "text": "Motion carries."})
+        sink.write({"start": 3.0, "end": 4.0, "text": "Adjourned."})
+
+    assert list(iter_captions(str(scc))) == [(1.5, 3.0, "Motion carries."), (3.0, 4.0, "Adjourned.")]
+
+
+def test_parse_scc_compatibility(tmp_path):
+    segments = parse_scc(str(FIXTURE))
+
+    assert segments[0]["index"] == "1" and segments[0]["time"] == "00:00:01;00"
+    assert parse_scc(str(tmp_path / "missing.scc")) == []
+
+
+def test_bulk_parse_reports_throughput(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"m{i}.scc"
+        path.write_bytes(_encoded((0.0, 2.0, "Hello."), (5.0, 7.0, "Goodbye.")).getvalue())
+        paths.append(str(path))
+
+    result = bulk_parse(paths)
+
+    assert result["files"] == 3 and result["captions"] == 6
+
+
+def test_synthetic_archive_round_trips(tmp_path):
+    paths = synthetic_scc_archive(str(tmp_path), files=2, hours=0.05)
+    captions = load_scc(paths[1])
+
+    assert len(paths) == 2 and len(captions) == len(synthetic_transcript(0.05))
+    assert captions.text_at(1) == PHRASES[1]
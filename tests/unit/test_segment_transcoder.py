@@ -0,0 +1,132 @@
+import json
+import subprocess
+import threading
+
+import pytest
+
+import core.media_probe as media_probe
+import core.segment_transcoder as segment_transcoder
+from core.config import VOD_QUALITY_LOW
+from core.cpu_budget import CpuBudget
+from core.exceptions import VODError
+from core.media_probe import MediaProbe
+from core.segment_transcoder import (
+    QUALITY_PROFILES,
+    plan_segments,
+    segment_command,
+    transcode,
+    write_shifted_srt,
+)
+
+CAPTIONS = [(1.0, 3.0, "Call to order."), (299.0, 302.0, "Item two."), (900.0, 903.0, "Adjourn.")]
+
+
+class FakeFfmpeg:
+    """ffprobe answers for a 20-minute source with a keyframe every 2s; ffmpeg writes its output."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on, self.calls, self.lock = fail_on, [], threading.Lock()
+
+    def __call__(self, cmd, **kwargs):
+        with self.lock:
+            self.calls.append(cmd)
+        if "-show_format" in cmd:
+            out = json.dumps({"format": {"duration": "1200.0"}, "streams": []})
+        else:
+            out = "".join(f"{t:.3f},{'K_' if t % 2 == 0 else '__'}\n" for t in range(1200))
+        return subprocess.CompletedProcess(cmd, 0, stdout=out, stderr="")
+
+    def ffmpeg(self, cmd, timeout=None, job=None, part=0):
+        with self.lock:
+            self.calls.append(cmd)
+        if self.fail_on and self.fail_on in cmd[-1]:
+            raise VODError("Conversion failed!")
+        with open(cmd[-1], "wb") as f:
+            f.write(b"\0" * 64)
+        return {"seconds": 0.0, "progress": {}, "stderr": ""}
+
+    def encodes(self):
+        return [c for c in self.calls if c[0] == "ffmpeg" and "libx264" in c]
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    fake = FakeFfmpeg()
+    monkeypatch.setattr(segment_transcoder.subprocess, "run", fake)
+    monkeypatch.setattr(segment_transcoder, "run_ffmpeg", fake.ffmpeg)
+    monkeypatch.setattr(segment_transcoder, "get_cpu_budget", lambda: CpuBudget(8, str(tmp_path / "cpu")))
+    monkeypatch.setattr(media_probe, "_media_probe", MediaProbe(str(tmp_path / "probe.sqlite")))
+    (tmp_path / "in.mp4").write_bytes(b"\0" * 128)
+    monkeypatch.chdir(tmp_path)
+    return fake
+
+
+def test_plan_segments_splits_at_keyframes():
+    keyframes = [float(t) for t in range(0, 1200, 2)]
+
+    ranges = plan_segments(keyframes, 1200.0, 4, min_seconds=120)
+
+    assert ranges == [(0.0, 300.0), (300.0, 600.0), (600.0, 900.0), (900.0, 1200.0)]
+    assert plan_segments([0.0, 500.0], 1200.0, 4, min_seconds=120) == [(0.0, 500.0), (500.0, 1200.0)]
+    assert plan_segments(keyframes, 200.0, 4, min_seconds=120) == [(0.0, 200.0)]
+
+
+def test_shifted_srt_keeps_only_cues_in_segment(tmp_path):
+    path = str(tmp_path / "seg.srt")
+
+    assert write_shifted_srt(CAPTIONS, 300.0, 600.0, path) == 1
+    assert open(path).read() == "1\n00:00:00,000 --> 00:00:02,000\nItem two.\n\n"
+
+
+def test_segment_command_burns_captions_and_scales():
+    cmd = segment_command("in.mp4", 300.0, 600.0, "seg.mp4", QUALITY_PROFILES[VOD_QUALITY_LOW],
+                          "/tmp/it's:here.srt", threads=2)
+
+    assert cmd[cmd.index("-ss") + 1] == "300.000000" and cmd[cmd.index("-t") + 1] == "300.000000"
+    assert cmd[cmd.index("-vf") + 1] == (
+        "scale=-2:'min(480,ih)',subtitles=filename='/tmp/it'\\''s\\:here.srt'"
+    )
+    assert "-an" in cmd and cmd[cmd.index("-threads") + 1] == "2"
+
+
+def test_transcode_encodes_segments_in_parallel_and_concats(fake, tmp_path):
+    result = transcode("in.mp4", str(tmp_path / "out.mp4"), captions=CAPTIONS, workers=2)
+
+    assert result["mode"] == "segmented" and result["workers"] == 2
+    assert result["segments"] == len(fake.encodes()) == 4
+    concat = fake.calls[-1]
+    assert concat[concat.index("-f") + 1] == "concat" and concat[concat.index("-c") + 1] == "copy"
+    # The caption-free segment is encoded without the subtitles filter
+    filters = [c[c.index("-vf") + 1] if "-vf" in c else None for c in fake.encodes()]
+    assert sum(f is None for f in filters) == 1
+    assert (tmp_path / "out.mp4").exists()
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith("transcode_")] == []
+
+
+def test_transcode_single_process_path(fake, tmp_path):
+    result = transcode("in.mp4", str(tmp_path / "out.mp4"), quality=VOD_QUALITY_LOW, segmented=False)
+
+    assert (result["mode"], result["segments"], result["quality"]) == ("single", 1, "low")
+    [encode] = fake.encodes()
+    assert encode[encode.index("-c:a") + 1] == "copy"
+
+
+def test_failed_segment_fails_transcode(fake, tmp_path):
+    fake.fail_on = "segment_0002"
+
+    with pytest.raises(VODError, match="Conversion failed"):
+        transcode("in.mp4", str(tmp_path / "out.mp4"), workers=2)
+    assert not (tmp_path / "out.mp4").exists()
+
+
+def test_cpu_budget_leases_are_shared(tmp_path):
+    budget = CpuBudget(4, str(tmp_path / "cpu"))
+
+    with budget.lease(3) as first:
+        assert first == 3 and budget.in_use() == 3
+        with budget.lease(4, minimum=1) as second:
+            assert second == 1
+        with pytest.raises(TimeoutError):
+            with CpuBudget(4, str(tmp_path / "cpu")).lease(2, minimum=2, timeout=0):
+                pass
+    assert budget.get_stats() == {"slots": 4, "in_use": 0, "free": 4}
@@ -50,6 +50,31 @@ class TestTranscriptionService:
         
         assert "File not found" in str(exc_info.value)
 
+    def test_pick_newest_uncaptioned_reads_the_media_catalog(self, tmp_path, monkeypatch):
+        """Picks come from the catalog's uncaptioned, newest-first listing."""
+        import os
+        import core.services.transcription as service_module
+        from core.media_catalog import MediaCatalog
+
+        mount = tmp_path / "flex1"
+        mount.mkdir()
+        for name, mtime in (("old.mp4", 1_000), ("new.mp4", 3_000), ("done.mp4", 2_000)):
+            (mount / name).write_bytes(b"\0" * 16)
+            os.utime(mount / name, (mtime, mtime))
+        (mount / "done.scc").write_text("Scenarist_SCC V1.0\n")
+        catalog = MediaCatalog(str(tmp_path / "catalog.sqlite"))
+        catalog.refresh({"flex1": str(mount)})
+        monkeypatch.setattr(service_module, "get_media_catalog", lambda: catalog)
+        monkeypatch.setattr(service_module, "MEMBER_CITIES", {"flex1": {"mount_path": str(mount)}})
+        monkeypatch.setattr(service_module, "SPEECH_PRESCREEN_ENABLED", False)
+        monkeypatch.setattr(service_module.os.path, "ismount", lambda path: path == str(mount))
+
+        with patch("os.scandir") as mock_scandir:
+            picks = TranscriptionService().pick_newest_uncaptioned(max_per_city=2)
+
+        assert picks == {"flex1": [str(mount / "new.mp4"), str(mount / "old.mp4")]}
+        mock_scandir.assert_not_called()
+
 class TestVODService:
     """Test the VODService."""
     
@@ -0,0 +1,198 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import core.speech_prescreen as prescreen
+import core.transcription as transcription
+from core.audio_cache import SAMPLE_RATE
+from core.speech_prescreen import (
+    DecodePlan,
+    SpeechAnalysis,
+    analyze_samples,
+    plan_decode,
+    rank_by_speech,
+)
+
+
+def _speechlike(seconds, level=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level * np.sin(2 * np.pi * 220 * t) * (0.55 + 0.45 * np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+
+
+def _tone(seconds, level=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_tone_and_silence_are_not_speech():
+    analysis = analyze_samples(np.concatenate([_tone(30), _silence(30)]))
+
+    assert analysis.intervals == []
+    assert analysis.speech_ratio == 0.0
+    assert not analysis.has_speech()
+
+
+def test_speech_intervals_and_ratio():
+    audio = np.concatenate([_tone(20), _silence(10), _speechlike(20), _silence(10)])
+    analysis = analyze_samples(audio)
+
+    assert len(analysis.intervals) == 1
+    start, end = analysis.intervals[0]
+    assert abs(start - 30.0) < 0.2 and abs(end - 50.0) < 0.2
+    assert abs(analysis.speech_ratio - 20 / 60) < 0.01
+    assert analysis.has_speech()
+
+
+def test_plan_decode_cuts_long_silences_only():
+    analysis = SpeechAnalysis(600.0, [(100.0, 200.0), (203.0, 250.0), (400.0, 450.0)])
+    plan = plan_decode(analysis, pad=0.5, min_cut=10.0)
+
+    assert plan.ranges == [(99.5, 250.5), (399.5, 450.5)]
+    assert plan.decoded_duration == 202.0
+    # Decoded time 151.0 is the first second of the second range
+    assert plan.to_source(151.0) == 399.5
+    assert plan.to_source(151.0, end=True) == 250.5
+    assert plan.to_source(10.0) == 109.5
+
+
+def test_plan_decode_keeps_full_range_when_saving_is_small():
+    analysis = SpeechAnalysis(60.0, [(2.0, 58.0)])
+    plan = plan_decode(analysis, pad=0.5, min_cut=10.0)
+
+    assert plan.ranges == [(0.0, 60.0)]
+    assert plan_decode(analysis, start=30.0, pad=0.5, min_cut=10.0).ranges == [(30.0, 60.0)]
+
+
+def test_decode_plan_gather_concatenates_ranges():
+    samples = np.arange(10 * SAMPLE_RATE, dtype=np.float32)
+    plan = DecodePlan([(1.0, 2.0), (5.0, 6.0)], 10.0)
+    gathered = plan.gather(samples)
+
+    assert len(gathered) == 2 * SAMPLE_RATE
+    assert gathered[0] == SAMPLE_RATE and gathered[SAMPLE_RATE] == 5 * SAMPLE_RATE
+
+
+def test_rank_by_speech_orders_and_keeps_silent_files_last(tmp_path, monkeypatch):
+    ratios = {"new_slate.mp4": 0.0, "newer.mp4": 0.35, "older.mp4": 0.82,
+              "unstaged.mp4": None, "unreadable.mp4": None}
+    sampled = {"unstaged.mp4": 0.95, "unreadable.mp4": None}
+    paths = [str(tmp_path / name) for name in ratios]
+    staged = []
+
+    def fake_analysis(path, stage=True):
+        staged.append(stage)
+        ratio = ratios[path.rsplit("/", 1)[1]]
+        if ratio is None:
+            return None
+        return SpeechAnalysis(100.0, [(0.0, 100.0 * ratio)] if ratio else [])
+
+    monkeypatch.setattr(prescreen, "get_speech_analysis", fake_analysis)
+    monkeypatch.setattr(prescreen, "sample_speech_ratio", lambda path: sampled[path.rsplit("/", 1)[1]])
+    ranked = rank_by_speech(paths)
+
+    assert [p.rsplit("/", 1)[1] for p in ranked] == [
+        "unstaged.mp4", "older.mp4", "unreadable.mp4", "newer.mp4", "new_slate.mp4"]
+    # Ranking never extracts audio and never writes the deliverable SCC
+    assert staged == [False] * 5
+    assert not (tmp_path / "new_slate.scc").exists()
+
+    ranked = rank_by_speech(paths, mark=True)
+
+    assert "new_slate.mp4" not in [p.rsplit("/", 1)[1] for p in ranked]
+    assert "[No speech detected]" in (tmp_path / "new_slate.scc").read_text()
+
+
+def test_sampled_ratio_decodes_short_spread_samples_once(tmp_path, monkeypatch):
+    video = tmp_path / "council.mp4"
+    video.write_bytes(b"video")
+    decoded = []
+
+    def fake_decode(path, start, seconds):
+        decoded.append((start, seconds))
+        return _speechlike(seconds)
+
+    monkeypatch.setattr("core.audio_cache.decode_pcm", fake_decode)
+    monkeypatch.setattr("core.media_probe.media_duration", lambda _p: 3600.0)
+    monkeypatch.setattr(prescreen, "_SAMPLED_RATIOS", type(prescreen._SAMPLED_RATIOS)())
+
+    assert prescreen.sample_speech_ratio(str(video), count=3, seconds=10) > 0.5
+    assert decoded == [(595.0, 10), (1795.0, 10), (2995.0, 10)]
+    # Unchanged files are not sampled again on the next pass
+    prescreen.sample_speech_ratio(str(video), count=3, seconds=10)
+    assert len(decoded) == 3
+
+
+def test_serial_transcription_skips_whisper_without_speech(tmp_path, monkeypatch):
+    video = tmp_path / "bars_and_tone.mp4"
+    video.write_bytes(b"")
+
+    def no_model(*_a, **_k):
+        raise AssertionError("model must not load")
+
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(transcription, "SPEECH_PRESCREEN_SKIP_NO_SPEECH", True)
+    monkeypatch.setattr(transcription, "_speech_prescreen", lambda _p: SpeechAnalysis(3600.0, []))
+    monkeypatch.setattr(transcription, "get_whisper_model", no_model)
+
+    result = transcription._transcribe_with_faster_whisper(str(video), mode="serial")
+
+    assert result["mode"] == "prescreen"
+    assert result["warning"] == "No speech detected"
+    assert "[No speech detected]" in (tmp_path / "bars_and_tone.scc").read_text()
+
+
+def test_serial_transcription_remaps_trimmed_timestamps(tmp_path, monkeypatch):
+    video = tmp_path / "meeting.mp4"
+    video.write_bytes(b"")
+    speech = SpeechAnalysis(120.0, [(30.0, 40.0), (90.0, 100.0)])
+    seen = {}
+
+    def fake_transcribe(audio, **_kw):
+        seen["seconds"] = len(audio) / SAMPLE_RATE
+        segments = [SimpleNamespace(start=1.0, end=5.0, text="call to order"),
+                    SimpleNamespace(start=12.0, end=14.0, text="motion carries")]
+        return iter(segments), SimpleNamespace(duration=seen["seconds"], language="en")
+
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(transcription, "_speech_prescreen", lambda _p: speech)
+    monkeypatch.setattr(transcription, "_audio_input", lambda _p: _silence(120))
+    monkeypatch.setattr(transcription, "get_whisper_model",
+                        lambda *a, **k: SimpleNamespace(transcribe=fake_transcribe))
+
+    result = transcription._transcribe_with_faster_whisper(str(video), mode="serial")
+
+    assert seen["seconds"] == 22.0  # two 10s ranges plus 0.5s padding each side
+    assert result["duration"] == 120.0
+    assert result["trimmed_seconds"] == 98.0
+    content = (tmp_path / "meeting.scc").read_text()
+    assert "00:00:30:15\t00:00:34:15\ncall to order" in content
+    assert "00:01:30:15\t00:01:32:15\nmotion carries" in content
+
+
+def test_serial_transcription_decodes_in_full_when_prescreen_finds_no_speech(tmp_path, monkeypatch):
+    video = tmp_path / "quiet_meeting.mp4"
+    video.write_bytes(b"")
+    seen = {}
+
+    def fake_transcribe(audio, **_kw):
+        seen["seconds"] = len(audio) / SAMPLE_RATE
+        return iter([SimpleNamespace(start=50.0, end=53.0, text="roll call")]), \
+            SimpleNamespace(duration=seen["seconds"], language="en")
+
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(transcription, "_speech_prescreen", lambda _p: SpeechAnalysis(120.0, []))
+    monkeypatch.setattr(transcription, "_audio_input", lambda _p: _silence(120))
+    monkeypatch.setattr(transcription, "get_whisper_model",
+                        lambda *a, **k: SimpleNamespace(transcribe=fake_transcribe))
+
+    result = transcription._transcribe_with_faster_whisper(str(video), mode="serial")
+
+    assert seen["seconds"] == 120.0
+    assert result["segments"] == 1
+    assert "roll call" in (tmp_path / "quiet_meeting.scc").read_text()
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import core.scc_summarizer as scc_summarizer
+import core.summarization_backends as backends
+from core.summarization_backends import CTranslate2Summarizer, ct2_model_dir, load_summarizer
+from core.summarization_benchmark import rouge_l, rouge_n, rouge_scores
+
+
+class FakeTokenizer:
+    model_max_length = 1024
+
+    def __call__(self, texts, truncation=True, max_length=None):
+        return {"input_ids": [[len(w) for w in t.split()][:max_length] for t in texts]}
+
+    def convert_ids_to_tokens(self, ids):
+        return [f"t{i}" for i in ids]
+
+    def convert_tokens_to_ids(self, tokens):
+        return [int(t[1:]) for t in tokens]
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " " + "-".join(str(i) for i in ids) + " "
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, sources, **options):
+        self.calls.append(options)
+        return [SimpleNamespace(hypotheses=[list(reversed(tokens))]) for tokens in sources]
+
+
+def test_ctranslate2_wrapper_matches_pipeline_output_shape():
+    translator = FakeTranslator()
+    summarizer = CTranslate2Summarizer(translator, FakeTokenizer(), {"num_beams": 2})
+
+    out = summarizer(["a bb ccc", "dddd"], batch_size=4, max_length=60, min_length=10,
+                     do_sample=False)
+
+    assert out == [{"summary_text": "3-2-1"}, {"summary_text": "4"}]
+    options = translator.calls[0]
+    assert options["max_batch_size"] == 4 and options["beam_size"] == 2
+    assert (options["max_decoding_length"], options["min_decoding_length"]) == (60, 10)
+    assert options["no_repeat_ngram_size"] == 3
+
+
+def test_ct2_model_dir_is_per_model_and_compute_type(tmp_path):
+    path = ct2_model_dir("facebook/bart-large-cnn", "int8", str(tmp_path))
+
+    assert path == str(tmp_path / "facebook--bart-large-cnn-int8")
+
+
+def test_failed_backend_falls_back_to_float32(monkeypatch):
+    def broken(model_name):
+        raise ImportError("no ctranslate2")
+
+    monkeypatch.setitem(backends._LOADERS, "ctranslate2", broken)
+    monkeypatch.setattr(backends, "load_torch", lambda name: ("pipeline", "torch-float32"))
+
+    assert load_summarizer("bart", "ctranslate2") == ("pipeline", "torch-float32")
+    assert load_summarizer("bart", "nonsense") == ("pipeline", "torch-float32")
+
+
+def test_quantized_backend_gets_its_own_memo_key(monkeypatch):
+    monkeypatch.setattr(scc_summarizer, "load_summarizer",
+                        lambda name, backend: ("pipeline", backend))
+
+    assert scc_summarizer.LocalSummaryModel("torch-float32").backend == scc_summarizer.SUMMARIZATION_MODEL
+    assert scc_summarizer.LocalSummaryModel("torch-int8").backend.endswith("@torch-int8")
+
+
+def test_rouge():
+    assert rouge_n("the motion carried", "the motion carried", 1) == 1.0
+    assert rouge_n("motion carried", "the motion failed", 2) == 0.0
+    assert abs(rouge_l("council approved the budget", "the council approved budget") - 0.75) < 1e-9
+    assert rouge_scores([], []) == {"rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
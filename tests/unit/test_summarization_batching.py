@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+import core.summary_cache as summary_cache
+from core.cea608 import seconds_to_timecode
+from core.scc_parser import SccCaptions
+from core.scc_summarizer import summarize_captions, summarize_scc, token_budget_chunks
+
+
+class WordModel:
+    """Counts words as tokens and records every batched call."""
+
+    model_name = "fake-bart"
+
+    def __init__(self, max_input_tokens=40):
+        self.max_input_tokens = max_input_tokens
+        self.calls = []
+
+    def count_tokens(self, texts):
+        return [len(t.split()) for t in texts]
+
+    def summarize_batch(self, texts, num_points=1, batch_size=8):
+        self.calls.append((len(texts), batch_size))
+        return [" ".join(t.split()[:3]) for t in texts]
+
+
+@pytest.fixture(autouse=True)
+def no_summary_cache(monkeypatch):
+    monkeypatch.setattr(summary_cache, "SUMMARY_CACHE_ENABLED", False)
+
+
+def _captions(count, words=5):
+    return SccCaptions.from_captions(
+        (i * 4.0, i * 4.0 + 3.5, " ".join(f"w{i}_{j}" for j in range(words))) for i in range(count)
+    )
+
+
+def test_token_budget_chunks_pack_and_keep_oversized_items():
+    assert token_budget_chunks([5, 5, 5, 5], 11) == [(0, 2), (2, 4)]
+    assert token_budget_chunks([3, 50, 3], 10) == [(0, 1), (1, 2), (2, 3)]
+    assert token_budget_chunks([], 10) == []
+
+
+def test_summarize_captions_fills_token_budget_and_batches():
+    model = WordModel(max_input_tokens=40)  # 32 usable after the special-token margin
+    result = summarize_captions(_captions(30), model=model, map_reduce=False, batch_size=4)
+
+    # 5 words + 1 joining space per caption -> 5 captions per 32-token chunk
+    assert result["generation"]["chunks"] == 6
+    assert model.calls == [(6, 4)]
+    assert [item["start"] for item in result["summary"][:2]] == [seconds_to_timecode(0.0), seconds_to_timecode(20.0)]
+    assert "overview" not in result
+
+
+def test_map_reduce_produces_single_overview():
+    model = WordModel(max_input_tokens=20)
+    result = summarize_captions(_captions(60), model=model, map_reduce=True)
+
+    assert result["overview"]
+    # One map pass, then reduce passes until a single summary remains
+    assert len(model.calls) >= 2 and model.calls[-1][0] == 1
+    assert result["generation"]["map_reduce"] is True
+
+
+def test_summarize_scc_writes_minutes_schema(tmp_path, monkeypatch):
+    import core.scc_summarizer as summarizer_module
+
+    scc = tmp_path / "council.scc"
+    scc.write_text("00:00:01:00\t00:00:04:00\nCall to order.\n\n00:00:05:00\t00:00:08:00\nRoll call.\n\n")
+    monkeypatch.setattr(summarizer_module, "summarizer", WordModel())
+
+    path = summarize_scc(str(scc), map_reduce=True)
+    data = json.loads(open(path).read())
+
+    assert path.endswith("council_minutes.json")
+    assert data["summary"][0]["speaker"] == "Unknown" and data["summary"][0]["start"] == "00:00:01;00"
+    assert data["overview"] and data["generation"]["chunks"] == 1
@@ -0,0 +1,141 @@
+from core.scc_parser import SccCaptions
+from core.scc_summarizer import summarize_captions
+from core.summary_cache import SummaryCache
+
+
+class CountingModel:
+    backend = "fake-bart"
+    max_length, min_length, max_input_tokens = 100, 30, 40
+
+    def __init__(self):
+        self.summarized = []
+        self.fallbacks = 0
+
+    def count_tokens(self, texts):
+        return [len(t.split()) for t in texts]
+
+    def summarize_batch(self, texts, num_points=1, batch_size=8):
+        self.summarized.extend(texts)
+        return [f"summary of {t.split()[0]}" for t in texts]
+
+
+def _captions(texts):
+    return SccCaptions.from_captions((i * 4.0, i * 4.0 + 3.0, t) for i, t in enumerate(texts))
+
+
+def test_only_uncached_chunks_reach_the_model(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"))
+    model = CountingModel()
+
+    first = cache.summarize_batch(model, ["alpha one", "beta two"])
+    second = cache.summarize_batch(model, ["alpha one", "gamma three", "beta two"])
+
+    assert first == ["summary of alpha", "summary of beta"]
+    assert second == ["summary of alpha", "summary of gamma", "summary of beta"]
+    assert model.summarized == ["alpha one", "beta two", "gamma three"]
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 3)
+    assert stats["hit_rate"] == 0.4
+
+
+def test_key_includes_model_and_parameters(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"))
+    model = CountingModel()
+    cache.summarize_batch(model, ["alpha one"])
+
+    model.max_length = 60
+    cache.summarize_batch(model, ["alpha one"])
+    cache.summarize_batch(model, ["alpha one"], num_points=3)
+
+    assert model.summarized == ["alpha one"] * 3
+
+
+def test_fallback_output_is_not_memoized(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"))
+
+    class FailingModel(CountingModel):
+        def summarize_batch(self, texts, num_points=1, batch_size=8):
+            self.fallbacks += len(texts)
+            return super().summarize_batch(texts, num_points, batch_size)
+
+    cache.summarize_batch(FailingModel(), ["alpha one"])
+
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_lru_bound(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"), max_entries=2)
+    model = CountingModel()
+    cache.summarize_batch(model, ["a x"])
+    cache.summarize_batch(model, ["b x"])
+    cache.summarize_batch(model, ["a x"])  # refresh a
+    cache.summarize_batch(model, ["c x"])
+
+    model.summarized.clear()
+    cache.summarize_batch(model, ["a x", "b x", "c x"])
+    assert model.summarized == ["b x"]
+
+
+def test_rerun_of_edited_transcript_recomputes_changed_chunks_only(tmp_path, monkeypatch):
+    import core.summary_cache as summary_cache
+
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"))
+    monkeypatch.setattr(summary_cache, "SUMMARY_CACHE_ENABLED", True)
+    monkeypatch.setattr(summary_cache, "_summary_cache", cache)
+    texts = [f"w{i} " + "word " * 9 for i in range(12)]  # 10 tokens each, 3 per 32-token chunk
+    model = CountingModel()
+    summarize_captions(_captions(texts), model=model, map_reduce=False)
+    assert len(model.summarized) == 4
+
+    texts[4] = "w4 edited " + "word " * 8
+    model.summarized.clear()
+    summarize_captions(_captions(texts), model=model, map_reduce=False)
+
+    assert len(model.summarized) == 1 and "edited" in model.summarized[0]
+
+
+class WordTokenizer:
+    model_max_length = 40
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [t.split() for t in texts]}
+
+
+def test_fully_cached_rerun_never_loads_the_model(tmp_path, monkeypatch):
+    import core.scc_summarizer as scc_summarizer
+    import core.summary_cache as summary_cache
+
+    monkeypatch.setattr(summary_cache, "SUMMARY_CACHE_ENABLED", True)
+    monkeypatch.setattr(
+        summary_cache, "_summary_cache", SummaryCache(str(tmp_path / "s.sqlite"))
+    )
+    monkeypatch.setattr(scc_summarizer, "SUMMARIZATION_MAX_INPUT_TOKENS", 0)
+    monkeypatch.setattr(scc_summarizer, "load_tokenizer", lambda name: WordTokenizer())
+    loaded = []
+
+    def factory():
+        model = CountingModel()
+        model.backend = handle.backend
+        loaded.append(model)
+        return model
+
+    handle = scc_summarizer.LazySummaryModel(idle_unload_seconds=0, factory=factory)
+    captions = _captions([f"w{i} " + "word " * 9 for i in range(12)])
+    first = summarize_captions(captions, model=handle, map_reduce=False)
+    handle.unload()
+    second = summarize_captions(captions, model=handle, map_reduce=False)
+
+    assert first["summary"] == second["summary"] and len(loaded) == 1
+    assert not handle.loaded
+
+
+def test_output_of_an_unconfigured_backend_is_not_memoized(tmp_path, monkeypatch):
+    import core.scc_summarizer as scc_summarizer
+
+    monkeypatch.setattr(scc_summarizer, "load_tokenizer", lambda name: WordTokenizer())
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"))
+    handle = scc_summarizer.LazySummaryModel(idle_unload_seconds=0, factory=CountingModel)
+    cache.summarize_batch(handle, ["alpha one"])
+
+    # CountingModel reports "fake-bart", not the configured backend
+    assert cache.get_stats()["entries"] == 0 and handle.fallbacks == 1
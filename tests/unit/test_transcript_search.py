@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+import core.transcript_search as search
+from core.cea608 import Cea608Encoder
+from core.transcript_search import TranscriptSearchIndex, build_match_query
+
+
+def _write_text_scc(path, cues):
+    lines = []
+    for start, end, text in cues:
+        lines.append(f"{start}\t{end}\n{text}\n\n")
+    path.write_text("".join(lines))
+    return path
+
+
+def _write_608_scc(path, cues):
+    encoder = Cea608Encoder()
+    body = "".join(encoder.encode(start, end, text) for start, end, text in cues) + encoder.finish()
+    path.write_text("Scenarist_SCC V1.0\n\n" + body)
+    return path
+
+
+@pytest.fixture
+def flex(tmp_path):
+    root = tmp_path / "flex-1"
+    root.mkdir()
+    _write_text_scc(root / "council_0101.scc", [
+        ("00:00:01:00", "00:00:04:00", "Call the meeting to order"),
+        ("00:01:30:15", "00:01:33:00", "Motion to approve the street reconstruction budget"),
+    ])
+    (root / "council_0101.mp4").write_bytes(b"")
+    _write_608_scc(root / "parks_0215.scc", [
+        (10.0, 13.0, "Budgeting for the new playground"),
+        (20.0, 23.0, "The motion carries"),
+    ])
+    return root
+
+
+def test_build_match_query_quotes_terms_phrases_and_prefixes():
+    assert build_match_query('budg* "street  reconstruction" NOT') == '"budg"* "street reconstruction" "NOT"'
+    assert build_match_query("o'brien") == '"o brien"'
+    with pytest.raises(ValueError):
+        build_match_query(' "" * ')
+
+
+def test_index_and_search_phrase_prefix_and_pagination(tmp_path, flex):
+    index = TranscriptSearchIndex(str(tmp_path / "search.sqlite"))
+    stats = index.update_from_directories({"flex1": str(flex)})
+
+    assert stats["indexed"] == 2 and stats["errors"] == 0
+
+    result = index.search('"street reconstruction"')
+    assert result["total"] == 1
+    hit = result["hits"][0]
+    assert hit["title"] == "council_0101" and hit["mount"] == "flex1"
+    assert hit["video_path"] == str(flex / "council_0101.mp4")
+    assert hit["start"] == pytest.approx(90.5) and hit["timecode"].startswith("00:01:30")
+    assert "the [street reconstruction] budget" in hit["snippet"]
+
+    prefix = index.search("budget*")
+    assert {h["title"] for h in prefix["hits"]} == {"council_0101", "parks_0215"}
+    parks = next(h for h in prefix["hits"] if h["title"] == "parks_0215")
+    assert abs(parks["start"] - 10.0) < 0.05
+
+    page2 = index.search("motion", page=2, per_page=1)
+    assert page2["total"] == 2 and page2["pages"] == 2 and len(page2["hits"]) == 1
+    assert index.search("motion", mount="flex9")["total"] == 0
+
+
+def test_update_is_incremental_and_prunes_removed(tmp_path, flex):
+    index = TranscriptSearchIndex(str(tmp_path / "search.sqlite"))
+    index.update_from_directories({"flex1": str(flex)})
+
+    again = index.update_from_directories({"flex1": str(flex)})
+    assert again["indexed"] == 0 and again["unchanged"] == 2
+
+    _write_text_scc(flex / "council_0101.scc", [("00:00:05:00", "00:00:07:00", "Adjourned")])
+    os.utime(flex / "council_0101.scc", ns=(1, 1))
+    os.remove(flex / "parks_0215.scc")
+    changed = index.update_from_directories({"flex1": str(flex)})
+
+    assert changed["indexed"] == 1 and changed["removed"] == 1
+    assert index.search("motion")["total"] == 0
+    assert index.search("adjourned")["total"] == 1
+    assert index.get_stats()["transcripts"] == 1
+
+
+def test_secondary_caption_formats_are_not_indexed_twice(tmp_path, flex):
+    (flex / "council_0101.scc608.scc").write_text((flex / "council_0101.scc").read_text())
+    index = TranscriptSearchIndex(str(tmp_path / "search.sqlite"))
+
+    assert index.update_from_directories({"flex1": str(flex)})["indexed"] == 2
+
+
+def test_index_transcript_hook_is_best_effort(tmp_path, flex, monkeypatch):
+    index = TranscriptSearchIndex(str(tmp_path / "search.sqlite"))
+    monkeypatch.setattr(search, "_transcript_index", index)
+    monkeypatch.setattr(search, "FLEX_PATHS", {"flex1": str(flex)})
+    monkeypatch.setattr(search, "TRANSCRIPT_SEARCH_ENABLED", True)
+
+    assert search.index_transcript(str(flex / "council_0101.scc"))
+    assert not search.index_transcript(str(flex / "missing.scc"))
+    assert index.search("order")["hits"][0]["mount"] == "flex1"
@@ -0,0 +1,81 @@
+import os
+
+import core.transcription as transcription
+from core.transcription_benchmark import (
+    DEFAULT_FIXTURE,
+    BenchmarkConfig,
+    Fixture,
+    _environment,
+    _run_config,
+    compare_to_baseline,
+    expand_matrix,
+    prepare_fixtures,
+    read_wav_mono,
+)
+
+
+def test_expand_matrix_is_cartesian():
+    configs = expand_matrix(["base", "small"], ["int8"], [4, 8], [1, 5], [True, False])
+
+    assert len(configs) == 16
+    assert len({c.id for c in configs}) == 16
+    assert configs[0].id == "base/int8/t4/b1/vad/serial"
+    assert configs[0].environment("/tmp/w")["BATCH_SIZE"] == "4"
+
+
+def test_prepare_fixtures_synthesises_long_audio(tmp_path):
+    fixtures = prepare_fixtures(str(tmp_path), long_minutes=[0.5])
+
+    assert [f.name for f in fixtures] == ["test_audio", "synthetic_0.5min"]
+    assert abs(fixtures[0].duration - 5.0) < 0.01
+    assert fixtures[1].duration == 30.0
+    assert len(read_wav_mono(fixtures[1].path)) == 30 * 16000
+
+
+def test_compare_to_baseline_flags_regressions_over_threshold():
+    baseline = {"results": [
+        {"config_id": "a", "fixture": "f", "real_time_factor": 0.20},
+        {"config_id": "b", "fixture": "f", "real_time_factor": 0.20},
+    ]}
+    current = {"results": [
+        {"config_id": "a", "fixture": "f", "real_time_factor": 0.21},
+        {"config_id": "b", "fixture": "f", "real_time_factor": 0.25},
+        {"config_id": "c", "fixture": "f", "real_time_factor": 9.0},
+    ]}
+
+    regressions = compare_to_baseline(current, baseline, max_regression=0.10)
+
+    assert [r["config_id"] for r in regressions] == ["b"]
+    assert abs(regressions[0]["change"] - 0.25) < 1e-9
+
+
+def test_run_config_reports_throughput(monkeypatch):
+    calls = {}
+
+    def fake_transcribe(path, mode=None, use_cache=True, options=None, **_kwargs):
+        calls["options"] = options
+        return {"segments": 4, "duration": 5.0}
+
+    original = dict(transcription.TRANSCRIBE_OPTIONS)
+    monkeypatch.setattr(transcription, "_transcribe_with_faster_whisper", fake_transcribe)
+    monkeypatch.setattr("core.whisper_model_pool.get_whisper_model", lambda *a, **k: object())
+
+    config = BenchmarkConfig("base", "int8", 2, 1, False)
+    result = _run_config(config, Fixture("clip", str(DEFAULT_FIXTURE), 5.0), repeats=2)
+
+    assert calls["options"]["beam_size"] == 1 and calls["options"]["vad_filter"] is False
+    # Passed to the run (and on to chunked workers), not patched into the module
+    assert transcription.TRANSCRIBE_OPTIONS == original
+    assert result["config_id"] == config.id
+    assert result["segments"] == 4 and len(result["runs"]) == 2
+    assert result["real_time_factor"] == result["wall_seconds"] / 5.0
+    assert result["peak_rss_mb"] > 0
+
+
+def test_environment_is_restored(monkeypatch):
+    monkeypatch.setenv("WHISPER_MODEL", "large-v2")
+    monkeypatch.delenv("COMPUTE_TYPE", raising=False)
+    with _environment({"WHISPER_MODEL": "base", "COMPUTE_TYPE": "int8"}):
+        assert os.environ["WHISPER_MODEL"] == "base"
+    assert os.environ["WHISPER_MODEL"] == "large-v2"
+    assert "COMPUTE_TYPE" not in os.environ
@@ -0,0 +1,117 @@
+import numpy as np
+
+import core.transcription_cache as tcache
+from core.transcription_cache import TranscriptionResultCache, file_fingerprint, pcm_fingerprint
+
+
+def _media(path, size=3 * 1024 * 1024, seed=0):
+    data = np.random.default_rng(seed).integers(0, 256, size, dtype=np.uint8).tobytes()
+    path.write_bytes(data)
+    return path
+
+
+def _cache(tmp_path, monkeypatch, pcm=None):
+    monkeypatch.setattr(tcache, "_staged_pcm_fingerprint", lambda _path: pcm)
+    return TranscriptionResultCache(str(tmp_path / "cache"), model="base")
+
+
+def test_file_fingerprint_ignores_name_but_not_content(tmp_path):
+    original = _media(tmp_path / "council.mp4")
+    copy = tmp_path / "council_reexport.mp4"
+    copy.write_bytes(original.read_bytes())
+    edited = bytearray(original.read_bytes())
+    edited[-10] ^= 0xFF
+    (tmp_path / "edited.mp4").write_bytes(bytes(edited))
+
+    assert file_fingerprint(str(original)) == file_fingerprint(str(copy))
+    assert file_fingerprint(str(original)) != file_fingerprint(str(tmp_path / "edited.mp4"))
+
+
+def test_pcm_fingerprint_depends_on_duration():
+    audio = np.random.default_rng(1).standard_normal(16000 * 40).astype(np.float32)
+
+    assert pcm_fingerprint(audio) == pcm_fingerprint(audio.copy())
+    assert pcm_fingerprint(audio) != pcm_fingerprint(audio[:-16000])
+
+
+def test_store_and_materialize_for_duplicate(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch)
+    flex1, flex2 = tmp_path / "flex-1", tmp_path / "flex-2"
+    flex1.mkdir()
+    flex2.mkdir()
+    video = _media(flex1 / "council.mp4")
+    (flex1 / "council.scc").write_text("Scenarist_SCC V1.0\n\ncaption\n")
+    (flex1 / "council.srt").write_text("1\n")
+    cache.store(str(video), str(flex1 / "council.scc"), duration=3600.0, segments=10)
+
+    duplicate = flex2 / "council_copy.mp4"
+    duplicate.write_bytes(video.read_bytes())
+    entry = cache.materialize(str(duplicate), str(flex2 / "council_copy.scc"))
+
+    assert entry["source_path"] == str(video)
+    assert (flex2 / "council_copy.scc").read_text().endswith("caption\n")
+    assert (flex2 / "council_copy.srt").exists()
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["hits_file"] == 1
+    assert stats["seconds_saved"] == 3600
+
+
+def test_miss_and_persistent_hit_rate(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch)
+    video = _media(tmp_path / "a.mp4")
+    (tmp_path / "a.scc").write_text("Scenarist_SCC V1.0\n\n")
+    cache.store(str(video), str(tmp_path / "a.scc"))
+
+    other = _media(tmp_path / "b.mp4", seed=2)
+    assert cache.materialize(str(other), str(tmp_path / "b.scc")) is None
+    copy = tmp_path / "c.mp4"
+    copy.write_bytes(video.read_bytes())
+    assert cache.materialize(str(copy), str(tmp_path / "c.scc")) is not None
+
+    reopened = TranscriptionResultCache(cache.cache_dir, model="base")
+    stats = reopened.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    # Results from another model are not reused
+    assert TranscriptionResultCache(cache.cache_dir, model="large-v2").lookup(str(copy)) is None
+
+
+def test_each_model_keeps_its_own_captions(tmp_path, monkeypatch):
+    monkeypatch.setattr(tcache, "_staged_pcm_fingerprint", lambda _path: None)
+    video = _media(tmp_path / "a.mp4")
+    for model in ("base", "/models/large-v2"):
+        (tmp_path / "a.scc").write_text(f"Scenarist_SCC V1.0\n\n{model}\n")
+        TranscriptionResultCache(str(tmp_path / "cache"), model=model).store(str(video), str(tmp_path / "a.scc"))
+
+    copy = tmp_path / "b.mp4"
+    copy.write_bytes(video.read_bytes())
+    TranscriptionResultCache(str(tmp_path / "cache"), model="base").materialize(str(copy), str(tmp_path / "b.scc"))
+
+    assert (tmp_path / "b.scc").read_text().endswith("base\n")
+
+
+def test_audio_fingerprint_matches_remux(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch, pcm="pcm:same-audio")
+    video = _media(tmp_path / "council.mp4")
+    (tmp_path / "council.scc").write_text("Scenarist_SCC V1.0\n\n")
+    cache.store(str(video), str(tmp_path / "council.scc"))
+
+    remux = _media(tmp_path / "council.mov", seed=3)
+    assert cache.materialize(str(remux), str(tmp_path / "council_mov.scc")) is None
+    entry = cache.materialize(str(remux), str(tmp_path / "council_mov.scc"), use_audio=True)
+
+    assert entry["fingerprint"] == "pcm:same-audio"
+    assert (tmp_path / "council_mov.scc").exists()
+
+
+def test_fingerprint_memo_refreshes_on_change(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch)
+    video = _media(tmp_path / "a.mp4")
+    first = cache.fingerprint(str(video))
+
+    calls = []
+    monkeypatch.setattr(tcache, "file_fingerprint", lambda p: calls.append(p) or "file:x")
+    assert cache.fingerprint(str(video)) == first and not calls
+
+    _media(video, seed=5)
+    assert cache.fingerprint(str(video)) == "file:x"
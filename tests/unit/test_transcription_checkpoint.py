@@ -0,0 +1,123 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+import core.transcription as transcription
+from core.transcription_checkpoint import ResumePoint, TranscriptionJournal, get_checkpoint
+
+
+def _video(tmp_path):
+    video = tmp_path / "meeting.mp4"
+    video.write_bytes(b"video")
+    return str(video), str(tmp_path / "meeting.scc")
+
+
+def test_only_checkpointed_segments_are_resumed(tmp_path):
+    video, scc = _video(tmp_path)
+    journal = TranscriptionJournal(video, scc, interval=3600).open()
+    journal.append({"start": 0.0, "end": 2.0, "text": "first",
+                    "words": [SimpleNamespace(start=0.5, end=1.5, word=" first")]})
+    journal.append({"start": 2.0, "end": 4.0, "text": "second"})
+    journal.checkpoint()
+    journal.append({"start": 4.0, "end": 6.0, "text": "unconfirmed"})
+    journal.close()
+
+    resume = TranscriptionJournal(video, scc).load()
+
+    assert resume.offset == 4.0
+    assert [s["text"] for s in resume.segments] == ["first", "second"]
+    assert resume.segments[0]["words"] == [{"start": 0.5, "end": 1.5, "word": " first"}]
+    assert get_checkpoint(video)["segments"] == 2
+
+
+def test_modified_source_discards_journal(tmp_path):
+    video, scc = _video(tmp_path)
+    journal = TranscriptionJournal(video, scc, interval=0).open()
+    journal.append({"start": 0.0, "end": 2.0, "text": "first"})
+    journal.close()
+
+    with open(video, "ab") as f:
+        f.write(b"re-exported")
+
+    assert TranscriptionJournal(video, scc).load() is None
+    assert not os.path.exists(journal.path)
+
+
+def test_serial_transcription_resumes_from_checkpoint(tmp_path, monkeypatch):
+    video, scc = _video(tmp_path)
+    TranscriptionJournal(video, scc).open(
+        ResumePoint(10.0, [{"start": 1.0, "end": 3.0, "text": "before restart"}])
+    ).close()
+
+    seen = {}
+
+    def fake_transcribe(audio, **_kw):
+        seen["samples"] = len(audio)
+        seg = SimpleNamespace(start=1.0, end=2.0, text="after restart")
+        return iter([seg]), SimpleNamespace(duration=len(audio) / 16000, language="en")
+
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(transcription, "SPEECH_PRESCREEN_ENABLED", False)
+    monkeypatch.setattr(transcription, "get_whisper_model",
+                        lambda *a, **k: SimpleNamespace(transcribe=fake_transcribe))
+    monkeypatch.setattr(transcription, "_audio_input",
+                        lambda _p: np.zeros(20 * 16000, dtype=np.float32))
+
+    result = transcription._transcribe_with_faster_whisper(video, mode="serial")
+
+    assert seen["samples"] == 10 * 16000
+    assert result["segments"] == 2
+    assert result["resumed_from_offset"] == 10.0
+    assert result["duration"] == 20.0
+    content = open(scc).read()
+    assert "00:00:01:00\t00:00:03:00\nbefore restart" in content
+    assert "00:00:11:00\t00:00:12:00\nafter restart" in content
+    assert get_checkpoint(video) is None
+
+
+def test_unstaged_resume_decodes_from_the_offset_and_keeps_words(tmp_path, monkeypatch):
+    video, scc = _video(tmp_path)
+    TranscriptionJournal(video, scc).open(ResumePoint(10.0, [
+        {"start": 1.0, "end": 3.0, "text": "before restart",
+         "words": [{"start": 1.0, "end": 2.0, "word": "before"}]},
+    ])).close()
+
+    seen = {}
+
+    def fake_decode_pcm(path, start=0.0):
+        seen["start"] = start
+        return np.zeros(5 * 16000, dtype=np.float32)
+
+    def fake_transcribe(audio, **kwargs):
+        seen["samples"], seen["options"] = len(audio), kwargs
+        word = SimpleNamespace(start=1.0, end=1.5, word="after")
+        seg = SimpleNamespace(start=1.0, end=2.0, text="after restart", words=[word])
+        return iter([seg]), SimpleNamespace(duration=len(audio) / 16000, language="en")
+
+    monkeypatch.setattr(transcription, "TRANSCRIPTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(transcription, "SPEECH_PRESCREEN_ENABLED", False)
+    monkeypatch.setattr(transcription, "CAPTION_OUTPUT_FORMATS", ["scc", "words"])
+    monkeypatch.setattr(transcription, "get_whisper_model",
+                        lambda *a, **k: SimpleNamespace(transcribe=fake_transcribe))
+    monkeypatch.setattr(transcription, "_audio_input", lambda path: path)
+    monkeypatch.setattr("core.audio_cache.decode_pcm", fake_decode_pcm)
+
+    result = transcription._transcribe_with_faster_whisper(video, mode="serial")
+
+    assert (seen["start"], seen["samples"]) == (10.0, 5 * 16000)
+    assert "clip_timestamps" not in seen["options"]
+    assert (result["segments"], result["duration"]) == (2, 15.0)
+    assert "00:00:11:00\t00:00:12:00\nafter restart" in open(scc).read()
+    words = json.load(open(str(tmp_path / "meeting.words.json")))["segments"]
+    assert [row[3] for row in words] == [[[1.0, 2.0, "before"]], [[11.0, 11.5, "after"]]]
+
+
+def test_late_acked_transcriptions_outlast_the_broker_visibility_timeout():
+    from core.config import CELERY_VISIBILITY_TIMEOUT
+    from core.tasks import celery_app
+
+    # A redelivery mid-file would start a second worker on the same journal
+    assert celery_app.conf.broker_transport_options["visibility_timeout"] == CELERY_VISIBILITY_TIMEOUT
+    assert CELERY_VISIBILITY_TIMEOUT > 5 * 3600
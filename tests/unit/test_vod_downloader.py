@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from core.exceptions import VODError
+from core.vod_downloader import RangeDownloader
+
+PAYLOAD = os.urandom(1_200_000)
+SEGMENT = 256 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Minimal VOD origin: HEAD/GET with optional Range and ETag support."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("Range"))
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range") or "")
+        if match and server.ranges:
+            start, end = int(match.group(1)), min(int(match.group(2)), len(server.payload) - 1)
+            body = server.payload[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(server.payload)}")
+        else:
+            body = server.payload
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        if server.drop_after is not None and match and int(match.group(1)) > 0:
+            # Simulate a connection drop halfway through one segment
+            server.drop_after, cut = None, len(body) // 2
+            self.wfile.write(body[:cut])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.payload, server.ranges, server.etag = PAYLOAD, True, '"v1"'
+    server.drop_after, server.requests = None, []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/vod.mp4"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _downloader(origin, tmp_path, **kwargs):
+    kwargs.setdefault("segment_size", SEGMENT)
+    kwargs.setdefault("segment_retries", 1)
+    return RangeDownloader(origin.url, str(tmp_path / "vod.mp4"), connections=3, **kwargs)
+
+
+def test_parallel_range_download(origin, tmp_path):
+    result = _downloader(origin, tmp_path,
+                         expected_sha256=hashlib.sha256(PAYLOAD).hexdigest()).download()
+
+    assert (tmp_path / "vod.mp4").read_bytes() == PAYLOAD
+    assert result["mode"] == "ranges" and result["transferred_bytes"] == len(PAYLOAD)
+    assert sum(1 for r in origin.requests if r != "bytes=0-0") == 5
+    assert not (tmp_path / "vod.mp4.part").exists()
+    assert not (tmp_path / "vod.mp4.part.json").exists()
+
+
+def test_dropped_segment_resumes_from_last_byte(origin, tmp_path, monkeypatch):
+    monkeypatch.setattr("core.vod_downloader.time.sleep", lambda s: None)
+    origin.drop_after = 0
+
+    result = _downloader(origin, tmp_path).download()
+
+    assert (tmp_path / "vod.mp4").read_bytes() == PAYLOAD
+    assert result["segment_retries"] == 1
+    starts = [int(r[6:].split("-")[0]) for r in origin.requests]
+    assert any(start % SEGMENT for start in starts)
+
+
+def test_journal_resumes_only_missing_segments(origin, tmp_path):
+    part = tmp_path / "vod.mp4.part"
+    part.write_bytes(PAYLOAD[:SEGMENT * 2] + b"\0" * (len(PAYLOAD) - SEGMENT * 2))
+    (tmp_path / "vod.mp4.part.json").write_text(json.dumps({
+        "version": 1, "url": origin.url, "size": len(PAYLOAD), "validator": '"v1"',
+        "segment_size": SEGMENT, "completed": [0, 1],
+    }))
+
+    result = _downloader(origin, tmp_path).download()
+
+    assert (tmp_path / "vod.mp4").read_bytes() == PAYLOAD
+    assert result["resumed_bytes"] == SEGMENT * 2
+    assert f"bytes=0-{SEGMENT - 1}" not in origin.requests
+
+
+def test_changed_upstream_discards_journal(origin, tmp_path):
+    (tmp_path / "vod.mp4.part").write_bytes(b"\xff" * len(PAYLOAD))
+    (tmp_path / "vod.mp4.part.json").write_text(json.dumps({
+        "version": 1, "url": origin.url, "size": len(PAYLOAD), "validator": '"v0"',
+        "segment_size": SEGMENT, "completed": [0, 1, 2, 3, 4],
+    }))
+
+    result = _downloader(origin, tmp_path).download()
+
+    assert result["resumed_bytes"] == 0
+    assert (tmp_path / "vod.mp4").read_bytes() == PAYLOAD
+
+
+def test_server_without_ranges_streams(origin, tmp_path):
+    origin.ranges = False
+
+    result = _downloader(origin, tmp_path).download()
+
+    assert result["mode"] == "stream"
+    assert (tmp_path / "vod.mp4").read_bytes() == PAYLOAD
+
+
+def test_checksum_mismatch_discards_partial(origin, tmp_path):
+    with pytest.raises(VODError):
+        _downloader(origin, tmp_path, expected_sha256="0" * 64).download()
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_connection_failure_keeps_journal(origin, tmp_path, monkeypatch):
+    monkeypatch.setattr("core.vod_downloader.time.sleep", lambda s: None)
+    downloader = _downloader(origin, tmp_path, segment_retries=0)
+    real_get = requests.Session.get
+
+    def flaky_get(session, url, headers=None, **kwargs):
+        if headers and headers.get("Range", "").startswith(f"bytes={SEGMENT * 4}"):
+            raise requests.ConnectionError("reset")
+        return real_get(session, url, headers=headers, **kwargs)
+
+    monkeypatch.setattr(requests.Session, "get", flaky_get)
+    with pytest.raises(requests.ConnectionError):
+        downloader.download()
+
+    journal = json.loads((tmp_path / "vod.mp4.part.json").read_text())
+    assert journal["completed"] == [0, 1, 2, 3]
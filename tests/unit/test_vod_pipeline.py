@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from core.vod_pipeline import (
+    STAGES,
+    PipelineStore,
+    parse_concurrency,
+    stage_concurrency,
+    stage_queues,
+    task_routes,
+    worker_command,
+    worker_commands,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data, self.ttls, self.index = {}, {}, {}
+
+    def setex(self, key, ttl, value):
+        self.data[key], self.ttls[key] = value, ttl
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def zadd(self, key, mapping):
+        self.index.update(mapping)
+
+    def zrevrange(self, key, start, end):
+        ordered = sorted(self.index, key=self.index.get, reverse=True)
+        return [member.encode() for member in ordered[start:end + 1]]
+
+    def zremrangebyrank(self, key, start, end):
+        ordered = sorted(self.index, key=self.index.get)
+        for member in ordered[start:len(ordered) + end + 1]:
+            del self.index[member]
+
+
+@pytest.fixture
+def store():
+    return PipelineStore(FakeRedis(), ttl=3600)
+
+
+def create(store, pipeline_id="p1", vod_id=42):
+    return store.create(pipeline_id, vod_id, "birmingham", None,
+                        {stage: f"{pipeline_id}-{stage}" for stage in STAGES})
+
+
+def test_concurrency_spec_and_worker_commands():
+    assert parse_concurrency("cpu_asr=1, cpu_transcode=3,bogus,io_upload=x,=2") == {
+        "cpu_asr": 1, "cpu_transcode": 3}
+    assert stage_concurrency("cpu_transcode=0") == {"io_upload": 1, "cpu_asr": 1, "cpu_transcode": 1}
+
+    command = worker_command("cpu_transcode", 2)
+    assert command[command.index("-Q") + 1] == "cpu_transcode"
+    assert command[command.index("-c") + 1] == "2"
+    assert "-Ofair" in command and "--prefetch-multiplier=1" in command
+
+
+def test_stages_route_to_their_resource_queue():
+    routes = task_routes(enabled=True)
+
+    assert routes["vod_pipeline.transcribe"] == {"queue": "cpu_asr"}
+    assert routes["vod_pipeline.caption_mux"] == {"queue": "cpu_transcode"}
+    assert {routes[f"vod_pipeline.{s}"]["queue"] for s in ("locate", "probe", "upload", "validate")} == {"io_upload"}
+    assert routes["transcription.batch_item"] == {"queue": "cpu_asr"}
+    assert sorted(c[c.index("-Q") + 1] for c in worker_commands(enabled=True)) == [
+        "cpu_asr", "cpu_transcode", "io_upload"]
+
+
+def test_routing_is_opt_in():
+    # Until the stage workers exist, everything stays on the default queue
+    assert task_routes(enabled=False) == {}
+    assert worker_commands(enabled=False) == []
+    assert set(stage_queues(enabled=False).values()) == {"celery"}
+
+
+def test_stage_transitions_drive_pipeline_status(store):
+    state = create(store)
+    assert (state["status"], state["current_stage"]) == ("queued", "locate")
+    assert store.client.ttls["archivist:vod_pipeline:p1"] == 3600
+
+    store.update("p1", "locate", "running", task_id="p1-locate")
+    assert store.get("p1")["status"] == "running"
+    for stage in STAGES[:4]:
+        store.update("p1", stage, "done", result={"stage": stage})
+    store.update("p1", "upload", "skipped", result={"skipped": "no_cablecast_vod"})
+    state = store.get("p1")
+    assert (state["status"], state["current_stage"]) == ("running", "validate")
+    assert state["stages"]["locate"]["started_at"] <= state["stages"]["locate"]["finished_at"]
+
+    store.update("p1", "validate", "done")
+    # Skipping one stage leaves the pipeline completed
+    assert (store.get("p1")["status"], store.get("p1")["current_stage"]) == ("completed", None)
+
+
+def test_failed_and_skipped_pipelines(store):
+    create(store, "p1")
+    store.update("p1", "locate", "done")
+    store.update("p1", "probe", "failed", error="Video file validation failed")
+    assert store.get("p1")["status"] == "failed"
+    assert store.get("p1")["stages"]["probe"]["error"] == "Video file validation failed"
+
+    create(store, "p2")
+    store.update("p2", "locate", "skipped", skip_reason="captions_exist")
+    for stage in STAGES[1:]:
+        store.update("p2", stage, "skipped")
+    state = store.get("p2")
+    assert (state["status"], state["skip_reason"]) == ("skipped", "captions_exist")
+
+    store.update("missing", "locate", "running")  # no state: logged, not raised
+    assert store.get("missing") is None
+
+
+def test_list_returns_most_recent_first(store, monkeypatch):
+    clock = iter(range(100, 200))
+    monkeypatch.setattr("core.vod_pipeline.time.time", lambda: next(clock))
+    for pipeline_id in ("p1", "p2", "p3"):
+        create(store, pipeline_id)
+    del store.client.data["archivist:vod_pipeline:p2"]  # expired
+
+    assert [state["pipeline_id"] for state in store.list(limit=3)] == ["p3", "p1"]
+    assert list(store.client.index) == ["p1", "p2", "p3"]
+    assert json.loads(store.client.get("archivist:vod_pipeline:p3"))["vod_id"] == 42
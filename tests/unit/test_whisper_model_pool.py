@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from core.whisper_model_pool import WhisperModelPool, estimate_model_size_mb
+
+
+def _counting_loader():
+    calls = []
+
+    def loader(model_name, compute_type, cpu_threads, device, num_workers=1):
+        calls.append((model_name, compute_type, cpu_threads, device, num_workers))
+        return MagicMock(name=f"{model_name}-{compute_type}-{cpu_threads}")
+
+    return loader, calls
+
+
+def test_model_is_loaded_once_and_reused():
+    loader, calls = _counting_loader()
+    pool = WhisperModelPool(max_memory_mb=10_000, loader=loader)
+
+    first = pool.get("base", "int8", 4, "cpu")
+    second = pool.get("base", "int8", 4, "cpu")
+
+    assert first is second
+    assert len(calls) == 1
+    stats = pool.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["loads"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_different_threads_are_separate_entries():
+    loader, calls = _counting_loader()
+    pool = WhisperModelPool(max_memory_mb=10_000, loader=loader)
+
+    pool.get("base", "int8", 4, "cpu")
+    pool.get("base", "int8", 8, "cpu")
+    pool.get("base", "int8", 4, "cpu", num_workers=2)
+
+    assert len(calls) == 3
+    assert calls[-1][-1] == 2
+    assert len(pool.get_stats()["models"]) == 3
+
+
+def test_lru_eviction_under_memory_budget():
+    loader, calls = _counting_loader()
+    small = estimate_model_size_mb("small", "int8")
+    pool = WhisperModelPool(max_memory_mb=small * 2, loader=loader)
+
+    pool.get("small", "int8", 1, "cpu")
+    pool.get("small", "int8", 2, "cpu")
+    # Touch the first entry so the second becomes least recently used
+    pool.get("small", "int8", 1, "cpu")
+    pool.get("small", "int8", 3, "cpu")
+
+    loaded = {m["cpu_threads"] for m in pool.get_stats()["models"]}
+    assert loaded == {1, 3}
+    assert pool.get_stats()["evictions"] == 1
+    assert pool.memory_mb <= pool.max_memory_mb
+
+
+def test_oversized_model_is_still_admitted():
+    loader, _ = _counting_loader()
+    pool = WhisperModelPool(max_memory_mb=10, loader=loader)
+
+    pool.get("base", "int8", 1, "cpu")
+    pool.get("large-v2", "int8", 1, "cpu")
+
+    models = pool.get_stats()["models"]
+    assert [m["model"] for m in models] == ["large-v2"]
+
+
+def test_warm_up_swallows_loader_errors():
+    def failing_loader(*_args):
+        raise ImportError("faster_whisper missing")
+
+    pool = WhisperModelPool(max_memory_mb=1000, loader=failing_loader)
+    assert pool.warm_up("base", "int8", 1, "cpu") is False
+    assert pool.get_stats()["loads"] == 0
+
+
+def test_slow_load_does_not_block_other_keys_and_loads_once():
+    loader, calls = _counting_loader()
+    release = threading.Event()
+
+    def slow_loader(model_name, *args):
+        if model_name == "large-v2":
+            assert release.wait(5)
+        return loader(model_name, *args)
+
+    pool = WhisperModelPool(max_memory_mb=10_000, loader=slow_loader)
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(pool.get, "large-v2", "int8", 1, "cpu")
+        second = executor.submit(pool.get, "large-v2", "int8", 1, "cpu")
+        # Another key loads while large-v2 is still loading
+        assert pool.get("base", "int8", 1, "cpu") is not None
+        release.set()
+        assert first.result() is second.result()
+
+    assert [c[0] for c in calls] == ["base", "large-v2"]
+    assert pool.get_stats()["loads"] == 2